@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark for compressed article storage
+Loads the same corpus into databases stored plain, zlib-compressed and
+dictionary-compressed, then compares file size and list-query latency
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from database import NewsDatabase, NewsArticle
+from text_codec import zstandard
+
+SOURCES = ['SEC News', 'CISA Alerts', 'FTC News', 'Reuters Compliance', 'Compliance Week', 'AWS Blog']
+
+# Per-source boilerplate around extracted article text
+BOILERPLATE = {
+    source: (
+        f"{source} | Published by the {source} editorial team. Sign up for the {source} newsletter "
+        "to get compliance and regulatory updates delivered to your inbox every morning. ",
+        " This article is provided for informational purposes only and does not constitute legal advice. "
+        f"For media inquiries contact the {source} press office. Share this article: Twitter LinkedIn Email. "
+        "Related topics: compliance, enforcement, cybersecurity, data protection, financial regulation."
+    )
+    for source in SOURCES
+}
+
+TOPIC_WORDS = (
+    'regulators firm compliance program customer data controls breach investigation enforcement penalty '
+    'settlement disclosure securities exchange commission agency cybersecurity incident vulnerability '
+    'ransomware vendor cloud outage service providers financial institutions banks audit risk management '
+    'governance board oversight privacy consumer protection reporting requirements guidance rule proposal '
+    'comment period market participants fraud charges complaint court order remediation monitoring staff'
+).split()
+
+FUNCTION_WORDS = 'the of and to in a that for on with as by was is it its at from has have were said which'.split()
+
+def zipf_sentence(rng: random.Random, words: list, weights: list) -> str:
+    length = rng.randint(12, 28)
+    chosen = rng.choices(words, weights=weights, k=length)
+    return ' '.join(chosen).capitalize() + '.'
+
+def synthetic_corpus(count: int, max_length: int, seed: int = 42):
+    """Articles with Zipf-distributed wording, per-source boilerplate and varied lengths"""
+    rng = random.Random(seed)
+    vocabulary = FUNCTION_WORDS + TOPIC_WORDS + [f"term{i}" for i in range(5000)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+
+    for i in range(count):
+        source = rng.choice(SOURCES)
+        header, footer = BOILERPLATE[source]
+        target = min(max_length, int(rng.lognormvariate(math.log(2500), 0.6)))
+        body = []
+        size = 0
+        while size < target:
+            sentence = zipf_sentence(rng, vocabulary, weights)
+            body.append(sentence)
+            size += len(sentence) + 1
+        content = (header + ' '.join(body) + footer)[:max_length]
+        yield {
+            'title': zipf_sentence(rng, vocabulary, weights)[:90],
+            'content': content,
+            'summary': ' '.join(body[:3]),
+            'source': source
+        }
+
+def load_corpus(path: str):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def db_corpus(path: str):
+    db = NewsDatabase(path)
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute('SELECT title, content, summary, source FROM news_articles').fetchall()
+    for title, content, summary, source in rows:
+        yield {'title': title, 'content': db.codec.decode(content), 'summary': db.codec.decode(summary), 'source': source}
+
+def time_query(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def run_variant(name: str, compression, corpus, workdir: str, repeat: int):
+    path = os.path.join(workdir, f"{name}.db")
+    db = NewsDatabase(path, compression)
+
+    start = time.perf_counter()
+    for i, record in enumerate(corpus):
+        db.add_article(NewsArticle(
+            title=record.get('title', ''),
+            content=record.get('content', ''),
+            summary=record.get('summary', ''),
+            url=f"https://example.com/{name}/{i}",
+            source=record.get('source', 'Benchmark'),
+            category='compliance_news'
+        ))
+    insert_seconds = time.perf_counter() - start
+
+    dictionary_bytes = 0
+    if compression and compression.get('dictionary'):
+        dictionary_id = db.train_compression_dictionary()
+        dictionary_bytes = len(db.codec.dictionaries.get(dictionary_id, b''))
+        db.recompress_articles()
+
+    with sqlite3.connect(path) as conn:
+        conn.execute('VACUUM')
+        stored = conn.execute('''
+            SELECT SUM(LENGTH(CAST(content AS BLOB))) + SUM(LENGTH(CAST(summary AS BLOB))) FROM news_articles
+        ''').fetchone()[0]
+
+    def list_and_read():
+        for article in db.get_articles(limit=100):
+            len(article.content)
+
+    return {
+        'db_bytes': os.path.getsize(path),
+        'stored_text_bytes': stored,
+        'dictionary_bytes': dictionary_bytes,
+        'insert_articles_per_second': round(len(corpus) / insert_seconds) if insert_seconds else None,
+        'list_100_ms': round(time_query(lambda: db.get_articles(limit=100), repeat), 3),
+        'list_100_read_content_ms': round(time_query(list_and_read, repeat), 3),
+        'category_page_ms': round(time_query(lambda: db.get_articles(limit=50, offset=500, category='compliance_news'), repeat), 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Article compression benchmark')
+    parser.add_argument('--articles', type=int, default=20000, help='Synthetic articles to load')
+    parser.add_argument('--max-length', type=int, default=5000, help='Synthetic content length cap (scraping.max_content_length)')
+    parser.add_argument('--corpus', help='JSON lines file of {"title", "content", "summary", "source"} records')
+    parser.add_argument('--from-db', help='Use the articles stored in an existing news database')
+    parser.add_argument('--repeat', type=int, default=20, help='Repetitions per query')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = list(load_corpus(args.corpus))
+    elif args.from_db:
+        corpus = list(db_corpus(args.from_db))
+    else:
+        corpus = list(synthetic_corpus(args.articles, args.max_length))
+
+    variants = {
+        'plain': None,
+        'zlib': {'enabled': True, 'codec': 'zlib', 'dictionary': False},
+        'zlib_dictionary': {'enabled': True, 'codec': 'zlib', 'dictionary': True}
+    }
+    if zstandard is not None:
+        variants['zstd'] = {'enabled': True, 'codec': 'zstd', 'level': 3, 'dictionary': False}
+        variants['zstd_dictionary'] = {'enabled': True, 'codec': 'zstd', 'level': 3, 'dictionary': True}
+
+    workdir = tempfile.mkdtemp()
+    results = {
+        'articles': len(corpus),
+        'corpus': args.corpus or args.from_db or 'synthetic',
+        'mean_content_chars': round(sum(len(r.get('content') or '') for r in corpus) / len(corpus)) if corpus else 0,
+        'variants': {}
+    }
+    for name, compression in variants.items():
+        print(f"⏱️  {name}...", file=sys.stderr)
+        results['variants'][name] = run_variant(name, compression, corpus, workdir, args.repeat)
+
+    plain = results['variants']['plain']['db_bytes']
+    for variant in results['variants'].values():
+        variant['size_ratio'] = round(variant['db_bytes'] / plain, 3) if plain else None
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark for lease-based source sharding
+Runs 1..N scraper worker processes against one shared database and a local
+stub server, and reports wall time, throughput scaling and double work
+(sources scraped by more than one worker) for each worker count
+"""
+
+import argparse
+import copy
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, ROOT_DIR)
+
+from fixtures import load_config, synthetic_fixtures, source_path
+from stub_server import StubServer
+
+def replicate_sources(config: Dict[str, Any], copies: int) -> Dict[str, Any]:
+    """Config with every source repeated ``copies`` times under distinct names"""
+    config = copy.deepcopy(config)
+    for category, source_list in config['sources'].items():
+        config['sources'][category] = [
+            dict(source, name=f"{source['name']} #{i}") if i else dict(source)
+            for i in range(copies)
+            for source in source_list
+        ]
+    return config
+
+def worker_config(config: Dict[str, Any], base_url: str, db_path: str, worker: int) -> Dict[str, Any]:
+    config = copy.deepcopy(config)
+    config['database'] = {'type': 'sqlite', 'path': db_path}
+    for source_list in config['sources'].values():
+        for source in source_list:
+            source['url'] = base_url + source_path(source)
+    config['scraping']['delay_between_requests'] = 0
+    config['processing']['enable_nlp'] = False
+    config['canonicalization'] = dict(config.get('canonicalization') or {}, force_https=False, resolve_redirects=False)
+    config['raw_store'] = {'enabled': False}
+    config['leases'] = dict(config.get('leases') or {}, enabled=True, worker_id=f"bench-{worker}")
+    return config
+
+def run_worker(config: Dict[str, Any], start: multiprocessing.Event, results: multiprocessing.Queue):
+    """Child-process entry point: build a scraper, wait for the start signal, scrape"""
+    logging.disable(logging.CRITICAL)
+    from scraper import NewsScraper
+
+    scraper = NewsScraper(config)
+    start.wait()
+    started = time.time()
+    outcome = scraper.scrape_all_sources()
+    results.put({
+        'worker': scraper.worker_id,
+        'started': started,
+        'finished': time.time(),
+        'sources': outcome['total_sources'],
+        'articles': outcome['total_articles']
+    })
+
+def double_work(db_path: str) -> int:
+    """Scrape runs beyond one per source"""
+    with sqlite3.connect(db_path) as conn:
+        runs, sources = conn.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT source_name) FROM scraping_logs'
+        ).fetchone()
+    return runs - sources
+
+def bench_workers(config: Dict[str, Any], base_url: str, workers: int, timeout: float) -> Dict[str, Any]:
+    from database import NewsDatabase
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'news.db')
+        # Schema created once up front instead of by every worker at once
+        NewsDatabase(db_path)
+
+        start = context.Event()
+        result_queue = context.Queue()
+        processes = [
+            context.Process(target=run_worker, args=(worker_config(config, base_url, db_path, i), start, result_queue))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        start.set()
+
+        reports: List[Dict[str, Any]] = [result_queue.get(timeout=timeout) for _ in processes]
+        for process in processes:
+            process.join()
+
+        wall = max(r['finished'] for r in reports) - min(r['started'] for r in reports)
+        sources = sum(r['sources'] for r in reports)
+        return {
+            'workers': workers,
+            'wall_seconds': round(wall, 3),
+            'sources_scraped': sources,
+            'articles_saved': sum(r['articles'] for r in reports),
+            'sources_per_second': round(sources / wall, 2) if wall else None,
+            'sources_per_worker': sorted(r['sources'] for r in reports),
+            'double_scraped': double_work(db_path)
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description='Lease-based source sharding benchmark')
+    parser.add_argument('--config', default=os.path.join(ROOT_DIR, 'config', 'config.yaml'), help='Config file path')
+    parser.add_argument('--workers', default='1,2,4,8', help='Comma-separated worker counts to run')
+    parser.add_argument('--copies', type=int, default=4, help='Times each configured source is repeated')
+    parser.add_argument('--items', type=int, default=20, help='Articles per synthetic source')
+    parser.add_argument('--latency', type=float, default=0.5, help='Stub response latency in seconds')
+    parser.add_argument('--timeout', type=float, default=900, help='Give up on a worker count after this many seconds')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    config = replicate_sources(load_config(args.config), args.copies)
+    server = StubServer(synthetic_fixtures(config, args.items), latency=args.latency)
+    base_url = server.start()
+
+    results = {
+        'sources': sum(len(source_list) for source_list in config['sources'].values()),
+        'latency': args.latency,
+        'runs': []
+    }
+    try:
+        for workers in [int(w) for w in args.workers.split(',') if w.strip()]:
+            run = bench_workers(config, base_url, workers, args.timeout)
+            results['runs'].append(run)
+            print(f"⏱️  {workers} workers: {run['wall_seconds']}s, {run['double_scraped']} double-scraped", file=sys.stderr)
+    finally:
+        server.stop()
+
+    baseline = results['runs'][0] if results['runs'] else None
+    for run in results['runs']:
+        if baseline and run['wall_seconds']:
+            run['speedup'] = round(baseline['wall_seconds'] / run['wall_seconds'], 2)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
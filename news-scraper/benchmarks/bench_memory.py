@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for article batches
+Loads a corpus into a temporary database, then measures peak RSS and
+traced allocations for holding every article as the previous dataclass
+model, as slotted NewsArticle objects and as one columnar ArticleBatch, and
+for exporting them all to a local stub of the frontend API. Each scenario
+runs in a fresh process.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, ROOT_DIR)
+
+from bench_compression import synthetic_corpus, SOURCES
+from bench_pipeline import peak_rss_bytes
+from stub_server import StubServer, SINK_PATH
+
+SCENARIOS = ('dataclass_list', 'article_list', 'article_batch', 'export_list', 'export_batched')
+
+SOURCE_TAGS = {source: ['compliance', 'regulatory', source.split()[0].lower()] for source in SOURCES}
+
+@dataclass
+class DataclassArticle:
+    """The article model before slots, for comparison"""
+    id: Optional[int] = None
+    title: str = ""
+    content: str = ""
+    url: str = ""
+    source: str = ""
+    published_date: Optional[datetime] = None
+    scraped_date: Optional[datetime] = None
+    tags: List[str] = None
+    category: str = ""
+    sentiment_score: Optional[float] = None
+    relevance_score: Optional[float] = None
+    entities: List[str] = None
+    summary: str = ""
+    cluster_id: Optional[int] = None
+    topic_scores: Optional[Dict[str, float]] = None
+
+def load_database(path: str, articles: int, max_length: int):
+    from database import NewsDatabase, NewsArticle
+
+    db = NewsDatabase(path)
+    for i, record in enumerate(synthetic_corpus(articles, max_length)):
+        db.add_article(NewsArticle(
+            title=record['title'],
+            content=record['content'],
+            summary=record['summary'],
+            url=f"https://example.com/memory/{i}",
+            source=record['source'],
+            published_date=datetime.now(),
+            tags=SOURCE_TAGS[record['source']],
+            category='compliance_news',
+            entities=['agency:sec'] if i % 3 == 0 else [],
+            sentiment_score=0.1,
+            relevance_score=0.5
+        ))
+
+def hold_dataclass_list(db) -> list:
+    from database import ARTICLE_COLUMNS
+    with sqlite3.connect(db.db_path) as conn:
+        rows = conn.execute(f"SELECT {ARTICLE_COLUMNS} FROM news_articles").fetchall()
+    articles = []
+    for row in rows:
+        articles.append(DataclassArticle(
+            id=row[0], title=row[1], content=row[2], url=row[3], source=row[4],
+            published_date=datetime.fromtimestamp(row[5], timezone.utc) if row[5] else None,
+            scraped_date=datetime.fromtimestamp(row[6], timezone.utc) if row[6] else None,
+            tags=json.loads(row[7]) if row[7] else [], category=row[8],
+            sentiment_score=row[9], relevance_score=row[10],
+            entities=json.loads(row[11]) if row[11] else [], summary=row[12],
+            cluster_id=row[13], topic_scores=json.loads(row[14]) if row[14] else None
+        ))
+    del rows
+    return articles
+
+def hold_article_list(db) -> list:
+    return db.get_articles(limit=-1)
+
+def hold_article_batch(db):
+    from database import ArticleBatch
+    combined = ArticleBatch(codec=db.codec)
+    for batch in db.iter_article_batches(1000):
+        for name, column in batch.columns.items():
+            combined.columns[name].extend(column)
+    return combined
+
+def export_list(db, client) -> int:
+    articles = db.get_articles(limit=-1)
+    client.send_articles_to_frontend(articles)
+    return len(articles)
+
+def export_batched(db, client) -> int:
+    exported = 0
+    for batch in db.iter_article_batches(1000):
+        client.send_articles_to_frontend(batch)
+        exported += len(batch)
+    return exported
+
+def run_scenario(name: str, db_path: str, sink_url: str, results: multiprocessing.Queue):
+    """Child-process entry point for one scenario"""
+    logging.disable(logging.CRITICAL)
+    from database import NewsDatabase
+    from api_client import NewsAPIClient
+
+    db = NewsDatabase(db_path)
+    client = NewsAPIClient({'api_endpoint': sink_url, 'batch_size': 100})
+    baseline_rss = peak_rss_bytes()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    if name.startswith('export'):
+        count = (export_list if name == 'export_list' else export_batched)(db, client)
+        held = None
+    else:
+        held = {'dataclass_list': hold_dataclass_list,
+                'article_list': hold_article_list,
+                'article_batch': hold_article_batch}[name](db)
+        count = len(held)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results.put({
+        'articles': count,
+        'seconds': round(elapsed, 3),
+        'held_bytes': current if held is not None else None,
+        'traced_peak_bytes': peak,
+        'baseline_rss_bytes': baseline_rss,
+        'peak_rss_bytes': peak_rss_bytes()
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description='Article batch memory benchmark')
+    parser.add_argument('--articles', type=int, default=20000, help='Synthetic articles to load')
+    parser.add_argument('--max-length', type=int, default=5000, help='Synthetic content length cap')
+    parser.add_argument('--from-db', help='Use an existing news database instead of a synthetic one')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenarios to run')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    server = StubServer({})
+    sink_url = server.start() + SINK_PATH
+    context = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = args.from_db
+        if not db_path:
+            db_path = os.path.join(workdir, 'news.db')
+            print(f"⏳ Loading {args.articles} articles...", file=sys.stderr)
+            logging.disable(logging.CRITICAL)
+            load_database(db_path, args.articles, args.max_length)
+
+        results = {'database': args.from_db or 'synthetic', 'scenarios': {}}
+        try:
+            for name in [s.strip() for s in args.scenarios.split(',') if s.strip()]:
+                if name not in SCENARIOS:
+                    parser.error(f"Unknown scenario: {name}")
+                result_queue = context.Queue()
+                process = context.Process(target=run_scenario, args=(name, db_path, sink_url, result_queue))
+                process.start()
+                result = result_queue.get()
+                process.join()
+                result['rss_growth_bytes'] = result['peak_rss_bytes'] - result['baseline_rss_bytes']
+                results['scenarios'][name] = result
+                print(f"⏱️  {name}: +{result['rss_growth_bytes'] / 2**20:.1f} MiB RSS", file=sys.stderr)
+        finally:
+            server.stop()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark
+Replays recorded (or synthetic) fixtures from a local stub server and measures
+throughput, per-stage latency and peak RSS for scraping, vendor monitoring and
+API delivery. Each scenario runs in a fresh process so RSS figures don't bleed
+into one another.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, ROOT_DIR)
+
+from fixtures import MANIFEST, load_config, load_fixtures, synthetic_fixtures, source_path, vendor_base_path
+from stub_server import StubServer, SINK_PATH
+
+SCENARIOS = ('scrape', 'rescrape', 'monitor', 'deliver')
+
+def peak_rss_bytes() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+class StageTimer:
+    """Wraps methods on an instance and records how long each call takes
+
+    Stages nest: a wrapped method called from another wrapped method is
+    counted in both.
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def wrap(self, obj, method: str, stage: str = None):
+        original = getattr(obj, method)
+        stage = stage or method
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self.lock:
+                    self.samples[stage].append(elapsed)
+
+        setattr(obj, method, timed)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {
+                'count': len(values),
+                'total_ms': round(sum(values) * 1000, 3),
+                'mean_ms': round(sum(values) / len(values) * 1000, 3),
+                'p50_ms': round(percentile(values, 50) * 1000, 3),
+                'p95_ms': round(percentile(values, 95) * 1000, 3),
+                'max_ms': round(max(values) * 1000, 3)
+            }
+            for stage, values in self.samples.items() if values
+        }
+
+def scrape_config(options: Dict[str, Any], base_url: str, workdir: str) -> Dict[str, Any]:
+    config = load_config(options['config'])
+    config['database'] = {'type': 'sqlite', 'path': os.path.join(workdir, 'news.db')}
+    for source_list in config['sources'].values():
+        for source in source_list:
+            source['url'] = base_url + source_path(source)
+    config['scraping']['delay_between_requests'] = 0
+    config['processing']['enable_nlp'] = options['enrich']
+    # Stub links are plain http on localhost and never redirect
+    config['canonicalization'] = dict(config.get('canonicalization') or {}, force_https=False, resolve_redirects=False)
+    config['raw_store'] = {'enabled': False}
+    return config
+
+def scrape_timer(scraper) -> StageTimer:
+    timer = StageTimer()
+    timer.wrap(scraper, 'fetch_source', 'fetch')
+    timer.wrap(scraper, 'parse_rss_content', 'parse_rss')
+    timer.wrap(scraper, 'parse_rss_entry', 'parse_rss_entry')
+    timer.wrap(scraper, 'parse_web_content', 'parse_web')
+    timer.wrap(scraper, 'canonicalize_articles', 'canonicalize')
+    timer.wrap(scraper, 'new_articles', 'dedup')
+    timer.wrap(scraper, 'filter_articles', 'filter')
+    timer.wrap(scraper, 'process_article_content', 'enrich')
+    timer.wrap(scraper, 'score_articles', 'score')
+    timer.wrap(scraper, 'save_article', 'save')
+    return timer
+
+def bench_scrape(options: Dict[str, Any], base_url: str, workdir: str) -> Dict[str, Any]:
+    """NewsScraper.scrape_all_sources against every configured source"""
+    from scraper import NewsScraper
+
+    baseline_rss = peak_rss_bytes()
+    scraper = NewsScraper(scrape_config(options, base_url, workdir))
+    timer = scrape_timer(scraper)
+
+    start = time.perf_counter()
+    results = scraper.scrape_all_sources()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'wall_seconds': round(elapsed, 3),
+        'sources': results['total_sources'],
+        'successful_sources': results['successful_sources'],
+        'failed_sources': results['failed_sources'],
+        'articles_saved': results['total_articles'],
+        'articles_per_second': round(results['total_articles'] / elapsed, 2) if elapsed else None,
+        'sources_per_second': round(results['total_sources'] / elapsed, 2) if elapsed else None,
+        'baseline_rss_bytes': baseline_rss,
+        'stages': timer.summary(),
+        'pipeline': results.get('pipeline'),
+        'http': results.get('http')
+    }
+
+def bench_rescrape(options: Dict[str, Any], base_url: str, workdir: str) -> Dict[str, Any]:
+    """Steady-state scrape cycles over feeds that haven't changed since the first
+
+    The second cycle sends the stored ETags and gets 304s; the third drops
+    them, as for servers without validators, so the feed high-water marks
+    alone decide how many entries are parsed.
+    """
+    import sqlite3
+    from scraper import NewsScraper
+
+    config = scrape_config(options, base_url, workdir)
+    # Every source is due again straight away
+    config['leases'] = dict(config.get('leases') or {}, enabled=False)
+    scraper = NewsScraper(config)
+    first = scraper.scrape_all_sources()
+
+    cycles = {}
+    for name in ('conditional', 'unconditional'):
+        if name == 'unconditional':
+            with sqlite3.connect(config['database']['path']) as conn:
+                conn.execute('UPDATE sources SET feed_etag = NULL, feed_last_modified = NULL')
+        timer = scrape_timer(scraper)
+        start = time.perf_counter()
+        results = scraper.scrape_all_sources()
+        elapsed = time.perf_counter() - start
+        stages = timer.summary()
+        cycles[name] = {
+            'wall_seconds': round(elapsed, 3),
+            'articles_saved': results['total_articles'],
+            'entries_parsed': stages.get('parse_rss_entry', {}).get('count', 0),
+            'stages': stages
+        }
+        # Undo the wrapping before the next cycle wraps again
+        for method in ('fetch_source', 'parse_rss_content', 'parse_rss_entry', 'parse_web_content',
+                       'canonicalize_articles', 'new_articles', 'filter_articles',
+                       'process_article_content', 'score_articles', 'save_article'):
+            del scraper.__dict__[method]
+
+    return {
+        'wall_seconds': round(sum(cycle['wall_seconds'] for cycle in cycles.values()), 3),
+        'sources': first['total_sources'],
+        'first_cycle_articles': first['total_articles'],
+        'cycles': cycles
+    }
+
+def bench_monitor(options: Dict[str, Any], base_url: str, workdir: str) -> Dict[str, Any]:
+    """Repeated VendorStatusMonitor.run_monitoring_cycle calls"""
+    from vendor_monitor import VendorStatusMonitor
+
+    baseline_rss = peak_rss_bytes()
+    monitor = VendorStatusMonitor(
+        max_workers=options['workers'],
+        request_timeout=options['timeout'],
+        cycle_deadline=options['deadline'],
+        db_path=os.path.join(workdir, 'vendor_status.db'),
+        base_url=base_url
+    )
+    for vendor in monitor.vendors:
+        vendor['status_url'] = base_url + vendor_base_path(vendor)
+
+    timer = StageTimer()
+    timer.wrap(monitor, 'poll_vendor', 'poll')
+    timer.wrap(monitor, 'check_vendors_concurrently', 'check_all')
+    timer.wrap(monitor, 'check_vendors_sequentially', 'check_all')
+    timer.wrap(monitor, 'apply_status_updates', 'apply_transitions')
+    timer.wrap(monitor, 'record_health_samples', 'record_health')
+    timer.wrap(monitor, 'save_vendor_status', 'save_transitions')
+    timer.wrap(monitor, 'send_to_nextjs_api', 'send_alerts')
+    timer.wrap(monitor, 'save_parser_state', 'save_cursors')
+
+    cycle_seconds = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(options['cycles']):
+            start = time.perf_counter()
+            monitor.run_monitoring_cycle(concurrent=not options['sequential'])
+            cycle_seconds.append(time.perf_counter() - start)
+
+    total = sum(cycle_seconds)
+    return {
+        'wall_seconds': round(total, 3),
+        'vendors': len(monitor.vendors),
+        'cycles': len(cycle_seconds),
+        'first_cycle_seconds': round(cycle_seconds[0], 3),
+        'mean_cycle_seconds': round(total / len(cycle_seconds), 3),
+        'vendor_checks_per_second': round(len(monitor.vendors) * len(cycle_seconds) / total, 2) if total else None,
+        'baseline_rss_bytes': baseline_rss,
+        'stages': timer.summary()
+    }
+
+def bench_deliver(options: Dict[str, Any], base_url: str, workdir: str) -> Dict[str, Any]:
+    """NewsAPIClient.send_articles_to_frontend into the stub sink"""
+    from api_client import NewsAPIClient
+    from database import NewsArticle
+    from risk_rules import RiskRuleEngine
+
+    baseline_rss = peak_rss_bytes()
+    body = ' '.join(['Regulators reviewed compliance controls at the firm.'] * 40)
+    articles = [
+        NewsArticle(
+            title=f"Benchmark article {i}",
+            content=body,
+            url=f"{base_url}/articles/deliver/{i}",
+            source='Benchmark',
+            published_date=datetime.now(),
+            tags=['compliance', 'benchmark'],
+            category='compliance_news',
+            entities=['SEC']
+        )
+        for i in range(options['articles'])
+    ]
+
+    client = NewsAPIClient(
+        {'api_endpoint': base_url + SINK_PATH, 'batch_size': options['batch_size']},
+        RiskRuleEngine(load_config(options['config']).get('risk_rules'))
+    )
+    timer = StageTimer()
+    timer.wrap(client.http, 'post', 'post_batch')
+
+    start = time.perf_counter()
+    delivered = client.send_articles_to_frontend(articles)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'wall_seconds': round(elapsed, 3),
+        'articles': len(articles),
+        'batch_size': options['batch_size'],
+        'all_delivered': delivered,
+        'articles_per_second': round(len(articles) / elapsed, 2) if elapsed else None,
+        'baseline_rss_bytes': baseline_rss,
+        'stages': timer.summary()
+    }
+
+BENCHMARKS = {
+    'scrape': bench_scrape,
+    'rescrape': bench_rescrape,
+    'monitor': bench_monitor,
+    'deliver': bench_deliver
+}
+
+def run_scenario(name: str, options: Dict[str, Any], base_url: str, results: multiprocessing.Queue):
+    """Child-process entry point for one scenario"""
+    logging.disable(logging.CRITICAL)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = BENCHMARKS[name](options, base_url, workdir)
+    except Exception as e:
+        result = {'error': repr(e)}
+    result['peak_rss_bytes'] = peak_rss_bytes()
+    results.put(result)
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end pipeline benchmark')
+    parser.add_argument('--config', default=os.path.join(ROOT_DIR, 'config', 'config.yaml'), help='Config file path')
+    parser.add_argument('--fixtures', help='Recorded fixture directory (defaults to synthetic fixtures)')
+    parser.add_argument('--items', type=int, default=50, help='Articles per synthetic source')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for synthetic fixtures and error injection')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenarios to run')
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of stub requests answered with 503')
+    parser.add_argument('--enrich', action='store_true', help='Fetch and parse article pages during scraping')
+    parser.add_argument('--cycles', type=int, default=3, help='Vendor monitoring cycles')
+    parser.add_argument('--sequential', action='store_true', help='Poll vendors sequentially')
+    parser.add_argument('--workers', type=int, default=32, help='Vendor polling workers')
+    parser.add_argument('--timeout', type=float, default=10, help='Vendor request timeout in seconds')
+    parser.add_argument('--deadline', type=float, default=30, help='Vendor cycle deadline in seconds')
+    parser.add_argument('--articles', type=int, default=1000, help='Articles to deliver to the API sink')
+    parser.add_argument('--batch-size', type=int, default=100, help='API delivery batch size')
+    parser.add_argument('--scenario-timeout', type=float, default=900, help='Give up on a scenario after this many seconds')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+        with open(os.path.join(args.fixtures, MANIFEST)) as f:
+            fixture_mode = json.load(f).get('mode', 'record')
+    else:
+        fixtures = synthetic_fixtures(config, args.items, args.seed)
+        fixture_mode = 'synthetic'
+
+    server = StubServer(fixtures, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, seed=args.seed)
+    base_url = server.start()
+
+    options = vars(args)
+    results = {
+        'generated_at': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'fixture_mode': fixture_mode,
+        'fixtures': len(fixtures),
+        'options': options,
+        'scenarios': {}
+    }
+
+    # Fresh interpreters keep each scenario's peak RSS independent
+    context = multiprocessing.get_context('spawn')
+    try:
+        for name in [s.strip() for s in args.scenarios.split(',') if s.strip()]:
+            if name not in BENCHMARKS:
+                parser.error(f"Unknown scenario: {name}")
+
+            server.reset_stats()
+            result_queue = context.Queue()
+            process = context.Process(target=run_scenario, args=(name, options, base_url, result_queue))
+            process.start()
+            try:
+                result = result_queue.get(timeout=args.scenario_timeout)
+            except queue.Empty:
+                process.terminate()
+                result = {'error': f"timed out after {args.scenario_timeout}s"}
+            process.join()
+
+            result['stub'] = dict(server.stats)
+            results['scenarios'][name] = result
+            print(f"⏱️ {name}: {result.get('wall_seconds', result.get('error'))}", file=sys.stderr)
+    finally:
+        server.stop()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark
+Runs fresh scheduler.py processes against a local stub server and times how
+long `--run-once` takes to make its first request and to finish, how long
+`--status` takes to answer, and how long `import scraper` takes on its own.
+The database is created by a warm-up run first, as it would be for a cron job.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+import yaml
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+sys.path.insert(0, ROOT_DIR)
+
+from fixtures import load_config, synthetic_fixtures, source_path
+from stub_server import StubServer
+
+IMPORT_SNIPPET = 'import time; start = time.perf_counter(); import scraper; print(time.perf_counter() - start)'
+
+def write_config(config: Dict[str, Any], base_url: str, workdir: str) -> str:
+    """Scheduler config pointing at the stub server and a scratch database"""
+    config = dict(config)
+    config['sources'] = {
+        category: [dict(source, url=base_url + source_path(source)) for source in source_list]
+        for category, source_list in config['sources'].items()
+    }
+    config['database'] = {'type': 'sqlite', 'path': os.path.join(workdir, 'news.db')}
+    config['scraping'] = dict(config['scraping'], delay_between_requests=0)
+    config['processing'] = dict(config['processing'], enable_nlp=False)
+    config['canonicalization'] = dict(config.get('canonicalization') or {}, force_https=False, resolve_redirects=False)
+    config['raw_store'] = {'enabled': False}
+    # Every run scrapes instead of finding the sources leased or not yet due
+    config['leases'] = dict(config.get('leases') or {}, enabled=False)
+    config['logging'] = dict(config.get('logging') or {}, file=os.path.join(workdir, 'logs', 'news_scraper.log'))
+
+    # The scheduler saves run results to ../data relative to its working directory
+    os.makedirs(os.path.join(workdir, 'data'))
+    os.makedirs(os.path.join(workdir, 'run'))
+
+    path = os.path.join(workdir, 'config.yaml')
+    with open(path, 'w') as f:
+        yaml.safe_dump(config, f)
+    return path
+
+def scheduler(config_path: str, flag: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, os.path.join(SRC_DIR, 'scheduler.py'), '--config', config_path, flag],
+        cwd=os.path.join(os.path.dirname(config_path), 'run'),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        'min_ms': round(min(values) * 1000, 1),
+        'median_ms': round(statistics.median(values) * 1000, 1),
+        'max_ms': round(max(values) * 1000, 1)
+    }
+
+def bench_import(repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], cwd=SRC_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return summarize(samples)
+
+def bench_run_once(server: StubServer, config_path: str, repeat: int) -> Dict[str, Any]:
+    first_fetch, total = [], []
+    for _ in range(repeat):
+        server.reset_stats()
+        start = time.time()
+        scheduler(config_path, '--run-once').wait()
+        total.append(time.time() - start)
+        if server.first_request_at is not None:
+            first_fetch.append(server.first_request_at - start)
+    return {
+        'time_to_first_fetch': summarize(first_fetch) if first_fetch else None,
+        'total': summarize(total)
+    }
+
+def bench_status(config_path: str, repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.time()
+        scheduler(config_path, '--status').wait()
+        samples.append(time.time() - start)
+    return summarize(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start benchmark')
+    parser.add_argument('--config', default=os.path.join(ROOT_DIR, 'config', 'config.yaml'), help='Config file path')
+    parser.add_argument('--items', type=int, default=20, help='Articles per synthetic source')
+    parser.add_argument('--repeat', type=int, default=5, help='Processes started per measurement')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    server = StubServer(synthetic_fixtures(config, args.items))
+    base_url = server.start()
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            config_path = write_config(config, base_url, workdir)
+            print("⏳ Warm-up run to create the database...", file=sys.stderr)
+            scheduler(config_path, '--run-once').wait()
+
+            results = {'repeat': args.repeat}
+            results['import_scraper'] = bench_import(args.repeat)
+            print(f"⏱️  import scraper: {results['import_scraper']['median_ms']} ms", file=sys.stderr)
+            results['run_once'] = bench_run_once(server, config_path, args.repeat)
+            first_fetch = results['run_once']['time_to_first_fetch']
+            print(f"⏱️  --run-once first fetch: {first_fetch and first_fetch['median_ms']} ms", file=sys.stderr)
+            results['status'] = bench_status(config_path, args.repeat)
+            print(f"⏱️  --status: {results['status']['median_ms']} ms", file=sys.stderr)
+    finally:
+        server.stop()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the vendor uptime time-series store
+Loads a year of 1-minute samples for 200 vendors and times SLA queries
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from vendor_timeseries import VendorUptimeStore, DAY, MINUTE
+
+def generate_day(vendors, day_start, rng, state):
+    """Yield one day of chronological samples with occasional outages"""
+    for offset in range(0, DAY, MINUTE):
+        ts = day_start + offset
+        for vendor in vendors:
+            remaining = state.get(vendor, 0)
+            if remaining:
+                state[vendor] = remaining - 1
+                yield vendor, ts, 'outage' if remaining > 10 else 'degraded'
+            else:
+                # Roughly one incident per vendor every few days
+                if rng.random() < 0.0003:
+                    state[vendor] = rng.randint(5, 120)
+                yield vendor, ts, 'operational'
+
+def time_query(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Vendor time-series benchmark')
+    parser.add_argument('--vendors', type=int, default=200, help='Number of vendors')
+    parser.add_argument('--days', type=int, default=365, help='Days of 1-minute samples')
+    parser.add_argument('--db', help='Database path (defaults to a temporary file)')
+    parser.add_argument('--repeat', type=int, default=50, help='Repetitions per query')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), 'vendor_timeseries.db')
+    store = VendorUptimeStore(db_path)
+    vendors = [f"vendor-{i:03d}" for i in range(args.vendors)]
+    rng = random.Random(42)
+    state = {}
+
+    end = int(time.time()) // DAY * DAY
+    start = end - args.days * DAY
+
+    ingest_start = time.perf_counter()
+    total = 0
+    for day_start in range(start, end, DAY):
+        total += store.record_samples(generate_day(vendors, day_start, rng, state))
+    ingest_seconds = time.perf_counter() - ingest_start
+
+    vendor = vendors[0]
+    queries = {
+        'uptime_1d_ms': lambda: store.uptime(vendor, DAY, end=end),
+        'uptime_7d_ms': lambda: store.uptime(vendor, 7 * DAY, end=end),
+        'uptime_30d_ms': lambda: store.uptime(vendor, 30 * DAY, end=end),
+        'uptime_365d_ms': lambda: store.uptime(vendor, 365 * DAY, end=end),
+        'mttr_30d_ms': lambda: store.mttr(vendor, 30 * DAY, end=end),
+        'incident_timeline_ms': lambda: store.incident_timeline(vendor)
+    }
+
+    results = {
+        'vendors': args.vendors,
+        'days': args.days,
+        'samples': total,
+        'ingest_seconds': round(ingest_seconds, 2),
+        'ingest_samples_per_second': round(total / ingest_seconds) if ingest_seconds else None,
+        'db_bytes': os.path.getsize(db_path),
+        'uptime_365d': store.uptime(vendor, 365 * DAY, end=end)
+    }
+    for name, fn in queries.items():
+        results[name] = round(time_query(fn, args.repeat), 3)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Fixtures for the end-to-end pipeline benchmarks
+Records every configured news source and vendor status page, or generates
+deterministic synthetic stand-ins, keyed by the path the stub server serves
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, Any, List
+from urllib.parse import urlsplit
+
+import requests
+import yaml
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, ROOT_DIR)
+from status_parsers import get_parser
+
+MANIFEST = 'manifest.json'
+
+# Replaced by the stub server with its own address when serving a fixture
+STUB_BASE = '__STUB_BASE__'
+
+# Words that get synthetic articles past the relevance filter
+RELEVANT_WORDS = ['compliance', 'regulatory', 'data breach', 'cybersecurity', 'audit', 'aws', 'azure', 'banking']
+FILLER_WORDS = (
+    'the firm said on tuesday that its quarterly review found several issues with how '
+    'customer records were handled and that new controls would be rolled out across teams'
+).split()
+
+def slugify(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+def load_config(path: str) -> Dict[str, Any]:
+    """Scraper config, unwrapped from the top-level ``scraper`` key"""
+    with open(path) as f:
+        config = yaml.safe_load(f)
+    return config.get('scraper', config)
+
+def configured_sources(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        dict(source, category=category)
+        for category, source_list in config['sources'].items()
+        for source in source_list
+    ]
+
+def configured_vendors() -> List[Dict[str, Any]]:
+    """Vendors polled by the status monitor"""
+    from vendor_monitor import VendorStatusMonitor
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = VendorStatusMonitor(db_path=os.path.join(tmp, 'vendor_status.db'))
+        return [dict(vendor) for vendor in monitor.vendors]
+
+def source_path(source: Dict[str, Any]) -> str:
+    return f"/sources/{slugify(source['name'])}"
+
+def vendor_base_path(vendor: Dict[str, Any]) -> str:
+    return f"/vendors/{slugify(vendor['name'])}"
+
+def vendor_path(vendor: Dict[str, Any]) -> str:
+    """Path the vendor's parser will request once pointed at the stub"""
+    stub_vendor = dict(vendor, status_url='http://stub' + vendor_base_path(vendor))
+    return urlsplit(get_parser(vendor.get('format', 'generic_json')).url(stub_vendor)).path
+
+def save_fixtures(output: str, fixtures: Dict[str, Dict[str, Any]], mode: str):
+    """Write fixture bodies and a manifest describing them"""
+    os.makedirs(output, exist_ok=True)
+    manifest = {'mode': mode, 'created_at': datetime.now().isoformat(), 'fixtures': {}}
+
+    for path, fixture in fixtures.items():
+        filename = slugify(path) + '.bin'
+        with open(os.path.join(output, filename), 'wb') as f:
+            f.write(fixture['body'])
+        manifest['fixtures'][path] = {
+            'file': filename,
+            'status': fixture.get('status', 200),
+            'content_type': fixture.get('content_type', 'application/octet-stream'),
+            'origin': fixture.get('origin')
+        }
+
+    with open(os.path.join(output, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def load_fixtures(directory: str) -> Dict[str, Dict[str, Any]]:
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    fixtures = {}
+    for path, entry in manifest['fixtures'].items():
+        with open(os.path.join(directory, entry['file']), 'rb') as f:
+            fixtures[path] = dict(entry, body=f.read())
+    return fixtures
+
+def record_fixtures(config: Dict[str, Any], timeout: float = 30) -> Dict[str, Dict[str, Any]]:
+    """Fetch every configured source and status page once"""
+    session = requests.Session()
+    session.headers.update({'User-Agent': config['scraping']['user_agent']})
+    fixtures = {}
+
+    targets = [(source_path(source), source['url']) for source in configured_sources(config)]
+    for vendor in configured_vendors():
+        parser = get_parser(vendor.get('format', 'generic_json'))
+        targets.append((vendor_path(vendor), parser.url(vendor)))
+
+    for path, url in targets:
+        try:
+            response = session.get(url, timeout=timeout)
+            fixtures[path] = {
+                'status': response.status_code,
+                'content_type': response.headers.get('Content-Type', 'application/octet-stream'),
+                'body': response.content,
+                'origin': url
+            }
+            print(f"📥 {response.status_code} {url} ({len(response.content)} bytes)")
+        except requests.RequestException as e:
+            print(f"❌ Could not record {url}: {e}")
+
+    return fixtures
+
+def _sentence(rng: random.Random, relevant: bool) -> str:
+    words = rng.sample(FILLER_WORDS, 12)
+    if relevant:
+        words.insert(rng.randrange(len(words)), rng.choice(RELEVANT_WORDS))
+    return ' '.join(words).capitalize() + '.'
+
+def _synthetic_items(rng: random.Random, source: Dict[str, Any], items: int) -> List[Dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    entries = []
+    for i in range(items):
+        relevant = rng.random() < 0.7
+        entries.append({
+            'title': f"{source['name']} story {i}: " + _sentence(rng, relevant)[:60],
+            'link': f"/articles/{slugify(source['name'])}/{i}",
+            'body': ' '.join(_sentence(rng, relevant) for _ in range(rng.randint(3, 8))),
+            'published': now - timedelta(minutes=i * 17)
+        })
+    return entries
+
+def synthetic_rss(rng: random.Random, source: Dict[str, Any], items: int) -> bytes:
+    parts = [f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{source["name"]}</title>']
+    for entry in _synthetic_items(rng, source, items):
+        parts.append(
+            f"<item><title>{entry['title']}</title><link>{STUB_BASE}{entry['link']}</link>"
+            f"<guid>{entry['link']}</guid><pubDate>{format_datetime(entry['published'])}</pubDate>"
+            f"<description>{entry['body']}</description></item>"
+        )
+    parts.append('</channel></rss>')
+    return ''.join(parts).encode('utf-8')
+
+def synthetic_web(rng: random.Random, source: Dict[str, Any], items: int) -> bytes:
+    css_class = source.get('selector', 'article').partition('.')[2]
+    class_attr = f' class="{css_class}"' if css_class else ''
+    parts = ['<html><body><main>']
+    for entry in _synthetic_items(rng, source, items):
+        parts.append(
+            f"<article{class_attr}><h2><a href=\"{entry['link']}\">{entry['title']}</a></h2>"
+            f"<p>{entry['body']}</p></article>"
+        )
+    parts.append('</main></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+def synthetic_status(rng: random.Random, vendor: Dict[str, Any]) -> Dict[str, Any]:
+    """One open and one resolved incident in the vendor's format"""
+    now = int(time.time())
+    begin = now - rng.randint(600, 7200)
+    fmt = vendor.get('format', 'generic_json')
+
+    if fmt == 'statuspage_io':
+        body = {'incidents': [
+            {
+                'id': 'open1', 'name': 'Elevated API error rates', 'status': 'investigating',
+                'impact': 'major', 'created_at': datetime.fromtimestamp(begin, timezone.utc).isoformat(),
+                'updated_at': datetime.fromtimestamp(now - 60, timezone.utc).isoformat(),
+                'incident_updates': [{'body': 'We are investigating elevated error rates.'}]
+            },
+            {
+                'id': 'old1', 'name': 'Delayed webhooks', 'status': 'resolved', 'impact': 'minor',
+                'created_at': datetime.fromtimestamp(begin - 86400, timezone.utc).isoformat(),
+                'updated_at': datetime.fromtimestamp(begin - 80000, timezone.utc).isoformat(),
+                'resolved_at': datetime.fromtimestamp(begin - 80000, timezone.utc).isoformat(),
+                'incident_updates': [{'body': 'Resolved.'}]
+            }
+        ]}
+    elif fmt == 'gcp':
+        body = [
+            {
+                'id': 'g1', 'external_desc': 'Cloud Storage latency', 'severity': 'medium',
+                'begin': datetime.fromtimestamp(begin, timezone.utc).isoformat(),
+                'modified': datetime.fromtimestamp(now - 60, timezone.utc).isoformat(),
+                'most_recent_update': {'text': 'Mitigation in progress.'}
+            },
+            {
+                'id': 'g0', 'external_desc': 'BigQuery errors', 'severity': 'high',
+                'begin': datetime.fromtimestamp(begin - 86400, timezone.utc).isoformat(),
+                'end': datetime.fromtimestamp(begin - 80000, timezone.utc).isoformat(),
+                'modified': datetime.fromtimestamp(begin - 80000, timezone.utc).isoformat()
+            }
+        ]
+    elif fmt == 'aws':
+        body = [{
+            'service': 'ec2-us-east-1', 'service_name': 'Amazon EC2', 'region_name': 'N. Virginia',
+            'status': '2', 'date': str(begin), 'summary': 'Increased API error rates',
+            'event_log': [{'timestamp': now - 60, 'message': 'We are investigating increased error rates.'}]
+        }]
+    elif fmt == 'azure_rss':
+        return {
+            'content_type': 'application/rss+xml',
+            'body': (
+                '<?xml version="1.0"?><rss version="2.0"><channel><title>Azure Status</title>'
+                f'<item><title>Virtual Machines - degraded performance</title><guid>az1</guid>'
+                f'<pubDate>{format_datetime(datetime.fromtimestamp(begin, timezone.utc))}</pubDate>'
+                '<description>Customers may experience delays.</description></item>'
+                '</channel></rss>'
+            ).encode('utf-8')
+        }
+    else:
+        body = {'incidents': [{'title': 'Login delays', 'description': 'Some instances are slow.'}]}
+
+    return {'content_type': 'application/json', 'body': json.dumps(body).encode('utf-8')}
+
+def synthetic_fixtures(config: Dict[str, Any], items: int = 50, seed: int = 42) -> Dict[str, Dict[str, Any]]:
+    """Deterministic fixtures for every configured source and vendor
+
+    RSS links contain a STUB_BASE placeholder the stub server fills in with
+    its own address, so enrichment fetches stay local.
+    """
+    rng = random.Random(seed)
+    fixtures = {}
+
+    for source in configured_sources(config):
+        if source['type'] == 'rss':
+            fixtures[source_path(source)] = {
+                'content_type': 'application/rss+xml',
+                'body': synthetic_rss(rng, source, items)
+            }
+        else:
+            fixtures[source_path(source)] = {
+                'content_type': 'text/html',
+                'body': synthetic_web(rng, source, items)
+            }
+
+    for vendor in configured_vendors():
+        fixtures[vendor_path(vendor)] = synthetic_status(rng, vendor)
+
+    return fixtures
+
+def main():
+    parser = argparse.ArgumentParser(description='Record or generate pipeline benchmark fixtures')
+    parser.add_argument('mode', choices=['record', 'synthetic'], help='Fetch live pages or generate stand-ins')
+    parser.add_argument('--config', default=os.path.join(ROOT_DIR, 'config', 'config.yaml'), help='Config file path')
+    parser.add_argument('--output', default=os.path.join(BENCH_DIR, 'fixtures'), help='Fixture directory')
+    parser.add_argument('--items', type=int, default=50, help='Articles per synthetic source')
+    parser.add_argument('--seed', type=int, default=42, help='Synthetic fixture seed')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.mode == 'record':
+        fixtures = record_fixtures(config, timeout=config['scraping']['request_timeout'])
+    else:
+        fixtures = synthetic_fixtures(config, args.items, args.seed)
+
+    save_fixtures(args.output, fixtures, args.mode)
+    print(f"💾 Wrote {len(fixtures)} fixtures to {args.output}")
+
+if __name__ == "__main__":
+    main()
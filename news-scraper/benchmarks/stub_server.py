@@ -0,0 +1,168 @@
+"""
+Local stub HTTP server for the pipeline benchmarks
+Serves recorded or synthetic fixtures with injectable latency and errors,
+plus a stand-in for the Next.js /api/news/process endpoint
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+from fixtures import STUB_BASE
+
+SINK_PATH = '/api/news/process'
+
+ARTICLE_PAGE = (
+    '<html><head><title>{title}</title></head><body><article><h1>{title}</h1>'
+    + ''.join(
+        f'<p>Paragraph {i}: regulators reviewed the firm\'s compliance controls and found gaps in how '
+        'customer data was retained, prompting a remediation plan, an independent audit and a fine.</p>'
+        for i in range(8)
+    )
+    + '</article></body></html>'
+)
+
+class StubServer:
+    """Threaded fixture server running in the background of the benchmark process"""
+
+    def __init__(self, fixtures: Dict[str, Dict[str, Any]], latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+        self.base_url = ''
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {
+                'requests': 0,
+                'not_modified': 0,
+                'injected_errors': 0,
+                'sink_batches': 0,
+                'sink_articles': 0,
+                'sink_bytes': 0
+            }
+            # Epoch time of the first fixture GET, for cold-start timing
+            self.first_request_at: Optional[float] = None
+
+    def count(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def delay(self):
+        """Sleep for the configured latency and decide whether to inject an error"""
+        with self.lock:
+            wait = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+            fail = self.rng.random() < self.error_rate
+        if wait:
+            time.sleep(wait)
+        return fail
+
+    def body_for(self, path: str) -> Optional[Dict[str, Any]]:
+        fixture = self.fixtures.get(path)
+        if fixture is not None:
+            body = fixture['body'].replace(STUB_BASE.encode(), self.base_url.encode())
+            return dict(fixture, body=body)
+
+        if path.startswith('/articles/'):
+            return {
+                'status': 200,
+                'content_type': 'text/html; charset=utf-8',
+                'body': ARTICLE_PAGE.format(title=path.rsplit('/', 2)[-2]).encode('utf-8')
+            }
+        return None
+
+    def start(self) -> str:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; don't let Nagle stall them
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def respond(self, status: int, content_type: str, body: bytes, headers: Dict[str, str] = None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                server.count('requests')
+                with server.lock:
+                    if server.first_request_at is None:
+                        server.first_request_at = time.time()
+                if server.delay():
+                    server.count('injected_errors')
+                    self.respond(503, 'text/plain', b'injected error')
+                    return
+
+                fixture = server.body_for(self.path.split('?', 1)[0])
+                if fixture is None:
+                    self.respond(404, 'text/plain', b'no fixture')
+                    return
+
+                etag = '"' + hashlib.sha1(fixture['body']).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    server.count('not_modified')
+                    self.respond(304, fixture['content_type'], b'', {'ETag': etag})
+                    return
+
+                self.respond(fixture.get('status', 200), fixture['content_type'], fixture['body'], {'ETag': etag})
+
+            def do_HEAD(self):
+                fixture = server.body_for(self.path.split('?', 1)[0])
+                self.send_response(200 if fixture else 404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_POST(self):
+                server.count('requests')
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if server.delay():
+                    server.count('injected_errors')
+                    self.respond(503, 'text/plain', b'injected error')
+                    return
+
+                if self.path.split('?', 1)[0] != SINK_PATH:
+                    self.respond(404, 'text/plain', b'unknown endpoint')
+                    return
+
+                try:
+                    articles = json.loads(body).get('articles', [])
+                except ValueError:
+                    self.respond(400, 'application/json', b'{"success": false}')
+                    return
+
+                server.count('sink_batches')
+                server.count('sink_articles', len(articles))
+                server.count('sink_bytes', len(body))
+                self.respond(200, 'application/json', json.dumps({'success': True, 'processed': len(articles)}).encode())
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
@@ -1,66 +1,75 @@
 import requests
-import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
-from database import NewsArticle
+from database import NewsArticle, ArticleBatch
+from risk_rules import RiskRuleEngine
+from http_client import HttpClient
 
 class NewsAPIClient:
-    def __init__(self, api_config: Dict[str, Any]):
+    def __init__(self, api_config: Dict[str, Any], risk_rules: Optional[RiskRuleEngine] = None,
+                 http: Optional[HttpClient] = None):
         self.api_config = api_config
+        self.risk_rules = risk_rules
         self.logger = logging.getLogger(__name__)
-        self.session = requests.Session()
+        # Usually the scraper's client, so API calls share its connection pools
+        self.http = http or HttpClient()
         
-        # Setup headers
-        self.session.headers.update({
+        # Setup headers, sent with each request since the client is shared
+        self.headers = {
             'Content-Type': 'application/json',
             'User-Agent': 'Beacon-News-Scraper/1.0'
-        })
+        }
         
         if api_config.get('api_key'):
-            self.session.headers.update({
+            self.headers.update({
                 'Authorization': f"Bearer {api_config['api_key']}"
             })
     
-    def send_articles_to_frontend(self, articles: List[NewsArticle]) -> bool:
-        """Send scraped articles to the frontend API"""
+    def send_articles_to_frontend(self, articles: Union[List[NewsArticle], ArticleBatch]) -> bool:
+        """Send scraped articles (a list or an ArticleBatch) to the frontend API"""
         try:
             api_endpoint = self.api_config.get('api_endpoint')
             if not api_endpoint:
                 self.logger.warning("No API endpoint configured")
                 return False
             
-            # Convert articles to API format
-            api_articles = []
-            for article in articles:
-                api_article = {
-                    'title': article.title,
-                    'content': article.content,
-                    'url': article.url,
-                    'source': article.source,
-                    'published_date': article.published_date.isoformat() if article.published_date else None,
-                    'scraped_date': article.scraped_date.isoformat() if article.scraped_date else None,
-                    'tags': article.tags,
-                    'category': article.category,
-                    'sentiment_score': article.sentiment_score,
-                    'relevance_score': article.relevance_score,
-                    'entities': article.entities,
-                    'summary': article.summary
-                }
-                api_articles.append(api_article)
+            # Alert scoring for the whole batch up front
+            assessments = self.risk_rules.evaluate_articles(articles) if self.risk_rules else [{}] * len(articles)
             
-            # Send in batches
+            # Send in batches, converting each to API format only when it's
+            # sent so a large export never holds every payload at once
             batch_size = self.api_config.get('batch_size', 100)
             success_count = 0
             error_count = 0
             
-            for i in range(0, len(api_articles), batch_size):
-                batch = api_articles[i:i + batch_size]
+            for i in range(0, len(articles), batch_size):
+                batch = []
+                for article, assessment in zip(articles[i:i + batch_size], assessments[i:i + batch_size]):
+                    api_article = {
+                        'title': article.title,
+                        'content': article.content,
+                        'url': article.url,
+                        'source': article.source,
+                        'published_date': article.published_date.isoformat() if article.published_date else None,
+                        'scraped_date': article.scraped_date.isoformat() if article.scraped_date else None,
+                        'tags': article.tags,
+                        'category': article.category,
+                        'sentiment_score': article.sentiment_score,
+                        'relevance_score': article.relevance_score,
+                        'entities': article.entities,
+                        'summary': article.summary,
+                        'cluster_id': article.cluster_id,
+                        'topic_scores': article.topic_scores
+                    }
+                    api_article.update(assessment)
+                    batch.append(api_article)
                 
                 try:
-                    response = self.session.post(
+                    response = self.http.post(
                         api_endpoint,
                         json={'articles': batch},
+                        headers=self.headers,
                         timeout=30
                     )
                     
@@ -103,9 +112,10 @@ class NewsAPIClient:
                 'timestamp': datetime.now().isoformat()
             }
             
-            response = self.session.post(
+            response = self.http.post(
                 alert_endpoint,
                 json=alert_data,
+                headers=self.headers,
                 timeout=10
             )
             
@@ -125,7 +135,7 @@ class NewsAPIClient:
         try:
             config_endpoint = f"{self.api_config.get('api_endpoint', '')}/config"
             
-            response = self.session.get(config_endpoint, timeout=10)
+            response = self.http.get(config_endpoint, headers=self.headers, timeout=10)
             
             if response.status_code == 200:
                 return response.json()
@@ -142,7 +152,7 @@ class NewsAPIClient:
         try:
             health_endpoint = f"{self.api_config.get('api_endpoint', '')}/health"
             
-            response = self.session.get(health_endpoint, timeout=10)
+            response = self.http.get(health_endpoint, headers=self.headers, timeout=10)
             
             if response.status_code == 200:
                 self.logger.info("Frontend API connection test successful")
@@ -160,9 +170,10 @@ class NewsAPIClient:
         try:
             report_endpoint = f"{self.api_config.get('api_endpoint', '')}/report"
             
-            response = self.session.post(
+            response = self.http.post(
                 report_endpoint,
                 json=report_data,
+                headers=self.headers,
                 timeout=30
             )
             
@@ -182,7 +193,7 @@ class NewsAPIClient:
         try:
             keywords_endpoint = f"{self.api_config.get('api_endpoint', '')}/vendor-keywords"
             
-            response = self.session.get(keywords_endpoint, timeout=10)
+            response = self.http.get(keywords_endpoint, headers=self.headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -200,7 +211,7 @@ class NewsAPIClient:
         try:
             keywords_endpoint = f"{self.api_config.get('api_endpoint', '')}/compliance-keywords"
             
-            response = self.session.get(keywords_endpoint, timeout=10)
+            response = self.http.get(keywords_endpoint, headers=self.headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,174 @@
+import os
+import re
+import time
+import signal
+import logging
+from typing import Dict, Any, List, Optional, Callable
+from urllib.parse import urlparse
+
+# Sections the running process can't switch to; they need a restart
+RESTART_SECTIONS = ('database', 'logging')
+
+SOURCE_TYPES = ('rss', 'web')
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+TIME_OF_DAY = re.compile(r'^([01]\d|2[0-3]):[0-5]\d$')
+
+def _validate_source(source: Any, category: str, errors: List[str]):
+    if not isinstance(source, dict):
+        errors.append(f"sources.{category}: entries must be mappings")
+        return
+    name = source.get('name')
+    label = f"sources.{category}.{name or '?'}"
+    if not name:
+        errors.append(f"{label}: missing name")
+    if urlparse(str(source.get('url', ''))).scheme not in ('http', 'https'):
+        errors.append(f"{label}: url must be http(s)")
+    if source.get('type') not in SOURCE_TYPES:
+        errors.append(f"{label}: type must be one of {', '.join(SOURCE_TYPES)}")
+    if not isinstance(source.get('tags'), list):
+        errors.append(f"{label}: tags must be a list")
+    if source.get('type') == 'web':
+        selector = source.get('selector')
+        if not selector:
+            errors.append(f"{label}: web sources need a selector")
+        else:
+            import soupsieve
+            try:
+                soupsieve.compile(selector)
+            except soupsieve.SelectorSyntaxError as e:
+                errors.append(f"{label}: invalid selector {selector!r}: {e}")
+
+def validate_config(config: Any) -> List[str]:
+    """Problems that would break the scraper if it switched to ``config``"""
+    if not isinstance(config, dict) or not config:
+        return ['config is empty or not a mapping']
+
+    errors = []
+    for section in ('database', 'scraping', 'sources', 'filtering', 'processing'):
+        if not isinstance(config.get(section), dict):
+            errors.append(f"{section}: missing section")
+    if errors:
+        return errors
+
+    if not config['database'].get('path'):
+        errors.append('database.path: missing')
+
+    scraping = config['scraping']
+    for key in ('max_articles_per_source', 'max_content_length', 'request_timeout'):
+        if not isinstance(scraping.get(key), (int, float)) or scraping[key] <= 0:
+            errors.append(f"scraping.{key}: must be a positive number")
+    if not isinstance(scraping.get('delay_between_requests'), (int, float)) or scraping['delay_between_requests'] < 0:
+        errors.append('scraping.delay_between_requests: must be a number >= 0')
+    if not scraping.get('user_agent'):
+        errors.append('scraping.user_agent: missing')
+
+    names = set()
+    for category, source_list in config['sources'].items():
+        if not isinstance(source_list, list):
+            errors.append(f"sources.{category}: must be a list")
+            continue
+        for source in source_list:
+            _validate_source(source, category, errors)
+            name = source.get('name') if isinstance(source, dict) else None
+            if name in names:
+                errors.append(f"sources.{category}.{name}: duplicate source name")
+            names.add(name)
+
+    filtering = config['filtering']
+    keywords = filtering.get('keywords')
+    if not isinstance(keywords, dict) or not all(isinstance(words, list) for words in keywords.values()):
+        errors.append('filtering.keywords: must map categories to keyword lists')
+    if not isinstance(filtering.get('exclude_keywords', []), list):
+        errors.append('filtering.exclude_keywords: must be a list')
+
+    schedule_config = config.get('schedule') or {}
+    for key in ('daily_time', 'weekly_time'):
+        if key in schedule_config and not TIME_OF_DAY.match(str(schedule_config[key])):
+            errors.append(f"schedule.{key}: must be HH:MM")
+    if 'weekly_day' in schedule_config and schedule_config['weekly_day'] not in WEEKDAYS:
+        errors.append('schedule.weekly_day: must be a lowercase weekday name')
+
+    return errors
+
+def _sources_by_name(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {
+        source['name']: dict(source, category=category)
+        for category, source_list in (config.get('sources') or {}).items()
+        for source in source_list
+    }
+
+def config_diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level sections and sources that differ between two configs"""
+    sections = sorted(
+        section for section in set(old) | set(new)
+        if section != 'sources' and old.get(section) != new.get(section)
+    )
+    old_sources = _sources_by_name(old)
+    new_sources = _sources_by_name(new)
+    return {
+        'sections': sections,
+        'restart_required': [section for section in sections if section in RESTART_SECTIONS],
+        'sources_added': sorted(set(new_sources) - set(old_sources)),
+        'sources_removed': sorted(set(old_sources) - set(new_sources)),
+        'sources_changed': sorted(
+            name for name in set(old_sources) & set(new_sources)
+            if old_sources[name] != new_sources[name]
+        )
+    }
+
+def has_changes(diff: Dict[str, Any]) -> bool:
+    return any(diff[key] for key in ('sections', 'sources_added', 'sources_removed', 'sources_changed'))
+
+class ConfigWatcher:
+    """Notices edits to the config file, or SIGHUP, and loads the new config
+
+    ``poll`` is cheap enough to call between sources: it stats the file at
+    most every ``check_seconds``. A changed file is loaded with ``loader``
+    and validated; an invalid one is logged and ignored until it changes
+    again, so the scraper keeps running on the last good config.
+    """
+
+    def __init__(self, path: str, loader: Callable[[], Dict[str, Any]], check_seconds: float = 10):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.loader = loader
+        self.check_seconds = check_seconds
+        self.requested = False
+        self._signature = self._stat()
+        self._next_check = time.monotonic() + check_seconds
+
+    def _stat(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def install_sighup(self):
+        """Reload on SIGHUP; only possible from the main thread, and not on Windows"""
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self._on_sighup)
+
+    def _on_sighup(self, signum, frame):
+        self.requested = True
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """The new config if the file changed (or SIGHUP arrived) and is valid"""
+        if not self.requested:
+            now = time.monotonic()
+            if now < self._next_check:
+                return None
+            self._next_check = now + self.check_seconds
+            if self._stat() == self._signature:
+                return None
+
+        self.requested = False
+        self._signature = self._stat()
+        config = self.loader()
+        errors = validate_config(config)
+        if errors:
+            self.logger.error(f"Ignoring invalid config {self.path}: {'; '.join(errors)}")
+            return None
+
+        self.logger.info(f"Loaded changed config {self.path}")
+        return config
@@ -1,39 +1,363 @@
+import sys
 import sqlite3
 import json
+import time
 import logging
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterable, Iterator, Union, Set
+from dedup import signature_bands, similarity, to_blob, from_blob, BAND_COUNT
+from entity_extraction import is_entity_id
+from retention import RetentionManager
+from text_codec import TextCodec, LazyText
+from source_health import HEALTH_COLUMNS
+from feed_stream import FEED_MARK_COLUMNS, parse_feed_date
+
+# Article timestamps are stored as integer UTC epoch seconds
+EPOCH_NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+TIMESTAMP_COLUMNS = ('published_date', 'scraped_date', 'created_at', 'updated_at')
+
+NEWS_ARTICLES_TABLE = f'''
+    CREATE TABLE IF NOT EXISTS {{table}} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        content TEXT,
+        url TEXT UNIQUE NOT NULL,
+        source TEXT NOT NULL,
+        published_date INTEGER,
+        scraped_date INTEGER DEFAULT ({EPOCH_NOW}),
+        tags TEXT,  -- JSON array
+        category TEXT,
+        sentiment_score REAL,
+        relevance_score REAL,
+        entities TEXT,  -- JSON array
+        summary TEXT,
+        created_at INTEGER DEFAULT ({EPOCH_NOW}),
+        updated_at INTEGER DEFAULT ({EPOCH_NOW})
+    )
+'''
+
+# Columns of simple_scraper's old news_articles table and where they go
+LEGACY_ARTICLE_COLUMNS = {'description': 'content'}
+
+# Columns added to news_articles after the original schema
+ARTICLE_EXTRA_COLUMNS = {
+    'cluster_id': 'INTEGER',
+    'topic_scores': 'TEXT',  # JSON object of class -> probability
+    'canonical_url': 'TEXT'  # Identity for dedup; url stays the publisher's link
+}
+
+# Column order used by every article query
+ARTICLE_COLUMNS = '''
+    id, title, content, url, source, published_date, scraped_date, tags,
+    category, sentiment_score, relevance_score, entities, summary, cluster_id,
+    topic_scores, canonical_url
+'''
+
+# Counters kept current by triggers so stats never scan news_articles or
+# scraping_logs. Keys are never NULL ('' stands in for a missing value);
+# article days and run days are UTC dates.
+STATS_TRIGGERS = {
+    'trg_article_stats_insert': '''
+        CREATE TRIGGER trg_article_stats_insert AFTER INSERT ON news_articles
+        BEGIN
+            INSERT INTO article_stats (dimension, key, count) VALUES
+                ('total', '', 1),
+                ('category', COALESCE(NEW.category, ''), 1),
+                ('source', NEW.source, 1),
+                ('day', COALESCE(date(NEW.scraped_date, 'unixepoch'), ''), 1)
+            ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+        END
+    ''',
+    'trg_article_stats_delete': '''
+        CREATE TRIGGER trg_article_stats_delete AFTER DELETE ON news_articles
+        BEGIN
+            INSERT INTO article_stats (dimension, key, count) VALUES
+                ('total', '', -1),
+                ('category', COALESCE(OLD.category, ''), -1),
+                ('source', OLD.source, -1),
+                ('day', COALESCE(date(OLD.scraped_date, 'unixepoch'), ''), -1)
+            ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+        END
+    ''',
+    'trg_article_stats_update': '''
+        CREATE TRIGGER trg_article_stats_update AFTER UPDATE OF category, source, scraped_date ON news_articles
+        WHEN OLD.category IS NOT NEW.category OR OLD.source IS NOT NEW.source
+             OR date(OLD.scraped_date, 'unixepoch') IS NOT date(NEW.scraped_date, 'unixepoch')
+        BEGIN
+            INSERT INTO article_stats (dimension, key, count) VALUES
+                ('category', COALESCE(OLD.category, ''), -1),
+                ('source', OLD.source, -1),
+                ('day', COALESCE(date(OLD.scraped_date, 'unixepoch'), ''), -1)
+            ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+            INSERT INTO article_stats (dimension, key, count) VALUES
+                ('category', COALESCE(NEW.category, ''), 1),
+                ('source', NEW.source, 1),
+                ('day', COALESCE(date(NEW.scraped_date, 'unixepoch'), ''), 1)
+            ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+        END
+    ''',
+    'trg_source_run_stats_insert': '''
+        CREATE TRIGGER trg_source_run_stats_insert AFTER INSERT ON scraping_logs
+        BEGIN
+            INSERT INTO source_run_stats
+                (source_name, day, runs, successes, articles, timed_runs, duration_sum, duration_max)
+            VALUES (
+                NEW.source_name, COALESCE(date(NEW.created_at), ''), 1,
+                NEW.status = 'success', COALESCE(NEW.articles_scraped, 0),
+                NEW.scraping_duration IS NOT NULL, COALESCE(NEW.scraping_duration, 0),
+                NEW.scraping_duration
+            )
+            ON CONFLICT (source_name, day) DO UPDATE SET
+                runs = runs + 1,
+                successes = successes + excluded.successes,
+                articles = articles + excluded.articles,
+                timed_runs = timed_runs + excluded.timed_runs,
+                duration_sum = duration_sum + excluded.duration_sum,
+                duration_max = MAX(COALESCE(duration_max, excluded.duration_max), COALESCE(excluded.duration_max, duration_max));
+        END
+    ''',
+    # duration_max can't be un-maxed; rebuild_stats recomputes it exactly
+    'trg_source_run_stats_delete': '''
+        CREATE TRIGGER trg_source_run_stats_delete AFTER DELETE ON scraping_logs
+        BEGIN
+            UPDATE source_run_stats SET
+                runs = runs - 1,
+                successes = successes - (OLD.status = 'success'),
+                articles = articles - COALESCE(OLD.articles_scraped, 0),
+                timed_runs = timed_runs - (OLD.scraping_duration IS NOT NULL),
+                duration_sum = duration_sum - COALESCE(OLD.scraping_duration, 0)
+            WHERE source_name = OLD.source_name AND day = COALESCE(date(OLD.created_at), '');
+        END
+    '''
+}
+
+def to_epoch(value) -> Optional[int]:
+    """UTC epoch seconds from a datetime (naive ones are taken as UTC), number or ISO string"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+def from_epoch(value: Optional[int]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+class EpochDatetime:
+    """Timestamp attribute stored as epoch seconds and read as an aware UTC datetime
+
+    Rows hand over the stored integer untouched; the datetime is only built
+    (once) when the attribute is read. ``epoch()`` gives the integer back
+    without building one.
+    """
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if isinstance(value, (int, float)):
+            value = from_epoch(value)
+            setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+    def epoch(self, obj) -> Optional[int]:
+        return to_epoch(getattr(obj, self.slot))
+
+def _stored_size(value) -> int:
+    if value is None:
+        return 0
+    return len(value) if isinstance(value, bytes) else len(value.encode('utf-8'))
+
+# Shared tag tuples; articles from one source all point at the same one.
+# Bounded so keyword combinations from enrichment can't grow it forever
+_TAG_TUPLES: Dict[tuple, tuple] = {}
+_TAG_TUPLES_MAX = 4096
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+def intern_tags(tags: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Immutable, interned tag tuple shared by every article with the same tags"""
+    if not tags:
+        return ()
+    key = tags if type(tags) is tuple else tuple(tags)
+    shared = _TAG_TUPLES.get(key)
+    if shared is None:
+        if len(_TAG_TUPLES) >= _TAG_TUPLES_MAX:
+            _TAG_TUPLES.clear()
+        shared = tuple(_intern(tag) for tag in key)
+        _TAG_TUPLES[shared] = shared
+    return shared
 
-@dataclass
 class NewsArticle:
-    id: Optional[int] = None
-    title: str = ""
-    content: str = ""
-    url: str = ""
-    source: str = ""
-    published_date: Optional[datetime] = None
-    scraped_date: Optional[datetime] = None
-    tags: List[str] = None
-    category: str = ""
-    sentiment_score: Optional[float] = None
-    relevance_score: Optional[float] = None
-    entities: List[str] = None
-    summary: str = ""
-    
-    def __post_init__(self):
-        if self.tags is None:
-            self.tags = []
-        if self.entities is None:
-            self.entities = []
-        if self.scraped_date is None:
-            self.scraped_date = datetime.now()
+    """A news article
+    
+    Slotted rather than a dataclass, so an instance carries no __dict__.
+    ``source`` and ``category`` are interned and ``tags`` is a shared,
+    immutable tuple: assigning or calling ``add_tags`` makes a new tuple
+    (copy on write) and never changes the one other articles, or the
+    source config, hold. ``published_date`` and ``scraped_date`` read as
+    aware UTC datetimes (see EpochDatetime). ``url`` is the link as the
+    publisher served it, used for fetching and display; ``canonical_url``
+    is its normalized form, used only to recognize duplicates.
+    """
+    
+    FIELDS = (
+        'id', 'title', 'content', 'url', 'source', 'published_date', 'scraped_date', 'tags',
+        'category', 'sentiment_score', 'relevance_score', 'entities', 'summary', 'cluster_id',
+        'topic_scores', 'canonical_url'
+    )
+    
+    __slots__ = (
+        'id', 'title', 'content', 'url', 'source', '_published_date', '_scraped_date', '_tags',
+        'category', 'sentiment_score', 'relevance_score', 'entities', 'summary', 'cluster_id',
+        'topic_scores', 'canonical_url'
+    )
+    
+    def __init__(self, id: Optional[int] = None, title: str = "", content: str = "", url: str = "",
+                 source: str = "", published_date: Union[datetime, int, None] = None,
+                 scraped_date: Union[datetime, int, None] = None, tags: Optional[Iterable[str]] = None,
+                 category: str = "", sentiment_score: Optional[float] = None,
+                 relevance_score: Optional[float] = None, entities: Optional[List[str]] = None,
+                 summary: str = "", cluster_id: Optional[int] = None,
+                 topic_scores: Optional[Dict[str, float]] = None, canonical_url: Optional[str] = None):
+        self.id = id
+        self.title = title
+        self.content = content
+        self.url = url
+        self.source = _intern(source)
+        self.published_date = published_date
+        self.scraped_date = int(time.time()) if scraped_date is None else scraped_date
+        self.tags = tags
+        self.category = _intern(category)
+        self.sentiment_score = sentiment_score
+        self.relevance_score = relevance_score
+        self.entities = [] if entities is None else entities
+        self.summary = summary
+        self.cluster_id = cluster_id
+        self.topic_scores = topic_scores
+        self.canonical_url = canonical_url
+    
+    published_date = EpochDatetime('_published_date')
+    scraped_date = EpochDatetime('_scraped_date')
+    
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        return self._tags
+    
+    @tags.setter
+    def tags(self, tags: Optional[Iterable[str]]):
+        self._tags = intern_tags(tags)
+    
+    @property
+    def dedup_url(self) -> str:
+        """The URL duplicates are recognized by: canonical when known"""
+        return self.canonical_url or self.url
+    
+    def add_tags(self, tags: Iterable[str]):
+        """Append tags not already present"""
+        self.tags = tuple(dict.fromkeys(self._tags + tuple(tags)))
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+    
+    __hash__ = None
+
+class StoredArticle(NewsArticle):
+    """NewsArticle read back from the database
+
+    Compressed content and summary stay as BLOBs until first accessed, so
+    list queries never pay for decompressing bodies nobody reads.
+    """
+    __slots__ = ('_codec',)
+    
+    content = LazyText()
+    summary = LazyText()
+
+class ArticleBatch:
+    """Columnar container for many articles
+    
+    Holds one list per NewsArticle field instead of one object per article,
+    so backfills and exports of thousands of rows don't pay per-object
+    overhead. Compressed text stays compressed until an article is taken
+    out. Indexing returns a NewsArticle (a copy), slicing a new batch.
+    """
+    
+    __slots__ = ('columns', 'codec')
+    
+    def __init__(self, articles: Iterable[NewsArticle] = (), codec: Optional[TextCodec] = None):
+        self.columns: Dict[str, list] = {name: [] for name in NewsArticle.FIELDS}
+        self.codec = codec
+        for article in articles:
+            self.append(article)
+    
+    def append(self, article: NewsArticle):
+        for name, column in self.columns.items():
+            if name in ('published_date', 'scraped_date'):
+                column.append(getattr(article, '_' + name))
+            else:
+                column.append(getattr(article, name))
+    
+    def append_values(self, values: tuple):
+        """Append one article given as field values in NewsArticle.FIELDS order"""
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+    
+    def column(self, name: str) -> list:
+        return self.columns[name]
+    
+    def __len__(self) -> int:
+        return len(self.columns['id'])
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = ArticleBatch(codec=self.codec)
+            batch.columns = {name: column[index] for name, column in self.columns.items()}
+            return batch
+        values = {name: column[index] for name, column in self.columns.items()}
+        if isinstance(values['content'], bytes) or isinstance(values['summary'], bytes):
+            article = StoredArticle(**values)
+            article._codec = self.codec
+            return article
+        return NewsArticle(**values)
+    
+    def __iter__(self) -> Iterator[NewsArticle]:
+        for index in range(len(self)):
+            yield self[index]
 
 class NewsDatabase:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, compression: Optional[Dict[str, Any]] = None):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
+        
+        # The codec always exists so compressed rows stay readable with
+        # compression switched off; it only encodes when enabled
+        compression = compression or {}
+        self.compress = compression.get('enabled', False)
+        self.use_dictionary = compression.get('dictionary', True)
+        self.codec = TextCodec(
+            compression.get('codec', 'zlib'),
+            level=compression.get('level', 6),
+            min_size=compression.get('min_size', 256)
+        )
+        
         self.init_database()
+        self.load_compression_dictionaries()
     
     def init_database(self):
         """Initialize the database with required tables"""
@@ -41,26 +365,12 @@ class NewsDatabase:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
+                # Only takes effect on a new, empty database; lets retention
+                # hand freed pages back with incremental_vacuum
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                
                 # Create news articles table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS news_articles (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        content TEXT,
-                        url TEXT UNIQUE NOT NULL,
-                        source TEXT NOT NULL,
-                        published_date DATETIME,
-                        scraped_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        tags TEXT,  -- JSON array
-                        category TEXT,
-                        sentiment_score REAL,
-                        relevance_score REAL,
-                        entities TEXT,  -- JSON array
-                        summary TEXT,
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
+                cursor.execute(NEWS_ARTICLES_TABLE.format(table='news_articles'))
                 
                 # Create sources table
                 cursor.execute('''
@@ -91,12 +401,125 @@ class NewsDatabase:
                     )
                 ''')
                 
+                # Near-duplicate signatures and their LSH band buckets
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS article_signatures (
+                        article_id INTEGER PRIMARY KEY,
+                        signature BLOB NOT NULL,
+                        cluster_id INTEGER NOT NULL
+                    )
+                ''')
+                
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS signature_bands (
+                        band INTEGER NOT NULL,
+                        band_value INTEGER NOT NULL,
+                        article_id INTEGER NOT NULL,
+                        PRIMARY KEY (band, band_value, article_id)
+                    ) WITHOUT ROWID
+                ''')
+                
+                # Redirector link -> final article URL
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS url_redirects (
+                        source_url TEXT PRIMARY KEY,
+                        final_url TEXT NOT NULL,
+                        resolved_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
+                # Canonical entity ids (see entity_extraction.py) per article
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS article_entities (
+                        entity_id TEXT NOT NULL,
+                        article_id INTEGER NOT NULL,
+                        PRIMARY KEY (entity_id, article_id)
+                    ) WITHOUT ROWID
+                ''')
+                
+                # Trained compression dictionaries, referenced by id from compressed values
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS compression_dictionaries (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        codec TEXT NOT NULL,
+                        data BLOB NOT NULL,
+                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
+                # Materialized counters, see STATS_TRIGGERS
+                cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'article_stats'")
+                rebuild_stats = cursor.fetchone() is None
+                
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS article_stats (
+                        dimension TEXT NOT NULL,  -- total, category, source or day
+                        key TEXT NOT NULL,
+                        count INTEGER NOT NULL,
+                        PRIMARY KEY (dimension, key)
+                    ) WITHOUT ROWID
+                ''')
+                
+                # Scraping runs per source and UTC day
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS source_run_stats (
+                        source_name TEXT NOT NULL,
+                        day TEXT NOT NULL,
+                        runs INTEGER NOT NULL DEFAULT 0,
+                        successes INTEGER NOT NULL DEFAULT 0,
+                        articles INTEGER NOT NULL DEFAULT 0,
+                        timed_runs INTEGER NOT NULL DEFAULT 0,
+                        duration_sum REAL NOT NULL DEFAULT 0,
+                        duration_max REAL,
+                        PRIMARY KEY (source_name, day)
+                    ) WITHOUT ROWID
+                ''')
+                
+                # Columns added after the original schema
+                self._ensure_columns(cursor, 'news_articles', ARTICLE_EXTRA_COLUMNS)
+                
+                # Databases from before epoch timestamps are rebuilt once
+                if self._migrate_article_timestamps(cursor):
+                    rebuild_stats = True
+                
+                # Work distribution between scraper workers (epoch seconds)
+                self._ensure_columns(cursor, 'sources', {
+                    'lease_owner': 'TEXT',
+                    'lease_expires': 'REAL',
+                    'last_attempt': 'REAL'
+                })
+                self._ensure_columns(cursor, 'sources', HEALTH_COLUMNS)
+                self._ensure_columns(cursor, 'sources', FEED_MARK_COLUMNS)
+                
                 # Create indexes for better performance
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_url ON news_articles(url)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_source ON news_articles(source)')
+                # Rows from before canonical URLs are keyed by their link until
+                # --migrate-urls fills in the canonical form
+                cursor.execute('UPDATE OR IGNORE news_articles SET canonical_url = url WHERE canonical_url IS NULL')
+                cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_news_articles_canonical_url ON news_articles(canonical_url)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_published_date ON news_articles(published_date)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_category ON news_articles(category)')
+                # Filter + sort of get_articles in one index range scan; these
+                # also serve plain source/category lookups
+                cursor.execute('DROP INDEX IF EXISTS idx_news_articles_source')
+                cursor.execute('DROP INDEX IF EXISTS idx_news_articles_category')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_source_published ON news_articles(source, published_date)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_category_published ON news_articles(category, published_date)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_tags ON news_articles(tags)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_cluster_id ON news_articles(cluster_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_article_entities_article ON article_entities(article_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_signature_bands_article ON signature_bands(article_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_articles_scraped_date ON news_articles(scraped_date)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraping_logs_created_at ON scraping_logs(created_at)')
+                
+                cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+                existing_triggers = {row[0] for row in cursor.fetchall()}
+                for name, sql in STATS_TRIGGERS.items():
+                    if name not in existing_triggers:
+                        cursor.execute(sql)
+                
+                # Databases from before the counters existed start from a full count
+                if rebuild_stats:
+                    self._rebuild_stats(cursor)
                 
                 conn.commit()
                 self.logger.info("Database initialized successfully")
@@ -105,14 +528,234 @@ class NewsDatabase:
             self.logger.error(f"Database initialization error: {e}")
             raise
     
+    def _migrate_article_timestamps(self, cursor) -> bool:
+        """Rebuild a news_articles table with TEXT timestamps as INTEGER epoch seconds
+        
+        SQLite can't change a column's type in place, so the table is copied
+        into a new one and swapped in, all in one transaction. Stored text
+        is UTC (CURRENT_TIMESTAMP, feedparser's UTC struct_time) unless it
+        carries an offset, which strftime applies; RFC 822 feed dates, as
+        simple_scraper stored them, are parsed like feed entries. Returns
+        True if it ran.
+        """
+        cursor.execute('PRAGMA table_info(news_articles)')
+        columns = {row[1]: row[2].upper() for row in cursor.fetchall()}
+        if columns.get('scraped_date') == 'INTEGER':
+            return False
+        
+        cursor.execute('SAVEPOINT migrate_article_timestamps')
+        try:
+            cursor.execute('DROP TABLE IF EXISTS news_articles_migrated')
+            cursor.execute(NEWS_ARTICLES_TABLE.format(table='news_articles_migrated'))
+            self._ensure_columns(cursor, 'news_articles_migrated', ARTICLE_EXTRA_COLUMNS)
+            
+            cursor.connection.create_function('feed_date', 1, parse_feed_date, deterministic=True)
+            sources = {
+                new: old for old, new in LEGACY_ARTICLE_COLUMNS.items()
+                if old in columns and new not in columns
+            }
+            sources.update((name, name) for name in columns)
+            
+            cursor.execute('PRAGMA table_info(news_articles_migrated)')
+            copied = [row[1] for row in cursor.fetchall() if row[1] in sources]
+            selected = [
+                f"CASE typeof({sources[name]}) WHEN 'text' THEN COALESCE(CAST(strftime('%s', {sources[name]}) AS INTEGER), "
+                f"feed_date({sources[name]})) ELSE {sources[name]} END"
+                if name in TIMESTAMP_COLUMNS else sources[name]
+                for name in copied
+            ]
+            cursor.execute(f'''
+                INSERT INTO news_articles_migrated ({', '.join(copied)})
+                SELECT {', '.join(selected)} FROM news_articles
+            ''')
+            migrated = cursor.rowcount
+            
+            # Indexes and triggers go with the old table and are recreated by init_database
+            cursor.execute('DROP TABLE news_articles')
+            cursor.execute('ALTER TABLE news_articles_migrated RENAME TO news_articles')
+            cursor.execute('RELEASE migrate_article_timestamps')
+        except sqlite3.Error:
+            cursor.execute('ROLLBACK TO migrate_article_timestamps')
+            cursor.execute('RELEASE migrate_article_timestamps')
+            raise
+        
+        self.logger.info(f"Migrated {migrated} articles to epoch timestamps")
+        return True
+    
+    def _ensure_columns(self, cursor, table: str, columns: Dict[str, str]):
+        """Add columns missing from databases created by older versions"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+                self.logger.info(f"Added column {table}.{name}")
+    
+    def load_compression_dictionaries(self):
+        """Load every stored dictionary; the newest for the codec compresses new rows"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT id, codec, data FROM compression_dictionaries ORDER BY id')
+                for dictionary_id, codec, data in cursor.fetchall():
+                    active = self.use_dictionary and codec == self.codec.codec
+                    self.codec.add_dictionary(dictionary_id, data, active=active)
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error loading compression dictionaries: {e}")
+    
+    def train_compression_dictionary(self, sample_size: int = 500) -> Optional[int]:
+        """Train a dictionary on a sample of stored article bodies and make it active"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT content FROM news_articles
+                    WHERE content IS NOT NULL
+                    ORDER BY RANDOM() LIMIT ?
+                ''', (sample_size,))
+                samples = [self.codec.decode(row[0]) for row in cursor.fetchall()]
+                if len(samples) < 10:
+                    self.logger.warning(f"Only {len(samples)} articles stored, not training a dictionary")
+                    return None
+                
+                data = self.codec.train(samples)
+                cursor.execute('''
+                    INSERT INTO compression_dictionaries (codec, data) VALUES (?, ?)
+                ''', (self.codec.codec, data))
+                dictionary_id = cursor.lastrowid
+                conn.commit()
+                
+                self.codec.add_dictionary(dictionary_id, data, active=True)
+                self.logger.info(f"Trained {self.codec.codec} dictionary {dictionary_id} "
+                                 f"({len(data)} bytes) from {len(samples)} articles")
+                return dictionary_id
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error training compression dictionary: {e}")
+            return None
+    
+    def recompress_articles(self, batch_size: int = 500) -> Dict[str, int]:
+        """Rewrite stored content and summaries with the current compression settings
+        
+        Runs in id-ordered batches committed separately. With compression
+        disabled this decompresses everything back to plain text.
+        """
+        stats = {'articles': 0, 'bytes_before': 0, 'bytes_after': 0}
+        last_id = 0
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                while True:
+                    cursor.execute('''
+                        SELECT id, content, summary FROM news_articles
+                        WHERE id > ? ORDER BY id LIMIT ?
+                    ''', (last_id, batch_size))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    
+                    updates = []
+                    for article_id, content, summary in rows:
+                        last_id = article_id
+                        new_content = self._encode_text(self.codec.decode(content))
+                        new_summary = self._encode_text(self.codec.decode(summary))
+                        stats['articles'] += 1
+                        stats['bytes_before'] += _stored_size(content) + _stored_size(summary)
+                        stats['bytes_after'] += _stored_size(new_content) + _stored_size(new_summary)
+                        if new_content != content or new_summary != summary:
+                            updates.append((new_content, new_summary, article_id))
+                    
+                    cursor.executemany('UPDATE news_articles SET content = ?, summary = ? WHERE id = ?', updates)
+                    conn.commit()
+                
+                self.logger.info(f"Recompressed {stats['articles']} articles: "
+                                 f"{stats['bytes_before']} -> {stats['bytes_after']} bytes")
+                return stats
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error recompressing articles: {e}")
+            return stats
+    
+    def _encode_text(self, text: Optional[str]):
+        return self.codec.encode(text) if self.compress else text
+    
+    def _row_values(self, row) -> tuple:
+        """NewsArticle field values (FIELDS order) from a row selected with ARTICLE_COLUMNS"""
+        return (
+            row[0],
+            row[1],
+            row[2],
+            row[3],
+            _intern(row[4]),
+            row[5],
+            row[6],
+            intern_tags(json.loads(row[7])) if row[7] else (),
+            _intern(row[8]),
+            row[9],
+            row[10],
+            json.loads(row[11]) if row[11] else [],
+            row[12],
+            row[13],
+            json.loads(row[14]) if row[14] else None,
+            row[15]
+        )
+    
+    def _row_to_article(self, row) -> NewsArticle:
+        """Build a NewsArticle from a row selected with ARTICLE_COLUMNS"""
+        compressed = isinstance(row[2], bytes) or isinstance(row[12], bytes)
+        article = (StoredArticle if compressed else NewsArticle)(*self._row_values(row))
+        if compressed:
+            article._codec = self.codec
+        return article
+    
+    def iter_article_batches(self, batch_size: int = 1000, category: str = None,
+                             source: str = None) -> Iterator[ArticleBatch]:
+        """Every stored article in id order, as ArticleBatch chunks of batch_size"""
+        last_id = 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                query = f"SELECT {ARTICLE_COLUMNS} FROM news_articles WHERE id > ?"
+                params: list = []
+                if category:
+                    query += " AND category = ?"
+                    params.append(category)
+                if source:
+                    query += " AND source = ?"
+                    params.append(source)
+                query += " ORDER BY id LIMIT ?"
+                
+                while True:
+                    cursor.execute(query, [last_id] + params + [batch_size])
+                    rows = cursor.fetchall()
+                    if not rows:
+                        return
+                    
+                    batch = ArticleBatch(codec=self.codec)
+                    for row in rows:
+                        batch.append_values(self._row_values(row))
+                    last_id = rows[-1][0]
+                    yield batch
+                    
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading article batches: {e}")
+    
     def add_source(self, name: str, url: str, source_type: str, category: str, tags: List[str]):
         """Add a new news source to the database"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
+                # Upsert rather than replace, so restarting one worker doesn't
+                # wipe the leases and last_scraped of the others
                 cursor.execute('''
-                    INSERT OR REPLACE INTO sources (name, url, type, category, tags)
+                    INSERT INTO sources (name, url, type, category, tags)
                     VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (name) DO UPDATE SET
+                        url = excluded.url, type = excluded.type, category = excluded.category,
+                        tags = excluded.tags, updated_at = CURRENT_TIMESTAMP
                 ''', (name, url, source_type, category, json.dumps(tags)))
                 conn.commit()
                 self.logger.info(f"Source '{name}' added successfully")
@@ -120,59 +763,332 @@ class NewsDatabase:
         except sqlite3.Error as e:
             self.logger.error(f"Error adding source '{name}': {e}")
     
+    def sync_sources(self, sources: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Make the active sources match the configured ones in one transaction
+        
+        ``sources`` are source configs with their category. New and changed
+        sources are written and active, sources no longer configured are
+        deactivated. Rows that already match are left alone, keeping their
+        last_scraped, leases, health and feed marks.
+        """
+        changes = {'added': 0, 'updated': 0, 'deactivated': 0, 'unchanged': 0}
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT name, url, type, category, tags, is_active FROM sources')
+                existing = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+                
+                for source in sources:
+                    values = (source['url'], source['type'], source['category'], json.dumps(source['tags']))
+                    current = existing.get(source['name'])
+                    if current == values + (1,):
+                        changes['unchanged'] += 1
+                        continue
+                    
+                    # Upsert, in case another worker added it since the select
+                    cursor.execute('''
+                        INSERT INTO sources (url, type, category, tags, name)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (name) DO UPDATE SET
+                            url = excluded.url, type = excluded.type, category = excluded.category,
+                            tags = excluded.tags, is_active = 1, updated_at = CURRENT_TIMESTAMP
+                    ''', values + (source['name'],))
+                    changes['added' if current is None else 'updated'] += 1
+                    self.logger.info(f"Source '{source['name']}' {'added' if current is None else 'updated'}")
+                
+                configured = {source['name'] for source in sources}
+                for name, current in existing.items():
+                    if name not in configured and current[-1]:
+                        cursor.execute('''
+                            UPDATE sources SET is_active = 0, updated_at = CURRENT_TIMESTAMP WHERE name = ?
+                        ''', (name,))
+                        changes['deactivated'] += 1
+                        self.logger.info(f"Source '{name}' is no longer configured, deactivated")
+                
+                conn.commit()
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error syncing sources: {e}")
+        
+        return changes
+    
+    def _source_from_row(self, row) -> Dict[str, Any]:
+        """Source dict from name, url, type, category, tags, the HEALTH_COLUMNS
+        and the FEED_MARK_COLUMNS"""
+        mark_start = 5 + len(HEALTH_COLUMNS)
+        feed_mark = dict(zip(FEED_MARK_COLUMNS, row[mark_start:mark_start + len(FEED_MARK_COLUMNS)]))
+        feed_mark['feed_seen'] = json.loads(feed_mark['feed_seen']) if feed_mark['feed_seen'] else []
+        return {
+            'name': row[0],
+            'url': row[1],
+            'type': row[2],
+            'category': row[3],
+            'tags': json.loads(row[4]) if row[4] else [],
+            'health': dict(zip(HEALTH_COLUMNS, row[5:mark_start])),
+            'feed_mark': feed_mark
+        }
+    
     def get_active_sources(self) -> List[Dict[str, Any]]:
         """Get all active news sources"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT name, url, type, category, tags
+                cursor.execute(f'''
+                    SELECT name, url, type, category, tags, {', '.join(HEALTH_COLUMNS)},
+                           {', '.join(FEED_MARK_COLUMNS)}
                     FROM sources
                     WHERE is_active = 1
                 ''')
                 
-                sources = []
-                for row in cursor.fetchall():
-                    sources.append({
-                        'name': row[0],
-                        'url': row[1],
-                        'type': row[2],
-                        'category': row[3],
-                        'tags': json.loads(row[4]) if row[4] else []
-                    })
-                
-                return sources
+                return [self._source_from_row(row) for row in cursor.fetchall()]
                 
         except sqlite3.Error as e:
             self.logger.error(f"Error getting active sources: {e}")
             return []
     
-    def add_article(self, article: NewsArticle) -> int:
-        """Add a news article to the database"""
+    def update_source_health(self, source_name: str, health: Dict[str, Any]):
+        """Persist a source's health and breaker state"""
+        columns = [column for column in HEALTH_COLUMNS if column in health]
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    UPDATE sources SET {', '.join(f"{column} = ?" for column in columns)}
+                    WHERE name = ?
+                ''', [health[column] for column in columns] + [source_name])
+                conn.commit()
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating health of {source_name}: {e}")
+    
+    def update_feed_mark(self, source_name: str, feed_mark: Dict[str, Any]):
+        """Persist a feed's high-water mark once its new entries are saved"""
+        values = dict(feed_mark, feed_seen=json.dumps(feed_mark.get('feed_seen') or []))
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    UPDATE sources SET {', '.join(f"{column} = ?" for column in FEED_MARK_COLUMNS)}
+                    WHERE name = ?
+                ''', [values.get(column) for column in FEED_MARK_COLUMNS] + [source_name])
+                conn.commit()
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating feed mark of {source_name}: {e}")
+    
+    def claim_next_source(self, owner: str, ttl: float, due_before: float) -> Optional[Dict[str, Any]]:
+        """Atomically lease the next due source to ``owner`` for ``ttl`` seconds
+        
+        A source is due when it wasn't attempted since ``due_before``, its
+        circuit breaker isn't open and no other worker holds an unexpired
+        lease on it; expired leases of crashed workers are taken over.
+        Healthy, fast sources are handed out first. Returns None when
+        nothing is due.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        except sqlite3.Error as e:
+            self.logger.error(f"Error claiming source: {e}")
+            return None
+        
+        try:
+            now = time.time()
+            # The write lock up front makes select-then-update one atomic claim
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(f'''
+                    SELECT name, url, type, category, tags, {', '.join(HEALTH_COLUMNS)},
+                           {', '.join(FEED_MARK_COLUMNS)}, lease_owner
+                    FROM sources
+                    WHERE is_active = 1
+                      AND (lease_expires IS NULL OR lease_expires < ?)
+                      AND (last_attempt IS NULL OR last_attempt < ?)
+                      AND (breaker_state IS NOT 'open' OR breaker_open_until <= ?)
+                    ORDER BY (1 - COALESCE(error_rate, 0)) / (1 + COALESCE(latency_ewma, 0)) DESC, name
+                    LIMIT 1
+                ''', (now, due_before, now)).fetchone()
+                if row is None:
+                    conn.execute('COMMIT')
+                    return None
+                
+                conn.execute('''
+                    UPDATE sources SET lease_owner = ?, lease_expires = ? WHERE name = ?
+                ''', (owner, now + ttl, row[0]))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            
+            previous_owner = row[-1]
+            if previous_owner and previous_owner != owner:
+                self.logger.warning(f"Reclaimed expired lease on {row[0]} from {previous_owner}")
+            
+            return self._source_from_row(row)
+            
+        except sqlite3.Error as e:
+            self.logger.error(f"Error claiming source: {e}")
+            return None
+        finally:
+            conn.close()
+    
+    def renew_source_lease(self, source_name: str, owner: str, ttl: float) -> bool:
+        """Extend a lease still held by ``owner``; False if it was lost"""
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE sources SET lease_expires = ?
+                    WHERE name = ? AND lease_owner = ?
+                ''', (time.time() + ttl, source_name, owner))
+                conn.commit()
+                return cursor.rowcount == 1
+                
+        except sqlite3.Error as e:
+            # Transient (e.g. locked); the lease may still be valid
+            self.logger.error(f"Error renewing lease on {source_name}: {e}")
+            return True
+    
+    def release_source(self, source_name: str, owner: str) -> bool:
+        """Drop ``owner``'s lease and mark the source attempted"""
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE sources SET lease_owner = NULL, lease_expires = NULL, last_attempt = ?
+                    WHERE name = ? AND lease_owner = ?
+                ''', (time.time(), source_name, owner))
+                conn.commit()
+                return cursor.rowcount == 1
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error releasing lease on {source_name}: {e}")
+            return False
+    
+    def reclaim_expired_leases(self) -> int:
+        """Clear leases whose owners stopped heartbeating"""
+        try:
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE sources SET lease_owner = NULL, lease_expires = NULL
+                    WHERE lease_expires < ?
+                ''', (time.time(),))
+                conn.commit()
+                if cursor.rowcount:
+                    self.logger.warning(f"Reclaimed {cursor.rowcount} expired source leases")
+                return cursor.rowcount
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reclaiming expired leases: {e}")
+            return 0
+    
+    def get_source_health(self) -> Dict[str, Dict[str, Any]]:
+        """Health and breaker state of every active source, keyed by name"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT name, {', '.join(HEALTH_COLUMNS)}
+                    FROM sources
+                    WHERE is_active = 1
+                    ORDER BY name
+                ''')
+                return {row[0]: dict(zip(HEALTH_COLUMNS, row[1:])) for row in cursor.fetchall()}
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting source health: {e}")
+            return {}
+    
+    def get_source_leases(self) -> List[Dict[str, Any]]:
+        """Current lease holder and expiry of every leased source"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT name, lease_owner, lease_expires
+                    FROM sources
+                    WHERE lease_owner IS NOT NULL
+                    ORDER BY name
+                ''')
+                now = time.time()
+                return [
+                    {
+                        'source': name,
+                        'owner': owner,
+                        'expires_at': datetime.fromtimestamp(expires).isoformat() if expires else None,
+                        'expired': expires is not None and expires < now
+                    }
+                    for name, owner, expires in cursor.fetchall()
+                ]
                 
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting source leases: {e}")
+            return []
+    
+    def add_article(self, article: NewsArticle, signature=None) -> int:
+        """Add a news article to the database
+        
+        When a MinHash ``signature`` is given it is indexed for near-duplicate
+        lookups. Articles without a cluster start their own, keyed by their id.
+        An article whose URL is already stored (saved by another source or
+        worker since it was checked) is left as it is and its id returned.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT OR REPLACE INTO news_articles 
-                    (title, content, url, source, published_date, tags, category, 
-                     sentiment_score, relevance_score, entities, summary)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO news_articles 
+                    (title, content, url, source, published_date, scraped_date, tags, category, 
+                     sentiment_score, relevance_score, entities, summary, cluster_id, topic_scores,
+                     canonical_url)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT DO NOTHING
                 ''', (
                     article.title,
-                    article.content,
+                    self._encode_text(article.content),
                     article.url,
                     article.source,
-                    article.published_date,
+                    NewsArticle.published_date.epoch(article),
+                    NewsArticle.scraped_date.epoch(article),
                     json.dumps(article.tags),
                     article.category,
                     article.sentiment_score,
                     article.relevance_score,
                     json.dumps(article.entities),
-                    article.summary
+                    self._encode_text(article.summary),
+                    article.cluster_id,
+                    json.dumps(article.topic_scores) if article.topic_scores else None,
+                    article.dedup_url
                 ))
                 
+                if cursor.rowcount == 0:
+                    cursor.execute('''
+                        SELECT id FROM news_articles WHERE url = ? OR canonical_url = ?
+                    ''', (article.url, article.dedup_url))
+                    row = cursor.fetchone()
+                    self.logger.debug(f"Article already exists: {article.title}")
+                    return row[0] if row else None
+                
                 article_id = cursor.lastrowid
+                
+                if article.cluster_id is None:
+                    article.cluster_id = article_id
+                    cursor.execute('''
+                        UPDATE news_articles SET cluster_id = ? WHERE id = ?
+                    ''', (article_id, article_id))
+                
+                if signature is not None:
+                    cursor.execute('''
+                        INSERT OR REPLACE INTO article_signatures (article_id, signature, cluster_id)
+                        VALUES (?, ?, ?)
+                    ''', (article_id, to_blob(signature), article.cluster_id))
+                    cursor.executemany('''
+                        INSERT OR IGNORE INTO signature_bands (band, band_value, article_id)
+                        VALUES (?, ?, ?)
+                    ''', [(band, value, article_id) for band, value in enumerate(signature_bands(signature))])
+                
+                self._index_entities(cursor, article_id, article.entities)
+                
                 conn.commit()
                 self.logger.info(f"Article '{article.title}' added successfully with ID {article_id}")
                 return article_id
@@ -181,6 +1097,183 @@ class NewsDatabase:
             self.logger.error(f"Error adding article '{article.title}': {e}")
             return None
     
+    def article_exists(self, url: str) -> bool:
+        """Check whether an article with this canonical URL is already stored"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1 FROM news_articles WHERE canonical_url = ? LIMIT 1', (url,))
+                return cursor.fetchone() is not None
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error checking article existence: {e}")
+            return False
+    
+    def existing_urls(self, urls: List[str], chunk_size: int = 500) -> Set[str]:
+        """Which of these canonical URLs are already stored, in one connection"""
+        existing = set()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                for i in range(0, len(urls), chunk_size):
+                    chunk = urls[i:i + chunk_size]
+                    cursor.execute(
+                        f"SELECT canonical_url FROM news_articles WHERE canonical_url IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                    existing.update(row[0] for row in cursor.fetchall())
+            return existing
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error checking article existence: {e}")
+            return existing
+    
+    def get_redirect(self, source_url: str) -> Optional[str]:
+        """Cached final URL for a redirector link"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT final_url FROM url_redirects WHERE source_url = ?', (source_url,))
+                row = cursor.fetchone()
+                return row[0] if row else None
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading redirect cache: {e}")
+            return None
+    
+    def save_redirect(self, source_url: str, final_url: str):
+        """Cache the final URL a redirector link resolved to"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO url_redirects (source_url, final_url)
+                    VALUES (?, ?)
+                ''', (source_url, final_url))
+                conn.commit()
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error saving redirect: {e}")
+    
+    def _index_entities(self, cursor, article_id: int, entities: List[str]):
+        """Replace the entity index rows for one article"""
+        cursor.execute('DELETE FROM article_entities WHERE article_id = ?', (article_id,))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO article_entities (entity_id, article_id) VALUES (?, ?)
+        ''', [(entity_id, article_id) for entity_id in entities if is_entity_id(entity_id)])
+    
+    def _delete_article_rows(self, cursor, article_id: int):
+        cursor.execute('DELETE FROM news_articles WHERE id = ?', (article_id,))
+        cursor.execute('DELETE FROM article_entities WHERE article_id = ?', (article_id,))
+        cursor.execute('DELETE FROM signature_bands WHERE article_id = ?', (article_id,))
+        cursor.execute('DELETE FROM article_signatures WHERE article_id = ?', (article_id,))
+    
+    def recanonicalize_urls(self, canonicalize: Callable[[str], str], batch_size: int = 500) -> Tuple[int, int]:
+        """Fill in the canonical URL of stored articles from their links
+        
+        ``url`` is left as the publisher served it. When several rows share
+        a canonical URL only the oldest is kept. Returns (updated, removed)
+        counts.
+        """
+        updated = removed = 0
+        last_id = 0
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                while True:
+                    cursor.execute('''
+                        SELECT id, url, canonical_url FROM news_articles
+                        WHERE id > ? ORDER BY id LIMIT ?
+                    ''', (last_id, batch_size))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    
+                    for article_id, url, current in rows:
+                        last_id = article_id
+                        canonical = canonicalize(url)
+                        if canonical == current:
+                            continue
+                        
+                        cursor.execute('SELECT id FROM news_articles WHERE canonical_url = ?', (canonical,))
+                        existing = cursor.fetchone()
+                        if existing and existing[0] < article_id:
+                            self._delete_article_rows(cursor, article_id)
+                            removed += 1
+                            continue
+                        if existing:
+                            # A later copy already holds the canonical URL
+                            self._delete_article_rows(cursor, existing[0])
+                            removed += 1
+                        
+                        cursor.execute('''
+                            UPDATE news_articles SET canonical_url = ?, updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+                            WHERE id = ?
+                        ''', (canonical, article_id))
+                        updated += 1
+                    
+                    # Commit per batch to keep write locks short
+                    conn.commit()
+                
+                self.logger.info(f"Canonicalized {updated} article URLs, removed {removed} duplicates")
+                return updated, removed
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error canonicalizing article URLs: {e}")
+            return updated, removed
+    
+    def find_near_duplicate_cluster(self, signature, threshold: float = 0.5) -> Optional[int]:
+        """Return the cluster of the most similar stored article above threshold
+        
+        Only articles sharing at least one LSH band bucket with the signature
+        are compared, so the lookup cost depends on bucket size, not table size.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                conditions = " OR ".join(["(b.band = ? AND b.band_value = ?)"] * BAND_COUNT)
+                params = []
+                for band, value in enumerate(signature_bands(signature)):
+                    params.extend([band, value])
+                
+                cursor.execute(f'''
+                    SELECT DISTINCT s.article_id, s.signature, s.cluster_id
+                    FROM signature_bands b
+                    JOIN article_signatures s ON s.article_id = b.article_id
+                    WHERE {conditions}
+                ''', params)
+                
+                best = None
+                for _, stored, cluster_id in cursor.fetchall():
+                    score = similarity(signature, from_blob(stored))
+                    if score >= threshold and (best is None or score > best[0]):
+                        best = (score, cluster_id)
+                
+                return best[1] if best else None
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error looking up near duplicates: {e}")
+            return None
+    
+    def get_cluster_articles(self, cluster_id: int) -> List[NewsArticle]:
+        """Get every copy of a story, earliest first"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT {ARTICLE_COLUMNS} FROM news_articles
+                    WHERE cluster_id = ?
+                    ORDER BY id
+                ''', (cluster_id,))
+                return [self._row_to_article(row) for row in cursor.fetchall()]
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting cluster articles: {e}")
+            return []
+    
     def get_articles(self, limit: int = 100, offset: int = 0, 
                     category: str = None, tags: List[str] = None, 
                     source: str = None) -> List[NewsArticle]:
@@ -189,7 +1282,7 @@ class NewsDatabase:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                query = "SELECT * FROM news_articles WHERE 1=1"
+                query = f"SELECT {ARTICLE_COLUMNS} FROM news_articles WHERE 1=1"
                 params = []
                 
                 if category:
@@ -210,24 +1303,7 @@ class NewsDatabase:
                 
                 cursor.execute(query, params)
                 
-                articles = []
-                for row in cursor.fetchall():
-                    article = NewsArticle(
-                        id=row[0],
-                        title=row[1],
-                        content=row[2],
-                        url=row[3],
-                        source=row[4],
-                        published_date=datetime.fromisoformat(row[5]) if row[5] else None,
-                        scraped_date=datetime.fromisoformat(row[6]) if row[6] else None,
-                        tags=json.loads(row[7]) if row[7] else [],
-                        category=row[8],
-                        sentiment_score=row[9],
-                        relevance_score=row[10],
-                        entities=json.loads(row[11]) if row[11] else [],
-                        summary=row[12]
-                    )
-                    articles.append(article)
+                articles = [self._row_to_article(row) for row in cursor.fetchall()]
                 
                 return articles
                 
@@ -249,7 +1325,7 @@ class NewsDatabase:
                     params.append(f'%{tag}%')
                 
                 query = f'''
-                    SELECT * FROM news_articles 
+                    SELECT {ARTICLE_COLUMNS} FROM news_articles 
                     WHERE {" OR ".join(tag_conditions)}
                     ORDER BY published_date DESC 
                     LIMIT ?
@@ -258,24 +1334,7 @@ class NewsDatabase:
                 
                 cursor.execute(query, params)
                 
-                articles = []
-                for row in cursor.fetchall():
-                    article = NewsArticle(
-                        id=row[0],
-                        title=row[1],
-                        content=row[2],
-                        url=row[3],
-                        source=row[4],
-                        published_date=datetime.fromisoformat(row[5]) if row[5] else None,
-                        scraped_date=datetime.fromisoformat(row[6]) if row[6] else None,
-                        tags=json.loads(row[7]) if row[7] else [],
-                        category=row[8],
-                        sentiment_score=row[9],
-                        relevance_score=row[10],
-                        entities=json.loads(row[11]) if row[11] else [],
-                        summary=row[12]
-                    )
-                    articles.append(article)
+                articles = [self._row_to_article(row) for row in cursor.fetchall()]
                 
                 return articles
                 
@@ -283,38 +1342,89 @@ class NewsDatabase:
             self.logger.error(f"Error getting articles by tags: {e}")
             return []
     
+    def get_articles_by_entities(self, entity_ids: List[str], limit: int = 50) -> List[NewsArticle]:
+        """Get articles mentioning any of the given canonical entity ids"""
+        if not entity_ids:
+            return []
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                placeholders = ', '.join('?' for _ in entity_ids)
+                cursor.execute(f'''
+                    SELECT {ARTICLE_COLUMNS} FROM news_articles
+                    WHERE id IN (
+                        SELECT article_id FROM article_entities WHERE entity_id IN ({placeholders})
+                    )
+                    ORDER BY published_date DESC
+                    LIMIT ?
+                ''', list(entity_ids) + [limit])
+                
+                return [self._row_to_article(row) for row in cursor.fetchall()]
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting articles by entities: {e}")
+            return []
+    
+    def backfill_entities(self, extract: Callable[[str, str], List[str]], batch_size: int = 500) -> int:
+        """Re-run entity extraction over stored articles and rebuild their index rows
+        
+        ``extract(title, content)`` returns canonical ids; non-canonical
+        entries already stored (author names) are kept. Returns the number
+        of articles processed.
+        """
+        processed = 0
+        last_id = 0
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                while True:
+                    cursor.execute('''
+                        SELECT id, title, content, entities FROM news_articles
+                        WHERE id > ? ORDER BY id LIMIT ?
+                    ''', (last_id, batch_size))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    
+                    for article_id, title, content, stored in rows:
+                        last_id = article_id
+                        kept = [e for e in (json.loads(stored) if stored else []) if not is_entity_id(e)]
+                        entities = kept + extract(title, self.codec.decode(content))
+                        
+                        cursor.execute('UPDATE news_articles SET entities = ? WHERE id = ?',
+                                       (json.dumps(entities), article_id))
+                        self._index_entities(cursor, article_id, entities)
+                        processed += 1
+                    
+                    # Commit per batch to keep write locks short
+                    conn.commit()
+                
+                self.logger.info(f"Re-indexed entities for {processed} articles")
+                return processed
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Error re-indexing entities: {e}")
+            return processed
+    
     def get_recent_articles(self, hours: int = 24) -> List[NewsArticle]:
         """Get articles from the last N hours"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                cutoff_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                cutoff_time = int(time.time()) - hours * 3600
                 
-                cursor.execute('''
-                    SELECT * FROM news_articles 
+                cursor.execute(f'''
+                    SELECT {ARTICLE_COLUMNS} FROM news_articles 
                     WHERE scraped_date >= ?
                     ORDER BY published_date DESC
                 ''', (cutoff_time,))
                 
-                articles = []
-                for row in cursor.fetchall():
-                    article = NewsArticle(
-                        id=row[0],
-                        title=row[1],
-                        content=row[2],
-                        url=row[3],
-                        source=row[4],
-                        published_date=datetime.fromisoformat(row[5]) if row[5] else None,
-                        scraped_date=datetime.fromisoformat(row[6]) if row[6] else None,
-                        tags=json.loads(row[7]) if row[7] else [],
-                        category=row[8],
-                        sentiment_score=row[9],
-                        relevance_score=row[10],
-                        entities=json.loads(row[11]) if row[11] else [],
-                        summary=row[12]
-                    )
-                    articles.append(article)
+                articles = [self._row_to_article(row) for row in cursor.fetchall()]
                 
                 return articles
                 
@@ -355,31 +1465,45 @@ class NewsDatabase:
         except sqlite3.Error as e:
             self.logger.error(f"Error updating source last scraped: {e}")
     
-    def get_scraping_stats(self) -> Dict[str, Any]:
-        """Get scraping statistics"""
+    def get_scraping_stats(self, window_days: int = 7) -> Dict[str, Any]:
+        """Get scraping statistics
+        
+        Read from the trigger-maintained counters, so the cost grows with the
+        number of categories, sources and days rather than articles. Source
+        health covers runs of the last ``window_days`` UTC days.
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # Total articles
-                cursor.execute("SELECT COUNT(*) FROM news_articles")
-                total_articles = cursor.fetchone()[0]
-                
-                # Articles by category
                 cursor.execute('''
-                    SELECT category, COUNT(*) 
-                    FROM news_articles 
-                    GROUP BY category
+                    SELECT dimension, NULLIF(key, ''), count
+                    FROM article_stats
+                    WHERE count != 0
                 ''')
-                articles_by_category = dict(cursor.fetchall())
+                counters: Dict[str, Dict[Any, int]] = {'total': {}, 'category': {}, 'source': {}, 'day': {}}
+                for dimension, key, count in cursor.fetchall():
+                    counters.setdefault(dimension, {})[key] = count
                 
-                # Articles by source
                 cursor.execute('''
-                    SELECT source, COUNT(*) 
-                    FROM news_articles 
-                    GROUP BY source
-                ''')
-                articles_by_source = dict(cursor.fetchall())
+                    SELECT source_name, SUM(runs), SUM(successes), SUM(articles),
+                           SUM(timed_runs), SUM(duration_sum), MAX(duration_max)
+                    FROM source_run_stats
+                    WHERE day >= date('now', ?)
+                    GROUP BY source_name
+                    HAVING SUM(runs) > 0
+                ''', (f"-{max(window_days - 1, 0)} days",))
+                source_health = {}
+                for source_name, runs, successes, articles, timed_runs, duration_sum, duration_max in cursor.fetchall():
+                    source_health[source_name] = {
+                        'runs': runs,
+                        'successes': successes,
+                        'failures': runs - successes,
+                        'success_rate': round(successes / runs, 3),
+                        'articles': articles,
+                        'avg_duration': round(duration_sum / timed_runs, 3) if timed_runs else None,
+                        'max_duration': duration_max
+                    }
                 
                 # Recent scraping sessions
                 cursor.execute('''
@@ -391,9 +1515,11 @@ class NewsDatabase:
                 recent_sessions = cursor.fetchall()
                 
                 return {
-                    'total_articles': total_articles,
-                    'articles_by_category': articles_by_category,
-                    'articles_by_source': articles_by_source,
+                    'total_articles': counters['total'].get(None, 0),
+                    'articles_by_category': counters['category'],
+                    'articles_by_source': counters['source'],
+                    'articles_by_day': dict(sorted(counters['day'].items(), key=lambda item: item[0] or '')),
+                    'source_health': source_health,
                     'recent_sessions': recent_sessions
                 }
                 
@@ -401,26 +1527,56 @@ class NewsDatabase:
             self.logger.error(f"Error getting scraping stats: {e}")
             return {}
     
-    def cleanup_old_articles(self, days_to_keep: int = 30):
-        """Clean up articles older than specified days"""
+    def _rebuild_stats(self, cursor):
+        cursor.execute('DELETE FROM article_stats')
+        cursor.execute('''
+            INSERT INTO article_stats (dimension, key, count)
+            SELECT 'total', '', COUNT(*) FROM news_articles
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), COUNT(*) FROM news_articles GROUP BY 2
+            UNION ALL
+            SELECT 'source', source, COUNT(*) FROM news_articles GROUP BY 2
+            UNION ALL
+            SELECT 'day', COALESCE(date(scraped_date, 'unixepoch'), ''), COUNT(*) FROM news_articles GROUP BY 2
+        ''')
+        cursor.execute('DELETE FROM source_run_stats')
+        cursor.execute('''
+            INSERT INTO source_run_stats
+                (source_name, day, runs, successes, articles, timed_runs, duration_sum, duration_max)
+            SELECT source_name, COALESCE(date(created_at), ''), COUNT(*),
+                   SUM(status = 'success'), SUM(COALESCE(articles_scraped, 0)),
+                   COUNT(scraping_duration), COALESCE(SUM(scraping_duration), 0), MAX(scraping_duration)
+            FROM scraping_logs
+            GROUP BY 1, 2
+        ''')
+    
+    def rebuild_stats(self) -> Dict[str, int]:
+        """Recount the stats tables from news_articles and scraping_logs, repairing any drift"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
-                
-                cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                cutoff_date = cutoff_date.replace(day=cutoff_date.day - days_to_keep)
-                
-                cursor.execute('''
-                    DELETE FROM news_articles 
-                    WHERE scraped_date < ?
-                ''', (cutoff_date,))
-                
-                deleted_count = cursor.rowcount
+                self._rebuild_stats(cursor)
                 conn.commit()
                 
-                self.logger.info(f"Cleaned up {deleted_count} old articles")
-                return deleted_count
+                cursor.execute('SELECT COUNT(*) FROM article_stats')
+                article_groups = cursor.fetchone()[0]
+                cursor.execute('SELECT COUNT(*) FROM source_run_stats')
+                run_groups = cursor.fetchone()[0]
+                
+                self.logger.info(f"Rebuilt stats: {article_groups} article counters, {run_groups} source run buckets")
+                return {'article_counters': article_groups, 'source_run_buckets': run_groups}
                 
         except sqlite3.Error as e:
-            self.logger.error(f"Error cleaning up old articles: {e}")
-            return 0
\ No newline at end of file
+            self.logger.error(f"Error rebuilding stats: {e}")
+            return {}
+    
+    def cleanup_old_articles(self, days_to_keep: int = 30, archive_path: Optional[str] = None) -> int:
+        """Clean up articles older than specified days, in short chunked transactions
+        
+        Expired articles are written to monthly archive files first when an
+        archive_path is given. Their signatures, bands and entity rows go too.
+        """
+        retention = RetentionManager(self.db_path, archive_path, decode=self.codec.decode)
+        stats = retention.apply('news_articles', keep_days=days_to_keep, archive=archive_path is not None)
+        self.logger.info(f"Cleaned up {stats['deleted']} old articles")
+        return stats['deleted']
\ No newline at end of file
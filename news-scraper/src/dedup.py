@@ -0,0 +1,73 @@
+import re
+import random
+import hashlib
+from array import array
+from typing import List
+
+# 64 MinHash permutations split into 16 bands of 4 rows. Two articles land in
+# a shared bucket with probability 1 - (1 - J^4)^16, which rises steeply
+# around a Jaccard similarity of (1/16)^(1/4) = 0.5
+NUM_PERMUTATIONS = 64
+BAND_COUNT = 16
+BAND_ROWS = NUM_PERMUTATIONS // BAND_COUNT
+
+SHINGLE_SIZE = 2
+MAX_BODY_WORDS = 400
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase word tokens with punctuation and markup noise removed"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+def _hash64(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'big')
+
+def shingles(title: str, content: str = "") -> set:
+    """Word shingles over the title and leading body text"""
+    result = set()
+    for tokens in (normalize_tokens(title), normalize_tokens(content)[:MAX_BODY_WORDS]):
+        if len(tokens) < SHINGLE_SIZE:
+            result.update(tokens)
+        else:
+            result.update(' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+    return result
+
+def minhash(title: str, content: str = "") -> array:
+    """MinHash signature of an article as NUM_PERMUTATIONS 32-bit values"""
+    hashes = [_hash64(shingle.encode('utf-8')) for shingle in shingles(title, content)]
+    signature = array('I', [0xFFFFFFFF] * NUM_PERMUTATIONS)
+    if not hashes:
+        return signature
+
+    for i, (a, b) in enumerate(_PERMUTATIONS):
+        signature[i] = min((a * h + b) % _MERSENNE_PRIME for h in hashes) & 0xFFFFFFFF
+    return signature
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERMUTATIONS
+
+def signature_bands(signature: array) -> List[int]:
+    """One signed 64-bit LSH bucket key per band"""
+    keys = []
+    for band in range(BAND_COUNT):
+        rows = signature[band * BAND_ROWS:(band + 1) * BAND_ROWS].tobytes()
+        key = _hash64(bytes([band]) + rows)
+        keys.append(key - (1 << 64) if key >= 1 << 63 else key)
+    return keys
+
+def to_blob(signature: array) -> bytes:
+    return signature.tobytes()
+
+def from_blob(blob: bytes) -> array:
+    signature = array('I')
+    signature.frombytes(blob)
+    return signature
@@ -0,0 +1,202 @@
+import re
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+# Canonical entity ids look like "<type>:<slug>"
+ENTITY_TYPES = ('vendor', 'regulator', 'framework', 'cve', 'regulation')
+ENTITY_ID_RE = re.compile(r'^(?:%s):\S+$' % '|'.join(ENTITY_TYPES))
+
+# Entity id -> display name, aliases matched case-insensitively and acronyms
+# matched only in upper case (so "SEC" counts but "sec" does not). Aliases
+# name only the entity: a bare "amazon" or "google" would tag retail and
+# search stories as cloud vendors.
+DEFAULT_GAZETTEER = {
+    # Vendors
+    'vendor:aws': {'name': 'Amazon Web Services', 'aliases': ['amazon web services', 'aws'], 'acronyms': []},
+    'vendor:azure': {'name': 'Microsoft Azure', 'aliases': ['microsoft azure', 'azure'], 'acronyms': []},
+    'vendor:google-cloud': {'name': 'Google Cloud', 'aliases': ['google cloud', 'google cloud platform', 'gcp'], 'acronyms': []},
+    'vendor:microsoft': {'name': 'Microsoft', 'aliases': ['microsoft', 'msft'], 'acronyms': []},
+    'vendor:oracle': {'name': 'Oracle', 'aliases': ['oracle', 'oracle cloud'], 'acronyms': []},
+    'vendor:salesforce': {'name': 'Salesforce', 'aliases': ['salesforce'], 'acronyms': []},
+    'vendor:ibm': {'name': 'IBM', 'aliases': ['ibm', 'ibm cloud'], 'acronyms': []},
+    'vendor:adobe': {'name': 'Adobe', 'aliases': ['adobe', 'creative cloud'], 'acronyms': []},
+    'vendor:stripe': {'name': 'Stripe', 'aliases': [], 'acronyms': ['Stripe']},
+    'vendor:plaid': {'name': 'Plaid', 'aliases': [], 'acronyms': ['Plaid']},
+    'vendor:cloudflare': {'name': 'Cloudflare', 'aliases': ['cloudflare'], 'acronyms': []},
+    'vendor:okta': {'name': 'Okta', 'aliases': ['okta'], 'acronyms': []},
+    'vendor:crowdstrike': {'name': 'CrowdStrike', 'aliases': ['crowdstrike'], 'acronyms': []},
+    # Regulators
+    'regulator:sec': {'name': 'U.S. Securities and Exchange Commission', 'aliases': ['securities and exchange commission'], 'acronyms': ['SEC']},
+    'regulator:fca': {'name': 'Financial Conduct Authority', 'aliases': ['financial conduct authority'], 'acronyms': ['FCA']},
+    'regulator:pra': {'name': 'Prudential Regulation Authority', 'aliases': ['prudential regulation authority'], 'acronyms': ['PRA']},
+    'regulator:finra': {'name': 'FINRA', 'aliases': ['finra', 'financial industry regulatory authority'], 'acronyms': []},
+    'regulator:cftc': {'name': 'Commodity Futures Trading Commission', 'aliases': ['cftc', 'commodity futures trading commission'], 'acronyms': []},
+    'regulator:occ': {'name': 'Office of the Comptroller of the Currency', 'aliases': ['office of the comptroller of the currency'], 'acronyms': ['OCC']},
+    'regulator:federal-reserve': {'name': 'Federal Reserve', 'aliases': ['federal reserve', 'federal reserve board'], 'acronyms': []},
+    'regulator:cfpb': {'name': 'Consumer Financial Protection Bureau', 'aliases': ['cfpb', 'consumer financial protection bureau'], 'acronyms': []},
+    'regulator:ftc': {'name': 'Federal Trade Commission', 'aliases': ['federal trade commission'], 'acronyms': ['FTC']},
+    'regulator:fincen': {'name': 'FinCEN', 'aliases': ['fincen', 'financial crimes enforcement network'], 'acronyms': []},
+    'regulator:ofac': {'name': 'OFAC', 'aliases': ['ofac', 'office of foreign assets control'], 'acronyms': []},
+    'regulator:cisa': {'name': 'CISA', 'aliases': ['cisa', 'cybersecurity and infrastructure security agency'], 'acronyms': []},
+    'regulator:ico': {'name': "Information Commissioner's Office", 'aliases': ['information commissioner s office', 'information commissioners office'], 'acronyms': ['ICO']},
+    'regulator:ecb': {'name': 'European Central Bank', 'aliases': ['european central bank'], 'acronyms': ['ECB']},
+    'regulator:eba': {'name': 'European Banking Authority', 'aliases': ['european banking authority'], 'acronyms': ['EBA']},
+    'regulator:esma': {'name': 'ESMA', 'aliases': ['esma', 'european securities and markets authority'], 'acronyms': []},
+    'regulator:european-commission': {'name': 'European Commission', 'aliases': ['european commission'], 'acronyms': []},
+    # Frameworks and regulations
+    'framework:gdpr': {'name': 'GDPR', 'aliases': ['gdpr', 'general data protection regulation'], 'acronyms': []},
+    'framework:ccpa': {'name': 'CCPA', 'aliases': ['ccpa', 'california consumer privacy act'], 'acronyms': []},
+    'framework:hipaa': {'name': 'HIPAA', 'aliases': ['hipaa'], 'acronyms': []},
+    'framework:pci-dss': {'name': 'PCI DSS', 'aliases': ['pci dss', 'payment card industry data security standard'], 'acronyms': []},
+    'framework:sox': {'name': 'Sarbanes-Oxley', 'aliases': ['sarbanes oxley'], 'acronyms': []},
+    'framework:soc2': {'name': 'SOC 2', 'aliases': ['soc 2', 'soc2', 'soc ii'], 'acronyms': []},
+    'framework:iso-27001': {'name': 'ISO/IEC 27001', 'aliases': ['iso 27001', 'iso iec 27001', 'iso27001'], 'acronyms': []},
+    'framework:nist-csf': {'name': 'NIST Cybersecurity Framework', 'aliases': ['nist csf', 'nist cybersecurity framework'], 'acronyms': []},
+    'framework:dora': {'name': 'Digital Operational Resilience Act', 'aliases': ['digital operational resilience act'], 'acronyms': ['DORA']},
+    'framework:nis2': {'name': 'NIS2 Directive', 'aliases': ['nis2', 'nis 2'], 'acronyms': []},
+    'framework:mifid-ii': {'name': 'MiFID II', 'aliases': ['mifid ii', 'mifid 2', 'mifid'], 'acronyms': []},
+    'framework:basel-iii': {'name': 'Basel III', 'aliases': ['basel iii', 'basel 3'], 'acronyms': []},
+    'framework:glba': {'name': 'Gramm-Leach-Bliley Act', 'aliases': ['glba', 'gramm leach bliley'], 'acronyms': []},
+    'framework:aml': {'name': 'Anti-Money Laundering', 'aliases': ['anti money laundering'], 'acronyms': ['AML']}
+}
+
+# Identifier patterns that don't fit a fixed list
+CVE_RE = re.compile(r'\bCVE-(\d{4})-(\d{4,7})\b', re.IGNORECASE)
+EU_ACT_RE = re.compile(
+    r'\b(?:Regulation|Directive|Decision)\s+\((EU|EC|EEC)\)\s+(?:No\.?\s+)?(\d{2,4}/\d{1,4})'
+    r'|\bDirective\s+(\d{2,4}/\d{1,4})/(EU|EC|EEC)\b'
+)
+CFR_RE = re.compile(r'\b(\d{1,2})\s+C\.?F\.?R\.?\s+(?:(?:Part|§{1,2})\s*)?(\d+(?:\.\d+[a-z0-9-]*)?)', re.IGNORECASE)
+
+_TOKEN_RE = re.compile(r'[A-Za-z0-9]+')
+
+# Compiled tries shared by every extractor with the same gazetteer
+_TRIE_CACHE: Dict[Tuple, Tuple[Dict, Dict[str, str]]] = {}
+
+_END = '$'
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text)
+
+def _compile(gazetteer: Dict[str, Dict[str, Any]]) -> Tuple[Dict, Dict[str, str]]:
+    """Token trie over every alias plus a flat alias -> id lookup
+
+    Terminal nodes hold (entity_id, acronym) pairs; acronym entries only
+    match when the source text has exactly that casing.
+    """
+    trie: Dict = {}
+    lookup: Dict[str, str] = {}
+
+    for entity_id, entry in gazetteer.items():
+        lookup[entity_id] = entity_id
+        lookup[' '.join(_tokens(entry.get('name', ''))).lower()] = entity_id
+        forms = [(alias, None) for alias in entry.get('aliases', [])]
+        forms += [(acronym, acronym) for acronym in entry.get('acronyms', [])]
+
+        for form, case_sensitive in forms:
+            words = [word.lower() for word in _tokens(form)]
+            if not words:
+                continue
+            lookup[' '.join(words)] = entity_id
+            node = trie
+            for word in words:
+                node = node.setdefault(word, {})
+            node.setdefault(_END, []).append((entity_id, case_sensitive))
+
+    return trie, lookup
+
+class EntityExtractor:
+    """Single-pass gazetteer and identifier extraction over article text"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.logger = logging.getLogger(__name__)
+        config = config or {}
+
+        gazetteer = dict(DEFAULT_GAZETTEER)
+        gazetteer.update(config.get('gazetteer') or {})
+
+        key = tuple(
+            (entity_id, tuple(entry.get('aliases', [])), tuple(entry.get('acronyms', [])), entry.get('name', ''))
+            for entity_id, entry in sorted(gazetteer.items())
+        )
+        compiled = _TRIE_CACHE.get(key)
+        if compiled is None:
+            compiled = _compile(gazetteer)
+            _TRIE_CACHE[key] = compiled
+            self.logger.info(f"Compiled entity gazetteer with {len(gazetteer)} entities")
+
+        self.gazetteer = gazetteer
+        self.trie, self.lookup = compiled
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical id for an entity id, name or alias"""
+        if name in self.gazetteer:
+            return name
+        return self.lookup.get(' '.join(_tokens(name)).lower())
+
+    def display_name(self, entity_id: str) -> str:
+        entry = self.gazetteer.get(entity_id)
+        return entry['name'] if entry else entity_id.split(':', 1)[-1]
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical entity ids in order of first mention"""
+        if not text:
+            return []
+
+        found: Dict[str, None] = {}
+        tokens = _tokens(text)
+        lowered = [token.lower() for token in tokens]
+        trie = self.trie
+        i = 0
+
+        while i < len(tokens):
+            node = trie.get(lowered[i])
+            if node is None:
+                i += 1
+                continue
+
+            # Longest alias starting here wins
+            best_end, best_ids = 0, None
+            j = i
+            while node is not None:
+                j += 1
+                matches = node.get(_END)
+                if matches:
+                    ids = [
+                        entity_id for entity_id, acronym in matches
+                        if acronym is None or ' '.join(tokens[i:j]) == acronym
+                    ]
+                    if ids:
+                        best_end, best_ids = j, ids
+                node = node.get(lowered[j]) if j < len(tokens) else None
+
+            if best_ids:
+                for entity_id in best_ids:
+                    found[entity_id] = None
+                i = best_end
+            else:
+                i += 1
+
+        for match in CVE_RE.finditer(text):
+            found[f"cve:CVE-{match.group(1)}-{match.group(2)}"] = None
+
+        for match in EU_ACT_RE.finditer(text):
+            if match.group(2):
+                found[f"regulation:{match.group(1).lower()}-{match.group(2)}"] = None
+            else:
+                found[f"regulation:{match.group(4).lower()}-{match.group(3)}"] = None
+
+        for match in CFR_RE.finditer(text):
+            found[f"regulation:cfr-{match.group(1)}-{match.group(2).lower()}"] = None
+
+        return list(found)
+
+    def extract_articles(self, articles) -> None:
+        """Add canonical entity ids from title and content to each article in place"""
+        for article in articles:
+            entity_ids = self.extract(f"{article.title or ''}\n{article.content or ''}")
+            existing = set(article.entities)
+            article.entities.extend(entity_id for entity_id in entity_ids if entity_id not in existing)
+
+def is_entity_id(value: str) -> bool:
+    return bool(ENTITY_ID_RE.match(value or ''))
@@ -0,0 +1,196 @@
+import io
+import time
+import calendar
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_tz, mktime_tz
+from typing import Dict, Any, Iterator, List, Optional
+
+# Per-source high-water mark persisted in the sources table (see NewsDatabase)
+FEED_MARK_COLUMNS = {
+    'feed_seen': 'TEXT',  # JSON list of recent entry GUIDs/links, newest first
+    'feed_newest': 'INTEGER',  # Newest published date seen, epoch seconds
+    'feed_ordered': 'INTEGER DEFAULT 0',  # Entries came newest first last time
+    'feed_etag': 'TEXT',
+    'feed_last_modified': 'TEXT'
+}
+
+ENTRY_TAGS = ('item', 'entry')
+
+logger = logging.getLogger(__name__)
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+def _text(element) -> str:
+    """Element text, including child markup of Atom type="xhtml" content"""
+    if len(element):
+        return ''.join(ET.tostring(child, encoding='unicode') for child in element)
+    return element.text or ''
+
+def parse_feed_date(value: Optional[str]) -> Optional[int]:
+    """RFC 822 (RSS) or ISO 8601 (Atom, dc:date) date as epoch seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    parsed = parsedate_tz(value)
+    if parsed:
+        return mktime_tz(parsed)
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+class FeedEntry(dict):
+    """Entry with attribute access, like feedparser's FeedParserDict"""
+
+    def __getattr__(self, name: str):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+def _entry(element) -> FeedEntry:
+    """feedparser-style entry from an RSS <item> or Atom <entry> element"""
+    entry = FeedEntry()
+    for child in element:
+        name = _local(child.tag)
+        if name == 'title':
+            entry['title'] = _text(child)
+        elif name == 'link':
+            href = child.get('href')
+            if href is None:
+                entry.setdefault('link', (child.text or '').strip())
+            elif child.get('rel', 'alternate') == 'alternate':
+                entry['link'] = href
+        elif name in ('guid', 'id'):
+            entry['id'] = (child.text or '').strip()
+        elif name in ('description', 'summary'):
+            entry['summary'] = _text(child)
+        elif name in ('encoded', 'content'):
+            entry['content'] = [FeedEntry(value=_text(child))]
+        elif name in ('pubDate', 'published', 'date', 'updated'):
+            key = 'updated' if name == 'updated' else 'published'
+            entry.setdefault(key, (child.text or '').strip())
+            published = parse_feed_date(child.text)
+            if published is not None:
+                entry.setdefault(key + '_parsed', time.gmtime(published))
+    return entry
+
+def stream_entries(content: bytes) -> Iterator[FeedEntry]:
+    """Yield feed entries one at a time as the body is parsed
+
+    Entries the caller stops before are never built. Bodies that aren't
+    well-formed XML fall back to feedparser's lenient parser, continuing
+    after any entries already yielded.
+    """
+    yielded = 0
+    try:
+        for _, element in ET.iterparse(io.BytesIO(content), events=('end',)):
+            if _local(element.tag) in ENTRY_TAGS:
+                entry = _entry(element)
+                element.clear()
+                yielded += 1
+                yield entry
+        return
+    except ET.ParseError as e:
+        logger.debug(f"Streaming feed parse failed after {yielded} entries, using feedparser: {e}")
+
+    # Imported only for the rare malformed feed; it's slow to load
+    import feedparser
+    feed = feedparser.parse(content)
+    if feed.bozo:
+        logger.warning(f"RSS feed parsing warning: {feed.bozo_exception}")
+    for entry in feed.entries[yielded:]:
+        yield entry
+
+def entry_key(entry) -> str:
+    """Identity of a feed entry before any parsing: GUID, else link"""
+    return (entry.get('id') or entry.get('link') or '').strip()
+
+def entry_published(entry) -> Optional[int]:
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    return calendar.timegm(parsed) if parsed else None
+
+class FeedMark:
+    """High-water mark of a feed: entries already processed on earlier cycles
+
+    An entry is known if its GUID/link was seen recently, or, in a feed
+    whose entries came newest first, if it is older than the newest entry
+    seen. Once ``stop_after`` known entries in a row turn up in an ordered
+    feed the rest of it is older still, and processing stops there.
+    Unordered feeds skip known entries but are read to the end.
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None, stop_after: int = 3):
+        state = state or {}
+        self.seen = set(state.get('feed_seen') or ())
+        self.previous_seen: List[str] = list(state.get('feed_seen') or ())
+        self.newest = state.get('feed_newest')
+        self.ordered = bool(state.get('feed_ordered'))
+        self.etag = state.get('feed_etag')
+        self.last_modified = state.get('feed_last_modified')
+        self.stop_after = stop_after
+
+        self.new_keys: List[str] = []
+        self.known_run = 0
+        self.examined = 0
+        self.skipped = 0
+        self.seen_ordered = True
+        self.seen_newest = self.newest
+        self._last_published = None
+
+    def request_headers(self) -> Dict[str, str]:
+        """Conditional GET headers, so an unchanged feed answers 304"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def is_known(self, key: str, published: Optional[int]) -> bool:
+        """Record one entry in feed order; True if it was processed before"""
+        self.examined += 1
+        if published is not None:
+            if self._last_published is not None and published > self._last_published:
+                self.seen_ordered = False
+            self._last_published = published
+            if self.seen_newest is None or published > self.seen_newest:
+                self.seen_newest = published
+
+        known = bool(key) and key in self.seen
+        if not known and self.ordered and self.newest is not None and published is not None:
+            known = published < self.newest
+
+        if known:
+            self.known_run += 1
+            self.skipped += 1
+        else:
+            self.known_run = 0
+            if key:
+                self.seen.add(key)
+                self.new_keys.append(key)
+        return known
+
+    @property
+    def exhausted(self) -> bool:
+        """Everything after this point in the feed was processed before"""
+        return self.ordered and self.known_run >= self.stop_after
+
+    def state(self, keep: int) -> Dict[str, Any]:
+        """Mark to persist after the new entries were saved"""
+        seen = list(dict.fromkeys(self.new_keys + self.previous_seen))[:keep]
+        # Too few entries this time (304, or one new entry) to judge the order
+        ordered = self.seen_ordered if self.examined > 1 else self.ordered
+        return {
+            'feed_seen': seen,
+            'feed_newest': self.seen_newest,
+            'feed_ordered': int(ordered),
+            'feed_etag': self.etag,
+            'feed_last_modified': self.last_modified
+        }
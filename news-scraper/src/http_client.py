@@ -0,0 +1,219 @@
+import time
+import socket
+import ipaddress
+import threading
+from collections import defaultdict
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+from urllib3.util.connection import allowed_gai_family
+
+# gzip and deflate always; br (and zstd) when urllib3 can decode them, i.e.
+# when the optional brotli (zstandard) package is installed
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+class ResponseTooLarge(requests.RequestException):
+    """The response body is over the client's size cap"""
+
+class DNSCache:
+    """Resolved address of each host, reused for ``ttl`` seconds
+
+    Only new connections resolve names, so with keep-alive this mostly
+    saves the lookup when a pool reconnects or grows under concurrency.
+    Lookup failures aren't cached; the connection then resolves the name
+    itself and raises its usual error.
+    """
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> str:
+        if self.ttl <= 0:
+            return host
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        now = time.monotonic()
+        entry = self._entries.get((host, port))
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        try:
+            addresses = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            return host
+        address = addresses[0][4][0]
+        with self._lock:
+            self._entries[(host, port)] = (address, now + self.ttl)
+        return address
+
+class _CachedDNSConnection:
+    """Connects to the cached address; SNI, Host and certificate checks still use the name"""
+
+    dns_cache: Optional[DNSCache] = None
+
+    def _new_conn(self):
+        if self.dns_cache is None:
+            return super()._new_conn()
+        # host is derived from _dns_host, so it's only swapped while connecting
+        hostname = self._dns_host
+        self._dns_host = self.dns_cache.resolve(hostname, self.port)
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = hostname
+
+class CachedDNSHTTPConnection(_CachedDNSConnection, HTTPConnection):
+    pass
+
+class CachedDNSHTTPSConnection(_CachedDNSConnection, HTTPSConnection):
+    pass
+
+class _MeteredPool:
+    """Counts requests and new connections per host for HttpClient.stats"""
+
+    client: Optional['HttpClient'] = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.dns_cache = self.client.dns_cache
+        self.client._count(self.host, 'connections')
+        return conn
+
+    def urlopen(self, *args, **kwargs):
+        self.client._count(self.host, 'requests')
+        return super().urlopen(*args, **kwargs)
+
+class MeteredHTTPConnectionPool(_MeteredPool, HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+class MeteredHTTPSConnectionPool(_MeteredPool, HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+class _MeteredAdapter(HTTPAdapter):
+    def __init__(self, client: 'HttpClient', pool_kwargs: Optional[Dict[str, Any]] = None, **kwargs):
+        self.client = client
+        self.pool_kwargs = pool_kwargs or {}
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **dict(self.pool_kwargs, **kwargs))
+        self.poolmanager.pool_classes_by_scheme = self.client.pool_classes
+
+class HttpClient:
+    """One pooled, keep-alive HTTP client for every request a process makes
+
+    A drop-in for the requests.Session calls used here (get, post, head,
+    headers). Each host gets a pool of ``pool_maxsize`` kept-alive
+    connections, or its entry in ``host_pool_sizes``, for up to
+    ``pool_connections`` hosts at once. Host names are resolved through a
+    DNS cache, compressed responses are accepted, and bodies over
+    ``max_response_mb`` are cut off with ResponseTooLarge unless the caller
+    streams them. ``stats`` reports per-host connection reuse.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None):
+        config = config or {}
+        self.max_response_bytes = int(config.get('max_response_mb', 10) * 1024 * 1024)
+        self.dns_cache = DNSCache(config.get('dns_cache_seconds', 300))
+        self._stats = defaultdict(lambda: {'requests': 0, 'connections': 0})
+        self._stats_lock = threading.Lock()
+
+        # Pools look up this client through their class
+        self.pool_classes = {
+            'http': type('MeteredHTTPConnectionPool', (MeteredHTTPConnectionPool,), {'client': self}),
+            'https': type('MeteredHTTPSConnectionPool', (MeteredHTTPSConnectionPool,), {'client': self})
+        }
+
+        pool_kwargs = {}
+        if config.get('tcp_keepalive', True):
+            # Idle pooled connections dropped by a NAT or load balancer are
+            # noticed instead of hanging the next request
+            pool_kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        pool_connections = config.get('pool_connections', 64)
+
+        def adapter(maxsize: int) -> HTTPAdapter:
+            return _MeteredAdapter(self, pool_kwargs, pool_connections=pool_connections, pool_maxsize=maxsize)
+
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        self.session.headers.update(headers or {})
+        default_adapter = adapter(config.get('pool_maxsize', 8))
+        self.session.mount('http://', default_adapter)
+        self.session.mount('https://', default_adapter)
+        # Longer prefixes win, so these hosts get their own pool size
+        for host, size in (config.get('host_pool_sizes') or {}).items():
+            host_adapter = adapter(size)
+            self.session.mount(f"http://{host}", host_adapter)
+            self.session.mount(f"https://{host}", host_adapter)
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def _count(self, host: str, key: str):
+        with self._stats_lock:
+            self._stats[host][key] += 1
+
+    def request(self, method: str, url: str, max_bytes: Optional[int] = None, **kwargs) -> requests.Response:
+        """Send a request, reading at most ``max_bytes`` of body (default max_response_mb, 0 for no cap)
+
+        With ``stream=True`` the body is left to the caller, uncapped.
+        """
+        if kwargs.pop('stream', False):
+            return self.session.request(method, url, stream=True, **kwargs)
+
+        limit = self.max_response_bytes if max_bytes is None else max_bytes
+        response = self.session.request(method, url, stream=True, **kwargs)
+        try:
+            length = response.headers.get('Content-Length', '')
+            if limit and length.isdigit() and int(length) > limit:
+                raise ResponseTooLarge(f"{url} is {length} bytes, over the {limit} byte limit", response=response)
+
+            # Counted after decompression, so a small gzip bomb is caught too
+            chunks, size = [], 0
+            for chunk in response.iter_content(64 * 1024):
+                size += len(chunk)
+                if limit and size > limit:
+                    raise ResponseTooLarge(f"{url} is over the {limit} byte limit", response=response)
+                chunks.append(chunk)
+        except BaseException:
+            # A connection with unread body left can't be reused
+            response.close()
+            raise
+
+        response._content = b''.join(chunks)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Requests, new connections and reused connections per host"""
+        with self._stats_lock:
+            stats = {host: dict(counts) for host, counts in self._stats.items()}
+        for counts in stats.values():
+            counts['reused'] = max(counts['requests'] - counts['connections'], 0)
+            counts['reuse_ratio'] = round(counts['reused'] / counts['requests'], 3) if counts['requests'] else 0.0
+        return stats
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,38 @@
+import re
+from typing import Dict, Any, Iterable, Optional
+
+# Kept even when none of their articles mention a keyword
+TRUSTED_SOURCES = frozenset(['SEC News', 'FCA News', 'AWS Status', 'Microsoft Azure Status'])
+
+def _compile(keywords: Iterable[str]) -> Optional[re.Pattern]:
+    """One alternation matching any keyword as a substring of lowercased text"""
+    keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+    if not keywords:
+        return None
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+class KeywordFilter:
+    """Article relevance from the filtering config's keywords
+
+    Exclude keywords reject an article, any category keyword accepts it,
+    otherwise only trusted sources are kept. Both keyword lists are
+    compiled once, so checking an article is two regex searches instead
+    of lowercasing and scanning for every keyword in turn.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.exclude = _compile(config.get('exclude_keywords') or [])
+        self.include = _compile(
+            keyword
+            for category_keywords in (config.get('keywords') or {}).values()
+            for keyword in category_keywords
+        )
+
+    def is_relevant(self, title: str, content: str, source: str) -> bool:
+        text = f"{title}\n{content}".lower()
+        if self.exclude and self.exclude.search(text):
+            return False
+        if self.include and self.include.search(text):
+            return True
+        return source in TRUSTED_SOURCES
@@ -0,0 +1,213 @@
+import time
+import queue
+import logging
+import threading
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
+
+# Marks the end of a stage's input
+_DONE = object()
+
+class Stage:
+    """One step of a pipeline, run by ``workers`` threads
+
+    ``func`` is called once per input item and returns an iterable of
+    output items (usually it's a generator), so a stage can drop an item,
+    pass it on, or split it. Outputs of a stage with more than one worker
+    can arrive at the next stage out of order.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Iterable[Any]], workers: int = 1,
+                 queue_size: Optional[int] = None):
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.queue_size = queue_size
+        self.received = 0
+        self.emitted = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'received': self.received,
+            'emitted': self.emitted,
+            'failed': self.failed,
+            'busy_seconds': round(self.busy_seconds, 3)
+        }
+
+class SourceJob:
+    """One source's trip through a scrape pipeline
+
+    Stages fill in the fetched body, then narrow ``articles`` down to the
+    ones worth saving. Articles travel as one batch per source so scoring
+    and classification stay vectorized.
+    """
+
+    __slots__ = ('source', 'started', 'content', 'base_url', 'fetch_seconds', 'fetched',
+                 'articles', 'saved', 'feed_mark', 'lease')
+
+    def __init__(self, source: Dict[str, Any], lease=None):
+        self.source = source
+        self.started = time.time()
+        self.content: Optional[bytes] = None
+        self.base_url = source.get('url')
+        self.fetch_seconds = 0.0
+        self.fetched = False
+        self.articles: List[Any] = []
+        self.saved = 0
+        self.feed_mark = None
+        self.lease = lease
+
+    @property
+    def name(self) -> str:
+        return self.source['name']
+
+class PipelineClosed(Exception):
+    """The consumer stopped reading before the pipeline finished"""
+
+class Pipeline:
+    """Generator stages connected by bounded queues
+
+    Each stage reads from a queue of at most ``queue_size`` items (or its
+    own ``Stage.queue_size``), so a slow stage blocks the stages feeding it
+    instead of letting their output pile up in memory, and the input
+    iterable is only read as fast as the first stage keeps up. An item
+    whose stage raises is handed to ``on_error(stage_name, item, error)``
+    and goes no further; the other items keep flowing. on_error calls are
+    serialized, but they run on the stage's worker thread.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 4,
+                 on_error: Optional[Callable[[str, Any, Exception], None]] = None):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.logger = logging.getLogger(__name__)
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self._error_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def _put(self, target: queue.Queue, item: Any):
+        while True:
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if self._stopped.is_set():
+                    raise PipelineClosed()
+
+    def _get(self, source: queue.Queue) -> Any:
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                if self._stopped.is_set():
+                    raise PipelineClosed()
+
+    def _report(self, stage: Stage, item: Any, error: Exception):
+        with self._error_lock:
+            stage.failed += 1
+            if self.on_error is None:
+                self.logger.error(f"Pipeline stage {stage.name} failed: {error}")
+                return
+            try:
+                self.on_error(stage.name, item, error)
+            except Exception as e:
+                self.logger.error(f"Error handling failure in pipeline stage {stage.name}: {e}")
+
+    def _feed(self, items: Iterable[Any], target: queue.Queue, workers: int, failure: List[BaseException]):
+        try:
+            for item in items:
+                self._put(target, item)
+        except PipelineClosed:
+            return
+        except BaseException as e:
+            # Raised to the consumer once the items already fed are through
+            failure.append(e)
+        try:
+            for _ in range(workers):
+                self._put(target, _DONE)
+        except PipelineClosed:
+            pass
+
+    def _work(self, stage: Stage, source: queue.Queue, target: queue.Queue, downstream_workers: int,
+              remaining: List[int], lock: threading.Lock):
+        try:
+            while True:
+                item = self._get(source)
+                if item is _DONE:
+                    break
+                start = time.perf_counter()
+                outputs = []
+                try:
+                    outputs = list(stage.func(item))
+                except Exception as e:
+                    self._report(stage, item, e)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    stage.received += 1
+                    stage.emitted += len(outputs)
+                    stage.busy_seconds += elapsed
+                for output in outputs:
+                    self._put(target, output)
+
+            # The last worker out tells every worker of the next stage
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(downstream_workers):
+                    self._put(target, _DONE)
+        except PipelineClosed:
+            pass
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Feed ``items`` through every stage, yielding what the last stage emits
+
+        Closing the generator early stops the pipeline; items in flight are
+        abandoned.
+        """
+        self._stopped.clear()
+        for stage in self.stages:
+            stage.received = stage.emitted = stage.failed = 0
+            stage.busy_seconds = 0.0
+
+        queues = [queue.Queue(stage.queue_size or self.queue_size) for stage in self.stages]
+        queues.append(queue.Queue(self.queue_size))
+        failure: List[BaseException] = []
+
+        threads = [threading.Thread(
+            target=self._feed, args=(items, queues[0], self.stages[0].workers, failure),
+            name='pipeline-feed', daemon=True
+        )]
+        for index, stage in enumerate(self.stages):
+            downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            remaining, lock = [stage.workers], threading.Lock()
+            for number in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[index], queues[index + 1], downstream, remaining, lock),
+                    name=f"pipeline-{stage.name}-{number}", daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self._stopped.set()
+            for thread in threads:
+                thread.join()
+
+        if failure:
+            raise failure[0]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Items in, out and failed, and time spent working, per stage"""
+        return {stage.name: stage.stats() for stage in self.stages}
@@ -0,0 +1,322 @@
+import os
+import zlib
+import sqlite3
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+# Fetch kinds: a source's feed/listing page, or an article page fetched for enrichment
+SOURCE_FETCH = 'source'
+ARTICLE_FETCH = 'article'
+
+# Keep the one-row raw_store_size totals current, so a put never sums raw_blobs
+SIZE_TRIGGERS = {
+    'trg_raw_blobs_insert': '''
+        CREATE TRIGGER trg_raw_blobs_insert AFTER INSERT ON raw_blobs
+        BEGIN
+            UPDATE raw_store_size SET
+                blobs = blobs + 1, bytes = bytes + NEW.size, stored_bytes = stored_bytes + NEW.stored_size;
+        END
+    ''',
+    'trg_raw_blobs_update': '''
+        CREATE TRIGGER trg_raw_blobs_update AFTER UPDATE OF size, stored_size ON raw_blobs
+        BEGIN
+            UPDATE raw_store_size SET
+                bytes = bytes - OLD.size + NEW.size,
+                stored_bytes = stored_bytes - OLD.stored_size + NEW.stored_size;
+        END
+    ''',
+    'trg_raw_blobs_delete': '''
+        CREATE TRIGGER trg_raw_blobs_delete AFTER DELETE ON raw_blobs
+        BEGIN
+            UPDATE raw_store_size SET
+                blobs = blobs - 1, bytes = bytes - OLD.size, stored_bytes = stored_bytes - OLD.stored_size;
+        END
+    '''
+}
+
+class RawResponseStore:
+    """Content-addressed store of fetched response bodies
+
+    Bodies are zlib-compressed and written once per SHA-256 under
+    ``objects/<2 hex>/<62 hex>``, so a feed that hasn't changed between
+    cycles costs one index row rather than another copy. The index database
+    records which source fetched which blob and when. Once the compressed
+    total exceeds ``max_bytes`` the oldest fetches are dropped and blobs
+    nothing references any more are deleted. Totals are kept in a one-row
+    table by triggers, so checking the limit on every put costs one lookup.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 500 * 1024 * 1024, compression_level: int = 6):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.db_path = os.path.join(root, 'index.db')
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.init_database()
+
+    def init_database(self):
+        """Create the blob and fetch index tables"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS raw_blobs (
+                        hash TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        stored_size INTEGER NOT NULL,
+                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS raw_fetches (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        source_name TEXT NOT NULL,
+                        kind TEXT NOT NULL,
+                        url TEXT NOT NULL,
+                        final_url TEXT,
+                        content_type TEXT,
+                        blob_hash TEXT NOT NULL,
+                        fetched_at DATETIME NOT NULL
+                    )
+                ''')
+
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_raw_fetches_source ON raw_fetches(source_name, fetched_at)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_raw_fetches_url ON raw_fetches(url, fetched_at)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_raw_fetches_blob ON raw_fetches(blob_hash)')
+
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS raw_store_size (
+                        id INTEGER PRIMARY KEY CHECK (id = 0),
+                        blobs INTEGER NOT NULL,
+                        bytes INTEGER NOT NULL,
+                        stored_bytes INTEGER NOT NULL
+                    )
+                ''')
+                # Stores from before the totals existed start from a full count
+                cursor.execute('''
+                    INSERT OR IGNORE INTO raw_store_size (id, blobs, bytes, stored_bytes)
+                    SELECT 0, COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM raw_blobs
+                ''')
+
+                cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+                existing_triggers = {row[0] for row in cursor.fetchall()}
+                for name, sql in SIZE_TRIGGERS.items():
+                    if name not in existing_triggers:
+                        cursor.execute(sql)
+
+                conn.commit()
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Raw store initialization error: {e}")
+            raise
+
+    def _blob_path(self, blob_hash: str) -> str:
+        return os.path.join(self.objects_dir, blob_hash[:2], blob_hash[2:])
+
+    def put(self, source_name: str, url: str, content: bytes, kind: str = SOURCE_FETCH,
+            final_url: Optional[str] = None, content_type: Optional[str] = None) -> Optional[str]:
+        """Store a response body and record the fetch; returns the blob hash"""
+        blob_hash = hashlib.sha256(content).hexdigest()
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('SELECT 1 FROM raw_blobs WHERE hash = ?', (blob_hash,))
+                if cursor.fetchone() is None or not os.path.exists(self._blob_path(blob_hash)):
+                    stored_size = self._write_blob(blob_hash, content)
+                    cursor.execute('''
+                        INSERT INTO raw_blobs (hash, size, stored_size)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT (hash) DO UPDATE SET size = excluded.size, stored_size = excluded.stored_size
+                    ''', (blob_hash, len(content), stored_size))
+
+                cursor.execute('''
+                    INSERT INTO raw_fetches (source_name, kind, url, final_url, content_type, blob_hash, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (source_name, kind, url, final_url or url, content_type, blob_hash, datetime.now().isoformat()))
+
+                conn.commit()
+
+            self.enforce_retention()
+            return blob_hash
+
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"Error storing raw response for {url}: {e}")
+            return None
+
+    def _write_blob(self, blob_hash: str, content: bytes) -> int:
+        """Write a compressed blob atomically and return its size on disk"""
+        path = self._blob_path(blob_hash)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        compressed = zlib.compress(content, self.compression_level)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+        return len(compressed)
+
+    def get(self, blob_hash: str) -> Optional[bytes]:
+        """Decompressed body for a blob hash"""
+        try:
+            with open(self._blob_path(blob_hash), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            self.logger.warning(f"Could not read raw blob {blob_hash}: {e}")
+            return None
+
+    def fetches(self, source_name: Optional[str] = None, kind: str = SOURCE_FETCH,
+                since: Optional[datetime] = None, distinct: bool = False) -> List[Dict[str, Any]]:
+        """Recorded fetches, oldest first
+
+        With ``distinct`` set, each distinct blob is returned once, at its
+        first fetch, since identical bodies parse to identical articles.
+        """
+        query = 'SELECT id, source_name, kind, url, final_url, content_type, blob_hash, fetched_at FROM raw_fetches WHERE kind = ?'
+        params: List[Any] = [kind]
+
+        if source_name:
+            query += ' AND source_name = ?'
+            params.append(source_name)
+
+        if since:
+            query += ' AND fetched_at >= ?'
+            params.append(since.isoformat())
+
+        if distinct:
+            query += ' AND id IN (SELECT MIN(id) FROM raw_fetches GROUP BY source_name, blob_hash)'
+
+        query += ' ORDER BY id'
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+
+                return [
+                    {
+                        'id': row[0],
+                        'source_name': row[1],
+                        'kind': row[2],
+                        'url': row[3],
+                        'final_url': row[4],
+                        'content_type': row[5],
+                        'blob_hash': row[6],
+                        'fetched_at': row[7]
+                    }
+                    for row in cursor.fetchall()
+                ]
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error listing raw fetches: {e}")
+            return []
+
+    def latest_for_url(self, url: str, kind: str = ARTICLE_FETCH) -> Optional[bytes]:
+        """Most recently stored body fetched from a URL"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT blob_hash FROM raw_fetches
+                    WHERE url = ? AND kind = ?
+                    ORDER BY fetched_at DESC LIMIT 1
+                ''', (url, kind))
+                row = cursor.fetchone()
+
+            return self.get(row[0]) if row else None
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error looking up raw response for {url}: {e}")
+            return None
+
+    def total_size(self) -> int:
+        """Compressed bytes held by all blobs"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT stored_bytes FROM raw_store_size')
+                return cursor.fetchone()[0]
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading raw store size: {e}")
+            return 0
+
+    def enforce_retention(self, batch_size: int = 100) -> int:
+        """Drop the oldest fetches until the store fits in max_bytes
+
+        Returns the number of blobs removed.
+        """
+        removed = 0
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT stored_bytes FROM raw_store_size')
+                total = cursor.fetchone()[0]
+
+                while total > self.max_bytes:
+                    cursor.execute('SELECT id, blob_hash FROM raw_fetches ORDER BY id LIMIT ?', (batch_size,))
+                    oldest = cursor.fetchall()
+                    if not oldest:
+                        break
+
+                    for fetch_id, blob_hash in oldest:
+                        cursor.execute('DELETE FROM raw_fetches WHERE id = ?', (fetch_id,))
+                        cursor.execute('SELECT 1 FROM raw_fetches WHERE blob_hash = ? LIMIT 1', (blob_hash,))
+                        if cursor.fetchone() is None:
+                            cursor.execute('SELECT stored_size FROM raw_blobs WHERE hash = ?', (blob_hash,))
+                            row = cursor.fetchone()
+                            cursor.execute('DELETE FROM raw_blobs WHERE hash = ?', (blob_hash,))
+                            try:
+                                os.unlink(self._blob_path(blob_hash))
+                            except FileNotFoundError:
+                                pass
+                            total -= row[0] if row else 0
+                            removed += 1
+                        if total <= self.max_bytes:
+                            break
+
+                    conn.commit()
+
+            if removed:
+                self.logger.info(f"Raw store retention removed {removed} blobs")
+            return removed
+
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"Error enforcing raw store retention: {e}")
+            return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Blob and fetch counts with raw and compressed sizes"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT blobs, bytes, stored_bytes FROM raw_store_size')
+                blobs, size, stored_size = cursor.fetchone()
+                cursor.execute('SELECT COUNT(*) FROM raw_fetches')
+                fetches = cursor.fetchone()[0]
+
+                return {
+                    'blobs': blobs,
+                    'fetches': fetches,
+                    'bytes': size,
+                    'stored_bytes': stored_size,
+                    'max_bytes': self.max_bytes
+                }
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting raw store stats: {e}")
+            return {}
@@ -0,0 +1,263 @@
+import os
+import gzip
+import json
+import time
+import sqlite3
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Iterator, Callable
+
+# Tables with a retention window. ``column`` is the row timestamp compared
+# against the cutoff: 'epoch' columns hold integer UTC epoch seconds, 'utc'
+# ones are written by CURRENT_TIMESTAMP and 'local' ones by
+# datetime.now().isoformat(). Rows of ``dependents`` keyed
+# by the expired ids are removed in the same transaction.
+POLICIES = {
+    'news_articles': {
+        'column': 'scraped_date',
+        'clock': 'epoch',
+        'keep_days': 30,
+        'archive': True,
+        'dependents': [
+            ('article_entities', 'article_id'),
+            ('article_signatures', 'article_id'),
+            ('signature_bands', 'article_id')
+        ]
+    },
+    'scraping_logs': {
+        'column': 'created_at',
+        'clock': 'utc',
+        'keep_days': 30,
+        'archive': False
+    },
+    'vendor_status': {
+        'column': 'checked_at',
+        'clock': 'local',
+        'keep_days': 90,
+        'archive': True,
+        # Open incidents are live state, never history
+        'where': 'resolved_at IS NOT NULL'
+    }
+}
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+def cutoff_for(policy: Dict[str, Any], keep_days: float, now: Optional[datetime] = None):
+    """Cutoff timestamp in the same format as the policy's column"""
+    if policy.get('clock') == 'epoch':
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        return int((now - timedelta(days=keep_days)).timestamp())
+    if policy.get('clock') == 'local':
+        return ((now or datetime.now()) - timedelta(days=keep_days)).isoformat()
+    return ((now or datetime.utcnow()) - timedelta(days=keep_days)).strftime('%Y-%m-%d %H:%M:%S')
+
+class ArchiveWriter:
+    """Appends expired rows to gzip files partitioned by table and month
+
+    Each chunk becomes one gzip member holding a single JSON line in
+    columnar form ({"columns": [...], "data": [[column values], ...]}), so
+    files can be appended to without rewriting and read back with a plain
+    gzip reader. Archives are written and synced before the rows are
+    deleted; a crash in between can archive a chunk twice but never lose it.
+    """
+
+    def __init__(self, root: str, compression_level: int = 6):
+        self.root = root
+        self.compression_level = compression_level
+
+    def path_for(self, table: str, month: str) -> str:
+        return os.path.join(self.root, table, f"{month}.jsonl.gz")
+
+    def write(self, table: str, columns: List[str], rows: List[tuple], time_index: int) -> int:
+        partitions: Dict[str, List[tuple]] = {}
+        for row in rows:
+            value = row[time_index]
+            if isinstance(value, (int, float)):
+                month = datetime.fromtimestamp(value, timezone.utc).strftime('%Y-%m')
+            else:
+                month = str(value or 'unknown')[:7]
+            partitions.setdefault(month, []).append(row)
+
+        for month, month_rows in partitions.items():
+            path = self.path_for(table, month)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            record = {
+                'columns': columns,
+                'data': [list(values) for values in zip(*month_rows)]
+            }
+            payload = gzip.compress((json.dumps(record, default=str) + '\n').encode('utf-8'),
+                                    compresslevel=self.compression_level)
+            with open(path, 'ab') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+        return len(rows)
+
+def read_archive(path: str) -> Iterator[Dict[str, Any]]:
+    """Rows of an archive file as dicts"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            for values in zip(*record['data']):
+                yield dict(zip(record['columns'], values))
+
+class RetentionManager:
+    """Deletes or archives expired rows in small, separately committed chunks
+
+    Each chunk is read and archived first, then deleted in one short BEGIN
+    IMMEDIATE transaction followed by a pause, so scraper writes queue
+    behind at most one chunk's deletes, and the database is
+    switched to WAL so readers are never blocked. Freed pages are returned
+    with incremental vacuum when the database supports it.
+    """
+
+    def __init__(self, db_path: str, archive_path: Optional[str] = None, chunk_size: int = 500,
+                 pause_seconds: float = 0.05, vacuum_pages: int = 1000, busy_timeout: float = 30,
+                 decode: Optional[Callable[[bytes], Any]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.archive = ArchiveWriter(archive_path) if archive_path else None
+        self.chunk_size = chunk_size
+        self.pause_seconds = pause_seconds
+        self.vacuum_pages = vacuum_pages
+        self.busy_timeout = busy_timeout
+        # Turns compressed BLOB columns back into text for the archive
+        self.decode = decode
+
+    def connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly per chunk
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _existing_tables(self, conn: sqlite3.Connection) -> set:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    def apply(self, table: str, keep_days: Optional[float] = None, archive: Optional[bool] = None,
+              now: Optional[datetime] = None) -> Dict[str, int]:
+        """Expire one table's rows older than keep_days; returns deleted/archived/chunk counts"""
+        policy = POLICIES[table]
+        keep_days = policy['keep_days'] if keep_days is None else keep_days
+        archive = policy['archive'] if archive is None else archive
+        writer = self.archive if archive else None
+        cutoff = cutoff_for(policy, keep_days, now)
+        stats = {'deleted': 0, 'archived': 0, 'chunks': 0}
+
+        try:
+            conn = self.connect()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error opening {self.db_path} for retention: {e}")
+            return stats
+
+        try:
+            tables = self._existing_tables(conn)
+            if table not in tables:
+                return stats
+            dependents = [(name, column) for name, column in policy.get('dependents', []) if name in tables]
+            incremental = conn.execute('PRAGMA auto_vacuum').fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+
+            where = f"{policy['column']} < ?"
+            if policy.get('where'):
+                where += f" AND ({policy['where']})"
+
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            time_index = columns.index(policy['column'])
+            selected = ', '.join(columns) if writer else 'id'
+            id_index = columns.index('id') if writer else 0
+            last_id = 0
+
+            while True:
+                # Selected and archived before taking the write lock, so
+                # scraper writes never wait on compression or an fsync
+                rows = conn.execute(f'''
+                    SELECT {selected} FROM {table}
+                    WHERE id > ? AND {where}
+                    ORDER BY id LIMIT ?
+                ''', (last_id, cutoff, self.chunk_size)).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][id_index]
+                
+                if writer:
+                    if self.decode:
+                        rows = [
+                            tuple(self.decode(value) if isinstance(value, bytes) else value for value in row)
+                            for row in rows
+                        ]
+                    stats['archived'] += writer.write(table, columns, rows, time_index)
+                
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    # Only rows still expired; one changed since the select
+                    # stays (and at worst is archived twice)
+                    chunk = [row[id_index] for row in rows]
+                    placeholders = ', '.join('?' for _ in chunk)
+                    ids = [row[0] for row in conn.execute(f'''
+                        SELECT id FROM {table} WHERE id IN ({placeholders}) AND {where}
+                    ''', chunk + [cutoff])]
+                    placeholders = ', '.join('?' for _ in ids)
+                    conn.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", ids)
+                    for dependent, column in dependents:
+                        conn.execute(f"DELETE FROM {dependent} WHERE {column} IN ({placeholders})", ids)
+                    conn.execute('COMMIT')
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+                
+                stats['deleted'] += len(ids)
+                stats['chunks'] += 1
+
+                if incremental:
+                    # executescript steps the pragma to completion; execute()
+                    # would free a single page
+                    conn.executescript(f'PRAGMA incremental_vacuum({int(self.vacuum_pages)});')
+                if self.pause_seconds:
+                    time.sleep(self.pause_seconds)
+
+            # Fold the chunks (and vacuumed pages) back into the main file
+            if stats['chunks']:
+                conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchall()
+            
+            self.logger.info(f"Retention on {table}: removed {stats['deleted']} rows older than {cutoff} "
+                             f"({stats['archived']} archived, {stats['chunks']} chunks)")
+            return stats
+
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"Error applying retention to {table}: {e}")
+            return stats
+        finally:
+            conn.close()
+
+    def run(self, tables: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+        """Apply retention to several tables, {table: {"keep_days", "archive"}}"""
+        return {
+            table: self.apply(table, settings.get('keep_days'), settings.get('archive'))
+            for table, settings in tables.items()
+        }
+
+    def enable_incremental_vacuum(self) -> bool:
+        """One-off switch of an existing database to incremental auto-vacuum
+
+        Changing auto_vacuum on a populated database only takes effect after
+        a full VACUUM, which rewrites the file and holds an exclusive lock;
+        run it during a maintenance window.
+        """
+        try:
+            conn = self.connect()
+            try:
+                if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+                    return False
+                conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                conn.execute('VACUUM')
+                self.logger.info(f"Enabled incremental vacuum on {self.db_path}")
+                return True
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error enabling incremental vacuum: {e}")
+            return False
@@ -0,0 +1,173 @@
+import re
+import json
+import bisect
+import logging
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+# Rule sets: ordered rules, first match wins; a rule's ``then`` outputs are
+# merged over the set's ``default``. Conditions in ``when`` must all hold:
+#   keywords    - any substring of the lowercased text
+#   pattern     - case-insensitive regex searched in the text
+#   sources     - exact source names
+#   categories  - category names, case-insensitive
+#   severities  - the record's own severity (vendor incidents)
+DEFAULT_RULE_SETS = {
+    'articles': {
+        'default': {'riskLevel': 'Medium', 'severity': 'Info', 'priority': 3},
+        'rules': [
+            {
+                'when': {'keywords': ['breach', 'violation', 'penalty', 'fine', 'enforcement']},
+                'then': {'riskLevel': 'Critical', 'severity': 'Critical', 'priority': 1}
+            },
+            {
+                'when': {'keywords': ['warning', 'alert', 'investigation', 'compliance']},
+                'then': {'riskLevel': 'High', 'severity': 'Warning', 'priority': 2}
+            }
+        ]
+    },
+    'vendor_incidents': {
+        # riskLevel is left to the incident's own severity
+        'default': {'severity': 'Warning', 'priority': 2},
+        'rules': [
+            {
+                'when': {'severities': ['Critical', 'High']},
+                'then': {'severity': 'Critical', 'priority': 1}
+            }
+        ]
+    }
+}
+
+# Keywords never contain this, so a match can't span two texts of a batch
+_SEPARATOR = '\x00'
+
+# Compiled rule sets shared by every engine with the same rules
+_COMPILED_CACHE: Dict[str, Dict[str, Any]] = {}
+
+def _compile(rule_set: Dict[str, Any]) -> Dict[str, Any]:
+    """Keyword -> rule index table plus the per-rule checks"""
+    rules = []
+    keyword_rules: Dict[str, set] = {}
+
+    for index, rule in enumerate(rule_set.get('rules', [])):
+        when = rule.get('when', {})
+        for keyword in when.get('keywords', []):
+            keyword_rules.setdefault(keyword.lower(), set()).add(index)
+        rules.append({
+            'index': index,
+            'keywords': bool(when.get('keywords')),
+            'pattern': re.compile(when['pattern'], re.IGNORECASE) if when.get('pattern') else None,
+            'sources': frozenset(when['sources']) if when.get('sources') else None,
+            'categories': frozenset(c.lower() for c in when['categories']) if when.get('categories') else None,
+            'severities': frozenset(when['severities']) if when.get('severities') else None,
+            'then': dict(rule.get('then', {}))
+        })
+
+    return {
+        'rules': rules,
+        'keyword_rules': [(keyword, frozenset(ids)) for keyword, ids in sorted(keyword_rules.items())],
+        'default': dict(rule_set.get('default', {}))
+    }
+
+class RiskRuleEngine:
+    """Evaluates riskLevel, severity and priority for alerts from configured rules
+
+    Each distinct keyword is searched once across the whole batch (joined
+    into one string) rather than once per article and rule; the remaining
+    per-rule conditions are only checked for rules whose keywords hit.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, rule_set: str = 'articles'):
+        self.logger = logging.getLogger(__name__)
+        rules = (config or {}).get(rule_set) or DEFAULT_RULE_SETS.get(rule_set, {})
+
+        key = json.dumps(rules, sort_keys=True)
+        compiled = _COMPILED_CACHE.get(key)
+        if compiled is None:
+            compiled = _compile(rules)
+            _COMPILED_CACHE[key] = compiled
+            self.logger.info(f"Compiled {len(compiled['rules'])} '{rule_set}' risk rules")
+
+        self.rule_set = rule_set
+        self.rules = compiled['rules']
+        self.keyword_rules = compiled['keyword_rules']
+        self.default = compiled['default']
+
+    def _keyword_hits(self, texts: List[str]) -> List[set]:
+        """Rule indices whose keywords occur in each text"""
+        hits = [set() for _ in texts]
+        if not self.keyword_rules or not texts:
+            return hits
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        starts.append(offset)
+
+        joined = _SEPARATOR.join(texts)
+        for keyword, rule_ids in self.keyword_rules:
+            position = joined.find(keyword)
+            while position != -1:
+                row = bisect.bisect_right(starts, position) - 1
+                hits[row] |= rule_ids
+                # One hit per text is enough; resume at the next one
+                position = joined.find(keyword, starts[row + 1])
+        return hits
+
+    def _first_match(self, hits: set, text: str, source: Optional[str], category: Optional[str],
+                     severity: Optional[str]) -> Dict[str, Any]:
+        result = dict(self.default)
+        for rule in self.rules:
+            if rule['keywords'] and rule['index'] not in hits:
+                continue
+            if rule['sources'] is not None and source not in rule['sources']:
+                continue
+            if rule['categories'] is not None and (category or '').lower() not in rule['categories']:
+                continue
+            if rule['severities'] is not None and severity not in rule['severities']:
+                continue
+            if rule['pattern'] is not None and not rule['pattern'].search(text):
+                continue
+            result.update(rule['then'])
+            break
+        return result
+
+    def evaluate(self, text: str, source: Optional[str] = None, category: Optional[str] = None,
+                 severity: Optional[str] = None) -> Dict[str, Any]:
+        """riskLevel/severity/priority for one alert"""
+        return self.evaluate_batch([(text, source, category, severity)])[0]
+
+    def evaluate_batch(self, items: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]]) -> List[Dict[str, Any]]:
+        """Evaluate (text, source, category, severity) tuples in one pass over the batch"""
+        items = list(items)
+        texts = [(text or '').lower() for text, _, _, _ in items]
+        hits = self._keyword_hits(texts)
+        return [
+            self._first_match(row_hits, text, source, category, severity)
+            for row_hits, text, (_, source, category, severity) in zip(hits, texts, items)
+        ]
+
+    def evaluate_articles(self, articles) -> List[Dict[str, Any]]:
+        """Evaluate NewsArticle objects on their title and content"""
+        return self.evaluate_batch(
+            (f"{article.title or ''}\n{article.content or ''}", article.source, article.category, None)
+            for article in articles
+        )
+
+def load_risk_rules(config_path: str) -> Dict[str, Any]:
+    """risk_rules section of a YAML config file, empty if it can't be read"""
+    logger = logging.getLogger(__name__)
+    try:
+        import yaml
+    except ImportError:
+        logger.warning("PyYAML not installed, using default risk rules")
+        return {}
+
+    try:
+        with open(config_path) as f:
+            config = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning(f"Using default risk rules, could not read {config_path}: {e}")
+        return {}
+    return config.get('scraper', config).get('risk_rules') or {}
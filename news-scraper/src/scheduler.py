@@ -6,6 +6,7 @@ import os
 from datetime import datetime
 from typing import Dict, Any
 from scraper import NewsScraper
+from config_reload import ConfigWatcher, config_diff
 import json
 
 class NewsScheduler:
@@ -15,6 +16,12 @@ class NewsScheduler:
         self.scraper = None
         self.logger = self.setup_logging()
         
+        # Config file edits (or SIGHUP) are applied without a restart
+        reload_config = self.config.get('reload', {})
+        self.config_watcher = None
+        if reload_config.get('enabled', True):
+            self.config_watcher = ConfigWatcher(config_path, self.load_config, reload_config.get('check_seconds', 10))
+        
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         try:
@@ -59,6 +66,7 @@ class NewsScheduler:
         """Initialize the news scraper"""
         try:
             self.scraper = NewsScraper(self.config)
+            self.scraper.config_watcher = self.config_watcher
             self.logger.info("News scraper initialized successfully")
         except Exception as e:
             self.logger.error(f"Error initializing scraper: {e}")
@@ -79,6 +87,10 @@ class NewsScheduler:
             # Save results to file for monitoring
             self.save_scraping_results(results)
             
+            # Dashboards see the new articles without waiting for the interval
+            if self.config.get('snapshot', {}).get('enabled', False):
+                self.publish_snapshot()
+            
             return results
             
         except Exception as e:
@@ -111,15 +123,159 @@ class NewsScheduler:
             if not self.scraper:
                 self.initialize_scraper()
             
-            deleted_count = self.scraper.cleanup_old_data(days=30)
+            results = self.scraper.apply_retention()
             
-            self.logger.info(f"Cleaned up {deleted_count} old articles")
+            self.logger.info(f"Cleanup completed: {results}")
             
-            return deleted_count
+            return results
             
         except Exception as e:
             self.logger.error(f"Error cleaning up old data: {e}")
-            return 0
+            return {}
+    
+    def compress_articles(self):
+        """Apply the configured compression to stored articles"""
+        try:
+            self.logger.info("Recompressing stored articles")
+            
+            if not self.scraper:
+                self.initialize_scraper()
+            
+            results = self.scraper.compress_articles()
+            
+            self.logger.info(f"Recompression completed: {results}")
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error recompressing articles: {e}")
+            return None
+    
+    def compact_databases(self):
+        """Enable incremental vacuum on existing databases"""
+        try:
+            self.logger.info("Compacting databases")
+            
+            if not self.scraper:
+                self.initialize_scraper()
+            
+            results = self.scraper.compact_databases()
+            
+            self.logger.info(f"Compaction completed: {results}")
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error compacting databases: {e}")
+            return None
+    
+    def publish_snapshot(self, force: bool = False):
+        """Publish the read-only snapshot of the database for dashboards"""
+        try:
+            self.logger.info("Publishing database snapshot")
+            
+            if not self.scraper:
+                self.initialize_scraper()
+            
+            results = self.scraper.publish_snapshot(force)
+            
+            self.logger.info(f"Snapshot publishing completed: {results}")
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error publishing snapshot: {e}")
+            return None
+    
+    def export_articles(self, category: str = None):
+        """Send stored articles to the frontend API"""
+        try:
+            self.logger.info("Exporting stored articles")
+            
+            if not self.scraper:
+                self.initialize_scraper()
+            
+            results = self.scraper.export_articles(category=category)
+            
+            self.logger.info(f"Export completed: {results}")
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error exporting articles: {e}")
+            return None
+    
+    def rebuild_stats(self):
+        """Recount the materialized statistics"""
+        try:
+            self.logger.info("Rebuilding scraping statistics")
+            
+            if not self.scraper:
+                self.initialize_scraper()
+            
+            results = self.scraper.rebuild_stats()
+            
+            self.logger.info(f"Statistics rebuilt: {results}")
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error rebuilding statistics: {e}")
+            return None
+    
+    def migrate_article_urls(self):
+        """Fill in canonical URLs of stored articles"""
+        try:
+            self.logger.info("Canonicalizing stored article URLs")
+            
+            if not self.scraper:
+                self.initialize_scraper()
+            
+            results = self.scraper.migrate_article_urls()
+            
+            self.logger.info(f"URL migration completed: {results}")
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error migrating article URLs: {e}")
+            return None
+    
+    def reindex_entities(self):
+        """Re-run entity extraction over stored articles"""
+        try:
+            self.logger.info("Re-indexing article entities")
+            
+            if not self.scraper:
+                self.initialize_scraper()
+            
+            processed = self.scraper.reindex_entities()
+            
+            self.logger.info(f"Entity re-indexing completed for {processed} articles")
+            
+            return processed
+            
+        except Exception as e:
+            self.logger.error(f"Error re-indexing entities: {e}")
+            return None
+    
+    def reprocess_raw(self, source_name: str = None, since: datetime = None, workers: int = None):
+        """Re-run the scraping pipeline over archived responses"""
+        try:
+            self.logger.info("Reprocessing archived responses")
+            
+            if not self.scraper:
+                self.initialize_scraper()
+            
+            results = self.scraper.reprocess_raw(source_name=source_name, since=since, workers=workers)
+            
+            self.logger.info(f"Reprocessing completed: {results}")
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error reprocessing archived responses: {e}")
+            return None
     
     def save_scraping_results(self, results: Dict[str, Any]):
         """Save scraping results to a file"""
@@ -153,6 +309,28 @@ class NewsScheduler:
         except Exception as e:
             self.logger.error(f"Error saving scraping results: {e}")
     
+    def check_config_reload(self):
+        """Pick up a changed config file and reschedule if its schedule changed
+        
+        The scraper may already have switched to the new config between
+        sources of a running scrape; the scheduler follows it here.
+        """
+        if self.scraper:
+            self.scraper.check_config_reload()
+            config = self.scraper.config
+        else:
+            config = self.config_watcher.poll() if self.config_watcher else None
+        
+        if config is None or config is self.config:
+            return
+        
+        diff = config_diff(self.config, config)
+        self.config = config
+        if {'schedule', 'snapshot'} & set(diff['sections']):
+            schedule.clear()
+            self.setup_schedules()
+            self.logger.info("Rescheduled jobs after config change")
+    
     def setup_schedules(self):
         """Setup scheduled tasks"""
         schedule_config = self.config.get('schedule', {})
@@ -175,6 +353,13 @@ class NewsScheduler:
         
         else:
             self.logger.info("Scheduling is disabled")
+        
+        # Snapshots are republished on their own interval (skipped when unchanged)
+        snapshot_config = self.config.get('snapshot', {})
+        if snapshot_config.get('enabled', False):
+            interval = snapshot_config.get('interval_minutes', 15)
+            schedule.every(interval).minutes.do(self.publish_snapshot)
+            self.logger.info(f"Scheduled snapshot publishing every {interval} minutes")
     
     def run_scheduler(self):
         """Run the scheduler"""
@@ -186,15 +371,20 @@ class NewsScheduler:
         # Initialize scraper
         self.initialize_scraper()
         
+        if self.config_watcher:
+            self.config_watcher.install_sighup()
+        
         # Run initial scraping
         self.logger.info("Running initial scraping")
         self.scrape_all_sources()
         
         # Run scheduler loop
+        poll_seconds = min(60, self.config_watcher.check_seconds) if self.config_watcher else 60
         try:
             while True:
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                self.check_config_reload()
+                time.sleep(poll_seconds)
                 
         except KeyboardInterrupt:
             self.logger.info("Scheduler stopped by user")
@@ -236,7 +426,11 @@ class NewsScheduler:
             
             return {
                 'status': 'running',
+                'worker_id': self.scraper.worker_id,
                 'stats': stats,
+                'source_health': self.scraper.get_source_health(),
+                'source_leases': self.scraper.get_source_leases(),
+                'snapshot': self.scraper.get_snapshot_status() if self.config.get('snapshot', {}).get('enabled') else None,
                 'scheduled_jobs': jobs,
                 'config': {
                     'schedule_enabled': self.config.get('schedule', {}).get('enabled', False),
@@ -260,6 +454,17 @@ def main():
     parser.add_argument('--status', action='store_true', help='Get scheduler status')
     parser.add_argument('--category', help='Scrape specific category')
     parser.add_argument('--cleanup', action='store_true', help='Run cleanup')
+    parser.add_argument('--compress', action='store_true', help='Train a dictionary and recompress stored articles')
+    parser.add_argument('--compact', action='store_true', help='One-off VACUUM enabling incremental vacuum for cleanup')
+    parser.add_argument('--publish-snapshot', action='store_true', help='Publish the read-only dashboard snapshot now')
+    parser.add_argument('--export', action='store_true', help='Send stored articles to the frontend API (with --category to limit)')
+    parser.add_argument('--rebuild-stats', action='store_true', help='Recount the materialized statistics to repair drift')
+    parser.add_argument('--migrate-urls', action='store_true', help='Fill in canonical URLs of stored articles')
+    parser.add_argument('--reindex-entities', action='store_true', help='Re-run entity extraction over stored articles')
+    parser.add_argument('--reprocess', action='store_true', help='Re-parse archived responses without fetching')
+    parser.add_argument('--source', help='Limit reprocessing to one source')
+    parser.add_argument('--since', help='Limit reprocessing to responses fetched since this ISO date')
+    parser.add_argument('--workers', type=int, help='Reprocessing worker processes (defaults to CPU count)')
     
     args = parser.parse_args()
     
@@ -274,13 +479,46 @@ def main():
             status = scheduler.get_status()
             print(f"Scheduler status: {json.dumps(status, indent=2)}")
         
+        elif args.publish_snapshot:
+            results = scheduler.publish_snapshot(force=True)
+            print(f"Snapshot published: {results}")
+        
+        elif args.export:
+            results = scheduler.export_articles(args.category)
+            print(f"Export completed: {results}")
+        
         elif args.category:
             articles = scheduler.scrape_specific_category(args.category)
             print(f"Found {len(articles)} articles in category '{args.category}'")
         
         elif args.cleanup:
-            deleted_count = scheduler.cleanup_old_data()
-            print(f"Cleaned up {deleted_count} old articles")
+            results = scheduler.cleanup_old_data()
+            print(f"Cleanup completed: {results}")
+        
+        elif args.compress:
+            results = scheduler.compress_articles()
+            print(f"Recompression completed: {results}")
+        
+        elif args.compact:
+            results = scheduler.compact_databases()
+            print(f"Compaction completed: {results}")
+        
+        elif args.rebuild_stats:
+            results = scheduler.rebuild_stats()
+            print(f"Statistics rebuilt: {results}")
+        
+        elif args.migrate_urls:
+            results = scheduler.migrate_article_urls()
+            print(f"URL migration completed: {results}")
+        
+        elif args.reindex_entities:
+            processed = scheduler.reindex_entities()
+            print(f"Re-indexed entities for {processed} articles")
+        
+        elif args.reprocess:
+            since = datetime.fromisoformat(args.since) if args.since else None
+            results = scheduler.reprocess_raw(args.source, since, args.workers)
+            print(f"Reprocessing completed: {results}")
         
         else:
             scheduler.run_scheduler()
@@ -0,0 +1,210 @@
+import re
+import logging
+import numpy as np
+from typing import List, Dict, Any, Tuple
+
+# Finance/compliance-flavoured sentiment lexicon, weights in [-3, 3]
+DEFAULT_LEXICON = {
+    # Negative
+    'breach': -2.5, 'breached': -2.5, 'breaches': -2.5, 'hack': -2.0, 'hacked': -2.5, 'hackers': -2.0,
+    'attack': -2.0, 'attacks': -2.0, 'ransomware': -3.0, 'malware': -2.5, 'phishing': -2.0,
+    'exploit': -2.0, 'exploited': -2.5, 'vulnerability': -1.5, 'vulnerabilities': -1.5,
+    'leak': -2.0, 'leaked': -2.0, 'exposed': -1.5, 'stolen': -2.5, 'theft': -2.5,
+    'fraud': -3.0, 'fraudulent': -3.0, 'scam': -2.5, 'laundering': -3.0, 'bribery': -3.0,
+    'fine': -1.5, 'fined': -2.0, 'fines': -1.5, 'penalty': -2.0, 'penalties': -2.0,
+    'sanction': -2.0, 'sanctions': -2.0, 'sanctioned': -2.0, 'violation': -2.0, 'violations': -2.0,
+    'violated': -2.0, 'lawsuit': -1.5, 'sued': -1.5, 'charged': -2.0, 'charges': -1.5,
+    'investigation': -1.0, 'probe': -1.0, 'enforcement': -1.0, 'misconduct': -2.5,
+    'failure': -2.0, 'failed': -2.0, 'fails': -2.0, 'outage': -2.5, 'outages': -2.5,
+    'disruption': -2.0, 'degraded': -1.5, 'downtime': -2.0, 'incident': -1.0, 'error': -1.0,
+    'errors': -1.0, 'delay': -1.0, 'delayed': -1.0, 'risk': -0.5, 'risks': -0.5,
+    'warning': -1.0, 'warns': -1.0, 'concern': -1.0, 'concerns': -1.0, 'decline': -1.5,
+    'loss': -2.0, 'losses': -2.0, 'bankruptcy': -3.0, 'collapse': -3.0, 'crisis': -2.5,
+    'critical': -1.0, 'severe': -2.0, 'deficiencies': -2.0, 'weakness': -1.5, 'noncompliance': -2.5,
+    # Positive
+    'resolved': 2.0, 'restored': 2.0, 'recovered': 2.0, 'fixed': 1.5, 'patched': 1.5, 'mitigated': 1.5,
+    'secure': 1.5, 'secured': 1.5, 'protect': 1.0, 'protected': 1.5, 'protection': 1.0,
+    'compliant': 2.0, 'approved': 2.0, 'approves': 2.0, 'approval': 1.5, 'authorized': 1.5,
+    'cleared': 1.5, 'settled': 1.0, 'settlement': 0.5, 'improve': 1.5, 'improved': 1.5,
+    'improvement': 1.5, 'strengthen': 1.5, 'strengthened': 1.5, 'stronger': 1.5, 'growth': 1.5,
+    'gain': 1.5, 'gains': 1.5, 'success': 2.0, 'successful': 2.0, 'launch': 1.0, 'launches': 1.0,
+    'partnership': 1.0, 'innovation': 1.5, 'upgrade': 1.0, 'award': 2.0, 'stable': 1.0,
+    'guidance': 0.5, 'clarity': 1.5, 'relief': 1.5, 'welcome': 1.5, 'welcomes': 1.5
+}
+
+NEGATIONS = {'not', 'no', 'never', 'without', 'nor', 'cannot', 'isn', 'wasn', 'didn', 'doesn', 'hasn', 'haven'}
+
+# Negation flips polarity for this many following tokens
+NEGATION_SCOPE = 3
+
+# VADER-style normalization constant mapping raw sums into (-1, 1)
+SENTIMENT_ALPHA = 15.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Compiled scoring tables shared by every scorer with the same settings
+_COMPILED_CACHE: Dict[Tuple, Dict[str, Any]] = {}
+
+def _compile(lexicon: Dict[str, float], keywords: Dict[str, List[str]],
+             category_weights: Dict[str, float]) -> Dict[str, Any]:
+    """Build the term vocabulary and the dense lexicon/category matrices"""
+    terms = sorted(set(lexicon) | {kw.lower() for words in keywords.values() for kw in words})
+    vocab = {term: i for i, term in enumerate(terms)}
+    categories = sorted(keywords)
+
+    sentiment_weights = np.zeros(len(terms), dtype=np.float64)
+    for term, weight in lexicon.items():
+        sentiment_weights[vocab[term]] = weight
+
+    category_matrix = np.zeros((len(terms), len(categories)), dtype=np.float64)
+    for c, category in enumerate(categories):
+        for keyword in keywords[category]:
+            category_matrix[vocab[keyword.lower()], c] = 1.0
+
+    # Multi-word terms are matched as phrases keyed by their first token
+    phrases: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+    for term, index in vocab.items():
+        words = tuple(term.split())
+        if len(words) > 1:
+            phrases.setdefault(words[0], []).append((words[1:], index))
+    for candidates in phrases.values():
+        candidates.sort(key=lambda item: -len(item[0]))
+
+    return {
+        'vocab': vocab,
+        'phrases': phrases,
+        'interesting': frozenset(vocab) | frozenset(phrases) | NEGATIONS,
+        'categories': categories,
+        'sentiment_weights': sentiment_weights,
+        'category_matrix': category_matrix,
+        'category_weights': np.array([category_weights.get(c, 1.0) for c in categories], dtype=np.float64)
+    }
+
+class ArticleScorer:
+    """Scores batches of articles for sentiment and relevance with NumPy
+
+    Each batch is reduced to (article, term, weight) triples in one pass over
+    the text; sentiment and per-category relevance then come out of a couple
+    of array operations against matrices compiled once per configuration.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.logger = logging.getLogger(__name__)
+        scoring_config = config.get('scoring', {})
+        processing = config.get('processing', {})
+
+        self.enable_sentiment = processing.get('enable_sentiment_analysis', True)
+        self.enable_relevance = processing.get('enable_relevance_scoring', True)
+        self.title_weight = float(scoring_config.get('title_weight', 2.0))
+        self.relevance_saturation = float(scoring_config.get('relevance_saturation', 2.0))
+
+        lexicon = dict(DEFAULT_LEXICON)
+        lexicon.update({term.lower(): float(weight) for term, weight in (scoring_config.get('lexicon') or {}).items()})
+        keywords = config.get('filtering', {}).get('keywords', {})
+        category_weights = scoring_config.get('category_weights') or {}
+
+        key = (
+            tuple(sorted(lexicon.items())),
+            tuple((category, tuple(words)) for category, words in sorted(keywords.items())),
+            tuple(sorted(category_weights.items()))
+        )
+        compiled = _COMPILED_CACHE.get(key)
+        if compiled is None:
+            compiled = _compile(lexicon, keywords, category_weights)
+            _COMPILED_CACHE[key] = compiled
+            self.logger.info(f"Compiled scoring tables for {len(compiled['vocab'])} terms")
+
+        self.vocab = compiled['vocab']
+        self.phrases = compiled['phrases']
+        self.interesting = compiled['interesting']
+        self.categories = compiled['categories']
+        self.sentiment_weights = compiled['sentiment_weights']
+        self.category_matrix = compiled['category_matrix']
+        self.category_weights = compiled['category_weights']
+
+    @property
+    def enabled(self) -> bool:
+        return self.enable_sentiment or self.enable_relevance
+
+    def _collect(self, row: int, text: str, weight: float, rows: List[int], cols: List[int],
+                 weights: List[float], polarity: List[float]):
+        """Append term hits for one text field"""
+        tokens = _TOKEN_RE.findall(text.lower())
+        vocab_get = self.vocab.get
+        phrases = self.phrases
+        interesting = self.interesting
+        negated_until = -1
+
+        # Most tokens match nothing; only visit the ones that can
+        for i, token in [(i, token) for i, token in enumerate(tokens) if token in interesting]:
+            if token in NEGATIONS:
+                negated_until = i + NEGATION_SCOPE
+                continue
+
+            sign = -1.0 if i <= negated_until else 1.0
+            candidates = phrases.get(token)
+            if candidates:
+                for rest, phrase_index in candidates:
+                    if tuple(tokens[i + 1:i + 1 + len(rest)]) == rest:
+                        rows.append(row)
+                        cols.append(phrase_index)
+                        weights.append(weight)
+                        polarity.append(sign)
+                        break
+
+            index = vocab_get(token)
+            if index is not None:
+                rows.append(row)
+                cols.append(index)
+                weights.append(weight)
+                polarity.append(sign)
+
+    def term_counts(self, articles) -> Tuple[np.ndarray, np.ndarray]:
+        """Weighted (articles x terms) hit matrices, plain and polarity-signed"""
+        rows: List[int] = []
+        cols: List[int] = []
+        weights: List[float] = []
+        polarity: List[float] = []
+
+        for row, article in enumerate(articles):
+            self._collect(row, article.title or '', self.title_weight, rows, cols, weights, polarity)
+            self._collect(row, article.content or '', 1.0, rows, cols, weights, polarity)
+
+        size = len(articles) * len(self.vocab)
+        flat = np.asarray(rows, dtype=np.int64) * len(self.vocab) + np.asarray(cols, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+
+        counts = np.bincount(flat, weights=weights, minlength=size).reshape(len(articles), len(self.vocab))
+        signed = np.bincount(
+            flat, weights=weights * np.asarray(polarity, dtype=np.float64), minlength=size
+        ).reshape(len(articles), len(self.vocab))
+        return counts, signed
+
+    def score(self, articles) -> Tuple[np.ndarray, np.ndarray]:
+        """Sentiment in (-1, 1) and relevance in [0, 1) for each article"""
+        if not articles:
+            return np.zeros(0), np.zeros(0)
+
+        counts, signed = self.term_counts(articles)
+
+        raw = signed @ self.sentiment_weights
+        sentiment = raw / np.sqrt(raw * raw + SENTIMENT_ALPHA)
+
+        # Repeated mentions of a keyword count with diminishing returns
+        category_hits = np.log1p(counts) @ self.category_matrix
+        weighted = category_hits @ self.category_weights
+        relevance = 1.0 - np.exp(-weighted / self.relevance_saturation)
+
+        return sentiment, relevance
+
+    def score_articles(self, articles) -> None:
+        """Fill in sentiment_score and relevance_score for a batch in place"""
+        if not articles or not self.enabled:
+            return
+
+        sentiment, relevance = self.score(articles)
+        for article, sentiment_score, relevance_score in zip(articles, sentiment.tolist(), relevance.tolist()):
+            if self.enable_sentiment:
+                article.sentiment_score = round(sentiment_score, 4)
+            if self.enable_relevance:
+                article.relevance_score = round(relevance_score, 4)
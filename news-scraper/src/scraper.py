@@ -1,47 +1,232 @@
 import requests
-import feedparser
 import time
+import calendar
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import re
-from newspaper import Article
-import json
+from functools import cached_property
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from urllib.parse import urljoin
+import os
+import multiprocessing
 from database import NewsDatabase, NewsArticle
+from dedup import minhash
+from url_canonicalizer import URLCanonicalizer, RedirectResolver
+from raw_store import RawResponseStore, ARTICLE_FETCH
+from entity_extraction import EntityExtractor
+from risk_rules import RiskRuleEngine
+from retention import RetentionManager
+from snapshot import SnapshotPublisher
+from source_leases import LeaseHeartbeat, LeaseLostError, lease_settings
+from source_health import CircuitBreaker, HALF_OPEN
+from feed_stream import FeedMark, stream_entries, entry_key, entry_published
+from keyword_filter import KeywordFilter
+from config_reload import config_diff, has_changes
+from api_client import NewsAPIClient
+from pipeline import Pipeline, Stage, SourceJob
+from http_client import HttpClient
+
+# Scraper used by each reprocessing worker process
+_worker_scraper = None
+
+def _init_reprocess_worker(config: Dict[str, Any]):
+    global _worker_scraper
+    _worker_scraper = NewsScraper(config, offline=True)
+
+def _reprocess_fetch(job):
+    fetch, source = job
+    return _worker_scraper.reprocess_fetch(fetch, source)
 
 class NewsScraper:
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], offline: bool = False):
         self.config = config
-        self.db = NewsDatabase(config['database']['path'])
+        self.offline = offline
+        self.db = NewsDatabase(config['database']['path'], config['database'].get('compression'))
         self.logger = logging.getLogger(__name__)
         
-        # Configure requests session
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': config['scraping']['user_agent']
-        })
+        # One pooled, keep-alive HTTP client for feeds, article pages,
+        # redirect resolution and the frontend API
+        self.http = self.create_http_client(config)
+        
+        # Article identity: canonical URLs, with redirector links resolved once
+        canonical_config = config.get('canonicalization', {})
+        self.canonicalizer = URLCanonicalizer(canonical_config)
+        self.resolve_redirects = canonical_config.get('resolve_redirects', True)
+        self.redirect_resolver = RedirectResolver(self.db, self.http, config['scraping']['request_timeout'])
+        
+        # Optional archive of fetched bodies for offline re-parsing
+        self.raw_store = self.create_raw_store(config)
+        
+        # Gazetteer compiled once; also used to resolve vendor lookups
+        self.entity_extractor = EntityExtractor(config.get('entity_extraction', {}))
+        
+        # Alert riskLevel/severity/priority rules, shared with the API payload
+        self.risk_rules = RiskRuleEngine(config.get('risk_rules'), 'articles')
+        
+        # Relevance keywords and web selectors, compiled once
+        self.keyword_filter = KeywordFilter(config.get('filtering'))
+        self.selectors: Dict[str, Any] = {}
+        
+        # Sources are claimed one at a time under a lease when several
+        # workers share the database
+        self.leases = lease_settings(config)
+        self.worker_id = self.leases['worker_id']
+        
+        # Broken sources are skipped until a probe succeeds
+        self.breaker = CircuitBreaker(config.get('health'))
+        
+        # Set by the scheduler to pick up config file changes between sources
+        self.config_watcher = None
         
         # Initialize sources
-        self.initialize_sources()
+        if not offline:
+            self.initialize_sources()
     
     def initialize_sources(self):
-        """Initialize news sources from configuration"""
-        sources = []
+        """Bring the sources table in line with the configuration"""
+        changes = self.db.sync_sources(list(self.get_source_configs().values()))
+        self.logger.info(
+            f"Initialized news sources: {changes['added']} added, {changes['updated']} updated, "
+            f"{changes['deactivated']} deactivated, {changes['unchanged']} unchanged"
+        )
+    
+    def create_http_client(self, config: Dict[str, Any]) -> HttpClient:
+        return HttpClient(config.get('http'), {'User-Agent': config['scraping']['user_agent']})
+    
+    def create_raw_store(self, config: Dict[str, Any]) -> Optional[RawResponseStore]:
+        raw_config = config.get('raw_store', {})
+        if not raw_config.get('enabled', False):
+            return None
+        return RawResponseStore(
+            raw_config['path'],
+            max_bytes=int(raw_config.get('max_size_mb', 500) * 1024 * 1024)
+        )
+    
+    def check_config_reload(self) -> bool:
+        """Switch to a changed config file, if the watcher saw one"""
+        config = self.config_watcher.poll() if self.config_watcher else None
+        if config is None:
+            return False
+        try:
+            self.apply_config(config)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error applying changed config, keeping the old one: {e}")
+            return False
+    
+    def apply_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Switch to a new, validated config, rebuilding only what changed
         
-        for category, source_list in self.config['sources'].items():
-            for source_config in source_list:
-                self.db.add_source(
-                    name=source_config['name'],
-                    url=source_config['url'],
-                    source_type=source_config['type'],
-                    category=category,
-                    tags=source_config['tags']
-                )
-                sources.append(source_config)
+        Everything the change affects is built before anything is swapped
+        in, so a failure leaves the scraper on the old config. Caches of
+        unaffected parts (redirects, compiled rules, models) are kept.
+        Sections in RESTART_SECTIONS keep their running values.
+        """
+        diff = config_diff(self.config, config)
+        if not has_changes(diff):
+            return diff
         
-        self.logger.info(f"Initialized {len(sources)} news sources")
+        if diff['restart_required']:
+            self.logger.warning(f"Changes to {', '.join(diff['restart_required'])} take effect after a restart")
+            config = dict(config, **{section: self.config.get(section) for section in diff['restart_required']})
+        sections = set(diff['sections'])
+        
+        rebuilt = {}
+        if 'canonicalization' in sections:
+            rebuilt['canonicalizer'] = URLCanonicalizer(config.get('canonicalization', {}))
+            rebuilt['resolve_redirects'] = config.get('canonicalization', {}).get('resolve_redirects', True)
+        if 'raw_store' in sections:
+            rebuilt['raw_store'] = self.create_raw_store(config)
+        if 'entity_extraction' in sections:
+            rebuilt['entity_extractor'] = EntityExtractor(config.get('entity_extraction', {}))
+        if 'risk_rules' in sections:
+            rebuilt['risk_rules'] = RiskRuleEngine(config.get('risk_rules'), 'articles')
+        if 'filtering' in sections:
+            rebuilt['keyword_filter'] = KeywordFilter(config.get('filtering'))
+        if 'health' in sections:
+            rebuilt['breaker'] = CircuitBreaker(config.get('health'))
+        if 'http' in sections:
+            rebuilt['http'] = self.create_http_client(config)
+        if 'leases' in sections:
+            # A worker keeps its identity; leases it holds stay valid
+            rebuilt['leases'] = dict(lease_settings(config), worker_id=self.worker_id)
+        
+        self.config = config
+        for name, component in rebuilt.items():
+            setattr(self, name, component)
+        if 'http' in rebuilt:
+            self.redirect_resolver.session = self.http
+        # Lazily built again on next use
+        if sections & {'scoring', 'processing', 'filtering'}:
+            self.__dict__.pop('scorer', None)
+        if 'processing' in sections:
+            self.__dict__.pop('topic_classifier', None)
+        if 'scraping' in sections:
+            self.http.headers['User-Agent'] = config['scraping']['user_agent']
+            self.redirect_resolver.timeout = config['scraping']['request_timeout']
+        if diff['sources_added'] or diff['sources_removed'] or diff['sources_changed']:
+            self.initialize_sources()
+            in_use = {source.get('selector') for source in self.get_source_configs().values()}
+            self.selectors = {pattern: compiled for pattern, compiled in self.selectors.items() if pattern in in_use}
+        
+        self.logger.info(
+            f"Applied config changes: sections {diff['sections'] or 'none'}, "
+            f"sources added {diff['sources_added']}, removed {diff['sources_removed']}, "
+            f"changed {diff['sources_changed']}"
+        )
+        return diff
+    
+    # Scoring and topic models pull in numpy; they're built on first use so
+    # --status and other commands that never score start faster
+    @cached_property
+    def scorer(self):
+        """Batch sentiment/relevance scorer"""
+        from scoring import ArticleScorer
+        return ArticleScorer(self.config)
+    
+    @cached_property
+    def topic_classifier(self):
+        return self.load_topic_classifier()
+    
+    def load_topic_classifier(self):
+        """Memory-map the trained topic model if classification is enabled"""
+        processing = self.config['processing']
+        model_path = processing.get('topic_model_path')
+        if not processing.get('enable_topic_classification') or not model_path:
+            return None
+        
+        try:
+            from topic_classifier import TopicClassifier
+            classifier = TopicClassifier(model_path)
+            self.logger.info(f"Loaded topic model with classes {classifier.classes}")
+            return classifier
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Topic classification disabled, could not load {model_path}: {e}")
+            return None
+    
+    def get_source_configs(self) -> Dict[str, Dict[str, Any]]:
+        """Configured sources keyed by name, including their category"""
+        return {
+            source_config['name']: dict(source_config, category=category)
+            for category, source_list in self.config['sources'].items()
+            for source_config in source_list
+        }
+    
+    def canonicalize_url(self, url: str, offline: bool = False) -> str:
+        """Canonical identity URL for an article link"""
+        if self.resolve_redirects:
+            url = self.redirect_resolver.resolve(url, self.canonicalizer, offline=offline or self.offline)
+        return self.canonicalizer.canonicalize(url)
+    
+    def migrate_article_urls(self) -> Dict[str, int]:
+        """Fill in canonical URLs of stored articles using cached redirects only"""
+        updated, removed = self.db.recanonicalize_urls(lambda url: self.canonicalize_url(url, offline=True))
+        return {'updated': updated, 'removed': removed}
+    
+    def reindex_entities(self) -> int:
+        """Re-run entity extraction over every stored article"""
+        return self.db.backfill_entities(
+            lambda title, content: self.entity_extractor.extract(f"{title or ''}\n{content or ''}")
+        )
     
     def scrape_all_sources(self) -> Dict[str, Any]:
         """Scrape all configured news sources"""
@@ -50,122 +235,440 @@ class NewsScraper:
             'successful_sources': 0,
             'failed_sources': 0,
             'total_articles': 0,
+            'skipped_sources': [],
             'errors': []
         }
         
-        sources = self.db.get_active_sources()
+        # Parsing settings such as web selectors only live in the config
+        source_configs = self.get_source_configs()
+        
+        if self.leases['enabled']:
+            return self.scrape_leased_sources(results, source_configs)
+        
+        sources = []
+        for source in self.db.get_active_sources():
+            if self.breaker.allows(source['health']):
+                sources.append(source)
+            else:
+                results['skipped_sources'].append(source['name'])
+        sources.sort(key=lambda source: self.breaker.score(source['health']), reverse=True)
         results['total_sources'] = len(sources)
         
-        for source in sources:
-            try:
-                start_time = time.time()
-                self.logger.info(f"Scraping source: {source['name']}")
-                
-                if source['type'] == 'rss':
-                    articles = self.scrape_rss_source(source)
-                elif source['type'] == 'web':
-                    articles = self.scrape_web_source(source)
-                else:
-                    raise ValueError(f"Unknown source type: {source['type']}")
-                
-                # Process and save articles
-                saved_articles = 0
-                for article in articles:
-                    if self.save_article(article, source):
-                        saved_articles += 1
-                
-                duration = time.time() - start_time
-                
-                # Log successful scraping
-                self.db.log_scraping_session(
-                    source_name=source['name'],
-                    status='success',
-                    articles_scraped=saved_articles,
-                    scraping_duration=duration
-                )
-                
-                self.db.update_source_last_scraped(source['name'])
-                
-                results['successful_sources'] += 1
-                results['total_articles'] += saved_articles
-                
-                self.logger.info(f"Successfully scraped {saved_articles} articles from {source['name']} in {duration:.2f}s")
-                
-                # Rate limiting
-                time.sleep(self.config['scraping']['delay_between_requests'])
-                
-            except Exception as e:
-                error_msg = f"Error scraping {source['name']}: {str(e)}"
-                self.logger.error(error_msg)
-                results['errors'].append(error_msg)
-                results['failed_sources'] += 1
+        if results['skipped_sources']:
+            self.logger.info(f"Circuit open, skipping: {', '.join(results['skipped_sources'])}")
+        
+        def jobs():
+            configs = source_configs
+            for source in sources:
+                # Sources dropped from a reloaded config are skipped, changed
+                # ones use their new settings
+                if self.check_config_reload():
+                    configs = self.get_source_configs()
+                if source['name'] in configs:
+                    yield SourceJob(dict(configs[source['name']], **source))
+        
+        return self.scrape_sources(jobs(), results)
+    
+    def scrape_leased_sources(self, results: Dict[str, Any], source_configs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Claim and scrape due sources until none are left for this worker
+        
+        Sources attempted by any worker within min_interval_minutes of this
+        run starting are not due, so workers started together split the
+        sources between them and a late starter doesn't redo them. Sources
+        are claimed only as fast as the pipeline takes them. Sources with
+        an open circuit are never claimed; they're reported in
+        skipped_sources as in an unleased run.
+        """
+        ttl = self.leases['ttl_seconds']
+        due_before = time.time() - self.leases['min_interval_minutes'] * 60
+        self.db.reclaim_expired_leases()
+        
+        results['skipped_sources'] = [
+            source['name'] for source in self.db.get_active_sources() if not self.breaker.allows(source['health'])
+        ]
+        if results['skipped_sources']:
+            self.logger.info(f"Circuit open, skipping: {', '.join(results['skipped_sources'])}")
+        
+        def jobs():
+            configs = source_configs
+            while True:
+                if self.check_config_reload():
+                    configs = self.get_source_configs()
+                source = self.db.claim_next_source(self.worker_id, ttl, due_before)
+                if source is None:
+                    return
                 
-                # Log failed scraping
-                self.db.log_scraping_session(
-                    source_name=source['name'],
-                    status='failed',
-                    error_message=str(e)
-                )
+                results['total_sources'] += 1
+                lease = LeaseHeartbeat(self.db, source['name'], self.worker_id, ttl,
+                                       self.leases['heartbeat_seconds']).start()
+                yield SourceJob(dict(configs.get(source['name'], {}), **source), lease)
         
+        self.scrape_sources(jobs(), results)
+        self.logger.info(f"Worker {self.worker_id} scraped {results['total_sources']} sources")
         return results
     
-    def scrape_rss_source(self, source: Dict[str, Any]) -> List[NewsArticle]:
-        """Scrape articles from an RSS feed"""
-        articles = []
+    # Pipeline stages in order, each run by the <name>_stage method
+    PIPELINE_STAGES = ('fetch', 'parse', 'canonicalize', 'dedup', 'filter', 'enrich', 'score', 'persist')
+    
+    def build_pipeline(self, results: Dict[str, Any]) -> Pipeline:
+        """fetch → parse → canonicalize → dedup → filter → enrich → score → persist
+        
+        Worker threads per stage come from pipeline.workers. Persisting has
+        one writer, so dedup and story clustering see articles in save order.
+        """
+        settings = self.config.get('pipeline') or {}
+        workers = settings.get('workers') or {}
+        stages = [
+            Stage(name, getattr(self, f'{name}_stage'), 1 if name == 'persist' else workers.get(name, 1))
+            for name in self.PIPELINE_STAGES
+        ]
+        return Pipeline(stages, settings.get('queue_size', 4),
+                        on_error=lambda stage, job, error: self.source_failed(job, error, results))
+    
+    def scrape_sources(self, jobs: Iterable[SourceJob], results: Dict[str, Any]) -> Dict[str, Any]:
+        """Run sources through the scrape pipeline, adding their outcomes to ``results``"""
+        pipeline = self.build_pipeline(results)
+        for job in pipeline.run(jobs):
+            results['successful_sources'] += 1
+            results['total_articles'] += job.saved
+            self.logger.info(
+                f"Successfully scraped {job.saved} articles from {job.name} in {time.time() - job.started:.2f}s"
+            )
+        results['pipeline'] = pipeline.stats()
+        results['http'] = self.http.stats()
+        return results
+    
+    def fetch_stage(self, job: SourceJob) -> Iterator[SourceJob]:
+        """Fetch the source's feed or listing page; a 304 leaves no content"""
+        source = job.source
+        job.started = time.time()
+        self.logger.info(f"Scraping source: {source['name']}")
+        if source['type'] not in ('rss', 'web'):
+            raise ValueError(f"Unknown source type: {source['type']}")
+        
+        job.feed_mark = self.feed_mark(source)
+        response = self.fetch_source(source, job.feed_mark.request_headers() if job.feed_mark else None)
+        job.fetch_seconds = time.time() - job.started
+        if response.status_code == 304:
+            self.logger.info(f"{source['name']} feed not modified")
+        else:
+            job.content = response.content
+            job.base_url = response.url
+            if job.feed_mark is not None:
+                job.feed_mark.etag = response.headers.get('ETag')
+                job.feed_mark.last_modified = response.headers.get('Last-Modified')
+        
+        # Rate limiting, per fetch worker
+        time.sleep(self.config['scraping']['delay_between_requests'])
+        yield job
+    
+    def parse_stage(self, job: SourceJob) -> Iterator[SourceJob]:
+        start = time.time()
+        if job.content is not None:
+            if job.source['type'] == 'rss':
+                job.articles = self.parse_rss_content(job.content, job.source, job.feed_mark)
+            else:
+                job.articles = self.parse_web_content(job.content, job.source, job.base_url)
+            # The body isn't needed past this point
+            job.content = None
         
+        # Fetch and parse failures count against the source's health
+        job.fetched = True
+        self.record_source_health(job.source, True, job.fetch_seconds + time.time() - start)
+        yield job
+    
+    def canonicalize_stage(self, job: SourceJob) -> Iterator[SourceJob]:
+        job.articles = self.canonicalize_articles(job.articles)
+        yield job
+    
+    def dedup_stage(self, job: SourceJob) -> Iterator[SourceJob]:
+        job.articles = self.new_articles(job.articles)
+        yield job
+    
+    def filter_stage(self, job: SourceJob) -> Iterator[SourceJob]:
+        job.articles = self.filter_articles(job.articles)
+        yield job
+    
+    def enrich_stage(self, job: SourceJob) -> Iterator[SourceJob]:
+        job.articles = self.enrich_articles(job.articles)
+        yield job
+    
+    def score_stage(self, job: SourceJob) -> Iterator[SourceJob]:
+        self.score_articles(job.articles)
+        yield job
+    
+    def persist_stage(self, job: SourceJob) -> Iterator[SourceJob]:
+        """Save the source's articles and log the scrape"""
+        source = job.source
         try:
-            response = self.session.get(source['url'], timeout=self.config['scraping']['request_timeout'])
-            response.raise_for_status()
+            unsaved = 0
+            for article in job.articles:
+                # Another worker owns the source now and saves its own copy
+                if job.lease is not None:
+                    job.lease.check()
+                if self.save_article(article, source, enrich=False):
+                    job.saved += 1
+                elif not self.db.article_exists(article.dedup_url):
+                    # Not a duplicate, so saving it failed
+                    unsaved += 1
             
-            feed = feedparser.parse(response.content)
+            # Only now that they're saved may the next cycle skip these
+            # entries; after a failed save the old mark stays, so the next
+            # cycle reads them again and retries it
+            if job.feed_mark is not None:
+                if unsaved:
+                    self.logger.warning(f"{unsaved} articles from {source['name']} weren't saved, "
+                                        f"keeping its feed mark so they're retried")
+                else:
+                    keep = 2 * self.config['scraping']['max_articles_per_source']
+                    self.db.update_feed_mark(source['name'], job.feed_mark.state(max(keep, 100)))
             
-            if feed.bozo:
-                self.logger.warning(f"RSS feed parsing warning for {source['name']}: {feed.bozo_exception}")
+            self.db.log_scraping_session(
+                source_name=source['name'],
+                status='success',
+                articles_scraped=job.saved,
+                scraping_duration=time.time() - job.started
+            )
+            self.db.update_source_last_scraped(source['name'])
+        finally:
+            self.release_lease(job)
+        yield job
+    
+    def source_failed(self, job: SourceJob, error: Exception, results: Dict[str, Any]):
+        """Log a source that failed in any pipeline stage, adding it to ``results``"""
+        try:
+            if isinstance(error, LeaseLostError):
+                self.logger.warning(str(error))
+                results['errors'].append(str(error))
+                return
             
-            max_articles = self.config['scraping']['max_articles_per_source']
+            error_msg = f"Error scraping {job.name}: {str(error)}"
+            self.logger.error(error_msg)
+            results['errors'].append(error_msg)
+            results['failed_sources'] += 1
             
-            for entry in feed.entries[:max_articles]:
-                try:
-                    article = self.parse_rss_entry(entry, source)
-                    if article and self.is_article_relevant(article):
-                        articles.append(article)
-                except Exception as e:
-                    self.logger.warning(f"Error parsing RSS entry from {source['name']}: {e}")
-                    continue
+            if not job.fetched:
+                self.record_source_health(job.source, False, time.time() - job.started)
             
-        except Exception as e:
-            self.logger.error(f"Error scraping RSS source {source['name']}: {e}")
-            raise
+            # Log failed scraping
+            self.db.log_scraping_session(
+                source_name=job.name,
+                status='failed',
+                error_message=str(error)
+            )
+        finally:
+            self.release_lease(job)
+    
+    def release_lease(self, job: SourceJob):
+        if job.lease is not None:
+            job.lease.stop()
+            job.lease = None
+            self.db.release_source(job.name, self.worker_id)
+    
+    def feed_mark(self, source: Dict[str, Any]) -> Optional[FeedMark]:
+        """High-water mark of an RSS source, unless incremental_feeds is off"""
+        scraping = self.config['scraping']
+        if source['type'] != 'rss' or 'feed_mark' not in source or not scraping.get('incremental_feeds', True):
+            return None
+        return FeedMark(source['feed_mark'], stop_after=scraping.get('known_entries_before_stop', 3))
+    
+    def record_source_health(self, source: Dict[str, Any], success: bool, latency: float):
+        """Update and persist the source's error rate, latency EWMA and breaker"""
+        if 'health' not in source:
+            return
+        health = self.breaker.record(source['health'], success, latency)
+        if health['breaker_state'] != source['health'].get('breaker_state'):
+            self.logger.warning(f"Circuit for {source['name']} is now {health['breaker_state']}")
+        self.db.update_source_health(source['name'], health)
+    
+    def fetch_source(self, source: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Fetch a source's feed or listing page, archiving the body if enabled"""
+        response = self.get_with_retries(source, headers)
+        
+        if self.raw_store and response.status_code != 304:
+            self.raw_store.put(
+                source['name'],
+                source['url'],
+                response.content,
+                final_url=response.url,
+                content_type=response.headers.get('Content-Type')
+            )
+        
+        return response
+    
+    def get_with_retries(self, source: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """GET a source URL, retrying connection errors and 5xx/429 responses
+        
+        Up to scraping.retry_attempts retries with exponential backoff for
+        healthy sources. Sources that already failed, and half-open probes,
+        get one attempt (probes with the shorter health.probe_timeout), so a
+        broken source costs at most one timeout per cycle.
+        """
+        scraping = self.config['scraping']
+        health = source.get('health')
+        timeout = scraping['request_timeout']
+        retries = scraping.get('retry_attempts', 0)
+        if health and (health.get('consecutive_failures') or 0) > 0:
+            retries = 0
+        if self.breaker.state(health) == HALF_OPEN:
+            retries = 0
+            timeout = min(timeout, self.breaker.probe_timeout)
+        
+        attempt = 0
+        while True:
+            try:
+                response = self.http.get(source['url'], headers=headers, timeout=timeout)
+                if response.status_code == 429 or response.status_code >= 500:
+                    response.raise_for_status()
+                break
+            except (requests.ConnectionError, requests.HTTPError) as e:
+                # Read timeouts are not retried: waiting out another one is the cost we avoid
+                if attempt >= retries or isinstance(e, requests.ReadTimeout):
+                    raise
+                attempt += 1
+                delay = scraping.get('retry_backoff_seconds', 1) * 2 ** (attempt - 1)
+                self.logger.info(f"Retrying {source['name']} in {delay}s ({attempt}/{retries}): {e}")
+                time.sleep(delay)
         
+        response.raise_for_status()
+        return response
+    
+    def parse_source_content(self, content: bytes, source: Dict[str, Any], base_url: str) -> List[NewsArticle]:
+        """Parse, canonicalize and filter a fetched body according to the source type"""
+        if source['type'] == 'rss':
+            articles = self.parse_rss_content(content, source)
+        elif source['type'] == 'web':
+            articles = self.parse_web_content(content, source, base_url)
+        else:
+            raise ValueError(f"Unknown source type: {source['type']}")
+        return self.filter_articles(self.canonicalize_articles(articles))
+    
+    def parse_rss_content(self, content: bytes, source: Dict[str, Any],
+                          feed_mark: Optional[FeedMark] = None) -> List[NewsArticle]:
+        """Parse articles out of an RSS feed body
+        
+        Entries are parsed as the body is read. With a ``feed_mark``, entries
+        processed on earlier cycles are skipped before any HTML cleanup or
+        URL canonicalization, and reading stops once a newest-first feed
+        reaches them.
+        """
+        articles = []
+        
+        max_articles = self.config['scraping']['max_articles_per_source']
+        
+        for index, entry in enumerate(stream_entries(content)):
+            if index >= max_articles:
+                break
+            if feed_mark is not None and feed_mark.is_known(entry_key(entry), entry_published(entry)):
+                if feed_mark.exhausted:
+                    break
+                continue
+            try:
+                article = self.parse_rss_entry(entry, source)
+                if article:
+                    articles.append(article)
+            except Exception as e:
+                self.logger.warning(f"Error parsing RSS entry from {source['name']}: {e}")
+                continue
+        
+        if feed_mark is not None and feed_mark.skipped:
+            self.logger.info(
+                f"{source['name']}: {feed_mark.examined - feed_mark.skipped} new entries, "
+                f"{feed_mark.skipped} already processed"
+            )
         return articles
     
-    def scrape_web_source(self, source: Dict[str, Any]) -> List[NewsArticle]:
-        """Scrape articles from a web page"""
+    def parse_web_content(self, content: bytes, source: Dict[str, Any], base_url: str) -> List[NewsArticle]:
+        """Parse articles out of a web listing page"""
+        from bs4 import BeautifulSoup
+        
         articles = []
         
-        try:
-            response = self.session.get(source['url'], timeout=self.config['scraping']['request_timeout'])
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            article_elements = soup.select(source['selector'])
-            
-            max_articles = self.config['scraping']['max_articles_per_source']
-            
-            for element in article_elements[:max_articles]:
-                try:
-                    article = self.parse_web_element(element, source, response.url)
-                    if article and self.is_article_relevant(article):
-                        articles.append(article)
-                except Exception as e:
-                    self.logger.warning(f"Error parsing web element from {source['name']}: {e}")
+        soup = BeautifulSoup(content, 'html.parser')
+        max_articles = self.config['scraping']['max_articles_per_source']
+        article_elements = self.compiled_selector(source['selector']).select(soup, limit=max_articles)
+        
+        for element in article_elements:
+            try:
+                article = self.parse_web_element(element, source, base_url)
+                if article:
+                    articles.append(article)
+            except Exception as e:
+                self.logger.warning(f"Error parsing web element from {source['name']}: {e}")
+                continue
+        
+        return articles
+    
+    def compiled_selector(self, pattern: str):
+        """CSS selector compiled on first use, until a reload drops it"""
+        compiled = self.selectors.get(pattern)
+        if compiled is None:
+            import soupsieve
+            compiled = self.selectors[pattern] = soupsieve.compile(pattern)
+        return compiled
+    
+    def reprocess_raw(self, source_name: Optional[str] = None, since: Optional[datetime] = None,
+                      workers: Optional[int] = None) -> Dict[str, Any]:
+        """Re-run parse, filter, enrich and save over archived responses
+        
+        Parsing and enrichment run in a process pool without network access;
+        saving stays in this process, in fetch order, so dedup and story
+        clustering behave as they did during the original scrape.
+        """
+        if not self.raw_store:
+            raise ValueError("Raw response store is not enabled")
+        
+        sources = self.get_source_configs()
+        fetches = [
+            fetch for fetch in self.raw_store.fetches(source_name, since=since, distinct=True)
+            if fetch['source_name'] in sources
+        ]
+        
+        results = {
+            'fetches': len(fetches),
+            'parsed_articles': 0,
+            'saved_articles': 0,
+            'errors': []
+        }
+        
+        if not fetches:
+            return results
+        
+        workers = workers or os.cpu_count() or 1
+        jobs = [(fetch, sources[fetch['source_name']]) for fetch in fetches]
+        
+        with multiprocessing.Pool(workers, initializer=_init_reprocess_worker, initargs=(self.config,)) as pool:
+            for fetch, articles, error in pool.imap(_reprocess_fetch, jobs):
+                if error:
+                    results['errors'].append(f"{fetch['source_name']} fetch {fetch['id']}: {error}")
                     continue
-            
+                
+                results['parsed_articles'] += len(articles)
+                for article in articles:
+                    if self.save_article(article, sources[fetch['source_name']], enrich=False):
+                        results['saved_articles'] += 1
+        
+        self.logger.info(
+            f"Reprocessed {results['fetches']} stored responses: "
+            f"{results['parsed_articles']} articles parsed, {results['saved_articles']} saved"
+        )
+        return results
+    
+    def reprocess_fetch(self, fetch: Dict[str, Any], source: Dict[str, Any]):
+        """Parse, filter and enrich one archived response
+        
+        Returns (fetch, articles, error) for the parent process to save.
+        """
+        content = self.raw_store.get(fetch['blob_hash'])
+        if content is None:
+            return fetch, [], "stored body is missing"
+        
+        try:
+            articles = self.parse_source_content(content, source, fetch['final_url'])
         except Exception as e:
-            self.logger.error(f"Error scraping web source {source['name']}: {e}")
-            raise
+            return fetch, [], str(e)
         
-        return articles
+        return fetch, self.prepare_articles(articles), None
     
     def parse_rss_entry(self, entry, source: Dict[str, Any]) -> Optional[NewsArticle]:
         """Parse an RSS feed entry into a NewsArticle"""
@@ -188,15 +691,16 @@ class NewsScraper:
             
             # Clean HTML tags from content
             if content:
+                from bs4 import BeautifulSoup
                 soup = BeautifulSoup(content, 'html.parser')
                 content = soup.get_text().strip()
             
-            # Extract publication date
+            # Extract publication date; feedparser normalizes to UTC struct_time
             published_date = None
-            if hasattr(entry, 'published_parsed'):
-                published_date = datetime(*entry.published_parsed[:6])
-            elif hasattr(entry, 'updated_parsed'):
-                published_date = datetime(*entry.updated_parsed[:6])
+            if entry.get('published_parsed'):
+                published_date = calendar.timegm(entry.published_parsed)
+            elif entry.get('updated_parsed'):
+                published_date = calendar.timegm(entry.updated_parsed)
             
             # Create article object
             article = NewsArticle(
@@ -254,22 +758,89 @@ class NewsScraper:
             self.logger.error(f"Error parsing web element: {e}")
             return None
     
-    def save_article(self, article: NewsArticle, source: Dict[str, Any]) -> bool:
+    def canonicalize_articles(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+        """Set each article's canonical URL, dropping any whose link can't be canonicalized
+        
+        ``url`` keeps the link as published, for fetching and display.
+        """
+        canonical = []
+        for article in articles:
+            try:
+                article.canonical_url = self.canonicalize_url(article.url)
+                canonical.append(article)
+            except Exception as e:
+                self.logger.warning(f"Error canonicalizing {article.url} from {article.source}: {e}")
+        return canonical
+    
+    def new_articles(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+        """Articles whose canonical URL is neither stored nor earlier in the batch"""
+        seen = self.db.existing_urls([article.dedup_url for article in articles]) if articles else set()
+        new = []
+        for article in articles:
+            if article.dedup_url in seen:
+                continue
+            seen.add(article.dedup_url)
+            new.append(article)
+        return new
+    
+    def filter_articles(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+        return [article for article in articles if self.is_article_relevant(article)]
+    
+    def enrich_articles(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+        if self.config['processing']['enable_nlp']:
+            articles = [self.process_article_content(article) for article in articles]
+        return articles
+    
+    def score_articles(self, articles: List[NewsArticle]):
+        """Classify, score and extract entities for a batch, in place"""
+        # Classified and scored after enrichment so the fuller article text counts
+        if self.topic_classifier:
+            try:
+                min_confidence = self.config['processing'].get('min_topic_confidence', 0.5)
+                self.topic_classifier.classify_articles(articles, min_confidence)
+            except Exception as e:
+                self.logger.warning(f"Error classifying articles: {e}")
+        
+        try:
+            self.scorer.score_articles(articles)
+        except Exception as e:
+            self.logger.warning(f"Error scoring articles: {e}")
+        
+        if self.config['processing'].get('enable_entity_extraction', True):
+            try:
+                self.entity_extractor.extract_articles(articles)
+            except Exception as e:
+                self.logger.warning(f"Error extracting entities: {e}")
+    
+    def prepare_articles(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+        """Enrich and score one source's batch of new articles"""
+        articles = self.enrich_articles(self.new_articles(articles))
+        self.score_articles(articles)
+        return articles
+    
+    def save_article(self, article: NewsArticle, source: Dict[str, Any], enrich: bool = True) -> bool:
         """Save an article to the database"""
         try:
             # Check if article already exists
-            existing_articles = self.db.get_articles(limit=1, source=article.source)
-            for existing in existing_articles:
-                if existing.url == article.url:
-                    self.logger.debug(f"Article already exists: {article.title}")
-                    return False
+            if self.db.article_exists(article.dedup_url):
+                self.logger.debug(f"Article already exists: {article.title}")
+                return False
             
             # Process article content if enabled
-            if self.config['processing']['enable_nlp']:
-                article = self.process_article_content(article)
+            if enrich:
+                article = self.prepare_articles([article])[0]
+            
+            # Attach the article to an existing story cluster if it's a near duplicate
+            signature = None
+            if self.config['processing'].get('enable_near_duplicate_detection', True):
+                signature = minhash(article.title, article.content)
+                threshold = self.config['processing'].get('near_duplicate_threshold', 0.5)
+                article.cluster_id = self.db.find_near_duplicate_cluster(signature, threshold)
+                if article.cluster_id is not None:
+                    self.logger.info(f"Article '{article.title}' is a near duplicate in cluster {article.cluster_id}")
             
             # Save to database
-            article_id = self.db.add_article(article)
+            article_id = self.db.add_article(article, signature)
             return article_id is not None
             
         except Exception as e:
@@ -280,9 +851,12 @@ class NewsScraper:
         """Process article content with NLP"""
         try:
             # Use newspaper3k for better content extraction and analysis
-            if article.url:
+            html = self.fetch_article_html(article) if article.url else None
+            if html:
+                # newspaper3k is slow to import and only needed with enable_nlp
+                from newspaper import Article
                 news_article = Article(article.url)
-                news_article.download()
+                news_article.download(input_html=html)
                 news_article.parse()
                 
                 # Update content with better extraction
@@ -293,19 +867,16 @@ class NewsScraper:
                 if news_article.summary:
                     article.summary = news_article.summary
                 
-                # Extract keywords
+                # Extract keywords; add_tags copies, so the source's tags stay untouched
                 if news_article.keywords:
-                    article.tags.extend(news_article.keywords)
+                    article.add_tags(news_article.keywords)
                 
                 # Extract authors
                 if news_article.authors:
                     article.entities.extend(news_article.authors)
             
-            # Remove duplicate tags
-            article.tags = list(set(article.tags))
-            
             # Remove duplicate entities
-            article.entities = list(set(article.entities))
+            article.entities = list(dict.fromkeys(article.entities))
             
             # Limit content length
             if len(article.content) > self.config['scraping']['max_content_length']:
@@ -317,52 +888,67 @@ class NewsScraper:
             self.logger.warning(f"Error processing article content: {e}")
             return article
     
+    def fetch_article_html(self, article: NewsArticle):
+        """Article page HTML, from the raw store when offline"""
+        if self.offline:
+            return self.raw_store.latest_for_url(article.url) if self.raw_store else None
+        
+        response = self.http.get(article.url, timeout=self.config['scraping']['request_timeout'])
+        response.raise_for_status()
+        
+        if self.raw_store:
+            self.raw_store.put(
+                article.source,
+                article.url,
+                response.content,
+                kind=ARTICLE_FETCH,
+                final_url=response.url,
+                content_type=response.headers.get('Content-Type')
+            )
+        
+        return response.content
+    
     def is_article_relevant(self, article: NewsArticle) -> bool:
         """Check if an article is relevant based on filtering rules"""
         try:
-            # Check exclude keywords
-            exclude_keywords = self.config['filtering']['exclude_keywords']
-            title_lower = article.title.lower()
-            content_lower = article.content.lower()
-            
-            for keyword in exclude_keywords:
-                if keyword.lower() in title_lower or keyword.lower() in content_lower:
-                    return False
-            
-            # Check if article matches any relevant keywords
-            all_keywords = []
-            for category_keywords in self.config['filtering']['keywords'].values():
-                all_keywords.extend(category_keywords)
-            
-            for keyword in all_keywords:
-                if keyword.lower() in title_lower or keyword.lower() in content_lower:
-                    return True
-            
-            # If no keywords match, check if it's from a trusted source
-            if article.source in ['SEC News', 'FCA News', 'AWS Status', 'Microsoft Azure Status']:
-                return True
-            
-            return False
+            return self.keyword_filter.is_relevant(article.title, article.content, article.source)
             
         except Exception as e:
             self.logger.error(f"Error checking article relevance: {e}")
             return True  # Default to true if there's an error
     
+    def assess_articles(self, articles: List[NewsArticle]) -> List[Dict[str, Any]]:
+        """riskLevel, severity and priority for each article"""
+        return self.risk_rules.evaluate_articles(articles)
+    
+    def create_api_client(self) -> NewsAPIClient:
+        """Frontend API client that attaches this scraper's risk assessments"""
+        return NewsAPIClient(self.config.get('integration', {}), self.risk_rules, self.http)
+    
+    def export_articles(self, category: Optional[str] = None, batch_size: int = 1000) -> Dict[str, int]:
+        """Send every stored article to the frontend API, one ArticleBatch at a time"""
+        client = self.create_api_client()
+        results = {'articles': 0, 'batches': 0, 'failed_batches': 0}
+        for batch in self.db.iter_article_batches(batch_size, category=category):
+            results['articles'] += len(batch)
+            results['batches'] += 1
+            if not client.send_articles_to_frontend(batch):
+                results['failed_batches'] += 1
+        self.logger.info(f"Exported {results['articles']} articles in {results['batches']} batches")
+        return results
+    
     def get_articles_by_vendor(self, vendor_name: str) -> List[NewsArticle]:
         """Get articles related to a specific vendor"""
-        vendor_keywords = {
-            'aws': ['aws', 'amazon web services', 'amazon'],
-            'azure': ['azure', 'microsoft azure', 'microsoft cloud'],
-            'google': ['google cloud', 'gcp', 'google'],
-            'microsoft': ['microsoft', 'msft', 'azure'],
-            'oracle': ['oracle', 'oracle cloud'],
-            'salesforce': ['salesforce', 'crm'],
-            'ibm': ['ibm', 'ibm cloud'],
-            'adobe': ['adobe', 'creative cloud']
-        }
+        entity_id = self.entity_extractor.resolve(vendor_name)
+        if entity_id:
+            return self.db.get_articles_by_entities([entity_id])
         
-        keywords = vendor_keywords.get(vendor_name.lower(), [vendor_name])
-        return self.db.get_articles_by_tags(keywords)
+        # Not in the gazetteer; fall back to matching tags
+        return self.db.get_articles_by_tags([vendor_name])
+    
+    def get_story_copies(self, cluster_id: int) -> List[NewsArticle]:
+        """Get every source's copy of the same story"""
+        return self.db.get_cluster_articles(cluster_id)
     
     def get_articles_by_category(self, category: str, limit: int = 50) -> List[NewsArticle]:
         """Get articles by category"""
@@ -376,6 +962,76 @@ class NewsScraper:
         """Get scraping statistics"""
         return self.db.get_scraping_stats()
     
+    def get_source_health(self) -> Dict[str, Dict[str, Any]]:
+        """Error rate, latency and circuit state of every active source"""
+        health = self.db.get_source_health()
+        for name, source_health in health.items():
+            source_health['breaker_state'] = self.breaker.state(source_health)
+            if source_health['breaker_open_until']:
+                source_health['breaker_open_until'] = datetime.fromtimestamp(source_health['breaker_open_until']).isoformat()
+        return health
+    
+    def get_source_leases(self) -> List[Dict[str, Any]]:
+        """Sources currently leased by scraper workers"""
+        return self.db.get_source_leases()
+    
+    def rebuild_stats(self) -> Dict[str, int]:
+        """Recount the materialized article and scraping-run statistics"""
+        return self.db.rebuild_stats()
+    
     def cleanup_old_data(self, days: int = 30):
         """Clean up old data"""
-        return self.db.cleanup_old_articles(days)
\ No newline at end of file
+        return self.db.cleanup_old_articles(days)
+    
+    def retention_manager(self, db_path: str) -> RetentionManager:
+        retention_config = self.config.get('retention', {})
+        return RetentionManager(
+            db_path,
+            archive_path=retention_config.get('archive_path'),
+            chunk_size=retention_config.get('chunk_size', 500),
+            pause_seconds=retention_config.get('pause_seconds', 0.05),
+            vacuum_pages=retention_config.get('vacuum_pages', 1000),
+            decode=self.db.codec.decode
+        )
+    
+    def apply_retention(self) -> Dict[str, Dict[str, int]]:
+        """Expire (and optionally archive) old articles, logs and vendor status history"""
+        retention_config = self.config.get('retention', {})
+        tables = retention_config.get('tables') or {'news_articles': {}, 'scraping_logs': {}}
+        
+        news_tables = {name: settings or {} for name, settings in tables.items() if name != 'vendor_status'}
+        results = self.retention_manager(self.config['database']['path']).run(news_tables)
+        
+        # Vendor status history lives in the vendor monitor's own database
+        vendor_db = retention_config.get('vendor_status_db')
+        if 'vendor_status' in tables and vendor_db and os.path.exists(vendor_db):
+            results.update(self.retention_manager(vendor_db).run({'vendor_status': tables['vendor_status'] or {}}))
+        
+        return results
+    
+    def compress_articles(self) -> Dict[str, Any]:
+        """Train a dictionary if configured, then rewrite stored articles to match the compression settings"""
+        dictionary_id = None
+        if self.db.compress and self.db.use_dictionary:
+            dictionary_id = self.db.train_compression_dictionary()
+        stats = self.db.recompress_articles()
+        return dict(stats, dictionary_id=dictionary_id)
+    
+    def compact_databases(self) -> Dict[str, bool]:
+        """Switch the databases to incremental auto-vacuum (one full VACUUM each)"""
+        paths = [self.config['database']['path']]
+        vendor_db = self.config.get('retention', {}).get('vendor_status_db')
+        if vendor_db and os.path.exists(vendor_db):
+            paths.append(vendor_db)
+        return {path: self.retention_manager(path).enable_incremental_vacuum() for path in paths}
+    
+    def snapshot_publisher(self) -> SnapshotPublisher:
+        return SnapshotPublisher(self.config['database']['path'], self.config.get('snapshot'))
+    
+    def publish_snapshot(self, force: bool = False) -> Dict[str, Any]:
+        """Publish the read-only copy of the database for dashboards, if it changed"""
+        return self.snapshot_publisher().publish(force)
+    
+    def get_snapshot_status(self) -> Dict[str, Any]:
+        """Age, publish latency and size of the published snapshot"""
+        return self.snapshot_publisher().status()
\ No newline at end of file
@@ -0,0 +1,211 @@
+import os
+import time
+import sqlite3
+import logging
+from urllib.parse import quote
+from typing import Dict, Any, Optional
+from text_codec import TextCodec
+
+# Dedup and redirect caches only matter to the scraper writing articles
+WRITE_PATH_TABLES = ('article_signatures', 'signature_bands', 'url_redirects')
+
+# One row per article with everything a listing page shows, text decoded
+ARTICLE_LISTING = '''
+    CREATE TABLE article_listing AS
+    SELECT a.id, a.title, a.url, a.source, a.category, a.published_date, a.scraped_date,
+           decode_text(a.summary) AS summary, a.tags, a.entities,
+           a.sentiment_score, a.relevance_score, a.cluster_id,
+           COALESCE(c.size, 1) AS cluster_size
+    FROM news_articles a
+    LEFT JOIN (
+        SELECT cluster_id, COUNT(*) AS size FROM news_articles
+        WHERE cluster_id IS NOT NULL GROUP BY cluster_id
+    ) c ON c.cluster_id = a.cluster_id
+'''
+
+# One row per source with its article count, latest article and run history
+SOURCE_LISTING = '''
+    CREATE TABLE source_listing AS
+    SELECT s.name, s.category, s.type, s.url, s.is_active, s.last_scraped,
+           s.error_rate, s.breaker_state,
+           COALESCE(st.count, 0) AS articles,
+           (SELECT MAX(published_date) FROM news_articles WHERE source = s.name) AS latest_published,
+           COALESCE(r.runs, 0) AS runs, COALESCE(r.successes, 0) AS successes
+    FROM sources s
+    LEFT JOIN article_stats st ON st.dimension = 'source' AND st.key = s.name
+    LEFT JOIN (
+        SELECT source_name, SUM(runs) AS runs, SUM(successes) AS successes
+        FROM source_run_stats GROUP BY source_name
+    ) r ON r.source_name = s.name
+'''
+
+LISTING_INDEXES = [
+    'CREATE INDEX idx_article_listing_published ON article_listing(published_date DESC)',
+    'CREATE INDEX idx_article_listing_category ON article_listing(category, published_date DESC)',
+    'CREATE INDEX idx_article_listing_source ON article_listing(source, published_date DESC)',
+    'CREATE INDEX idx_article_listing_cluster ON article_listing(cluster_id)',
+    'CREATE UNIQUE INDEX idx_source_listing_name ON source_listing(name)'
+]
+
+class _CopyTimeout(Exception):
+    pass
+
+def open_snapshot(path: str) -> sqlite3.Connection:
+    """Read-only connection to a published snapshot
+
+    Snapshots are replaced, never modified in place, so readers open them
+    immutable: no locks are taken and nothing the scraper does blocks them.
+    A connection keeps reading the snapshot it opened until it reconnects.
+    """
+    return sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro&immutable=1", uri=True)
+
+class SnapshotPublisher:
+    """Publishes a consistent, read-only, query-optimized copy of the news database
+
+    The copy is taken with SQLite's online backup API in steps of
+    ``pages_per_step`` pages, so the scraper can commit between steps. If
+    writes keep restarting it for ``max_copy_seconds`` the rest is copied in
+    one step. Write-path tables are then dropped, listing tables and their
+    indexes added, and the file is atomically renamed over the previous
+    snapshot. Publishing is skipped while the database and its WAL file are
+    unchanged.
+    """
+
+    def __init__(self, db_path: str, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.path = config.get('path') or os.path.splitext(db_path)[0] + '_snapshot.db'
+        self.pages_per_step = config.get('pages_per_step', 4096)
+        self.step_sleep = config.get('step_sleep_seconds', 0.005)
+        self.max_copy_seconds = config.get('max_copy_seconds', 30)
+        self.vacuum = config.get('vacuum', True)
+
+    def _source_signature(self) -> str:
+        """Stat of the database and its WAL file
+
+        In WAL mode (see RetentionManager.connect) a commit only writes the
+        -wal file until a checkpoint copies it into the database, so both
+        files are compared.
+        """
+        parts = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                parts.append('-')
+                continue
+            parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        return '/'.join(parts)
+
+    def _copy(self, target_path: str):
+        source = sqlite3.connect(self.db_path, timeout=30)
+        target = sqlite3.connect(target_path)
+        deadline = time.monotonic() + self.max_copy_seconds
+
+        def progress(status, remaining, total):
+            if time.monotonic() > deadline:
+                raise _CopyTimeout()
+
+        try:
+            try:
+                source.backup(target, pages=self.pages_per_step, progress=progress, sleep=self.step_sleep)
+            except _CopyTimeout:
+                self.logger.warning("Snapshot copy kept restarting under writes, copying in one step")
+                source.backup(target, pages=-1)
+        finally:
+            target.close()
+            source.close()
+
+    def _optimize(self, path: str, meta: Dict[str, Any], started: float) -> int:
+        """Turn the raw copy into the read-optimized snapshot; returns the article count"""
+        conn = sqlite3.connect(path, isolation_level=None)
+        try:
+            codec = TextCodec()
+            for dictionary_id, data in conn.execute('SELECT id, data FROM compression_dictionaries'):
+                codec.add_dictionary(dictionary_id, data)
+            conn.create_function('decode_text', 1, codec.decode, deterministic=True)
+
+            conn.execute('BEGIN')
+            for table in WRITE_PATH_TABLES:
+                conn.execute(f'DROP TABLE IF EXISTS {table}')
+            conn.execute(ARTICLE_LISTING)
+            conn.execute(SOURCE_LISTING)
+            for statement in LISTING_INDEXES:
+                conn.execute(statement)
+            articles = conn.execute('SELECT COUNT(*) FROM article_listing').fetchone()[0]
+            conn.execute('COMMIT')
+
+            conn.execute('ANALYZE')
+            if self.vacuum:
+                conn.execute('VACUUM')
+
+            # Written last so publish_seconds covers everything but the rename
+            meta = dict(meta, articles=articles, publish_seconds=round(time.perf_counter() - started, 3))
+            conn.execute('CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value)')
+            conn.executemany('INSERT INTO snapshot_meta (key, value) VALUES (?, ?)', list(meta.items()))
+            return articles
+        finally:
+            conn.close()
+
+    def publish(self, force: bool = False) -> Dict[str, Any]:
+        """Publish a new snapshot unless the database hasn't changed since the last one"""
+        start = time.perf_counter()
+        signature = self._source_signature()
+        if not force and self.status().get('source_signature') == signature:
+            return {'published': False, 'path': self.path, 'reason': 'unchanged'}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        try:
+            self._copy(temp_path)
+            copy_seconds = time.perf_counter() - start
+            articles = self._optimize(temp_path, {
+                'published_at': time.time(),
+                'source_signature': signature,
+                'copy_seconds': round(copy_seconds, 3)
+            }, start)
+            with open(temp_path, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        result = {
+            'published': True,
+            'path': self.path,
+            'articles': articles,
+            'bytes': os.path.getsize(self.path),
+            'copy_seconds': round(copy_seconds, 3),
+            'publish_seconds': round(time.perf_counter() - start, 3)
+        }
+        self.logger.info(f"Published snapshot of {articles} articles in {result['publish_seconds']}s")
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        """Age, publish latency and size of the current snapshot"""
+        if not os.path.exists(self.path):
+            return {'path': self.path, 'published_at': None, 'age_seconds': None}
+
+        try:
+            conn = open_snapshot(self.path)
+            try:
+                meta = dict(conn.execute('SELECT key, value FROM snapshot_meta').fetchall())
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading snapshot status: {e}")
+            return {'path': self.path, 'published_at': None, 'age_seconds': None, 'error': str(e)}
+
+        published_at = meta.get('published_at')
+        return dict(
+            meta,
+            path=self.path,
+            bytes=os.path.getsize(self.path),
+            age_seconds=round(time.time() - published_at, 1) if published_at else None
+        )
@@ -0,0 +1,86 @@
+import time
+import logging
+from typing import Dict, Any, Optional
+
+# Per-source health persisted in the sources table (see NewsDatabase)
+HEALTH_COLUMNS = {
+    'error_rate': 'REAL DEFAULT 0',  # EWMA of failures (0 healthy .. 1 always failing)
+    'latency_ewma': 'REAL',  # Seconds to fetch and parse
+    'consecutive_failures': 'INTEGER DEFAULT 0',
+    'breaker_state': "TEXT DEFAULT 'closed'",  # closed or open; half-open is derived
+    'breaker_opens': 'INTEGER DEFAULT 0',  # Consecutive trips, for the backoff
+    'breaker_open_until': 'REAL'  # Epoch seconds
+}
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+def default_health() -> Dict[str, Any]:
+    return {
+        'error_rate': 0.0,
+        'latency_ewma': None,
+        'consecutive_failures': 0,
+        'breaker_state': CLOSED,
+        'breaker_opens': 0,
+        'breaker_open_until': None
+    }
+
+class CircuitBreaker:
+    """Per-source circuit breaker with half-open probes and exponential backoff
+
+    A source's breaker opens after ``failure_threshold`` consecutive failed
+    scrapes and stays open for ``base_backoff_minutes``. Once that passes
+    it is half-open: one probe is allowed, with a single short-timeout
+    attempt. A successful probe closes it, a failed one reopens it for
+    twice as long, up to ``max_backoff_hours``.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.logger = logging.getLogger(__name__)
+        self.failure_threshold = config.get('failure_threshold', 3)
+        self.base_backoff = config.get('base_backoff_minutes', 60) * 60
+        self.max_backoff = config.get('max_backoff_hours', 168) * 3600
+        self.alpha = config.get('ewma_alpha', 0.3)
+        self.probe_timeout = config.get('probe_timeout', 10)
+
+    def state(self, health: Optional[Dict[str, Any]], now: Optional[float] = None) -> str:
+        if not health or health.get('breaker_state') != OPEN:
+            return CLOSED
+        if (health.get('breaker_open_until') or 0) <= (now or time.time()):
+            return HALF_OPEN
+        return OPEN
+
+    def allows(self, health: Optional[Dict[str, Any]], now: Optional[float] = None) -> bool:
+        """Whether the source may be scraped now (closed, or due a probe)"""
+        return self.state(health, now) != OPEN
+
+    def score(self, health: Optional[Dict[str, Any]]) -> float:
+        """Higher for reliable, fast sources; used to scrape them first"""
+        if not health:
+            return 1.0
+        return (1.0 - (health.get('error_rate') or 0.0)) / (1.0 + (health.get('latency_ewma') or 0.0))
+
+    def record(self, health: Optional[Dict[str, Any]], success: bool, latency: float,
+               now: Optional[float] = None) -> Dict[str, Any]:
+        """Health after one scrape of the source"""
+        now = now or time.time()
+        updated = dict(default_health(), **(health or {}))
+        was = self.state(updated, now)
+
+        updated['error_rate'] = self.alpha * (0.0 if success else 1.0) + (1 - self.alpha) * (updated['error_rate'] or 0.0)
+        previous = updated['latency_ewma']
+        updated['latency_ewma'] = latency if previous is None else self.alpha * latency + (1 - self.alpha) * previous
+
+        if success:
+            updated.update(consecutive_failures=0, breaker_state=CLOSED, breaker_opens=0, breaker_open_until=None)
+            return updated
+
+        updated['consecutive_failures'] = (updated['consecutive_failures'] or 0) + 1
+        if was == HALF_OPEN or updated['consecutive_failures'] >= self.failure_threshold:
+            updated['breaker_opens'] = (updated['breaker_opens'] or 0) + 1
+            backoff = min(self.base_backoff * 2 ** (updated['breaker_opens'] - 1), self.max_backoff)
+            updated['breaker_state'] = OPEN
+            updated['breaker_open_until'] = now + backoff
+        return updated
@@ -0,0 +1,75 @@
+import os
+import uuid
+import socket
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+class LeaseLostError(Exception):
+    """Raised when another worker took over a source this worker was scraping"""
+
+def make_worker_id() -> str:
+    """Identity of this scraper process in the sources.lease_owner column"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class LeaseHeartbeat:
+    """Keeps a claimed source's lease alive while it is being scraped
+
+    A background thread renews the lease every ``interval`` seconds. If a
+    renewal finds the lease gone (it expired and another worker reclaimed
+    it) ``lost`` is set, and the scraper drops its results instead of
+    saving them twice.
+    """
+
+    def __init__(self, db, source_name: str, owner: str, ttl: float, interval: float):
+        self.logger = logging.getLogger(__name__)
+        self.db = db
+        self.source_name = source_name
+        self.owner = owner
+        self.ttl = ttl
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.db.renew_source_lease(self.source_name, self.owner, self.ttl):
+                self.lost = True
+                self.logger.warning(f"Lost lease on {self.source_name}, another worker reclaimed it")
+                return
+
+    def check(self):
+        if self.lost:
+            raise LeaseLostError(f"Lease on {self.source_name} was reclaimed by another worker")
+
+    def start(self) -> 'LeaseHeartbeat':
+        self._thread = threading.Thread(target=self._run, name=f"lease-{self.source_name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'LeaseHeartbeat':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+def lease_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """leases config section with defaults filled in"""
+    settings = {
+        'enabled': False,
+        'ttl_seconds': 300,
+        'heartbeat_seconds': 60,
+        'min_interval_minutes': 30,
+        'worker_id': None
+    }
+    settings.update(config.get('leases') or {})
+    if not settings['worker_id']:
+        settings['worker_id'] = make_worker_id()
+    return settings
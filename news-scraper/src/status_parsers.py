@@ -0,0 +1,318 @@
+import json
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Optional, Callable, Type
+from dateutil.parser import isoparse
+
+class StatusParseError(Exception):
+    """Raised when a status page response can't be understood"""
+
+@dataclass
+class ParseResult:
+    """Incidents from one poll plus the cursor to resume from next time
+
+    ``snapshot`` is set when the incidents describe everything currently
+    open for the vendor, so anything else being tracked can be resolved.
+    Incremental polls only carry incidents updated since the cursor.
+    """
+    incidents: List[Dict[str, Any]] = field(default_factory=list)
+    cursor: Dict[str, Any] = field(default_factory=dict)
+    snapshot: bool = False
+
+# Parser plugins keyed by provider format
+PARSERS: Dict[str, Type['StatusPageParser']] = {}
+
+def register_parser(format_name: str) -> Callable:
+    """Class decorator registering a parser for a provider format"""
+    def decorator(cls):
+        cls.format_name = format_name
+        PARSERS[format_name] = cls
+        return cls
+    return decorator
+
+def get_parser(format_name: str) -> 'StatusPageParser':
+    """Instantiate the parser for a provider format, falling back to generic JSON"""
+    return PARSERS.get(format_name, PARSERS['generic_json'])()
+
+def _epoch(value) -> Optional[int]:
+    """Convert ISO 8601 strings, RFC 822 dates or epoch numbers to epoch seconds"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        parsed = isoparse(value)
+    except ValueError:
+        parsed = parsedate_to_datetime(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def _isoformat(epoch: Optional[int]) -> str:
+    if epoch is None:
+        return datetime.now().isoformat()
+    return datetime.fromtimestamp(epoch).isoformat()
+
+class StatusPageParser:
+    """Base class for status page parser plugins"""
+
+    format_name = ''
+    accept = 'application/json'
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def url(self, vendor: Dict[str, Any]) -> str:
+        """Endpoint to poll for a vendor"""
+        return vendor['status_url']
+
+    def parse(self, response, vendor: Dict[str, Any], cursor: Dict[str, Any]) -> ParseResult:
+        raise NotImplementedError
+
+    def load_json(self, response):
+        """Decode a JSON body, tolerating the UTF-16 some providers serve"""
+        content = response.content
+        if content[:2] in (b'\xff\xfe', b'\xfe\xff'):
+            text = content.decode('utf-16')
+        else:
+            text = content.decode(response.encoding or 'utf-8', errors='replace')
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise StatusParseError(f"Expected JSON from {response.url}: {e}")
+
+    def incident(self, vendor: Dict[str, Any], **fields) -> Dict[str, Any]:
+        """Build an incident record in the monitor's format"""
+        record = {
+            'vendor_name': vendor['name'],
+            'status': 'Incident',
+            'severity': 'Medium',
+            'checked_at': datetime.now().isoformat()
+        }
+        record.update(fields)
+        return record
+
+    def resolved(self, vendor: Dict[str, Any], incident_id: str,
+                 resolved_at: Optional[int] = None, **fields) -> Dict[str, Any]:
+        return self.incident(
+            vendor,
+            status='Resolved',
+            incident_id=incident_id,
+            resolved_at=_isoformat(resolved_at),
+            **fields
+        )
+
+@register_parser('statuspage_io')
+class StatuspageIOParser(StatusPageParser):
+    """Atlassian Statuspage (Stripe, Plaid, ...) via the incidents endpoint"""
+
+    IMPACT_SEVERITY = {
+        'critical': 'Critical',
+        'major': 'High',
+        'minor': 'Medium',
+        'none': 'Low'
+    }
+
+    def url(self, vendor: Dict[str, Any]) -> str:
+        return vendor['status_url'].rstrip('/') + '/api/v2/incidents.json'
+
+    def parse(self, response, vendor: Dict[str, Any], cursor: Dict[str, Any]) -> ParseResult:
+        data = self.load_json(response)
+        high_water_mark = cursor.get('updated_at')
+        newest = high_water_mark or 0
+        incidents = []
+
+        for item in data.get('incidents', []):
+            updated_at = _epoch(item.get('updated_at')) or 0
+            newest = max(newest, updated_at)
+            if high_water_mark is not None and updated_at <= high_water_mark:
+                continue
+
+            incident_id = f"{vendor['name']}:{item.get('id')}"
+            updates = item.get('incident_updates') or []
+            description = updates[0].get('body') if updates else item.get('name')
+
+            if item.get('status') in ('resolved', 'postmortem'):
+                incidents.append(self.resolved(
+                    vendor, incident_id,
+                    _epoch(item.get('resolved_at')) or updated_at,
+                    incident_title=item.get('name')
+                ))
+            else:
+                incidents.append(self.incident(
+                    vendor,
+                    incident_id=incident_id,
+                    incident_title=item.get('name', 'Service Issue'),
+                    incident_description=description,
+                    severity=self.IMPACT_SEVERITY.get(item.get('impact'), 'Medium'),
+                    started_at=_isoformat(_epoch(item.get('started_at') or item.get('created_at')))
+                ))
+
+        return ParseResult(incidents, {'updated_at': newest}, snapshot=high_water_mark is None)
+
+@register_parser('gcp')
+class GCPParser(StatusPageParser):
+    """Google Cloud incidents.json, filtered on each incident's modified time"""
+
+    SEVERITY = {'high': 'High', 'medium': 'Medium', 'low': 'Low'}
+
+    def parse(self, response, vendor: Dict[str, Any], cursor: Dict[str, Any]) -> ParseResult:
+        data = self.load_json(response)
+        if not isinstance(data, list):
+            raise StatusParseError("Expected a list of GCP incidents")
+
+        high_water_mark = cursor.get('modified')
+        newest = high_water_mark or 0
+        incidents = []
+
+        for item in data:
+            modified = _epoch(item.get('modified') or item.get('begin')) or 0
+            newest = max(newest, modified)
+            if high_water_mark is not None and modified <= high_water_mark:
+                continue
+
+            incident_id = f"gcp-{item.get('id')}"
+            latest = item.get('most_recent_update') or {}
+
+            if item.get('end'):
+                incidents.append(self.resolved(
+                    vendor, incident_id, _epoch(item['end']),
+                    incident_title=item.get('external_desc')
+                ))
+            else:
+                incidents.append(self.incident(
+                    vendor,
+                    incident_id=incident_id,
+                    incident_title=item.get('external_desc', 'GCP Incident'),
+                    incident_description=latest.get('text', 'Service disruption'),
+                    severity=self.SEVERITY.get(str(item.get('severity', '')).lower(), 'Medium'),
+                    started_at=_isoformat(_epoch(item.get('begin')))
+                ))
+
+        return ParseResult(incidents, {'modified': newest}, snapshot=high_water_mark is None)
+
+class CurrentEventsParser(StatusPageParser):
+    """Base for feeds that only list currently open events
+
+    The cursor remembers each open event's last update time, so only new
+    or updated events are emitted and events that drop off the feed are
+    reported as resolved.
+    """
+
+    def events(self, response, vendor: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return open events as dicts with id, updated and incident fields"""
+        raise NotImplementedError
+
+    def parse(self, response, vendor: Dict[str, Any], cursor: Dict[str, Any]) -> ParseResult:
+        previous = cursor.get('open')
+        current = {}
+        incidents = []
+
+        for event in self.events(response, vendor):
+            event_id = event.pop('id')
+            updated = event.pop('updated') or 0
+            current[event_id] = updated
+            if previous is None or previous.get(event_id) != updated:
+                incidents.append(self.incident(vendor, incident_id=event_id, **event))
+
+        for event_id in (previous or {}):
+            if event_id not in current:
+                incidents.append(self.resolved(vendor, event_id))
+
+        return ParseResult(incidents, {'open': current}, snapshot=previous is None)
+
+@register_parser('aws')
+class AWSHealthParser(CurrentEventsParser):
+    """AWS Health Dashboard current events"""
+
+    SEVERITY = {'3': 'High', '2': 'Medium', '1': 'Low'}
+
+    def events(self, response, vendor: Dict[str, Any]) -> List[Dict[str, Any]]:
+        data = self.load_json(response)
+        if isinstance(data, dict):
+            data = data.get('current', [])
+
+        events = []
+        for item in data:
+            status = str(item.get('status', '0'))
+            if status == '0':
+                continue
+
+            log = item.get('event_log') or []
+            latest = log[-1] if log else {}
+            region = item.get('region_name') or item.get('region', 'Unknown Region')
+            service = item.get('service_name') or item.get('service', 'AWS')
+
+            events.append({
+                'id': f"aws-{item.get('service', service)}-{item.get('date', region)}",
+                'updated': _epoch(latest.get('timestamp') or item.get('date')),
+                'incident_title': item.get('summary') or f"AWS {service} issue in {region}",
+                'incident_description': latest.get('message') or item.get('message', 'Service disruption detected'),
+                'severity': self.SEVERITY.get(status, 'Medium'),
+                'started_at': _isoformat(_epoch(item.get('date')))
+            })
+
+        return events
+
+@register_parser('azure_rss')
+class AzureRSSParser(CurrentEventsParser):
+    """Azure status RSS feed, which lists active incidents as items"""
+
+    accept = 'application/rss+xml, application/xml'
+
+    def events(self, response, vendor: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            root = ET.fromstring(response.content)
+        except ET.ParseError as e:
+            raise StatusParseError(f"Expected RSS from {response.url}: {e}")
+
+        channel = root.find('channel')
+        if channel is None:
+            raise StatusParseError(f"No RSS channel in {response.url}")
+
+        events = []
+        for item in channel.findall('item'):
+            title = (item.findtext('title') or 'Azure Service Issue').strip()
+            published = _epoch(item.findtext('pubDate'))
+            events.append({
+                'id': (item.findtext('guid') or item.findtext('link') or title).strip(),
+                'updated': published,
+                'incident_title': title,
+                'incident_description': (item.findtext('description') or '').strip() or 'Service disruption detected',
+                'severity': 'High' if 'outage' in title.lower() else 'Medium',
+                'started_at': _isoformat(published)
+            })
+
+        return events
+
+@register_parser('generic_json')
+class GenericJSONParser(StatusPageParser):
+    """Best-effort parsing for JSON status pages without an incremental API"""
+
+    INCIDENT_INDICATORS = ['incidents', 'issues', 'problems', 'outages']
+
+    def parse(self, response, vendor: Dict[str, Any], cursor: Dict[str, Any]) -> ParseResult:
+        data = self.load_json(response)
+        incidents = []
+
+        if isinstance(data, dict):
+            for key in self.INCIDENT_INDICATORS:
+                items = data.get(key)
+                if isinstance(items, list):
+                    for item in items[:3]:  # Limit to 3 most recent
+                        if not isinstance(item, dict):
+                            continue
+                        incidents.append(self.incident(
+                            vendor,
+                            incident_title=str(item.get('title', item.get('name', 'Service Issue'))),
+                            incident_description=str(item.get('description', item.get('summary', 'Service disruption detected')))
+                        ))
+
+        # Every poll is a full snapshot
+        return ParseResult(incidents, {}, snapshot=True)
@@ -0,0 +1,190 @@
+import re
+import zlib
+import struct
+import logging
+from collections import Counter
+from typing import List, Dict, Any, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compressed values are BLOBs starting with a codec byte and the id of the
+# dictionary they were compressed with (0 for none); plain TEXT values are
+# left as they are, so old rows and short fields need no migration
+ZLIB = 1
+ZSTD = 2
+HEADER = struct.Struct('>BI')
+
+CODECS = {'zlib': ZLIB, 'zstd': ZSTD}
+
+# zlib can only look back 32 KiB, so a larger preset dictionary is wasted
+ZLIB_DICTIONARY_SIZE = 32 * 1024
+ZSTD_DICTIONARY_SIZE = 112 * 1024
+
+_PHRASE_RE = re.compile(r'\S+')
+
+# Words per sample considered when training; boilerplate sits near the ends
+# of articles as often as the start, so both ends are kept
+TRAIN_WORDS = 400
+
+def train_zlib_dictionary(samples: List[str], size: int = ZLIB_DICTIONARY_SIZE) -> bytes:
+    """Preset dictionary of the phrases that recur across many samples
+
+    Word 2- to 8-grams are scored by document frequency times length; the
+    best go last, since zlib encodes nearer matches in fewer bits.
+    """
+    document_frequency: Counter = Counter()
+    for sample in samples:
+        words = _PHRASE_RE.findall(sample)
+        if len(words) > TRAIN_WORDS:
+            words = words[:TRAIN_WORDS // 2] + words[-TRAIN_WORDS // 2:]
+        seen = set()
+        for n in (8, 4, 2):
+            for i in range(0, max(len(words) - n + 1, 0)):
+                seen.add(' '.join(words[i:i + n]))
+        document_frequency.update(seen)
+
+    minimum = max(2, len(samples) // 50)
+    scored = sorted(
+        ((count * len(phrase), phrase) for phrase, count in document_frequency.items() if count >= minimum),
+        reverse=True
+    )
+
+    chosen: List[bytes] = []
+    total = 0
+    for _, phrase in scored:
+        encoded = phrase.encode('utf-8') + b' '
+        if total + len(encoded) > size:
+            continue
+        # Skip phrases already covered by a longer chosen one
+        if any(encoded in longer for longer in chosen[-200:]):
+            continue
+        chosen.append(encoded)
+        total += len(encoded)
+
+    return b''.join(reversed(chosen))
+
+class TextCodec:
+    """Compresses large text fields for storage and decompresses them on read"""
+
+    def __init__(self, codec: str = 'zlib', level: int = 6, min_size: int = 256):
+        self.logger = logging.getLogger(__name__)
+        if codec == 'zstd' and zstandard is None:
+            self.logger.warning("zstandard is not installed, compressing with zlib")
+            codec = 'zlib'
+        if codec not in CODECS:
+            raise ValueError(f"Unknown compression codec {codec!r}")
+
+        self.codec = codec
+        self.level = level
+        self.min_size = min_size
+        self.dictionaries: Dict[int, bytes] = {}
+        self.dictionary_id = 0
+        self._zstd_compressors: Dict[int, Any] = {}
+        self._zstd_decompressors: Dict[int, Any] = {}
+
+    def add_dictionary(self, dictionary_id: int, data: bytes, active: bool = False):
+        self.dictionaries[dictionary_id] = data
+        if active:
+            self.dictionary_id = dictionary_id
+
+    def encode(self, text: Optional[str]) -> Union[str, bytes, None]:
+        """Compressed BLOB, or the text itself when short or incompressible"""
+        if text is None or len(text) < self.min_size:
+            return text
+
+        raw = text.encode('utf-8')
+        dictionary = self.dictionaries.get(self.dictionary_id) if self.dictionary_id else None
+
+        if self.codec == 'zstd':
+            compressor = self._zstd_compressors.get(self.dictionary_id)
+            if compressor is None:
+                dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+                compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+                self._zstd_compressors[self.dictionary_id] = compressor
+            body = compressor.compress(raw)
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, zdict=dictionary) if dictionary \
+                else zlib.compressobj(self.level, zlib.DEFLATED, -15)
+            body = compressor.compress(raw) + compressor.flush()
+
+        if len(body) + HEADER.size >= len(raw):
+            return text
+        return HEADER.pack(CODECS[self.codec], self.dictionary_id if dictionary else 0) + body
+
+    def decode(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """Text of a stored value, compressed or not"""
+        if not isinstance(value, bytes):
+            return value
+
+        codec, dictionary_id = HEADER.unpack_from(value)
+        body = memoryview(value)[HEADER.size:]
+        dictionary = None
+        if dictionary_id:
+            dictionary = self.dictionaries.get(dictionary_id)
+            if dictionary is None:
+                raise ValueError(f"Compression dictionary {dictionary_id} is not loaded")
+
+        if codec == ZLIB:
+            decompressor = zlib.decompressobj(-15, zdict=dictionary) if dictionary else zlib.decompressobj(-15)
+            raw = decompressor.decompress(body) + decompressor.flush()
+        elif codec == ZSTD:
+            if zstandard is None:
+                raise ValueError("Value is zstd-compressed but zstandard is not installed")
+            decompressor = self._zstd_decompressors.get(dictionary_id)
+            if decompressor is None:
+                dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+                decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+                self._zstd_decompressors[dictionary_id] = decompressor
+            raw = decompressor.decompress(bytes(body))
+        else:
+            raise ValueError(f"Unknown compression codec id {codec}")
+
+        return raw.decode('utf-8')
+
+    def train(self, samples: List[str]) -> bytes:
+        """Dictionary data for this codec trained on sample texts"""
+        if self.codec == 'zstd':
+            encoded = [sample.encode('utf-8') for sample in samples if sample]
+            return zstandard.train_dictionary(ZSTD_DICTIONARY_SIZE, encoded).as_bytes()
+        return train_zlib_dictionary(samples)
+
+class LazyText:
+    """Data descriptor that decompresses a stored field on first access
+
+    The value lives in the slot of the same name on a base class (or the
+    instance __dict__ when there is none); the decoded text replaces the
+    BLOB there, so each field is decompressed at most once.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = next(
+            (klass.__dict__[name] for klass in owner.__mro__[1:] if name in klass.__dict__),
+            None
+        )
+
+    def _load(self, obj):
+        if self.slot is not None:
+            return self.slot.__get__(obj, type(obj))
+        return obj.__dict__.get(self.name)
+
+    def _store(self, obj, value):
+        if self.slot is not None:
+            self.slot.__set__(obj, value)
+        else:
+            obj.__dict__[self.name] = value
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self._load(obj)
+        if isinstance(value, bytes):
+            value = obj._codec.decode(value)
+            self._store(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        self._store(obj, value)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Topic classifier for scraped articles
+Hashed TF-IDF features with a softmax regression head, trained offline and
+memory-mapped at startup
+"""
+
+import re
+import json
+import zlib
+import sqlite3
+import logging
+import numpy as np
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+# 2^18 hashed unigram/bigram features
+N_FEATURES = 1 << 18
+MAX_TOKENS = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Token -> hashed feature index, shared across batches
+_feature_cache: Dict[str, int] = {}
+_FEATURE_CACHE_LIMIT = 200000
+
+def _feature(term: str) -> int:
+    index = _feature_cache.get(term)
+    if index is None:
+        if len(_feature_cache) >= _FEATURE_CACHE_LIMIT:
+            _feature_cache.clear()
+        # crc32 rather than hash() so indices are stable across processes
+        index = zlib.crc32(term.encode('utf-8')) & (N_FEATURES - 1)
+        _feature_cache[term] = index
+    return index
+
+def vectorize(texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sublinear term frequencies as CSR arrays (indptr, indices, data)"""
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+
+    for text in texts:
+        tokens = _TOKEN_RE.findall(text.lower())[:MAX_TOKENS]
+        terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        counts: Dict[int, int] = {}
+        for term in terms:
+            index = _feature(term)
+            counts[index] = counts.get(index, 0) + 1
+        indices.extend(counts)
+        data.extend(counts.values())
+        indptr.append(len(indices))
+
+    data_array = np.log1p(np.asarray(data, dtype=np.float32))
+    return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64), data_array
+
+def _apply_idf(indptr: np.ndarray, data: np.ndarray, idf_values: np.ndarray) -> np.ndarray:
+    """Scale term frequencies by their features' IDF and L2-normalize each row"""
+    data = data * idf_values
+    squares = _row_sums(indptr, data * data)
+    norms = np.sqrt(squares)
+    norms[norms == 0] = 1.0
+    return data / np.repeat(norms, np.diff(indptr))
+
+def _row_sums(indptr: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Per-row sums of CSR values, zero for empty rows"""
+    n_rows = len(indptr) - 1
+    if values.ndim == 1:
+        out = np.zeros(n_rows, dtype=values.dtype)
+    else:
+        out = np.zeros((n_rows,) + values.shape[1:], dtype=values.dtype)
+    nonempty = indptr[:-1] < indptr[1:]
+    if values.shape[0]:
+        out[nonempty] = np.add.reduceat(values, indptr[:-1][nonempty], axis=0)
+    return out
+
+def sparse_dot(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """CSR (rows x features) times dense (features x classes)"""
+    return _row_sums(indptr, data[:, None] * weights[indices])
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+def article_text(title: str, content: str) -> str:
+    # Title repeated so it weighs more than any single body sentence
+    return f"{title or ''} {title or ''} {content or ''}"
+
+class TopicClassifier:
+    """Loads a trained model and classifies batches of articles
+
+    The model is a single float32 .npy matrix whose first column holds the
+    IDF weights and remaining columns the per-class weights, plus a JSON
+    sidecar with class names and biases. The matrix is memory-mapped, so
+    only the rows for features that actually occur are paged in.
+    """
+
+    def __init__(self, model_path: str):
+        self.logger = logging.getLogger(__name__)
+        self.model_path = model_path
+
+        with open(f"{model_path}.json") as f:
+            meta = json.load(f)
+        self.classes: List[str] = meta['classes']
+        self.bias = np.asarray(meta['bias'], dtype=np.float32)
+
+        self.matrix = np.load(f"{model_path}.npy", mmap_mode='r')
+        if self.matrix.shape != (N_FEATURES, len(self.classes) + 1):
+            raise ValueError(f"Topic model {model_path} has unexpected shape {self.matrix.shape}")
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """Class probabilities, one row per text"""
+        if not texts:
+            return np.zeros((0, len(self.classes)), dtype=np.float32)
+
+        indptr, indices, data = vectorize(texts)
+        # Gather only the model rows this batch touches
+        rows = np.asarray(self.matrix[indices])
+        data = _apply_idf(indptr, data, rows[:, 0])
+        logits = _row_sums(indptr, data[:, None] * rows[:, 1:]) + self.bias
+        return softmax(logits)
+
+    def classify_articles(self, articles, min_confidence: float = 0.5) -> None:
+        """Store class probabilities and re-categorize confident predictions in place"""
+        if not articles:
+            return
+
+        probabilities = self.predict_proba([article_text(a.title, a.content) for a in articles])
+        best = probabilities.argmax(axis=1)
+
+        for article, row, top in zip(articles, probabilities.tolist(), best.tolist()):
+            article.topic_scores = {name: round(p, 4) for name, p in zip(self.classes, row)}
+            if row[top] >= min_confidence:
+                article.category = self.classes[top]
+
+def train_model(texts: List[str], labels: List[str], epochs: int = 200, learning_rate: float = 0.05,
+                l2: float = 1e-6) -> Dict[str, Any]:
+    """Fit IDF weights and a softmax regression over hashed TF-IDF features"""
+    classes = sorted(set(labels))
+    class_index = {name: i for i, name in enumerate(classes)}
+    y = np.array([class_index[label] for label in labels])
+    n_docs = len(texts)
+
+    indptr, indices, tf = vectorize(texts)
+
+    # Document frequency counts each feature once per document
+    row_ids = np.repeat(np.arange(n_docs), np.diff(indptr))
+    pairs = np.unique(row_ids * N_FEATURES + indices)
+    df = np.bincount(pairs % N_FEATURES, minlength=N_FEATURES)
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+    data = _apply_idf(indptr, tf, idf[indices])
+    targets = np.zeros((n_docs, len(classes)), dtype=np.float32)
+    targets[np.arange(n_docs), y] = 1.0
+
+    weights = np.zeros((N_FEATURES, len(classes)), dtype=np.float32)
+    bias = np.zeros(len(classes), dtype=np.float32)
+
+    # Adam over full batches; gradients only touch features present in the corpus
+    active = np.unique(indices)
+    local = np.searchsorted(active, indices)
+    w = np.zeros((len(active), len(classes)), dtype=np.float32)
+    m_w, v_w = np.zeros_like(w), np.zeros_like(w)
+    m_b, v_b = np.zeros_like(bias), np.zeros_like(bias)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+    for step in range(1, epochs + 1):
+        probabilities = softmax(sparse_dot(indptr, local, data, w) + bias)
+        error = (probabilities - targets) / n_docs
+
+        grad_w = np.zeros_like(w)
+        for c in range(len(classes)):
+            grad_w[:, c] = np.bincount(local, weights=data * error[row_ids, c], minlength=len(active))
+        grad_w += l2 * w
+        grad_b = error.sum(axis=0)
+
+        m_w = beta1 * m_w + (1 - beta1) * grad_w
+        v_w = beta2 * v_w + (1 - beta2) * grad_w * grad_w
+        m_b = beta1 * m_b + (1 - beta1) * grad_b
+        v_b = beta2 * v_b + (1 - beta2) * grad_b * grad_b
+        correction1, correction2 = 1 - beta1 ** step, 1 - beta2 ** step
+        w -= learning_rate * (m_w / correction1) / (np.sqrt(v_w / correction2) + eps)
+        bias -= learning_rate * (m_b / correction1) / (np.sqrt(v_b / correction2) + eps)
+
+    weights[active] = w
+    predictions = softmax(sparse_dot(indptr, local, data, w) + bias).argmax(axis=1)
+
+    return {
+        'classes': classes,
+        'idf': idf,
+        'weights': weights,
+        'bias': bias,
+        'training_accuracy': float((predictions == y).mean()),
+        'documents': n_docs
+    }
+
+def save_model(model: Dict[str, Any], model_path: str):
+    """Write the model matrix and its JSON sidecar"""
+    matrix = np.empty((N_FEATURES, len(model['classes']) + 1), dtype=np.float32)
+    matrix[:, 0] = model['idf']
+    matrix[:, 1:] = model['weights']
+    np.save(f"{model_path}.npy", matrix)
+
+    with open(f"{model_path}.json", 'w') as f:
+        json.dump({
+            'classes': model['classes'],
+            'bias': [float(b) for b in model['bias']],
+            'n_features': N_FEATURES,
+            'documents': model['documents'],
+            'training_accuracy': model['training_accuracy'],
+            'trained_at': datetime.now().isoformat()
+        }, f, indent=2)
+
+def load_training_data(data_path: Optional[str], db_path: Optional[str]) -> Tuple[List[str], List[str]]:
+    """Labelled texts from a JSON lines file and/or stored articles"""
+    texts, labels = [], []
+
+    if data_path:
+        with open(data_path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    texts.append(article_text(record.get('title', ''), record.get('content', '')))
+                    labels.append(record['label'])
+
+    if db_path:
+        from database import NewsDatabase
+        # Bodies may be stored compressed
+        codec = NewsDatabase(db_path).codec
+        with sqlite3.connect(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT title, content, category FROM news_articles WHERE category IS NOT NULL')
+            for title, content, category in cursor.fetchall():
+                texts.append(article_text(title, codec.decode(content)))
+                labels.append(category)
+
+    return texts, labels
+
+def main():
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description='Train the article topic classifier')
+    parser.add_argument('--data', help='JSON lines file of {"title", "content", "label"} records')
+    parser.add_argument('--from-db', help='Also train on stored articles labelled with their category')
+    parser.add_argument('--output', required=True, help='Model path without extension')
+    parser.add_argument('--epochs', type=int, default=200, help='Training epochs')
+    parser.add_argument('--learning-rate', type=float, default=0.05, help='Adam learning rate')
+    args = parser.parse_args()
+
+    texts, labels = load_training_data(args.data, args.from_db)
+    if len(set(labels)) < 2:
+        parser.error("Need labelled examples from at least two classes")
+
+    print(f"🧠 Training on {len(texts)} articles across {len(set(labels))} topics...")
+    model = train_model(texts, labels, epochs=args.epochs, learning_rate=args.learning_rate)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    save_model(model, args.output)
+    print(f"✅ Saved model to {args.output}.npy (training accuracy {model['training_accuracy']:.3f})")
+
+if __name__ == "__main__":
+    main()
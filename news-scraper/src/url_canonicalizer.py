@@ -0,0 +1,159 @@
+import logging
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Click and campaign tracking parameters that never change which article a
+# URL points to. Site-specific ones go in a domain's drop_params instead,
+# since keys like ref or src are real parameters on other sites
+TRACKING_PARAM_PREFIXES = ('utm_', 'mc_', 'hsa_')
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'gclsrc', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid',
+    'twclid', 'ttclid', 'igshid', 'li_fat_id', 'mkt_tok', '_hsenc', '_hsmi',
+    'pk_campaign', 'pk_kwd', 'pk_source', 'pk_medium', 'pk_content'
+}
+
+# Hosts whose links only redirect to the real article
+REDIRECTOR_HOSTS = {
+    'feeds.feedburner.com', 'feedproxy.google.com', 'feeds.feedblitz.com',
+    't.co', 'bit.ly', 'ow.ly', 'buff.ly', 'lnkd.in', 'trib.al', 'dlvr.it', 'tinyurl.com'
+}
+
+# Per-domain rules, matched on the registered domain and its subdomains
+DEFAULT_DOMAIN_RULES = {
+    'reuters.com': {'drop_query': True},
+    'wsj.com': {'drop_query': True},
+    'ft.com': {'drop_query': True},
+    'krebsonsecurity.com': {'drop_query': True},
+    'thehackernews.com': {'drop_query': True},
+    'securityweek.com': {'drop_query': True},
+    'fca.org.uk': {'drop_query': True}
+}
+
+class URLCanonicalizer:
+    """Normalizes article URLs so every variant of a link maps to one key"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.force_https = config.get('force_https', True)
+        self.strip_www = config.get('strip_www', True)
+        self.domain_rules = dict(DEFAULT_DOMAIN_RULES)
+        self.domain_rules.update(config.get('domains') or {})
+        self.tracking_params = TRACKING_PARAMS | {p.lower() for p in config.get('tracking_params', [])}
+
+    def rules_for(self, host: str) -> Dict[str, Any]:
+        """Most specific domain rule that applies to a host"""
+        parts = host.split('.')
+        for i in range(len(parts) - 1):
+            rules = self.domain_rules.get('.'.join(parts[i:]))
+            if rules is not None:
+                return rules
+        return {}
+
+    def is_redirector(self, url: str) -> bool:
+        return urlsplit(url).hostname in REDIRECTOR_HOSTS
+
+    def canonicalize(self, url: str) -> str:
+        """Canonical form of a URL; unparseable input is returned stripped"""
+        url = (url or '').strip()
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError:
+            return url
+
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https') or not parts.hostname:
+            return url
+
+        host = parts.hostname.lower()
+        path = parts.path or '/'
+
+        # Google AMP cache: https://example-com.cdn.ampproject.org/c/s/example.com/path
+        if host.endswith('.cdn.ampproject.org'):
+            segments = path.split('/')
+            if len(segments) > 3 and segments[1] == 'c':
+                offset = 3 if segments[2] == 's' else 2
+                host = segments[offset].lower()
+                path = '/' + '/'.join(segments[offset + 1:])
+
+        # AMP variants of the canonical page
+        if host.startswith('amp.'):
+            host = host[4:]
+        if path.endswith('/amp') or path.endswith('/amp/'):
+            path = path[:path.rstrip('/').rfind('/')] or '/'
+        if path.startswith('/amp/'):
+            path = path[4:]
+
+        if self.strip_www and host.startswith('www.'):
+            host = host[4:]
+
+        if self.force_https:
+            scheme = 'https'
+
+        # Drop default ports
+        netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+
+        rules = self.rules_for(host)
+        query = ''
+        if not rules.get('drop_query'):
+            keep = set(rules.get('keep_params', []))
+            drop = self.tracking_params | {p.lower() for p in rules.get('drop_params', [])}
+            params = [
+                (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                if key in keep or not (
+                    key.lower() in drop or key.lower().startswith(TRACKING_PARAM_PREFIXES)
+                )
+            ]
+            query = urlencode(sorted(params))
+
+        # Collapse duplicate slashes and trailing slashes
+        while '//' in path:
+            path = path.replace('//', '/')
+        if len(path) > 1 and path.endswith('/'):
+            path = path.rstrip('/')
+
+        return urlunsplit((scheme, netloc, path, query, ''))
+
+class RedirectResolver:
+    """Resolves redirector links to their final URL through a persistent cache"""
+
+    def __init__(self, db, session, timeout: float = 10):
+        self.db = db
+        self.session = session
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self._cache: Dict[str, str] = {}
+
+    def resolve(self, url: str, canonicalizer: URLCanonicalizer, offline: bool = False) -> str:
+        """Final URL for redirector links; other URLs are returned as-is
+
+        With ``offline`` set only cached resolutions are used.
+        """
+        if not canonicalizer.is_redirector(url):
+            return url
+
+        if url in self._cache:
+            return self._cache[url]
+
+        final_url = self.db.get_redirect(url)
+        if final_url is None and not offline:
+            final_url = self._follow(url)
+            if final_url:
+                self.db.save_redirect(url, final_url)
+
+        if final_url:
+            self._cache[url] = final_url
+            return final_url
+        return url
+
+    def _follow(self, url: str) -> Optional[str]:
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            if response.status_code in (405, 501):
+                # Some redirectors refuse HEAD
+                response = self.session.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+                response.close()
+            return response.url
+        except Exception as e:
+            self.logger.warning(f"Could not resolve redirect for {url}: {e}")
+            return None
@@ -0,0 +1,409 @@
+import sqlite3
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
+
+# Vendor health states, stored as small integers. Unknown samples (we
+# couldn't check the vendor) are kept raw but left out of rollups and
+# outages, so they count neither for nor against uptime
+STATE_CODES = {'operational': 0, 'degraded': 1, 'outage': 2, 'unknown': 3}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+UNKNOWN = STATE_CODES['unknown']
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+
+Window = Union[int, float, timedelta]
+
+def _seconds(window: Window) -> int:
+    if isinstance(window, timedelta):
+        return int(window.total_seconds())
+    return int(window)
+
+def _floor(ts: int, resolution: int) -> int:
+    return ts - ts % resolution
+
+def _ceil(ts: int, resolution: int) -> int:
+    return -(-ts // resolution) * resolution
+
+def covering_ranges(start: int, end: int) -> List[Tuple[int, int, int]]:
+    """Split [start, end) into (resolution, lo, hi) bucket ranges
+
+    Whole days are read from day buckets, the remaining whole hours from
+    hour buckets and only the ragged edges from minute buckets, so a query
+    touches at most a few hundred rollup rows whatever the window length.
+    """
+    start = _floor(start, MINUTE)
+    end = _ceil(end, MINUTE)
+    if end <= start:
+        return []
+
+    first_hour, last_hour = _ceil(start, HOUR), _floor(end, HOUR)
+    if first_hour >= last_hour:
+        return [(MINUTE, start, end)]
+
+    ranges = [(MINUTE, start, first_hour)]
+    first_day, last_day = _ceil(first_hour, DAY), _floor(last_hour, DAY)
+    if first_day >= last_day:
+        ranges.append((HOUR, first_hour, last_hour))
+    else:
+        ranges.extend([
+            (HOUR, first_hour, first_day),
+            (DAY, first_day, last_day),
+            (HOUR, last_day, last_hour)
+        ])
+    ranges.append((MINUTE, last_hour, end))
+
+    return [r for r in ranges if r[1] < r[2]]
+
+class VendorUptimeStore:
+    """Vendor health time series with raw samples and minute/hour/day rollups"""
+
+    def __init__(self, db_path: str, raw_retention_days: int = 7,
+                 minute_retention_days: int = 35, hour_retention_days: int = 400):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+
+        # Day rollups are kept forever
+        self.retention = {
+            'raw': raw_retention_days * DAY,
+            MINUTE: minute_retention_days * DAY,
+            HOUR: hour_retention_days * DAY
+        }
+
+        self._vendor_ids: Dict[str, int] = {}
+        self._open_outages: Dict[int, Optional[Tuple[int, int]]] = {}
+        self.init_database()
+
+    def init_database(self):
+        """Create the time-series tables"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS ts_vendors (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT UNIQUE NOT NULL
+                    )
+                ''')
+
+                # Raw samples: epoch seconds and a state code per vendor
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS ts_samples (
+                        vendor_id INTEGER NOT NULL,
+                        ts INTEGER NOT NULL,
+                        state INTEGER NOT NULL,
+                        PRIMARY KEY (vendor_id, ts)
+                    ) WITHOUT ROWID
+                ''')
+
+                # Bucket counts per resolution (60, 3600 or 86400 seconds)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS ts_rollups (
+                        vendor_id INTEGER NOT NULL,
+                        resolution INTEGER NOT NULL,
+                        bucket INTEGER NOT NULL,
+                        samples INTEGER NOT NULL,
+                        degraded INTEGER NOT NULL,
+                        outage INTEGER NOT NULL,
+                        PRIMARY KEY (vendor_id, resolution, bucket)
+                    ) WITHOUT ROWID
+                ''')
+
+                # Contiguous non-operational periods
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS ts_outages (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        vendor_id INTEGER NOT NULL,
+                        started_at INTEGER NOT NULL,
+                        resolved_at INTEGER,
+                        worst_state INTEGER NOT NULL
+                    )
+                ''')
+
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_ts_outages_vendor_started ON ts_outages(vendor_id, started_at)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_ts_outages_vendor_resolved ON ts_outages(vendor_id, resolved_at)')
+
+                conn.commit()
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Time-series initialization error: {e}")
+            raise
+
+    def _vendor_id(self, cursor, vendor_name: str, create: bool = True) -> Optional[int]:
+        if vendor_name in self._vendor_ids:
+            return self._vendor_ids[vendor_name]
+
+        cursor.execute('SELECT id FROM ts_vendors WHERE name = ?', (vendor_name,))
+        row = cursor.fetchone()
+        if row is None:
+            if not create:
+                return None
+            cursor.execute('INSERT INTO ts_vendors (name) VALUES (?)', (vendor_name,))
+            vendor_id = cursor.lastrowid
+        else:
+            vendor_id = row[0]
+
+        self._vendor_ids[vendor_name] = vendor_id
+        return vendor_id
+
+    def _open_outage(self, cursor, vendor_id: int) -> Optional[Tuple[int, int]]:
+        if vendor_id not in self._open_outages:
+            cursor.execute('''
+                SELECT id, worst_state FROM ts_outages
+                WHERE vendor_id = ? AND resolved_at IS NULL
+                ORDER BY started_at DESC LIMIT 1
+            ''', (vendor_id,))
+            self._open_outages[vendor_id] = cursor.fetchone()
+        return self._open_outages[vendor_id]
+
+    def record_sample(self, vendor_name: str, state: str, ts: Optional[int] = None):
+        """Record a single health sample for a vendor"""
+        self.record_samples([(vendor_name, int(ts if ts is not None else time.time()), state)])
+
+    def record_samples(self, samples: Iterable[Tuple[str, int, str]]) -> int:
+        """Record (vendor, epoch seconds, state) samples in one transaction
+
+        Samples must be chronological per vendor. Rollups are aggregated in
+        memory first, so a batch costs one upsert per touched bucket, and
+        data already past its retention is never written.
+        """
+        now = int(time.time())
+        raw_horizon = now - self.retention['raw']
+        minute_horizon = now - self.retention[MINUTE]
+        hour_horizon = now - self.retention[HOUR]
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+
+                raw_rows = []
+                minutes: Dict[Tuple[int, int], List[int]] = {}
+                outage_updates = []
+                count = 0
+
+                vendor_ids = self._vendor_ids
+                open_outages = self._open_outages
+                for vendor_name, ts, state in samples:
+                    vendor_id = vendor_ids.get(vendor_name)
+                    if vendor_id is None:
+                        vendor_id = self._vendor_id(cursor, vendor_name)
+                    code = STATE_CODES[state] if isinstance(state, str) else int(state)
+                    ts = int(ts)
+                    count += 1
+
+                    if ts >= raw_horizon:
+                        raw_rows.append((vendor_id, ts, code))
+                    if code == UNKNOWN:
+                        continue
+
+                    key = (vendor_id, ts - ts % MINUTE)
+                    bucket = minutes.get(key)
+                    if bucket is None:
+                        bucket = minutes[key] = [0, 0, 0]
+                    bucket[0] += 1
+                    if code:
+                        bucket[code] += 1
+
+                    # Open, escalate or close the vendor's current outage
+                    if vendor_id in open_outages:
+                        current = open_outages[vendor_id]
+                    else:
+                        current = self._open_outage(cursor, vendor_id)
+                    if not code:
+                        if current is not None:
+                            outage_updates.append(('resolved', current[0], ts))
+                            open_outages[vendor_id] = None
+                    elif current is None:
+                        cursor.execute('''
+                            INSERT INTO ts_outages (vendor_id, started_at, worst_state)
+                            VALUES (?, ?, ?)
+                        ''', (vendor_id, ts, code))
+                        open_outages[vendor_id] = (cursor.lastrowid, code)
+                    elif code > current[1]:
+                        outage_updates.append(('worst', current[0], code))
+                        open_outages[vendor_id] = (current[0], code)
+
+                # Hour and day buckets are derived from the minute buckets
+                rollups: Dict[Tuple[int, int, int], List[int]] = {}
+                for (vendor_id, minute), counts in minutes.items():
+                    for resolution, horizon in ((MINUTE, minute_horizon), (HOUR, hour_horizon), (DAY, None)):
+                        bucket_start = minute - minute % resolution
+                        if horizon is not None and bucket_start + resolution <= horizon:
+                            continue
+                        totals = rollups.setdefault((vendor_id, resolution, bucket_start), [0, 0, 0])
+                        totals[0] += counts[0]
+                        totals[1] += counts[1]
+                        totals[2] += counts[2]
+
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO ts_samples (vendor_id, ts, state)
+                    VALUES (?, ?, ?)
+                ''', raw_rows)
+
+                cursor.executemany('''
+                    INSERT INTO ts_rollups (vendor_id, resolution, bucket, samples, degraded, outage)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(vendor_id, resolution, bucket) DO UPDATE SET
+                        samples = samples + excluded.samples,
+                        degraded = degraded + excluded.degraded,
+                        outage = outage + excluded.outage
+                ''', [key + tuple(totals) for key, totals in rollups.items()])
+
+                for kind, outage_id, value in outage_updates:
+                    if kind == 'worst':
+                        cursor.execute('UPDATE ts_outages SET worst_state = ? WHERE id = ?', (value, outage_id))
+                    else:
+                        cursor.execute('UPDATE ts_outages SET resolved_at = ? WHERE id = ?', (value, outage_id))
+
+                conn.commit()
+                return count
+
+        except sqlite3.Error as e:
+            # Cached outage ids may refer to rolled-back rows
+            self._open_outages.clear()
+            self.logger.error(f"Error recording vendor samples: {e}")
+            return 0
+
+    def uptime(self, vendor_name: str, window: Window = timedelta(days=30),
+               end: Optional[int] = None, strict: bool = False) -> Optional[float]:
+        """Fraction of samples in the window where the vendor was up
+
+        Degraded samples count as up unless ``strict`` is set; unknown ones
+        don't count at all. Returns None when there are no samples in the
+        window. A window edge older than the minute (or hour) rollups kept
+        is widened to the whole hour (or day) around it.
+        """
+        now = int(time.time())
+        end = int(end if end is not None else now)
+        start = end - _seconds(window)
+
+        # Past their retention only the coarser buckets are left to read
+        for resolution, coarser in ((MINUTE, HOUR), (HOUR, DAY)):
+            horizon = now - self.retention[resolution]
+            if start < horizon:
+                start = _floor(start, coarser)
+            if end < horizon:
+                end = _ceil(end, coarser)
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                vendor_id = self._vendor_id(cursor, vendor_name, create=False)
+                if vendor_id is None:
+                    return None
+
+                samples = degraded = outage = 0
+                for resolution, lo, hi in covering_ranges(start, end):
+                    cursor.execute('''
+                        SELECT TOTAL(samples), TOTAL(degraded), TOTAL(outage)
+                        FROM ts_rollups
+                        WHERE vendor_id = ? AND resolution = ? AND bucket >= ? AND bucket < ?
+                    ''', (vendor_id, resolution, lo, hi))
+                    row = cursor.fetchone()
+                    samples += row[0]
+                    degraded += row[1]
+                    outage += row[2]
+
+                if not samples:
+                    return None
+
+                down = outage + degraded if strict else outage
+                return 1.0 - down / samples
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error computing uptime for {vendor_name}: {e}")
+            return None
+
+    def mttr(self, vendor_name: str, window: Window = timedelta(days=30),
+             end: Optional[int] = None) -> Optional[float]:
+        """Mean time to recovery in seconds for outages resolved in the window"""
+        end = int(end if end is not None else time.time())
+        start = end - _seconds(window)
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                vendor_id = self._vendor_id(cursor, vendor_name, create=False)
+                if vendor_id is None:
+                    return None
+
+                cursor.execute('''
+                    SELECT AVG(resolved_at - started_at)
+                    FROM ts_outages
+                    WHERE vendor_id = ? AND resolved_at >= ? AND resolved_at < ?
+                ''', (vendor_id, start, end))
+                return cursor.fetchone()[0]
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error computing MTTR for {vendor_name}: {e}")
+            return None
+
+    def incident_timeline(self, vendor_name: str, since: Optional[int] = None,
+                          limit: int = 100) -> List[Dict[str, Any]]:
+        """Degraded and outage periods for a vendor, newest first"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                vendor_id = self._vendor_id(cursor, vendor_name, create=False)
+                if vendor_id is None:
+                    return []
+
+                cursor.execute('''
+                    SELECT started_at, resolved_at, worst_state
+                    FROM ts_outages
+                    WHERE vendor_id = ? AND started_at >= ?
+                    ORDER BY started_at DESC
+                    LIMIT ?
+                ''', (vendor_id, since or 0, limit))
+
+                timeline = []
+                for started_at, resolved_at, worst_state in cursor.fetchall():
+                    timeline.append({
+                        'started_at': datetime.fromtimestamp(started_at),
+                        'resolved_at': datetime.fromtimestamp(resolved_at) if resolved_at else None,
+                        'duration': (resolved_at - started_at) if resolved_at else None,
+                        'state': STATE_NAMES[worst_state]
+                    })
+
+                return timeline
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting incident timeline for {vendor_name}: {e}")
+            return []
+
+    def prune(self, now: Optional[int] = None) -> int:
+        """Drop raw samples and rollups that are past their retention"""
+        now = int(now if now is not None else time.time())
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT id FROM ts_vendors')
+                vendor_ids = [row[0] for row in cursor.fetchall()]
+
+                # Per-vendor deletes stay on the primary key ranges
+                deleted = 0
+                for vendor_id in vendor_ids:
+                    cursor.execute('''
+                        DELETE FROM ts_samples WHERE vendor_id = ? AND ts < ?
+                    ''', (vendor_id, now - self.retention['raw']))
+                    deleted += cursor.rowcount
+
+                    for resolution in (MINUTE, HOUR):
+                        cursor.execute('''
+                            DELETE FROM ts_rollups
+                            WHERE vendor_id = ? AND resolution = ? AND bucket < ?
+                        ''', (vendor_id, resolution, now - self.retention[resolution] - resolution))
+                        deleted += cursor.rowcount
+
+                conn.commit()
+                self.logger.info(f"Pruned {deleted} expired vendor time-series rows")
+                return deleted
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error pruning vendor time series: {e}")
+            return 0
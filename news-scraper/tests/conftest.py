@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The scripts put src/ on the path and import its modules by name; do the same
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+# Benchmarks import their helpers (fixtures, stub_server) by name too
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from database import NewsArticle, ArticleBatch, NewsDatabase
+from text_codec import TextCodec
+
+def article(n, **fields):
+    values = dict(title=f'Story {n}', content='Body', url=f'https://example.com/{n}',
+                  source='Regulator', category='Regulatory', tags=['sec', 'enforcement'])
+    values.update(fields)
+    return NewsArticle(**values)
+
+def test_articles_are_slotted():
+    with pytest.raises(AttributeError):
+        article(1).extra = True
+
+def test_tags_are_shared_and_copied_on_write():
+    config_tags = ['sec', 'enforcement']
+    first, second = article(1, tags=config_tags), article(2, tags=list(config_tags))
+    assert first.tags is second.tags
+    assert first.source is second.source
+
+    first.add_tags(['fine', 'sec'])
+    assert first.tags == ('sec', 'enforcement', 'fine')
+    assert second.tags == ('sec', 'enforcement')
+    assert config_tags == ['sec', 'enforcement']
+
+def test_timestamps_read_as_utc_datetimes():
+    story = article(1, published_date=1_700_000_000)
+    assert story.published_date == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+    assert NewsArticle.published_date.epoch(story) == 1_700_000_000
+    assert article(2).published_date is None
+
+def test_batch_round_trip():
+    articles = [article(n, summary=f'Summary {n}') for n in range(5)]
+    batch = ArticleBatch(articles)
+    assert len(batch) == 5
+    assert batch[2] == articles[2]
+    assert batch[2] is not articles[2]
+    assert list(batch[1:3]) == articles[1:3]
+    assert batch.column('url') == [a.url for a in articles]
+
+def test_batch_keeps_text_compressed_until_taken_out():
+    codec = TextCodec(min_size=16)
+    text = 'Enforcement action against a broker-dealer. ' * 20
+    batch = ArticleBatch(codec=codec)
+    batch.append(article(1, content=codec.encode(text)))
+    assert isinstance(batch.column('content')[0], bytes)
+    assert batch[0].content == text
+
+def test_batches_from_the_database(tmp_path):
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    for n in range(7):
+        db.add_article(article(n, source='Wire' if n % 2 else 'Regulator'))
+
+    batches = list(db.iter_article_batches(batch_size=3))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [a.title for batch in batches for a in batch] == [f'Story {n}' for n in range(7)]
+    assert sum(len(batch) for batch in db.iter_article_batches(source='Wire')) == 3
@@ -0,0 +1,63 @@
+import os
+from datetime import datetime
+
+import pytest
+import requests
+
+import fixtures as fixtures_module
+from fixtures import ROOT_DIR, load_config, synthetic_fixtures, save_fixtures, load_fixtures, source_path
+from stub_server import StubServer, SINK_PATH
+
+CONFIG = os.path.join(ROOT_DIR, 'config', 'config.yaml')
+
+@pytest.fixture(scope='module')
+def fixtures():
+    return synthetic_fixtures(load_config(CONFIG), items=5)
+
+@pytest.fixture
+def stub(fixtures):
+    server = StubServer(fixtures)
+    server.start()
+    yield server
+    server.stop()
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 5, 1, 12, 0, tzinfo=tz)
+
+def test_synthetic_fixtures_are_deterministic_and_round_trip(tmp_path, monkeypatch):
+    # Only the timestamps depend on the clock
+    monkeypatch.setattr(fixtures_module, 'datetime', FrozenDatetime)
+    monkeypatch.setattr(fixtures_module.time, 'time', lambda: 1714564800.0)
+    config = load_config(CONFIG)
+    generated = synthetic_fixtures(config, items=5)
+    assert synthetic_fixtures(config, items=5) == generated
+    assert all(source_path(source) in generated for sources in config['sources'].values() for source in sources)
+
+    save_fixtures(str(tmp_path), generated, 'synthetic')
+    loaded = load_fixtures(str(tmp_path))
+    assert {path: fixture['body'] for path, fixture in loaded.items()} == \
+        {path: fixture['body'] for path, fixture in generated.items()}
+
+def test_stub_serves_fixtures_with_etags_and_a_sink(stub):
+    path = next(path for path in stub.fixtures if path.startswith('/sources/'))
+    first = requests.get(stub.base_url + path, timeout=5)
+    assert first.status_code == 200
+    assert b'__STUB_BASE__' not in first.content
+
+    again = requests.get(stub.base_url + path, headers={'If-None-Match': first.headers['ETag']}, timeout=5)
+    assert again.status_code == 304
+    assert requests.get(stub.base_url + '/missing', timeout=5).status_code == 404
+
+    posted = requests.post(stub.base_url + SINK_PATH, json={'articles': [{'title': 'a'}, {'title': 'b'}]}, timeout=5)
+    assert posted.json() == {'success': True, 'processed': 2}
+    assert (stub.stats['not_modified'], stub.stats['sink_articles']) == (1, 2)
+
+def test_replayed_scrape_benchmark(stub, tmp_path):
+    from bench_pipeline import bench_scrape
+    result = bench_scrape({'config': CONFIG, 'enrich': False}, stub.base_url, str(tmp_path))
+    assert result['failed_sources'] == 0
+    assert result['successful_sources'] == result['sources'] > 0
+    assert result['articles_saved'] > 0
+    assert 'fetch' in result['stages']
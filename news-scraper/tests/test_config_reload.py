@@ -0,0 +1,91 @@
+import copy
+
+import pytest
+
+from config_reload import ConfigWatcher, config_diff, has_changes, validate_config
+
+BASE = {
+    'database': {'path': 'news.db'},
+    'scraping': {'max_articles_per_source': 50, 'max_content_length': 5000, 'request_timeout': 30,
+                 'delay_between_requests': 2, 'user_agent': 'test'},
+    'filtering': {'keywords': {'regulatory': ['sec']}, 'exclude_keywords': []},
+    'processing': {'enable_nlp': False},
+    'sources': {
+        'regulatory_news': [
+            {'name': 'SEC News', 'url': 'https://www.sec.gov/rss', 'type': 'rss', 'tags': ['SEC']},
+            {'name': 'FCA News', 'url': 'https://www.fca.org.uk/rss', 'type': 'rss', 'tags': ['FCA']}
+        ]
+    }
+}
+
+@pytest.fixture
+def config():
+    return copy.deepcopy(BASE)
+
+def test_identical_configs_have_no_changes(config):
+    diff = config_diff(BASE, config)
+    assert not has_changes(diff)
+    assert diff == {'sections': [], 'restart_required': [], 'sources_added': [],
+                    'sources_removed': [], 'sources_changed': []}
+
+def test_section_changes(config):
+    config['scraping']['request_timeout'] = 10
+    config['database']['path'] = 'other.db'
+    config['health'] = {'failure_threshold': 3}
+    diff = config_diff(BASE, config)
+    assert diff['sections'] == ['database', 'health', 'scraping']
+    assert diff['restart_required'] == ['database']
+    assert has_changes(diff)
+
+def test_source_changes(config):
+    sources = config['sources']['regulatory_news']
+    sources[0]['tags'] = ['SEC', 'enforcement']
+    del sources[1]
+    config['sources']['vendor_news'] = [{'name': 'AWS Status', 'url': 'https://status.aws.amazon.com/rss',
+                                         'type': 'rss', 'tags': []}]
+    diff = config_diff(BASE, config)
+    assert diff['sections'] == []
+    assert diff['sources_added'] == ['AWS Status']
+    assert diff['sources_removed'] == ['FCA News']
+    assert diff['sources_changed'] == ['SEC News']
+
+def test_moving_a_source_to_another_category_changes_it(config):
+    config['sources'] = {'other': config['sources']['regulatory_news']}
+    assert config_diff(BASE, config)['sources_changed'] == ['FCA News', 'SEC News']
+
+def test_validate_config(config):
+    assert validate_config(config) == []
+    assert validate_config({}) == ['config is empty or not a mapping']
+
+    config['scraping']['request_timeout'] = 0
+    config['sources']['regulatory_news'].append(
+        {'name': 'SEC News', 'url': 'ftp://example.com', 'type': 'atom', 'tags': 'SEC'}
+    )
+    config['schedule'] = {'daily_time': '25:00', 'weekly_day': 'Monday'}
+    errors = validate_config(config)
+    assert 'scraping.request_timeout: must be a positive number' in errors
+    assert 'sources.regulatory_news.SEC News: url must be http(s)' in errors
+    assert 'sources.regulatory_news.SEC News: duplicate source name' in errors
+    assert 'sources.regulatory_news.SEC News: tags must be a list' in errors
+    assert 'schedule.daily_time: must be HH:MM' in errors
+    assert 'schedule.weekly_day: must be a lowercase weekday name' in errors
+
+def test_watcher_loads_only_valid_changes(tmp_path, config):
+    path = tmp_path / 'config.yaml'
+    path.write_text('v1')
+    loaded = [config]
+    watcher = ConfigWatcher(str(path), lambda: loaded[0], check_seconds=0)
+    assert watcher.poll() is None
+
+    path.write_text('version 2')
+    assert watcher.poll() is config
+    assert watcher.poll() is None
+
+    # An invalid file is ignored until it changes again
+    loaded[0] = {}
+    path.write_text('version 3, broken')
+    assert watcher.poll() is None
+
+    loaded[0] = config
+    watcher.requested = True
+    assert watcher.poll() is config
@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+
+from database import NewsDatabase, NewsArticle
+
+DAY = 86400
+
+@pytest.fixture
+def db(tmp_path):
+    return NewsDatabase(str(tmp_path / 'news.db'))
+
+def add(db, n, source='Regulator', category='Regulatory', scraped_date=20000 * DAY):
+    return db.add_article(NewsArticle(title=f'Story {n}', content='Body', url=f'https://example.com/{n}',
+                                      source=source, category=category, scraped_date=scraped_date))
+
+def counters(db):
+    stats = db.get_scraping_stats()
+    return {key: stats[key] for key in ('total_articles', 'articles_by_category', 'articles_by_source', 'articles_by_day')}
+
+def test_triggers_track_inserts_updates_and_deletes(db):
+    add(db, 1)
+    add(db, 2, source='Wire', category=None)
+    add(db, 3, scraped_date=20001 * DAY)
+
+    assert counters(db) == {
+        'total_articles': 3,
+        'articles_by_category': {'Regulatory': 2, None: 1},
+        'articles_by_source': {'Regulator': 2, 'Wire': 1},
+        'articles_by_day': {'2024-10-04': 2, '2024-10-05': 1}
+    }
+
+    # Re-saving a URL keeps the stored row and the counters don't move
+    add(db, 1, source='Wire', category='Enforcement')
+
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("UPDATE news_articles SET category = 'Enforcement' WHERE url = 'https://example.com/2'")
+    conn.execute("DELETE FROM news_articles WHERE url = 'https://example.com/3'")
+    conn.commit()
+    conn.close()
+
+    expected = {
+        'total_articles': 2,
+        'articles_by_category': {'Regulatory': 1, 'Enforcement': 1},
+        'articles_by_source': {'Regulator': 1, 'Wire': 1},
+        'articles_by_day': {'2024-10-04': 2}
+    }
+    assert counters(db) == expected
+
+    db.rebuild_stats()
+    assert counters(db) == expected
+
+def test_source_run_stats(db):
+    db.log_scraping_session('Regulator', 'success', 5, scraping_duration=2.0)
+    db.log_scraping_session('Regulator', 'error', 0, 'timeout', scraping_duration=10.0)
+    db.log_scraping_session('Regulator', 'success', 3)
+
+    health = db.get_scraping_stats()['source_health']['Regulator']
+    assert health == {
+        'runs': 3,
+        'successes': 2,
+        'failures': 1,
+        'success_rate': 0.667,
+        'articles': 8,
+        'avg_duration': 6.0,
+        'max_duration': 10.0
+    }
+
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("DELETE FROM scraping_logs WHERE status = 'error'")
+    conn.commit()
+    conn.close()
+
+    health = db.get_scraping_stats()['source_health']['Regulator']
+    assert (health['runs'], health['failures'], health['avg_duration']) == (2, 0, 2.0)
+
+    # The delete trigger can't lower a maximum; a rebuild does
+    db.rebuild_stats()
+    assert db.get_scraping_stats()['source_health']['Regulator']['max_duration'] == 2.0
+
+def test_counters_are_built_for_databases_that_predate_them(db):
+    add(db, 1)
+    add(db, 2)
+    conn = sqlite3.connect(db.db_path)
+    conn.execute('DROP TABLE article_stats')
+    conn.commit()
+    conn.close()
+
+    assert NewsDatabase(db.db_path).get_scraping_stats()['total_articles'] == 2
@@ -0,0 +1,73 @@
+import sqlite3
+
+from database import NewsDatabase, NewsArticle
+from dedup import (
+    NUM_PERMUTATIONS, BAND_COUNT,
+    minhash, similarity, signature_bands, shingles, to_blob, from_blob
+)
+
+STORY = ("Regulator fines bank $50 million over anti-money laundering failures",
+         "The regulator said the bank failed to monitor transactions for suspicious activity over "
+         "several years and must appoint an independent monitor to review its controls.")
+
+REWRITE = ("Regulator fines bank $50 million over anti-money laundering failures - Wire",
+           "The regulator said on Tuesday the bank failed to monitor transactions for suspicious activity "
+           "over several years and must appoint an independent monitor to review its controls.")
+
+OTHER = ("Cloud provider reports outage in two regions",
+         "Customers saw elevated error rates for compute and storage services for three hours.")
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles('Bank FINED!', '') == shingles('bank fined', '')
+    assert shingles('Fined', '') == {'fined'}
+
+def test_similar_stories_have_similar_signatures():
+    story, rewrite, other = minhash(*STORY), minhash(*REWRITE), minhash(*OTHER)
+    assert len(story) == NUM_PERMUTATIONS
+    assert minhash(*STORY) == story
+    assert similarity(story, story) == 1.0
+    assert similarity(story, rewrite) >= 0.5
+    assert similarity(story, other) < 0.2
+
+def test_bands_and_blobs():
+    signature = minhash(*STORY)
+    bands = signature_bands(signature)
+    assert len(bands) == BAND_COUNT
+    assert all(-(1 << 63) <= band < (1 << 63) for band in bands)
+    assert from_blob(to_blob(signature)) == signature
+
+def test_empty_text_has_a_signature():
+    assert len(minhash('', '')) == NUM_PERMUTATIONS
+
+def test_near_duplicates_join_the_first_copys_cluster(tmp_path):
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+
+    def save(n, title, content, source):
+        signature = minhash(title, content)
+        article = NewsArticle(title=title, content=content, url=f'https://example.com/{n}', source=source,
+                              cluster_id=db.find_near_duplicate_cluster(signature))
+        db.add_article(article, signature)
+        return article.cluster_id
+
+    first = save(1, *STORY, 'Regulator')
+    assert save(2, *REWRITE, 'Wire') == first
+    assert save(3, *OTHER, 'Status') != first
+
+    assert sorted(a.source for a in db.get_cluster_articles(first)) == ['Regulator', 'Wire']
+
+def test_saving_a_stored_url_again_keeps_the_first_row(tmp_path):
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    first = NewsArticle(title=STORY[0], content=STORY[1], url='https://example.com/1', source='Regulator',
+                        entities=['regulator:sec'])
+    first_id = db.add_article(first, minhash(*STORY))
+    again = NewsArticle(title=REWRITE[0], content=REWRITE[1], url='https://example.com/1', source='Wire',
+                        entities=['vendor:aws'])
+    assert db.add_article(again, minhash(*REWRITE)) == first_id
+
+    conn = sqlite3.connect(db.db_path)
+    counts = [conn.execute(f'SELECT COUNT(*) FROM {table} WHERE article_id != ?', (first_id,)).fetchone()[0]
+              for table in ('article_signatures', 'signature_bands', 'article_entities')]
+    assert counts == [0, 0, 0]
+    assert conn.execute('SELECT source FROM news_articles').fetchall() == [('Regulator',)]
+    conn.close()
+    assert db.find_near_duplicate_cluster(minhash(*REWRITE)) == first_id
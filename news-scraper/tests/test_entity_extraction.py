@@ -0,0 +1,56 @@
+from database import NewsArticle, NewsDatabase
+from entity_extraction import EntityExtractor, is_entity_id
+
+extractor = EntityExtractor()
+
+def test_aliases_in_order_of_first_mention():
+    text = 'The Securities and Exchange Commission said AWS and Microsoft Azure must meet GDPR; aws again.'
+    assert extractor.extract(text) == ['regulator:sec', 'vendor:aws', 'vendor:azure', 'framework:gdpr']
+
+def test_longest_alias_wins():
+    assert extractor.extract('Outage at Google Cloud Platform') == ['vendor:google-cloud']
+    assert extractor.extract('Microsoft Azure outage') == ['vendor:azure']
+
+def test_acronyms_only_match_their_casing():
+    assert extractor.extract('SEC fines firm') == ['regulator:sec']
+    assert extractor.extract('response within one sec') == []
+    assert extractor.extract('Stripe and Plaid') == ['vendor:stripe', 'vendor:plaid']
+    assert extractor.extract('a stripe of plaid') == []
+
+def test_ambiguous_names_are_not_entities():
+    assert extractor.extract('Amazon raises Prime prices as Google search ads slow') == []
+    assert extractor.extract('Retailer fined over PCI and SOX lapses') == []
+    assert extractor.extract('Sarbanes-Oxley and PCI DSS audit at Amazon Web Services') == [
+        'framework:sox', 'framework:pci-dss', 'vendor:aws'
+    ]
+
+def test_identifier_patterns():
+    text = ('Patch CVE-2024-3094 now, per Regulation (EU) 2022/2554, '
+            'Directive 2016/680/EU and 17 CFR Part 240.10b-5.')
+    assert extractor.extract(text) == [
+        'cve:CVE-2024-3094', 'regulation:eu-2022/2554', 'regulation:eu-2016/680', 'regulation:cfr-17-240.10b-5'
+    ]
+
+def test_configured_entities_and_lookups():
+    custom = EntityExtractor({'gazetteer': {'vendor:snowflake': {'name': 'Snowflake', 'aliases': ['snowflake']}}})
+    assert custom.extract('Snowflake breach') == ['vendor:snowflake']
+    assert custom.resolve('Snowflake') == 'vendor:snowflake'
+    assert custom.resolve('Amazon Web Services') == 'vendor:aws'
+    assert custom.resolve('vendor:aws') == 'vendor:aws'
+    assert custom.resolve('Unknown Corp') is None
+    assert custom.display_name('vendor:aws') == 'Amazon Web Services'
+    assert custom.display_name('cve:CVE-2024-3094') == 'CVE-2024-3094'
+    assert extractor.extract('Snowflake breach') == []
+
+def test_extract_articles_keeps_existing_entities():
+    article = NewsArticle(title='FCA fines bank', content='The FCA cited AML failings.', entities=['vendor:aws'])
+    extractor.extract_articles([article])
+    assert article.entities == ['vendor:aws', 'regulator:fca', 'framework:aml']
+    assert is_entity_id('regulator:fca') and not is_entity_id('AWS')
+
+def test_articles_are_found_by_entity(tmp_path):
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    for n, title in enumerate(['AWS outage', 'Azure outage', 'AWS and Azure pricing']):
+        db.add_article(NewsArticle(title=title, url=f'https://example.com/{n}', source='Wire',
+                                   entities=extractor.extract(title)))
+    assert sorted(a.title for a in db.get_articles_by_entities(['vendor:aws'])) == ['AWS and Azure pricing', 'AWS outage']
@@ -0,0 +1,113 @@
+import sqlite3
+from datetime import datetime, timezone
+
+from database import NewsDatabase
+
+# news_articles as created before timestamps were epoch seconds
+OLD_SCHEMA = '''
+    CREATE TABLE news_articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        content TEXT,
+        url TEXT UNIQUE NOT NULL,
+        source TEXT NOT NULL,
+        published_date DATETIME,
+        scraped_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        tags TEXT,
+        category TEXT,
+        sentiment_score REAL,
+        relevance_score REAL,
+        entities TEXT,
+        summary TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+def utc(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+def test_text_timestamps_become_epoch_seconds(tmp_path):
+    path = str(tmp_path / 'news.db')
+    conn = sqlite3.connect(path)
+    conn.execute(OLD_SCHEMA)
+    conn.executemany('''
+        INSERT INTO news_articles (title, url, source, category, tags, published_date, scraped_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        ('Plain', 'https://example.com/1', 'Regulator', 'Regulatory', '["sec"]', '2024-05-01 10:00:00', '2024-05-01 11:00:00'),
+        ('ISO with offset', 'https://example.com/2', 'Regulator', 'Regulatory', '[]', '2024-05-01T12:00:00+02:00', '2024-05-01 11:00:00'),
+        ('No date', 'https://example.com/3', 'Wire', None, None, None, '2024-05-02 00:30:00')
+    ])
+    conn.commit()
+    conn.close()
+
+    db = NewsDatabase(path)
+
+    conn = sqlite3.connect(path)
+    columns = {row[1]: row[2] for row in conn.execute('PRAGMA table_info(news_articles)')}
+    rows = conn.execute('SELECT url, published_date, scraped_date, typeof(created_at) FROM news_articles ORDER BY id').fetchall()
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'news_articles'")}
+    conn.close()
+
+    assert columns['published_date'] == columns['scraped_date'] == 'INTEGER'
+    assert 'cluster_id' in columns
+    assert rows == [
+        ('https://example.com/1', utc(2024, 5, 1, 10), utc(2024, 5, 1, 11), 'integer'),
+        ('https://example.com/2', utc(2024, 5, 1, 10), utc(2024, 5, 1, 11), 'integer'),
+        ('https://example.com/3', None, utc(2024, 5, 2, 0, 30), 'integer')
+    ]
+    assert 'idx_news_articles_source_published' in indexes
+
+    # Counters are rebuilt from the migrated rows, by UTC day
+    stats = db.get_scraping_stats()
+    assert stats['total_articles'] == 3
+    assert stats['articles_by_day'] == {'2024-05-01': 2, '2024-05-02': 1}
+
+    articles = {a.url: a for a in db.get_articles()}
+    assert articles['https://example.com/1'].published_date == datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+    assert articles['https://example.com/1'].tags == ('sec',)
+
+def test_migration_runs_once(tmp_path):
+    path = str(tmp_path / 'news.db')
+    NewsDatabase(path)
+    conn = sqlite3.connect(path)
+    before = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'news_articles'").fetchone()
+    conn.close()
+
+    db = NewsDatabase(path)
+    conn = sqlite3.connect(db.db_path)
+    assert conn.execute("SELECT sql FROM sqlite_master WHERE name = 'news_articles'").fetchone() == before
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'news_articles_migrated'").fetchone() is None
+    conn.close()
+
+def test_simple_scraper_databases_are_migrated(tmp_path):
+    path = str(tmp_path / 'news.db')
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE news_articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            url TEXT UNIQUE,
+            source TEXT,
+            category TEXT,
+            published_date TEXT,
+            scraped_date TEXT,
+            tags TEXT,
+            sent_to_api BOOLEAN DEFAULT FALSE
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO news_articles (title, description, url, source, category, published_date, scraped_date, tags)
+        VALUES ('Charges', 'The Commission charged a firm.', 'https://example.com/1', 'SEC News', 'Regulatory',
+                'Tue, 30 Sep 2025 20:06:12 -0400', '2025-10-02T20:23:35.444206', '["SEC"]')
+    ''')
+    conn.commit()
+    conn.close()
+
+    story, = NewsDatabase(path).get_articles()
+    assert story.content == 'The Commission charged a firm.'
+    assert story.published_date == datetime(2025, 10, 1, 0, 6, 12, tzinfo=timezone.utc)
+    assert story.scraped_date == datetime(2025, 10, 2, 20, 23, 35, tzinfo=timezone.utc)
+    assert story.tags == ('SEC',)
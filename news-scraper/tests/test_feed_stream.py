@@ -0,0 +1,178 @@
+import pytest
+
+from database import NewsArticle
+from feed_stream import FeedMark, parse_feed_date, stream_entries, entry_key, entry_published
+from pipeline import SourceJob
+
+RSS = b'''<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <item>
+      <title>Second action</title>
+      <link>https://example.com/2</link>
+      <guid>urn:2</guid>
+      <pubDate>Wed, 01 May 2024 12:00:00 GMT</pubDate>
+      <content:encoded>Full text</content:encoded>
+    </item>
+    <item>
+      <title>First action</title>
+      <link>https://example.com/1</link>
+      <pubDate>Wed, 01 May 2024 10:00:00 +0200</pubDate>
+      <description>Summary</description>
+    </item>
+  </channel>
+</rss>'''
+
+ATOM = b'''<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title>Atom story</title>
+    <link rel="self" href="https://example.com/self"/>
+    <link href="https://example.com/atom"/>
+    <id>tag:example.com,2024:1</id>
+    <updated>2024-05-01T08:00:00Z</updated>
+  </entry>
+</feed>'''
+
+def test_parse_feed_date():
+    assert parse_feed_date('Wed, 01 May 2024 12:00:00 GMT') == 1714564800
+    assert parse_feed_date('Wed, 01 May 2024 14:00:00 +0200') == 1714564800
+    assert parse_feed_date('2024-05-01T12:00:00Z') == 1714564800
+    assert parse_feed_date('2024-05-01T12:00:00') == 1714564800
+    assert parse_feed_date('yesterday') is None
+    assert parse_feed_date(None) is None
+
+def test_stream_entries():
+    first, second = stream_entries(RSS)
+    assert (first.title, first.link, entry_key(first)) == ('Second action', 'https://example.com/2', 'urn:2')
+    assert first.content[0].value == 'Full text'
+    assert entry_published(first) == 1714564800
+    assert entry_key(second) == 'https://example.com/1'
+    assert second.summary == 'Summary'
+    assert entry_published(second) == 1714564800 - 4 * 3600
+
+    atom, = stream_entries(ATOM)
+    assert atom.link == 'https://example.com/atom'
+    assert entry_key(atom) == 'tag:example.com,2024:1'
+    assert entry_published(atom) == 1714550400
+
+def test_stream_stops_where_the_caller_does():
+    entries = stream_entries(RSS)
+    assert next(entries).title == 'Second action'
+    entries.close()
+
+def test_first_cycle_knows_nothing():
+    mark = FeedMark()
+    assert not mark.is_known('a', 300)
+    assert not mark.is_known('b', 200)
+    assert mark.request_headers() == {}
+    assert mark.state(10) == {
+        'feed_seen': ['a', 'b'],
+        'feed_newest': 300,
+        'feed_ordered': 1,
+        'feed_etag': None,
+        'feed_last_modified': None
+    }
+
+def test_known_entries_are_skipped():
+    mark = FeedMark({'feed_seen': ['b'], 'feed_newest': 200})
+    assert not mark.is_known('c', 300)
+    assert mark.is_known('b', 200)
+    # An unordered feed can't skip by date
+    assert not mark.is_known('a', 100)
+    assert (mark.examined, mark.skipped) == (3, 1)
+    assert not mark.exhausted
+
+def test_ordered_feed_stops_after_a_run_of_known_entries():
+    mark = FeedMark({'feed_seen': ['d'], 'feed_newest': 400, 'feed_ordered': 1}, stop_after=3)
+    assert not mark.is_known('e', 500)
+    assert mark.is_known('d', 400)
+    # Older than the newest entry seen, so processed before
+    assert mark.is_known('c', 300)
+    assert not mark.exhausted
+    assert mark.is_known('b', 200)
+    assert mark.exhausted
+
+def test_state_keeps_the_newest_keys():
+    mark = FeedMark({'feed_seen': ['b', 'a'], 'feed_newest': 200, 'feed_ordered': 1})
+    mark.is_known('d', 400)
+    mark.is_known('c', 300)
+    state = mark.state(3)
+    assert state['feed_seen'] == ['d', 'c', 'b']
+    assert state['feed_newest'] == 400
+
+    # A feed that came out of order is remembered as unordered
+    mark = FeedMark({'feed_ordered': 1})
+    mark.is_known('a', 100)
+    mark.is_known('b', 200)
+    assert mark.state(10)['feed_ordered'] == 0
+
+    # One entry is too few to tell, so the old order stands
+    mark = FeedMark({'feed_ordered': 1})
+    mark.is_known('a', 100)
+    assert mark.state(10)['feed_ordered'] == 1
+
+def test_conditional_get_headers():
+    mark = FeedMark({'feed_etag': '"v1"', 'feed_last_modified': 'Wed, 01 May 2024 12:00:00 GMT'})
+    assert mark.request_headers() == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Wed, 01 May 2024 12:00:00 GMT'
+    }
+
+@pytest.fixture
+def scraper(tmp_path):
+    from scraper import NewsScraper
+    config = {
+        'database': {'path': str(tmp_path / 'news.db')},
+        'scraping': {'user_agent': 'test', 'request_timeout': 5, 'max_articles_per_source': 50},
+        'processing': {'enable_near_duplicate_detection': False},
+        'sources': {'Regulatory': [
+            {'name': 'Regulator', 'url': 'https://example.com/feed', 'type': 'rss', 'tags': []}
+        ]}
+    }
+    scraper = NewsScraper(config)
+    yield scraper
+    scraper.http.close()
+
+def persist(scraper, urls, fail=()):
+    source, = scraper.db.get_active_sources()
+    job = SourceJob(source)
+    job.feed_mark = scraper.feed_mark(source)
+    for url in urls:
+        job.feed_mark.is_known(url, None)
+    job.articles = [NewsArticle(title=url, content='Body', url=url, source='Regulator') for url in urls]
+
+    add_article = scraper.db.add_article
+    def failing_add(article, signature=None):
+        if article.url in fail:
+            raise OSError('disk full')
+        return add_article(article, signature)
+    scraper.db.add_article = failing_add
+    try:
+        list(scraper.persist_stage(job))
+    finally:
+        scraper.db.add_article = add_article
+    return job
+
+def saved_mark(scraper):
+    return scraper.db.get_active_sources()[0]['feed_mark']['feed_seen']
+
+def test_persist_advances_the_mark_over_saved_and_duplicate_entries(scraper):
+    assert persist(scraper, ['https://example.com/1']).saved == 1
+    assert saved_mark(scraper) == ['https://example.com/1']
+
+    job = persist(scraper, ['https://example.com/2', 'https://example.com/1'])
+    assert job.saved == 1
+    assert saved_mark(scraper) == ['https://example.com/2', 'https://example.com/1']
+
+def test_failed_save_keeps_the_mark(scraper):
+    persist(scraper, ['https://example.com/1'])
+
+    job = persist(scraper, ['https://example.com/3', 'https://example.com/2'], fail={'https://example.com/2'})
+    assert job.saved == 1
+    assert saved_mark(scraper) == ['https://example.com/1']
+
+    # The next cycle reads both again; the one that failed is saved this time
+    job = persist(scraper, ['https://example.com/3', 'https://example.com/2'])
+    assert job.saved == 1
+    assert saved_mark(scraper) == ['https://example.com/3', 'https://example.com/2', 'https://example.com/1']
@@ -0,0 +1,84 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_client import DNSCache, HttpClient, ResponseTooLarge
+
+BODIES = {
+    '/small': (b'<rss></rss>', {}),
+    '/large': (b'x' * 300000, {}),
+    '/gzip': (gzip.compress(b'x' * 300000), {'Content-Encoding': 'gzip'})
+}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body, headers = BODIES[self.path.split('?')[0]]
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if 'nolength' in self.path:
+            self.send_header('Connection', 'close')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope='module')
+def base_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://localhost:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+def test_connections_are_kept_alive(base_url):
+    client = HttpClient()
+    for _ in range(5):
+        assert client.get(f'{base_url}/small').content == b'<rss></rss>'
+    stats = client.stats()['localhost']
+    assert (stats['requests'], stats['connections'], stats['reused']) == (5, 1, 4)
+    assert stats['reuse_ratio'] == 0.8
+    assert 'gzip' in client.headers['Accept-Encoding']
+    client.close()
+
+def test_bodies_over_the_cap_are_refused(base_url):
+    client = HttpClient({'max_response_mb': 0.25})
+    # Declared too large, streamed without a length, and inflated past the cap
+    for path in ('/large', '/large?nolength', '/gzip'):
+        with pytest.raises(ResponseTooLarge):
+            client.get(f'{base_url}{path}')
+    assert len(client.get(f'{base_url}/large', max_bytes=0).content) == 300000
+    response = client.get(f'{base_url}/large', stream=True)
+    assert len(response.raw.read()) == 300000
+    response.close()
+    client.close()
+
+def test_dns_lookups_are_cached(monkeypatch):
+    calls = []
+
+    def getaddrinfo(host, port, *args):
+        calls.append(host)
+        return [(None, None, None, '', ('10.0.0.1', port))]
+
+    monkeypatch.setattr('socket.getaddrinfo', getaddrinfo)
+    cache = DNSCache(ttl=300)
+    assert cache.resolve('example.com', 443) == '10.0.0.1'
+    assert cache.resolve('example.com', 443) == '10.0.0.1'
+    assert cache.resolve('127.0.0.1', 80) == '127.0.0.1'
+    assert calls == ['example.com']
+    assert DNSCache(ttl=0).resolve('example.com', 443) == 'example.com'
+
+def test_failed_lookups_fall_back_to_the_name(monkeypatch):
+    def getaddrinfo(*args):
+        raise OSError('no such host')
+
+    monkeypatch.setattr('socket.getaddrinfo', getaddrinfo)
+    assert DNSCache().resolve('missing.invalid', 443) == 'missing.invalid'
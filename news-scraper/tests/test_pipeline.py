@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import Pipeline, Stage
+
+def double(item):
+    yield item * 2
+
+def test_items_flow_through_every_stage():
+    def split(item):
+        yield item
+        yield item + 100
+
+    def drop_odd(item):
+        if item % 2 == 0:
+            yield item
+
+    pipeline = Pipeline([Stage('double', double, workers=3), Stage('split', split), Stage('drop', drop_odd, workers=2)])
+    assert sorted(pipeline.run(range(5))) == [0, 2, 4, 6, 8, 100, 102, 104, 106, 108]
+
+    stats = pipeline.stats()
+    assert stats['double'] == dict(stats['double'], received=5, emitted=5, failed=0, workers=3)
+    assert (stats['split']['received'], stats['split']['emitted']) == (5, 10)
+    assert (stats['drop']['received'], stats['drop']['emitted']) == (10, 10)
+
+def test_failed_items_go_to_on_error():
+    errors = []
+
+    def parse(item):
+        if item == 3:
+            raise ValueError('bad feed')
+        yield item
+
+    pipeline = Pipeline([Stage('fetch', double), Stage('parse', parse)],
+                        on_error=lambda stage, item, error: errors.append((stage, item, str(error))))
+    assert sorted(pipeline.run([1, 2, 1.5, 4])) == [2, 4, 8]
+    assert errors == [('parse', 3, 'bad feed')]
+    assert pipeline.stats()['parse']['failed'] == 1
+
+def test_a_failing_error_handler_doesnt_stop_the_pipeline():
+    def broken(item):
+        raise RuntimeError('stage')
+        yield item
+
+    def handler(stage, item, error):
+        raise RuntimeError('handler')
+
+    assert list(Pipeline([Stage('broken', broken)], on_error=handler).run(range(3))) == []
+    assert list(Pipeline([Stage('broken', broken)]).run(range(3))) == []
+
+def test_input_is_read_only_as_fast_as_the_stages_keep_up():
+    release = threading.Event()
+    pulled = []
+
+    def items():
+        for n in range(100):
+            pulled.append(n)
+            yield n
+
+    def slow(item):
+        release.wait()
+        yield item
+
+    pipeline = Pipeline([Stage('fetch', double), Stage('slow', slow)], queue_size=2)
+    results = []
+    consumer = threading.Thread(target=lambda: results.extend(pipeline.run(items())))
+    consumer.start()
+    try:
+        time.sleep(0.3)
+        # Two full queues, one item per stage, one waiting to be queued
+        assert len(pulled) <= 8
+    finally:
+        release.set()
+        consumer.join(5)
+    assert len(results) == 100
+
+def test_closing_early_stops_the_pipeline():
+    def endless():
+        n = 0
+        while True:
+            yield n
+            n += 1
+
+    run = Pipeline([Stage('double', double, workers=2)], queue_size=1).run(endless())
+    assert next(run) in (0, 2)
+    run.close()
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith('pipeline-')]
+
+def test_feeder_errors_reach_the_consumer_after_the_items_fed():
+    def items():
+        yield 1
+        yield 2
+        raise OSError('source list unavailable')
+
+    results = []
+    with pytest.raises(OSError, match='source list unavailable'):
+        for item in Pipeline([Stage('double', double)]).run(items()):
+            results.append(item)
+    assert sorted(results) == [2, 4]
+
+def test_a_pipeline_needs_stages():
+    with pytest.raises(ValueError):
+        Pipeline([])
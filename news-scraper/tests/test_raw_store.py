@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import zlib
+
+from raw_store import RawResponseStore, ARTICLE_FETCH
+
+FEED = b'<rss><channel><item><title>Story</title><link>https://example.com/1</link></item></channel></rss>'
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    store = RawResponseStore(str(tmp_path / 'raw'))
+    first = store.put('Regulator', 'https://example.com/feed', FEED)
+    second = store.put('Regulator', 'https://example.com/feed', FEED, final_url='https://www.example.com/feed')
+    assert first == second
+    assert store.get(first) == FEED
+
+    stats = store.get_stats()
+    assert (stats['blobs'], stats['fetches']) == (1, 2)
+    with open(store._blob_path(first), 'rb') as f:
+        assert zlib.decompress(f.read()) == FEED
+
+    fetches = store.fetches('Regulator')
+    assert [fetch['final_url'] for fetch in fetches] == ['https://example.com/feed', 'https://www.example.com/feed']
+    assert len(store.fetches('Regulator', distinct=True)) == 1
+    assert store.fetches('Wire') == []
+
+def test_latest_article_page(tmp_path):
+    store = RawResponseStore(str(tmp_path / 'raw'))
+    store.put('Regulator', 'https://example.com/1', b'<html>v1</html>', kind=ARTICLE_FETCH)
+    store.put('Regulator', 'https://example.com/1', b'<html>v2</html>', kind=ARTICLE_FETCH)
+    assert store.latest_for_url('https://example.com/1') == b'<html>v2</html>'
+    assert store.latest_for_url('https://example.com/2') is None
+    assert store.fetches('Regulator') == []
+
+def test_oldest_fetches_are_dropped_over_the_size_limit(tmp_path):
+    store = RawResponseStore(str(tmp_path / 'raw'), max_bytes=10 ** 9)
+    bodies = [os.urandom(1000) for _ in range(3)]
+    hashes = [store.put('Regulator', f'https://example.com/{n}', body) for n, body in enumerate(bodies)]
+
+    store.max_bytes = 2500
+    assert store.enforce_retention() == 1
+    assert store.get(hashes[0]) is None
+    assert not os.path.exists(store._blob_path(hashes[0]))
+    assert [store.get(h) for h in hashes[1:]] == bodies[1:]
+    assert store.total_size() <= 2500
+
+def test_shared_blobs_outlive_their_first_fetch(tmp_path):
+    store = RawResponseStore(str(tmp_path / 'raw'), max_bytes=10 ** 9)
+    body = os.urandom(1000)
+    kept = store.put('Regulator', 'https://example.com/feed', body)
+    dropped = store.put('Wire', 'https://example.com/wire', os.urandom(1000))
+    store.put('Regulator', 'https://example.com/feed', body)
+
+    # The oldest fetch goes, but its blob is still referenced by the newest
+    store.max_bytes = 1500
+    assert store.enforce_retention() == 1
+    assert store.get(kept) == body
+    assert store.get(dropped) is None
+    assert [fetch['id'] for fetch in store.fetches()] == [3]
+
+def test_archived_feeds_reparse_offline(tmp_path):
+    from scraper import NewsScraper
+    config = {
+        'database': {'path': str(tmp_path / 'news.db')},
+        'raw_store': {'enabled': True, 'path': str(tmp_path / 'raw')},
+        'scraping': {'user_agent': 'test', 'request_timeout': 5, 'max_articles_per_source': 50},
+        'processing': {'enable_nlp': False},
+        'filtering': {'keywords': {'regulatory': ['story']}},
+        'sources': {}
+    }
+    scraper = NewsScraper(config, offline=True)
+    scraper.raw_store.put('Regulator', 'https://example.com/feed', FEED)
+    source = {'name': 'Regulator', 'type': 'rss', 'tags': ['sec'], 'category': 'Regulatory'}
+
+    fetch, = scraper.raw_store.fetches('Regulator')
+    _, articles, error = scraper.reprocess_fetch(fetch, source)
+    assert error is None
+    assert [(a.title, a.url, a.source) for a in articles] == [('Story', 'https://example.com/1', 'Regulator')]
+
+    scraper.raw_store.get = lambda blob_hash: None
+    assert scraper.reprocess_fetch(fetch, source) == (fetch, [], "stored body is missing")
+    scraper.http.close()
+
+def test_size_totals_are_kept_without_summing(tmp_path):
+    store = RawResponseStore(str(tmp_path / 'raw'), max_bytes=10 ** 9)
+    bodies = [os.urandom(1000) for _ in range(3)]
+    for n, body in enumerate(bodies + bodies[:1]):
+        store.put('Regulator', f'https://example.com/{n}', body)
+    store.max_bytes = 2500
+    store.enforce_retention()
+
+    conn = sqlite3.connect(store.db_path)
+    summed = conn.execute('SELECT COUNT(*), SUM(size), SUM(stored_size) FROM raw_blobs').fetchone()
+    assert conn.execute('SELECT blobs, bytes, stored_bytes FROM raw_store_size').fetchone() == summed
+    assert store.total_size() == summed[2]
+
+    # A store from before the totals existed is counted once on open
+    conn.execute('DROP TABLE raw_store_size')
+    for name in ('trg_raw_blobs_insert', 'trg_raw_blobs_update', 'trg_raw_blobs_delete'):
+        conn.execute(f'DROP TRIGGER {name}')
+    conn.commit()
+    conn.close()
+    stats = RawResponseStore(str(tmp_path / 'raw')).get_stats()
+    assert (stats['blobs'], stats['bytes'], stats['stored_bytes']) == summed
@@ -0,0 +1,107 @@
+import sqlite3
+from datetime import datetime, timezone
+
+from retention import POLICIES, RetentionManager, cutoff_for, read_archive
+
+NOW = datetime(2024, 3, 31, tzinfo=timezone.utc)
+DAY = 86400
+
+def make_db(path, ages):
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE news_articles (id INTEGER PRIMARY KEY, title TEXT, content BLOB, scraped_date INTEGER);
+        CREATE TABLE article_entities (article_id INTEGER, entity TEXT);
+        CREATE TABLE vendor_status (id INTEGER PRIMARY KEY, vendor TEXT, checked_at TEXT, resolved_at TEXT);
+    ''')
+    now = int(NOW.timestamp())
+    for n, age in enumerate(ages, 1):
+        conn.execute('INSERT INTO news_articles VALUES (?, ?, ?, ?)', (n, f'Story {n}', f'body {n}'.encode(), now - age * DAY))
+        conn.execute('INSERT INTO article_entities VALUES (?, ?)', (n, 'vendor:aws'))
+    conn.commit()
+    conn.close()
+
+def count(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    finally:
+        conn.close()
+
+def test_cutoffs_match_each_column_format():
+    now = datetime(2024, 3, 31, 12, 0, 0)
+    assert cutoff_for(POLICIES['news_articles'], 1, NOW) == int(NOW.timestamp()) - DAY
+    assert cutoff_for(POLICIES['scraping_logs'], 1, now) == '2024-03-30 12:00:00'
+    assert cutoff_for(POLICIES['vendor_status'], 1, now) == '2024-03-30T12:00:00'
+
+def test_expired_rows_are_deleted_in_chunks(tmp_path):
+    path = str(tmp_path / 'news.db')
+    make_db(path, [90, 60, 45, 40, 35, 5, 1])
+    manager = RetentionManager(path, chunk_size=2, pause_seconds=0)
+
+    assert manager.apply('news_articles', keep_days=30, now=NOW) == {'deleted': 5, 'archived': 0, 'chunks': 3}
+    assert count(path, 'news_articles') == 2
+    assert count(path, 'article_entities') == 2
+    assert manager.apply('news_articles', keep_days=30, now=NOW)['deleted'] == 0
+
+    conn = sqlite3.connect(path)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    conn.close()
+
+def test_archived_rows_are_partitioned_by_month(tmp_path):
+    path = str(tmp_path / 'news.db')
+    make_db(path, [60, 45, 40, 1])
+    manager = RetentionManager(path, archive_path=str(tmp_path / 'archive'), chunk_size=2,
+                               pause_seconds=0, decode=bytes.decode)
+
+    assert manager.apply('news_articles', keep_days=30, now=NOW) == {'deleted': 3, 'archived': 3, 'chunks': 2}
+    january, february = (manager.archive.path_for('news_articles', month) for month in ('2024-01', '2024-02'))
+    assert [row['title'] for row in read_archive(january)] == ['Story 1']
+    # Two chunks appended to the same month as separate gzip members
+    assert [(row['id'], row['content']) for row in read_archive(february)] == [(2, 'body 2'), (3, 'body 3')]
+
+def test_open_vendor_incidents_are_kept(tmp_path):
+    path = str(tmp_path / 'news.db')
+    make_db(path, [])
+    conn = sqlite3.connect(path)
+    conn.executemany('INSERT INTO vendor_status (vendor, checked_at, resolved_at) VALUES (?, ?, ?)', [
+        ('AWS', '2023-01-01T00:00:00', '2023-01-01T01:00:00'),
+        ('Azure', '2023-01-01T00:00:00', None),
+        ('GCP', '2024-03-30T00:00:00', '2024-03-30T01:00:00')
+    ])
+    conn.commit()
+    conn.close()
+
+    manager = RetentionManager(path, pause_seconds=0)
+    assert manager.apply('vendor_status', keep_days=90, archive=False, now=datetime(2024, 3, 31))['deleted'] == 1
+    # Tables missing from the database are skipped
+    assert manager.run({'scraping_logs': {}}) == {'scraping_logs': {'deleted': 0, 'archived': 0, 'chunks': 0}}
+    assert count(path, 'vendor_status') == 2
+
+def test_incremental_vacuum_is_enabled_once(tmp_path):
+    path = str(tmp_path / 'news.db')
+    make_db(path, [60, 1])
+    manager = RetentionManager(path, pause_seconds=0)
+    assert manager.enable_incremental_vacuum() is True
+    assert manager.enable_incremental_vacuum() is False
+    assert manager.apply('news_articles', keep_days=30, now=NOW)['deleted'] == 1
+
+def test_chunks_are_archived_outside_the_write_lock(tmp_path):
+    path = str(tmp_path / 'news.db')
+    make_db(path, [60, 45, 1])
+    manager = RetentionManager(path, archive_path=str(tmp_path / 'archive'), pause_seconds=0)
+    write = manager.archive.write
+
+    def write_while_scraping(table, columns, rows, time_index):
+        # The scraper can still write; here it re-saves one of the expired rows
+        conn = sqlite3.connect(path, timeout=0)
+        conn.execute('UPDATE news_articles SET scraped_date = ? WHERE id = 2', (int(NOW.timestamp()),))
+        conn.commit()
+        conn.close()
+        return write(table, columns, rows, time_index)
+
+    manager.archive.write = write_while_scraping
+    assert manager.apply('news_articles', keep_days=30, now=NOW) == {'deleted': 1, 'archived': 2, 'chunks': 1}
+    conn = sqlite3.connect(path)
+    assert [row[0] for row in conn.execute('SELECT id FROM news_articles ORDER BY id')] == [2, 3]
+    assert [row[0] for row in conn.execute('SELECT article_id FROM article_entities ORDER BY article_id')] == [2, 3]
+    conn.close()
@@ -0,0 +1,55 @@
+from database import NewsArticle
+from risk_rules import RiskRuleEngine, load_risk_rules
+
+CRITICAL = {'riskLevel': 'Critical', 'severity': 'Critical', 'priority': 1}
+HIGH = {'riskLevel': 'High', 'severity': 'Warning', 'priority': 2}
+DEFAULT = {'riskLevel': 'Medium', 'severity': 'Info', 'priority': 3}
+
+def test_default_article_rules_first_match_wins():
+    engine = RiskRuleEngine()
+    assert engine.evaluate('Bank pays fine after investigation') == CRITICAL
+    assert engine.evaluate('SEC opens investigation') == HIGH
+    assert engine.evaluate('Quarterly results') == DEFAULT
+    assert engine.evaluate('') == DEFAULT
+
+def test_batches_match_one_by_one_evaluation():
+    engine = RiskRuleEngine()
+    texts = ['Data BREACH at retailer', 'compliance update', 'weather', 'alert', 'no fine print', 'nothing']
+    batch = engine.evaluate_batch((text, None, None, None) for text in texts)
+    assert batch == [engine.evaluate(text) for text in texts]
+
+def test_keyword_hits_dont_span_texts():
+    engine = RiskRuleEngine({'articles': {'default': {'priority': 3}, 'rules': [
+        {'when': {'keywords': ['fine']}, 'then': {'priority': 1}}
+    ]}})
+    assert [r['priority'] for r in engine.evaluate_batch([('...f', None, None, None), ('ine', None, None, None)])] == [3, 3]
+
+def test_conditions_must_all_hold():
+    engine = RiskRuleEngine({'articles': {
+        'default': {'riskLevel': 'Low', 'priority': 4},
+        'rules': [
+            {'when': {'keywords': ['outage'], 'sources': ['AWS Status']}, 'then': {'riskLevel': 'High', 'priority': 1}},
+            {'when': {'pattern': r'cve-\d{4}-\d+', 'categories': ['Cybersecurity']}, 'then': {'riskLevel': 'Critical'}}
+        ]
+    }})
+    assert engine.evaluate('EC2 outage', source='AWS Status') == {'riskLevel': 'High', 'priority': 1}
+    assert engine.evaluate('EC2 outage', source='Wire') == {'riskLevel': 'Low', 'priority': 4}
+    assert engine.evaluate('Patch CVE-2024-3094', category='cybersecurity') == {'riskLevel': 'Critical', 'priority': 4}
+    assert engine.evaluate('Patch CVE-2024-3094', category='Regulatory')['riskLevel'] == 'Low'
+
+def test_vendor_incident_rules_use_the_record_severity():
+    engine = RiskRuleEngine(None, 'vendor_incidents')
+    assert engine.evaluate('API errors', severity='High') == {'severity': 'Critical', 'priority': 1}
+    assert engine.evaluate('API errors', severity='Low') == {'severity': 'Warning', 'priority': 2}
+
+def test_articles_are_evaluated_on_title_and_content():
+    engine = RiskRuleEngine()
+    article = NewsArticle(title='Update', content='Regulator announces enforcement', source='Wire')
+    assert engine.evaluate_articles([article]) == [CRITICAL]
+
+def test_rules_from_the_config_file(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text('scraper:\n  risk_rules:\n    articles:\n      default: {priority: 5}\n')
+    assert load_risk_rules(str(path)) == {'articles': {'default': {'priority': 5}}}
+    assert RiskRuleEngine(load_risk_rules(str(path))).evaluate('fine') == {'priority': 5}
+    assert load_risk_rules(str(tmp_path / 'missing.yaml')) == {}
@@ -0,0 +1,66 @@
+import pytest
+
+from database import NewsArticle
+from scoring import ArticleScorer
+
+CONFIG = {
+    'filtering': {'keywords': {
+        'compliance': ['compliance', 'audit'],
+        'security': ['data breach', 'ransomware']
+    }},
+    'scoring': {'category_weights': {'security': 2.0}}
+}
+
+def article(title, content=''):
+    return NewsArticle(title=title, content=content, url='https://example.com', source='Wire')
+
+@pytest.fixture
+def scorer():
+    return ArticleScorer(CONFIG)
+
+def test_sentiment_signs_and_negation(scorer):
+    sentiment, _ = scorer.score([
+        article('Bank fined over fraud and laundering'),
+        article('Outage resolved and service restored'),
+        article('Quarterly report published'),
+        article('Regulator found no fraud')
+    ])
+    assert sentiment[0] < -0.5
+    assert sentiment[1] > 0.5
+    assert sentiment[2] == 0
+    assert sentiment[3] > 0
+    assert all(-1 < value < 1 for value in sentiment)
+
+def test_relevance_grows_with_keyword_hits_and_phrases(scorer):
+    _, relevance = scorer.score([
+        article('Weather update'),
+        article('Compliance update'),
+        article('Compliance audit finds compliance gaps'),
+        article('Data breach at retailer'),
+        article('Data storage and a breach of contract')
+    ])
+    assert relevance[0] == 0
+    assert 0 < relevance[1] < relevance[2] < 1
+    # Phrases match as a whole, and security keywords weigh double
+    assert relevance[3] > relevance[1]
+    assert relevance[4] == 0
+
+def test_titles_outweigh_body_text(scorer):
+    _, relevance = scorer.score([article('Compliance news'), article('News', 'Compliance')])
+    assert relevance[0] > relevance[1]
+
+def test_batch_scores_match_single_scores(scorer):
+    articles = [article(f'Ransomware audit {n}', 'Fines ' * n) for n in range(5)]
+    sentiment, relevance = scorer.score(articles)
+    for n, single in enumerate(articles):
+        one_sentiment, one_relevance = scorer.score([single])
+        assert one_sentiment[0] == pytest.approx(sentiment[n])
+        assert one_relevance[0] == pytest.approx(relevance[n])
+
+def test_score_articles_fills_in_enabled_scores():
+    scorer = ArticleScorer(dict(CONFIG, processing={'enable_relevance_scoring': False}))
+    story = article('Data breach exposed records')
+    scorer.score_articles([story])
+    assert story.sentiment_score < 0
+    assert story.relevance_score is None
+    assert scorer.score([])[0].size == 0
@@ -0,0 +1,81 @@
+import requests
+import pytest
+
+from simple_scraper import BeaconNewsScraper, FEEDS
+
+FEED = b'''<?xml version="1.0"?>
+<rss version="2.0">
+  <channel>
+    <item>
+      <title>Agency announces enforcement action</title>
+      <link>https://example.gov/news/2?utm_source=rss</link>
+      <pubDate>Wed, 01 May 2024 12:00:00 GMT</pubDate>
+      <description>A penalty for reporting violations.</description>
+    </item>
+    <item>
+      <title>Agency publishes guidance</title>
+      <link>https://example.gov/news/1</link>
+      <pubDate>Tue, 30 Apr 2024 12:00:00 GMT</pubDate>
+      <description>New guidance for firms.</description>
+    </item>
+  </channel>
+</rss>'''
+
+class FeedHttp:
+    """Stands in for the scraper's HttpClient: every feed serves FEED, API posts are recorded"""
+
+    def __init__(self):
+        self.headers = {}
+        self.requests = []
+        self.posts = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append((url, headers))
+        resp = requests.Response()
+        resp.status_code = 304 if headers and headers.get('If-None-Match') == '"v1"' else 200
+        resp._content = FEED if resp.status_code == 200 else b''
+        resp.headers['ETag'] = '"v1"'
+        resp.url = url
+        return resp
+
+    def post(self, url, json=None, **kwargs):
+        self.posts.append((url, json))
+        return type('Response', (), {'status_code': 200})()
+
+    def stats(self):
+        return {}
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = BeaconNewsScraper(config_path=str(tmp_path / 'missing.yaml'), base_url='http://frontend',
+                                db_path=str(tmp_path / 'news.db'))
+    scraper.http = FeedHttp()
+    return scraper
+
+def test_cycle_saves_and_delivers_through_the_shared_core(scraper):
+    results = scraper.run_scraping_cycle()
+    sources = sum(len(feeds) for feeds in FEEDS.values())
+    assert results['successful_sources'] == sources
+    # Every feed has the same two links; the first source to persist keeps them
+    assert results['total_articles'] == 2
+
+    # Stored with the publisher's link, recognized by the canonical one
+    assert [(article.url, article.canonical_url) for article in scraper.db.get_articles()] == [
+        ('https://example.gov/news/2?utm_source=rss', 'https://example.gov/news/2'),
+        ('https://example.gov/news/1', 'https://example.gov/news/1')
+    ]
+    (url, payload), = scraper.http.posts
+    assert url == 'http://frontend/api/news/process'
+    assert {article['riskLevel'] for article in payload['articles']} == {'Critical', 'Medium'}
+
+    marks = {source['name']: source['feed_mark'] for source in scraper.db.get_active_sources()}
+    assert all(mark['feed_etag'] == '"v1"' for mark in marks.values())
+
+def test_next_cycle_uses_the_feed_marks(scraper):
+    scraper.run_scraping_cycle()
+    scraper.http.posts.clear()
+
+    results = scraper.run_scraping_cycle()
+    assert results['total_articles'] == 0
+    assert scraper.http.posts == []
+    assert all(headers == {'If-None-Match': '"v1"'} for _, headers in scraper.http.requests[-3:])
@@ -0,0 +1,74 @@
+import os
+import sqlite3
+
+import pytest
+
+from database import NewsDatabase, NewsArticle
+from retention import RetentionManager
+from snapshot import SnapshotPublisher, open_snapshot
+
+def article(n):
+    return NewsArticle(title=f'Story {n}', content='Body', url=f'https://example.com/{n}',
+                       source='Regulator', category='Regulatory', summary=f'Summary {n}')
+
+@pytest.fixture
+def db(tmp_path):
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    db.add_article(article(1))
+    return db
+
+def listing(path):
+    conn = open_snapshot(path)
+    try:
+        return conn.execute('SELECT title, summary FROM article_listing ORDER BY id').fetchall()
+    finally:
+        conn.close()
+
+def test_publish_and_skip_when_unchanged(db):
+    publisher = SnapshotPublisher(db.db_path, {'vacuum': False})
+    result = publisher.publish()
+    assert result['published'] and result['articles'] == 1
+    assert listing(publisher.path) == [('Story 1', 'Summary 1')]
+
+    conn = open_snapshot(publisher.path)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    assert 'url_redirects' not in tables and 'source_listing' in tables
+
+    assert publisher.publish() == {'published': False, 'path': publisher.path, 'reason': 'unchanged'}
+    assert publisher.status()['articles'] == 1
+
+    db.add_article(article(2))
+    assert publisher.publish()['articles'] == 2
+
+def test_commits_to_the_wal_are_published(db):
+    # A long-lived WAL connection, as retention keeps; its commits stay in
+    # the -wal file and leave the database file untouched
+    conn = RetentionManager(db.db_path).connect()
+    try:
+        publisher = SnapshotPublisher(db.db_path, {'vacuum': False})
+        assert publisher.publish()['articles'] == 1
+
+        stat = os.stat(db.db_path)
+        conn.execute("INSERT INTO news_articles (title, url, source) VALUES ('Story 2', 'https://example.com/2', 'Wire')")
+        assert os.stat(db.db_path).st_mtime_ns == stat.st_mtime_ns
+
+        result = publisher.publish()
+        assert result['published'] and result['articles'] == 2
+        assert publisher.publish()['reason'] == 'unchanged'
+    finally:
+        conn.close()
+
+def test_failed_publish_keeps_the_old_snapshot(db, monkeypatch):
+    publisher = SnapshotPublisher(db.db_path, {'vacuum': False})
+    publisher.publish()
+    db.add_article(article(2))
+
+    def broken_optimize(path, meta, started):
+        raise sqlite3.OperationalError('disk I/O error')
+    monkeypatch.setattr(publisher, '_optimize', broken_optimize)
+    with pytest.raises(sqlite3.OperationalError):
+        publisher.publish()
+
+    assert not os.path.exists(publisher.path + '.tmp')
+    assert listing(publisher.path) == [('Story 1', 'Summary 1')]
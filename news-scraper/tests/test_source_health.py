@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from database import NewsDatabase
+from source_health import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+NOW = 1_700_000_000
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker({'failure_threshold': 3, 'base_backoff_minutes': 10, 'max_backoff_hours': 1})
+
+def fail(breaker, health, times, now=NOW):
+    for _ in range(times):
+        health = breaker.record(health, False, 1.0, now=now)
+    return health
+
+def test_opens_after_consecutive_failures(breaker):
+    health = fail(breaker, None, 2)
+    assert breaker.state(health, NOW) == CLOSED
+    assert health['consecutive_failures'] == 2
+
+    health = fail(breaker, health, 1)
+    assert breaker.state(health, NOW) == OPEN
+    assert not breaker.allows(health, NOW)
+    assert health['breaker_open_until'] == NOW + 600
+
+def test_success_resets_the_count(breaker):
+    health = fail(breaker, None, 2)
+    health = breaker.record(health, True, 0.5, now=NOW)
+    health = fail(breaker, health, 2)
+    assert breaker.state(health, NOW) == CLOSED
+
+def test_half_open_probe(breaker):
+    health = fail(breaker, None, 3)
+    probe_time = NOW + 601
+    assert breaker.state(health, probe_time) == HALF_OPEN
+    assert breaker.allows(health, probe_time)
+
+    # A failed probe reopens at once, for twice as long
+    reopened = breaker.record(health, False, 1.0, now=probe_time)
+    assert breaker.state(reopened, probe_time) == OPEN
+    assert reopened['breaker_open_until'] == probe_time + 1200
+
+    # A good probe closes it and forgets the backoff
+    closed = breaker.record(health, True, 1.0, now=probe_time)
+    assert breaker.state(closed, probe_time) == CLOSED
+    assert closed['breaker_opens'] == 0
+    assert closed['breaker_open_until'] is None
+
+def test_backoff_is_capped(breaker):
+    health = fail(breaker, None, 3)
+    now = NOW
+    for _ in range(5):
+        now = health['breaker_open_until'] + 1
+        health = breaker.record(health, False, 1.0, now=now)
+    assert health['breaker_open_until'] == now + 3600
+
+def test_ewmas_and_score(breaker):
+    health = breaker.record(None, True, 2.0, now=NOW)
+    assert health['latency_ewma'] == 2.0
+    assert health['error_rate'] == 0.0
+
+    health = breaker.record(health, False, 4.0, now=NOW)
+    assert health['latency_ewma'] == pytest.approx(0.3 * 4.0 + 0.7 * 2.0)
+    assert health['error_rate'] == pytest.approx(0.3)
+
+    assert breaker.score(None) == 1.0
+    assert breaker.score(health) < breaker.score(breaker.record(None, True, 0.1, now=NOW))
+
+def test_open_sources_are_not_claimed(tmp_path, breaker):
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    for name in ('broken', 'healthy'):
+        db.add_source(name, f'https://{name}.example.com/feed', 'rss', 'Regulatory', [])
+    now = time.time()
+    db.update_source_health('broken', fail(breaker, None, 3, now=now))
+    assert db.get_source_health()['broken']['breaker_state'] == OPEN
+
+    assert db.claim_next_source('worker', ttl=60, due_before=now)['name'] == 'healthy'
+    assert db.claim_next_source('worker', ttl=60, due_before=now) is None
+
+@pytest.mark.parametrize('leased', [False, True])
+def test_open_sources_are_reported_as_skipped(tmp_path, leased):
+    from scraper import NewsScraper
+    config = {
+        'database': {'path': str(tmp_path / 'news.db')},
+        'scraping': {'user_agent': 'test', 'request_timeout': 5, 'max_articles_per_source': 50},
+        'processing': {'enable_nlp': False},
+        'health': {'failure_threshold': 3},
+        'leases': {'enabled': leased},
+        'sources': {'Regulatory': [
+            {'name': name, 'url': f'https://{name}.example.com/feed', 'type': 'rss', 'tags': []}
+            for name in ('broken', 'healthy')
+        ]}
+    }
+    scraper = NewsScraper(config)
+    scraper.db.update_source_health('broken', fail(scraper.breaker, None, 3, now=time.time()))
+    scraped = []
+    scraper.scrape_sources = lambda jobs, results: scraped.extend(job.source['name'] for job in jobs) or results
+
+    results = scraper.scrape_all_sources()
+    assert results['skipped_sources'] == ['broken']
+    assert scraped == ['healthy'] and results['total_sources'] == 1
+    scraper.http.close()
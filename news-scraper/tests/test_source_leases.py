@@ -0,0 +1,100 @@
+import os
+import time
+import threading
+
+import pytest
+import yaml
+
+from database import NewsDatabase
+from source_leases import LeaseHeartbeat, LeaseLostError, lease_settings
+
+@pytest.fixture
+def db(tmp_path):
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    for n in range(6):
+        db.add_source(f'Source {n}', f'https://example.com/{n}/feed', 'rss', 'Regulatory', [])
+    return db
+
+def test_each_source_is_claimed_once(db):
+    now = time.time()
+    claimed = []
+    while True:
+        source = db.claim_next_source('worker-a', ttl=60, due_before=now)
+        if source is None:
+            break
+        claimed.append(source['name'])
+
+    assert sorted(claimed) == [f'Source {n}' for n in range(6)]
+    assert db.claim_next_source('worker-b', ttl=60, due_before=now) is None
+    assert {lease['owner'] for lease in db.get_source_leases()} == {'worker-a'}
+
+def test_concurrent_workers_never_share_a_source(db):
+    now = time.time()
+    claims = {}
+    lock = threading.Lock()
+
+    def work(owner):
+        while True:
+            source = db.claim_next_source(owner, ttl=60, due_before=now)
+            if source is None:
+                return
+            with lock:
+                claims.setdefault(source['name'], []).append(owner)
+
+    workers = [threading.Thread(target=work, args=(f'worker-{n}',)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sorted(claims) == [f'Source {n}' for n in range(6)]
+    assert all(len(owners) == 1 for owners in claims.values())
+
+def test_release_marks_the_source_attempted(db):
+    source = db.claim_next_source('worker-a', ttl=60, due_before=time.time())
+    assert not db.release_source(source['name'], 'worker-b')
+    assert db.release_source(source['name'], 'worker-a')
+
+    # Attempted just now, so not due again until the next interval
+    due = time.time() - 1800
+    names = {db.claim_next_source('worker-a', ttl=60, due_before=due)['name'] for _ in range(5)}
+    assert source['name'] not in names
+
+def test_expired_leases_are_taken_over(db):
+    source = db.claim_next_source('crashed', ttl=-1, due_before=time.time())
+    taken = [db.claim_next_source('worker-b', ttl=60, due_before=time.time()) for _ in range(6)]
+    assert source['name'] in {s['name'] for s in taken}
+
+    # The old owner can no longer renew or release it
+    assert not db.renew_source_lease(source['name'], 'crashed', 60)
+    assert not db.release_source(source['name'], 'crashed')
+    assert db.renew_source_lease(source['name'], 'worker-b', 60)
+
+def test_reclaim_expired_leases(db):
+    db.claim_next_source('alive', ttl=60, due_before=time.time())
+    db.claim_next_source('crashed', ttl=-1, due_before=time.time())
+    assert db.reclaim_expired_leases() == 1
+    assert [lease['owner'] for lease in db.get_source_leases()] == ['alive']
+
+def test_heartbeat_notices_a_lost_lease(db):
+    source = db.claim_next_source('worker-a', ttl=60, due_before=time.time())
+    with LeaseHeartbeat(db, source['name'], 'worker-a', ttl=60, interval=0.01) as heartbeat:
+        time.sleep(0.05)
+        heartbeat.check()
+
+        db.release_source(source['name'], 'worker-a')
+        deadline = time.time() + 2
+        while not heartbeat.lost and time.time() < deadline:
+            time.sleep(0.01)
+        with pytest.raises(LeaseLostError):
+            heartbeat.check()
+
+def test_lease_settings_defaults():
+    settings = lease_settings({'leases': {'enabled': True, 'ttl_seconds': 30}})
+    assert settings['enabled'] and settings['ttl_seconds'] == 30
+    assert settings['heartbeat_seconds'] == 60
+    assert settings['worker_id'].count(':') == 2
+    # A single scheduler runs unleased unless the config turns leases on
+    assert lease_settings({})['enabled'] is False
+    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'config.yaml')) as f:
+        assert lease_settings(yaml.safe_load(f)['scraper'])['enabled'] is False
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+from database import NewsDatabase
+from scraper import NewsScraper
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+def source(name, url, category='Regulatory'):
+    return {'name': name, 'url': url, 'type': 'rss', 'category': category, 'tags': []}
+
+def test_importing_the_scraper_skips_heavy_modules():
+    # A fresh interpreter, since other tests import these modules
+    heavy = ('numpy', 'newspaper', 'bs4', 'feedparser', 'scoring', 'topic_classifier')
+    loaded = subprocess.run(
+        [sys.executable, '-c', f'import sys, scraper; print(",".join(m for m in {heavy!r} if m in sys.modules))'],
+        cwd=SRC, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert loaded == ''
+
+def test_models_are_built_on_first_use(tmp_path):
+    config = {
+        'database': {'path': str(tmp_path / 'news.db')},
+        'scraping': {'user_agent': 'test', 'request_timeout': 5, 'max_articles_per_source': 50},
+        'processing': {'enable_nlp': False, 'enable_topic_classification': False},
+        'sources': {}
+    }
+    scraper = NewsScraper(config, offline=True)
+    assert 'scorer' not in scraper.__dict__ and 'topic_classifier' not in scraper.__dict__
+    assert scraper.scorer is scraper.scorer
+    assert scraper.topic_classifier is None
+    scraper.http.close()
+
+def test_sync_sources_only_writes_changes(tmp_path):
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    first = [source('SEC', 'https://sec.gov/rss'), source('FTC', 'https://ftc.gov/rss'), source('CISA', 'https://cisa.gov/rss')]
+    assert db.sync_sources(first) == {'added': 3, 'updated': 0, 'deactivated': 0, 'unchanged': 0}
+    db.update_feed_mark('SEC', {'feed_etag': '"v1"', 'feed_seen': ['a']})
+
+    second = [source('SEC', 'https://sec.gov/rss'), source('FTC', 'https://ftc.gov/news.xml'), source('FCA', 'https://fca.org.uk/rss')]
+    assert db.sync_sources(second) == {'added': 1, 'updated': 1, 'deactivated': 1, 'unchanged': 1}
+    assert db.sync_sources(second) == {'added': 0, 'updated': 0, 'deactivated': 0, 'unchanged': 3}
+
+    active = {s['name']: s for s in db.get_active_sources()}
+    assert sorted(active) == ['FCA', 'FTC', 'SEC']
+    assert active['FTC']['url'] == 'https://ftc.gov/news.xml'
+    # Unchanged rows keep their feed marks
+    assert active['SEC']['feed_mark']['feed_etag'] == '"v1"'
+
+    # A source configured again is reactivated
+    assert db.sync_sources(first)['updated'] == 2
+    assert sorted(s['name'] for s in db.get_active_sources()) == ['CISA', 'FTC', 'SEC']
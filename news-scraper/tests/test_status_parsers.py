@@ -0,0 +1,121 @@
+import json
+
+import pytest
+import requests
+
+from status_parsers import get_parser, StatusParseError
+
+STRIPE = {'name': 'Stripe', 'status_url': 'https://status.stripe.com', 'format': 'statuspage_io'}
+
+def response(body, url='https://status.example.com/feed'):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode('utf-8')
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.encoding = 'utf-8'
+    resp.url = url
+    return resp
+
+def statuspage_incident(incident_id, updated_at, status='investigating', impact='major'):
+    return {
+        'id': incident_id,
+        'name': f'Incident {incident_id}',
+        'status': status,
+        'impact': impact,
+        'created_at': '2024-05-01T10:00:00Z',
+        'updated_at': updated_at,
+        'resolved_at': updated_at if status == 'resolved' else None,
+        'incident_updates': [{'body': 'Investigating'}]
+    }
+
+def test_statuspage_first_poll_is_a_snapshot_then_incremental():
+    parser = get_parser('statuspage_io')
+    assert parser.url(STRIPE) == 'https://status.stripe.com/api/v2/incidents.json'
+
+    page = {'incidents': [
+        statuspage_incident('a', '2024-05-01T10:05:00Z'),
+        statuspage_incident('b', '2024-04-01T10:05:00Z', status='resolved')
+    ]}
+    first = parser.parse(response(page), STRIPE, {})
+    assert first.snapshot
+    assert [(i['incident_id'], i['status']) for i in first.incidents] == [('Stripe:a', 'Incident'), ('Stripe:b', 'Resolved')]
+    assert first.incidents[0]['severity'] == 'High'
+
+    # Nothing newer than the cursor: nothing to report
+    again = parser.parse(response(page), STRIPE, first.cursor)
+    assert not again.snapshot
+    assert again.incidents == []
+
+    page['incidents'][0] = statuspage_incident('a', '2024-05-01T11:00:00Z', status='resolved')
+    resolved = parser.parse(response(page), STRIPE, first.cursor)
+    assert [(i['incident_id'], i['status']) for i in resolved.incidents] == [('Stripe:a', 'Resolved')]
+    assert resolved.cursor['updated_at'] > first.cursor['updated_at']
+
+def test_gcp_filters_on_modified_time():
+    parser = get_parser('gcp')
+    vendor = {'name': 'Google Cloud Platform', 'status_url': 'https://status.cloud.google.com/incidents.json'}
+    items = [
+        {'id': '1', 'external_desc': 'Compute errors', 'severity': 'high', 'begin': '2024-05-01T10:00:00Z',
+         'modified': '2024-05-01T10:30:00Z', 'most_recent_update': {'text': 'Mitigating'}},
+        {'id': '2', 'external_desc': 'Old', 'begin': '2024-04-01T10:00:00Z', 'end': '2024-04-01T12:00:00Z',
+         'modified': '2024-04-01T12:00:00Z'}
+    ]
+    first = parser.parse(response(items), vendor, {})
+    assert [(i['incident_id'], i['status']) for i in first.incidents] == [('gcp-1', 'Incident'), ('gcp-2', 'Resolved')]
+    assert first.incidents[0]['severity'] == 'High'
+    assert parser.parse(response(items), vendor, first.cursor).incidents == []
+
+    with pytest.raises(StatusParseError):
+        parser.parse(response({'incidents': []}), vendor, {})
+
+def test_current_events_report_dropped_events_as_resolved():
+    parser = get_parser('aws')
+    vendor = {'name': 'Amazon Web Services', 'status_url': 'https://health.aws.amazon.com/public/currentevents'}
+    event = {'service': 'ec2', 'service_name': 'EC2', 'region_name': 'us-east-1', 'status': '2',
+             'date': '1714557600', 'summary': 'EC2 API errors',
+             'event_log': [{'timestamp': 1714557600, 'message': 'Investigating'}]}
+
+    first = parser.parse(response([event]), vendor, {})
+    assert first.snapshot
+    assert [i['incident_title'] for i in first.incidents] == ['EC2 API errors']
+
+    unchanged = parser.parse(response([event]), vendor, first.cursor)
+    assert not unchanged.snapshot
+    assert unchanged.incidents == []
+
+    event['event_log'].append({'timestamp': 1714561200, 'message': 'Recovering'})
+    updated = parser.parse(response([event]), vendor, unchanged.cursor)
+    assert [i['incident_description'] for i in updated.incidents] == ['Recovering']
+
+    gone = parser.parse(response([]), vendor, updated.cursor)
+    assert [(i['incident_id'], i['status']) for i in gone.incidents] == [('aws-ec2-1714557600', 'Resolved')]
+
+def test_azure_rss():
+    parser = get_parser('azure_rss')
+    vendor = {'name': 'Microsoft Azure', 'status_url': 'https://azure.status.microsoft/en-us/status/feed/'}
+    feed = b'''<?xml version="1.0"?><rss><channel>
+        <item><guid>azure-1</guid><title>Storage outage in West Europe</title>
+        <pubDate>Wed, 01 May 2024 10:00:00 GMT</pubDate><description>Investigating</description></item>
+    </channel></rss>'''
+    result = parser.parse(response(feed), vendor, {})
+    assert [(i['incident_id'], i['severity']) for i in result.incidents] == [('azure-1', 'High')]
+
+    with pytest.raises(StatusParseError):
+        parser.parse(response(b'<html>maintenance</html>'), vendor, {})
+
+def test_generic_json_is_always_a_snapshot():
+    parser = get_parser('unknown_format')
+    vendor = {'name': 'Salesforce', 'status_url': 'https://status.example.com'}
+    result = parser.parse(response({'incidents': [{'title': 'Login failures'}, 'noise']}), vendor, {})
+    assert result.snapshot
+    assert [i['incident_title'] for i in result.incidents] == ['Login failures']
+
+    with pytest.raises(StatusParseError):
+        parser.parse(response(b'not json'), vendor, {})
+
+def test_utf16_json_is_decoded():
+    parser = get_parser('generic_json')
+    body = '{"incidents": [{"title": "Degraded"}]}'.encode('utf-16')
+    result = parser.parse(response(body), {'name': 'Salesforce'}, {})
+    assert [i['incident_title'] for i in result.incidents] == ['Degraded']
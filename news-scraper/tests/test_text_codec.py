@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+from text_codec import TextCodec, LazyText, train_zlib_dictionary
+from database import NewsDatabase, NewsArticle, StoredArticle
+
+BOILERPLATE = ("Subscribe to our newsletter for the latest compliance news. "
+               "This article was originally published by the regulator. ")
+
+def body(n):
+    return f"Enforcement action {n} against firm {n * 7} for reporting failures. " * 8 + BOILERPLATE * 3
+
+def test_round_trip():
+    codec = TextCodec(min_size=16)
+    text = body(1) + ' ünïcödé ✓'
+    encoded = codec.encode(text)
+    assert isinstance(encoded, bytes)
+    assert len(encoded) < len(text.encode('utf-8'))
+    assert codec.decode(encoded) == text
+
+def test_short_text_stays_plain():
+    codec = TextCodec(min_size=256)
+    assert codec.encode('short') == 'short'
+    assert codec.encode(None) is None
+    assert codec.encode('') == ''
+    assert codec.decode('short') == 'short'
+
+def test_dictionary_round_trip():
+    samples = [body(n) for n in range(40)]
+    dictionary = train_zlib_dictionary(samples)
+    assert 0 < len(dictionary) <= 32 * 1024
+
+    plain = TextCodec(min_size=16)
+    trained = TextCodec(min_size=16)
+    trained.add_dictionary(1, dictionary, active=True)
+
+    text = body(99)
+    encoded = trained.encode(text)
+    assert len(encoded) < len(plain.encode(text))
+    assert trained.decode(encoded) == text
+
+    # Values name their dictionary, so one that isn't loaded fails loudly
+    with pytest.raises(ValueError):
+        plain.decode(encoded)
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        TextCodec('lz4')
+
+def test_zstd_falls_back_to_zlib_without_the_package():
+    codec = TextCodec('zstd')
+    assert codec.codec in ('zstd', 'zlib')
+    assert codec.decode(codec.encode(body(1))) == body(1)
+
+def test_lazy_text_decodes_once():
+    class Record:
+        text = LazyText()
+
+        def __init__(self, codec, value):
+            self._codec = codec
+            self.text = value
+
+    codec = TextCodec(min_size=16)
+    record = Record(codec, codec.encode(body(1)))
+    assert isinstance(record.__dict__['text'], bytes)
+    assert record.text == body(1)
+    assert record.__dict__['text'] == body(1)
+
+def test_database_round_trip_and_recompress(tmp_path):
+    path = str(tmp_path / 'news.db')
+    db = NewsDatabase(path, {'enabled': True, 'min_size': 64})
+    for n in range(12):
+        db.add_article(NewsArticle(title=f'Story {n}', content=body(n), url=f'https://example.com/{n}',
+                                   source='Regulator', summary=body(n)[:200], category='Regulatory'))
+
+    conn = sqlite3.connect(path)
+    assert conn.execute('SELECT typeof(content) FROM news_articles LIMIT 1').fetchone()[0] == 'blob'
+    conn.close()
+
+    articles = db.get_articles(limit=20)
+    assert all(isinstance(article, StoredArticle) for article in articles)
+    assert sorted(article.content for article in articles) == sorted(body(n) for n in range(12))
+    batch = next(db.iter_article_batches())
+    assert batch[0].content == body(0)
+
+    dictionary_id = db.train_compression_dictionary()
+    assert dictionary_id is not None
+    db.recompress_articles()
+    # Rows compressed with the dictionary still read after a restart
+    assert {a.content for a in NewsDatabase(path, {'enabled': True}).get_articles(limit=20)} == {body(n) for n in range(12)}
+
+    # Switching compression off and recompressing restores plain TEXT
+    plain = NewsDatabase(path, {'enabled': False})
+    plain.recompress_articles()
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM news_articles WHERE typeof(content) = 'blob'").fetchone()[0] == 0
+    conn.close()
+    assert {a.content for a in plain.get_articles(limit=20)} == {body(n) for n in range(12)}
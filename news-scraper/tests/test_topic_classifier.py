@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+from database import NewsArticle
+from topic_classifier import (
+    N_FEATURES, TopicClassifier, article_text, load_training_data, save_model, sparse_dot, train_model, vectorize
+)
+
+TRAINING = [
+    ('SEC charges adviser with securities fraud', 'The commission filed charges in federal court.', 'Regulatory'),
+    ('Regulator fines broker over reporting failures', 'The agency imposed a penalty for late filings.', 'Regulatory'),
+    ('Commission adopts new disclosure rule', 'The rule requires firms to report to the regulator.', 'Regulatory'),
+    ('Ransomware gang leaks hospital records', 'Attackers encrypted servers and stole patient data.', 'Cybersecurity'),
+    ('Phishing campaign targets bank customers', 'Attackers sent malware links to steal passwords.', 'Cybersecurity'),
+    ('Zero-day exploit used against VPN appliances', 'Attackers exploited the vulnerability to gain access.', 'Cybersecurity')
+]
+
+@pytest.fixture(scope='module')
+def model_path(tmp_path_factory):
+    texts = [article_text(title, content) for title, content, _ in TRAINING]
+    model = train_model(texts, [label for _, _, label in TRAINING], epochs=100)
+    assert model['training_accuracy'] == 1.0
+    path = str(tmp_path_factory.mktemp('model') / 'topics')
+    save_model(model, path)
+    return path
+
+def test_vectorize_builds_csr_rows():
+    indptr, indices, data = vectorize(['fraud fraud', ''])
+    assert indptr.tolist() == [0, 2, 2]
+    assert all(0 <= index < N_FEATURES for index in indices)
+    # "fraud" twice and the bigram "fraud fraud" once, sublinear
+    assert sorted(data.tolist()) == pytest.approx(sorted([np.log1p(2), np.log1p(1)]))
+
+def test_sparse_dot_matches_dense():
+    indptr, indices, data = np.array([0, 2, 3]), np.array([0, 2, 1]), np.array([1.0, 2.0, 3.0])
+    weights = np.arange(6, dtype=np.float64).reshape(3, 2)
+    dense = np.array([[1.0, 0, 2.0], [0, 3.0, 0]])
+    assert sparse_dot(indptr, indices, data, weights).tolist() == (dense @ weights).tolist()
+
+def test_classifier_predicts_unseen_articles(model_path):
+    classifier = TopicClassifier(model_path)
+    assert classifier.classes == ['Cybersecurity', 'Regulatory']
+    assert isinstance(classifier.matrix, np.memmap)
+
+    probabilities = classifier.predict_proba([
+        article_text('Regulator charges firm over disclosure failures', ''),
+        article_text('Attackers deploy ransomware through phishing', '')
+    ])
+    assert probabilities.sum(axis=1) == pytest.approx([1.0, 1.0])
+    assert probabilities.argmax(axis=1).tolist() == [1, 0]
+    assert classifier.predict_proba([]).shape == (0, 2)
+
+def test_only_confident_predictions_recategorize(model_path):
+    classifier = TopicClassifier(model_path)
+    confident = NewsArticle(title='Attackers deploy ransomware through phishing', category='Wire')
+    unsure = NewsArticle(title='Quarterly results', category='Wire')
+    classifier.classify_articles([confident, unsure], min_confidence=0.6)
+    assert confident.category == 'Cybersecurity'
+    assert unsure.category == 'Wire'
+    assert set(unsure.topic_scores) == {'Cybersecurity', 'Regulatory'}
+
+def test_a_model_of_the_wrong_shape_is_rejected(model_path, tmp_path):
+    path = str(tmp_path / 'bad')
+    np.save(f"{path}.npy", np.zeros((16, 3), dtype=np.float32))
+    with open(f"{model_path}.json") as src, open(f"{path}.json", 'w') as dst:
+        dst.write(src.read())
+    with pytest.raises(ValueError):
+        TopicClassifier(path)
+
+def test_training_data_from_jsonl(tmp_path):
+    path = tmp_path / 'labels.jsonl'
+    path.write_text('\n'.join(json.dumps({'title': t, 'content': c, 'label': l}) for t, c, l in TRAINING[:2]) + '\n\n')
+    texts, labels = load_training_data(str(path), None)
+    assert labels == ['Regulatory', 'Regulatory']
+    assert texts[0].startswith('SEC charges adviser with securities fraud SEC charges')
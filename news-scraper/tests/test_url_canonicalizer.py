@@ -0,0 +1,111 @@
+import pytest
+
+from url_canonicalizer import URLCanonicalizer, RedirectResolver
+
+@pytest.fixture
+def canonicalizer():
+    return URLCanonicalizer()
+
+@pytest.mark.parametrize('url, expected', [
+    ('http://www.Example.com/news/story/?utm_source=rss&utm_medium=feed', 'https://example.com/news/story'),
+    ('https://example.com/story?fbclid=abc&gclid=def&mc_cid=1&id=7', 'https://example.com/story?id=7'),
+    ('https://example.com/story?b=2&a=1', 'https://example.com/story?a=1&b=2'),
+    ('https://example.com:443//news//story/', 'https://example.com/news/story'),
+    ('https://example.com:8443/story', 'https://example.com:8443/story'),
+    ('https://amp.example.com/amp/story', 'https://example.com/story'),
+    ('https://example.com/story/amp/', 'https://example.com/story'),
+    ('https://example-com.cdn.ampproject.org/c/s/example.com/story', 'https://example.com/story'),
+    ('https://www.reuters.com/markets/story?taid=1&page=2', 'https://reuters.com/markets/story'),
+    ('  https://example.com/story#comments  ', 'https://example.com/story'),
+])
+def test_variants_share_a_canonical_url(canonicalizer, url, expected):
+    assert canonicalizer.canonicalize(url) == expected
+
+@pytest.mark.parametrize('query', ['ref=2', 'src=homepage', 'cid=42', 'mod=article', 'feature=video', 'rss=1'])
+def test_generic_keys_are_kept_by_default(canonicalizer, query):
+    # Real content or routing parameters on plenty of sites
+    assert canonicalizer.canonicalize(f'https://example.com/view?{query}') == f'https://example.com/view?{query}'
+
+def test_domain_rules_from_config():
+    canonicalizer = URLCanonicalizer({
+        'tracking_params': ['Campaign'],
+        'domains': {
+            'example.com': {'drop_params': ['ref']},
+            'sec.gov': {'keep_params': ['utm_source']}
+        }
+    })
+    assert canonicalizer.canonicalize('https://news.example.com/a?ref=rss&p=1') == 'https://news.example.com/a?p=1'
+    assert canonicalizer.canonicalize('https://other.org/a?ref=rss&campaign=x') == 'https://other.org/a?ref=rss'
+    assert canonicalizer.canonicalize('https://www.sec.gov/a?utm_source=x') == 'https://sec.gov/a?utm_source=x'
+
+@pytest.mark.parametrize('url', ['https://example.com:99999/story', 'https://example.com:abc/story', 'http://[::1/story'])
+def test_malformed_urls_are_returned_as_is(canonicalizer, url):
+    assert canonicalizer.canonicalize(url) == url
+
+def test_non_web_urls_are_left_alone(canonicalizer):
+    assert canonicalizer.canonicalize('mailto:news@example.com') == 'mailto:news@example.com'
+    assert canonicalizer.canonicalize('') == ''
+    assert canonicalizer.canonicalize(None) == ''
+
+class FakeRedirectDb:
+    def __init__(self):
+        self.redirects = {}
+
+    def get_redirect(self, url):
+        return self.redirects.get(url)
+
+    def save_redirect(self, url, final_url):
+        self.redirects[url] = final_url
+
+class FakeSession:
+    def __init__(self, final_url):
+        self.final_url = final_url
+        self.calls = 0
+
+    def head(self, url, **kwargs):
+        self.calls += 1
+        return type('Response', (), {'status_code': 200, 'url': self.final_url})()
+
+def test_redirects_are_followed_once(canonicalizer):
+    db, session = FakeRedirectDb(), FakeSession('https://example.com/story')
+    resolver = RedirectResolver(db, session)
+
+    assert resolver.resolve('https://feeds.feedburner.com/~r/x/1', canonicalizer) == 'https://example.com/story'
+    assert resolver.resolve('https://feeds.feedburner.com/~r/x/1', canonicalizer) == 'https://example.com/story'
+    assert session.calls == 1
+
+    # A new resolver finds it in the database
+    resolver = RedirectResolver(db, session)
+    assert resolver.resolve('https://feeds.feedburner.com/~r/x/1', canonicalizer, offline=True) == 'https://example.com/story'
+    assert session.calls == 1
+
+    assert resolver.resolve('https://t.co/unseen', canonicalizer, offline=True) == 'https://t.co/unseen'
+    assert resolver.resolve('https://example.com/direct', canonicalizer) == 'https://example.com/direct'
+    assert session.calls == 1
+
+def test_articles_keep_the_publishers_link(tmp_path):
+    from database import NewsArticle, NewsDatabase
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    canonicalizer = URLCanonicalizer()
+    link = 'http://www.sec.gov/news/press-release/2025-12?utm_source=rss'
+    article = NewsArticle(title='Press release', url=link, source='SEC',
+                          canonical_url=canonicalizer.canonicalize(link))
+    db.add_article(article)
+
+    stored, = db.get_articles()
+    assert (stored.url, stored.canonical_url) == (link, 'https://sec.gov/news/press-release/2025-12')
+    assert db.existing_urls(['https://sec.gov/news/press-release/2025-12', link]) == {stored.canonical_url}
+    assert db.article_exists('https://sec.gov/news/press-release/2025-12')
+
+def test_stored_links_are_canonicalized_in_place(tmp_path):
+    from database import NewsArticle, NewsDatabase
+    db = NewsDatabase(str(tmp_path / 'news.db'))
+    for n, url in enumerate(['https://www.example.com/story/amp/', 'https://example.com/story?utm_source=x',
+                             'https://example.com/other']):
+        db.add_article(NewsArticle(title=f'Story {n}', url=url, source='Wire'))
+
+    assert db.recanonicalize_urls(URLCanonicalizer().canonicalize) == (1, 1)
+    assert [(a.url, a.canonical_url) for a in db.get_articles()] == [
+        ('https://example.com/other', 'https://example.com/other'),
+        ('https://www.example.com/story/amp/', 'https://example.com/story')
+    ]
@@ -0,0 +1,248 @@
+import json
+import sqlite3
+import time
+
+import pytest
+import requests
+
+from vendor_monitor import (
+    IncidentStateMachine, VendorStatusMonitor,
+    OPERATIONAL, DEGRADED, OUTAGE
+)
+
+def incident(status='Incident', severity='Medium', incident_id='stripe-1', **fields):
+    record = {
+        'vendor_name': 'Stripe',
+        'status': status,
+        'incident_id': incident_id,
+        'incident_title': 'Elevated API errors',
+        'severity': severity
+    }
+    record.update(fields)
+    return record
+
+def check_failure(status='Unknown', title='Status Page Unavailable'):
+    return {
+        'vendor_name': 'Stripe',
+        'status': status,
+        'incident_title': title,
+        'incident_description': 'Unable to fetch status (HTTP 503)',
+        'severity': 'Medium'
+    }
+
+class RecordingHttp:
+    """Stands in for the monitor's HttpClient, serving status pages and recording API posts"""
+
+    def __init__(self):
+        self.pages = []
+        self.posts = []
+
+    def get(self, url, **kwargs):
+        status_code, body = self.pages.pop(0)
+        resp = requests.Response()
+        resp.status_code = status_code
+        resp._content = json.dumps(body).encode('utf-8')
+        resp.encoding = 'utf-8'
+        resp.url = url
+        return resp
+
+    def stats(self):
+        return {}
+
+    def post(self, url, json=None, **kwargs):
+        self.posts.append(json)
+        return type('Response', (), {'status_code': 200})()
+
+@pytest.fixture
+def monitor(tmp_path):
+    monitor = VendorStatusMonitor(db_path=str(tmp_path / 'vendor_status.db'))
+    monitor.vendors = [v for v in monitor.vendors if v['name'] == 'Stripe']
+    monitor.http = RecordingHttp()
+    return monitor
+
+def test_only_transitions_are_reported():
+    machine = IncidentStateMachine()
+
+    opened = machine.observe('Stripe', [incident()])
+    assert [t['transition'] for t in opened] == ['opened']
+    assert machine.vendor_state('Stripe') == DEGRADED
+
+    assert machine.observe('Stripe', [incident()]) == []
+
+    changed = machine.observe('Stripe', [incident(severity='Critical')])
+    assert [t['transition'] for t in changed] == ['changed']
+    assert machine.vendor_state('Stripe') == OUTAGE
+
+    resolved = machine.observe('Stripe', [{'vendor_name': 'Stripe', 'status': 'Operational'}])
+    assert [t['transition'] for t in resolved] == ['resolved']
+    assert machine.vendor_state('Stripe') == OPERATIONAL
+
+def test_incremental_polls_resolve_only_explicitly():
+    machine = IncidentStateMachine()
+    machine.observe('Stripe', [incident()])
+
+    assert machine.observe('Stripe', [], snapshot=False) == []
+    assert machine.vendor_state('Stripe') == DEGRADED
+
+    resolved = machine.observe('Stripe', [incident(status='Resolved', resolved_at='2024-01-01T00:00:00')], snapshot=False)
+    assert resolved[0]['resolved_at'] == '2024-01-01T00:00:00'
+    assert machine.vendor_state('Stripe') == OPERATIONAL
+
+@pytest.mark.parametrize('status', ['Error', 'Unknown'])
+def test_failed_checks_are_not_incidents(status):
+    machine = IncidentStateMachine()
+    assert machine.observe('Stripe', [check_failure(status)]) == []
+    assert machine.vendor_state('Stripe') == OPERATIONAL
+    assert machine.open_incidents['Stripe'] == {}
+
+    # Nor does a failed check resolve a real incident, even as a "snapshot"
+    machine.observe('Stripe', [incident()])
+    assert machine.observe('Stripe', [check_failure(status)], snapshot=True) == []
+    assert machine.vendor_state('Stripe') == DEGRADED
+
+def test_restored_incidents_are_not_reopened():
+    machine = IncidentStateMachine()
+    machine.restore([incident(severity='High')])
+    assert machine.vendor_state('Stripe') == OUTAGE
+    assert machine.observe('Stripe', [incident(severity='High')]) == []
+
+def test_failed_checks_are_not_sent_as_alerts(monitor):
+    transitions = [
+        dict(check_failure(), transition='opened'),
+        dict(incident(), transition='opened')
+    ]
+    assert monitor.send_to_nextjs_api(transitions)
+    titles = [alert['title'] for alert in monitor.http.posts[0]['articles']]
+    assert titles == ['Stripe: Elevated API errors']
+
+def test_monitor_health_clears_on_next_successful_check(monitor):
+    monitor.update_monitor_health([check_failure()])
+    monitor.update_monitor_health([check_failure(status='Error', title='Monitoring Timeout')])
+    failure = monitor.monitor_failures['Stripe']
+    assert failure['failures'] == 2
+    assert failure['reason'] == 'Monitoring Timeout'
+
+    restarted = VendorStatusMonitor(db_path=monitor.db_path)
+    assert restarted.monitor_failures['Stripe']['failures'] == 2
+
+    # A 304 leaves no records at all, which still counts as a good check
+    monitor.update_monitor_health([])
+    assert monitor.monitor_failures == {}
+    assert VendorStatusMonitor(db_path=monitor.db_path).monitor_failures == {}
+
+def test_failed_checks_stored_as_incidents_are_closed_on_start(monitor):
+    conn = sqlite3.connect(monitor.db_path)
+    conn.execute('''
+        INSERT INTO vendor_status (vendor_name, status, incident_title, severity, started_at, checked_at)
+        VALUES ('Stripe', 'Unknown', 'Status Page Unavailable', 'Medium', '2024-01-01T00:00:00', '2024-01-01T00:05:00')
+    ''')
+    conn.commit()
+    conn.close()
+
+    restarted = VendorStatusMonitor(db_path=monitor.db_path)
+    assert restarted.state_machine.vendor_state('Stripe') == OPERATIONAL
+
+    conn = sqlite3.connect(monitor.db_path)
+    resolved_at = conn.execute('SELECT resolved_at FROM vendor_status').fetchone()[0]
+    conn.close()
+    assert resolved_at == '2024-01-01T00:05:00'
+
+def test_only_written_rows_count_as_saved(monitor):
+    conn = sqlite3.connect(monitor.db_path)
+    conn.execute("CREATE TRIGGER fail_insert BEFORE INSERT ON vendor_status BEGIN SELECT RAISE(ABORT, 'disk full'); END")
+    conn.commit()
+    assert monitor.save_vendor_status(monitor.apply_status_updates([incident()])) == 0
+
+    # No row was written, so there is nothing to update either
+    conn.execute('DROP TRIGGER fail_insert')
+    conn.commit()
+    assert monitor.save_vendor_status(monitor.apply_status_updates([incident(severity='High')])) == 0
+    assert conn.execute('SELECT COUNT(*) FROM vendor_status').fetchone()[0] == 0
+
+    # An open row without a tracked id is updated by incident id
+    conn.execute('''
+        INSERT INTO vendor_status (vendor_name, status, incident_id, incident_title, severity)
+        VALUES ('Stripe', 'Incident', 'stripe-1', 'Elevated API errors', 'High')
+    ''')
+    conn.commit()
+    resolved = monitor.apply_status_updates([{'vendor_name': 'Stripe', 'status': 'Operational'}])
+    assert monitor.save_vendor_status(resolved) == 1
+    assert conn.execute('SELECT resolved_at IS NOT NULL FROM vendor_status').fetchone()[0] == 1
+    conn.close()
+
+def test_failed_checks_are_sampled_as_unknown(monitor):
+    monitor.update_monitor_health([check_failure()])
+    monitor.record_health_samples()
+    assert monitor.uptime_store.uptime('Stripe') is None
+
+    monitor.update_monitor_health([])
+    monitor.apply_status_updates([incident(severity='Critical')])
+    monitor.record_health_samples()
+    # Through the end of the minute the sample was taken in
+    assert monitor.uptime_store.uptime('Stripe', end=time.time() + 60) == 0.0
+
+def test_unavailable_status_page_is_not_an_incident(monitor):
+    quiet = {'incidents': [{
+        'id': 'old', 'name': 'Old incident', 'status': 'resolved',
+        'updated_at': '2024-05-01T10:00:00Z', 'resolved_at': '2024-05-01T10:00:00Z'
+    }]}
+    monitor.http.pages = [(200, quiet), (503, {}), (200, quiet), (200, quiet)]
+
+    for cycle in range(4):
+        monitor.run_monitoring_cycle()
+        assert monitor.state_machine.vendor_state('Stripe') == OPERATIONAL
+        assert monitor.state_machine.open_incidents.get('Stripe', {}) == {}
+        assert ('Stripe' in monitor.monitor_failures) == (cycle == 1)
+
+    assert monitor.http.posts == []
+
+    restarted = VendorStatusMonitor(db_path=monitor.db_path)
+    assert restarted.state_machine.vendor_state('Stripe') == OPERATIONAL
+    assert restarted.monitor_failures == {}
+
+    conn = sqlite3.connect(monitor.db_path)
+    assert conn.execute('SELECT COUNT(*) FROM vendor_status').fetchone()[0] == 0
+    conn.close()
+
+class SlowHttp(RecordingHttp):
+    """Status pages that take ``delays[host]`` seconds to answer"""
+
+    def __init__(self, delays):
+        super().__init__()
+        self.delays = delays
+        self.hosts = []
+
+    def get(self, url, **kwargs):
+        host = url.split('/')[2]
+        self.hosts.append(host)
+        time.sleep(self.delays.get(host, 0))
+        self.pages.append((200, {'incidents': []}))
+        return super().get(url, **kwargs)
+
+def test_vendors_are_polled_concurrently_within_the_deadline(tmp_path):
+    monitor = VendorStatusMonitor(db_path=str(tmp_path / 'vendor_status.db'), cycle_deadline=0.5)
+    monitor.vendors = [
+        {'name': f'Vendor {n}', 'status_url': f'https://status{n}.example.com', 'format': 'statuspage_io'}
+        for n in range(4)
+    ]
+    monitor.http = SlowHttp({'status0.example.com': 0.2, 'status1.example.com': 0.2,
+                             'status2.example.com': 0.2, 'status3.example.com': 1.5})
+
+    start = time.monotonic()
+    records = monitor.check_vendors_concurrently()
+    assert time.monotonic() - start < 1
+
+    by_vendor = {record['vendor_name']: record for record in records}
+    assert [by_vendor[f'Vendor {n}']['status'] for n in range(3)] == ['Operational'] * 3
+    assert by_vendor['Vendor 3']['incident_title'] == 'Monitoring Timeout'
+    # Only polls that made the deadline advance their cursor
+    assert sorted(monitor.dirty_parser_state) == ['Vendor 0', 'Vendor 1', 'Vendor 2']
+
+    # The next cycle doesn't poll a vendor whose last poll is still running
+    records = monitor.check_vendors_concurrently()
+    assert monitor.http.hosts.count('status3.example.com') == 1
+    assert {record['vendor_name']: record for record in records}['Vendor 3']['incident_title'] == 'Monitoring Timeout'
+
+    monitor.pending_polls['Vendor 3'].result()
+    monitor.check_vendors_concurrently()
+    assert monitor.http.hosts.count('status3.example.com') == 2
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from vendor_timeseries import VendorUptimeStore, covering_ranges, MINUTE, HOUR, DAY
+
+@pytest.fixture
+def store(tmp_path):
+    return VendorUptimeStore(str(tmp_path / 'vendor_status.db'))
+
+def recent_hour():
+    """Start of an hour a little in the past, so every rollup is kept"""
+    now = int(time.time())
+    return now - now % HOUR - 2 * HOUR
+
+def test_covering_ranges_use_coarse_buckets_inside_the_window():
+    start = 5 * DAY + 90 * MINUTE
+    end = 8 * DAY + 2 * HOUR + 30 * MINUTE
+    assert covering_ranges(start, end) == [
+        (MINUTE, start, 5 * DAY + 2 * HOUR),
+        (HOUR, 5 * DAY + 2 * HOUR, 6 * DAY),
+        (DAY, 6 * DAY, 8 * DAY),
+        (HOUR, 8 * DAY, 8 * DAY + 2 * HOUR),
+        (MINUTE, 8 * DAY + 2 * HOUR, end)
+    ]
+    assert covering_ranges(10 * MINUTE, 20 * MINUTE) == [(MINUTE, 10 * MINUTE, 20 * MINUTE)]
+
+def test_uptime_and_mttr(store):
+    hour = recent_hour()
+    states = ['operational'] * 50 + ['degraded'] * 5 + ['outage'] * 5
+    store.record_samples(('Stripe', hour + i * MINUTE, state) for i, state in enumerate(states))
+    store.record_sample('Stripe', 'operational', hour + HOUR)
+
+    end = hour + HOUR + MINUTE
+    assert store.uptime('Stripe', HOUR + MINUTE, end=end) == pytest.approx(1 - 5 / 61)
+    assert store.uptime('Stripe', HOUR + MINUTE, end=end, strict=True) == pytest.approx(1 - 10 / 61)
+    assert store.mttr('Stripe', HOUR + MINUTE, end=end) == 10 * MINUTE
+    assert [period['state'] for period in store.incident_timeline('Stripe')] == ['outage']
+    assert store.uptime('Plaid', HOUR, end=end) is None
+
+def test_unknown_samples_count_neither_for_nor_against_uptime(store):
+    hour = recent_hour()
+    states = ['operational'] * 10 + ['outage'] * 2 + ['unknown'] * 30 + ['outage'] * 2 + ['operational'] * 6
+    store.record_samples(('Stripe', hour + i * MINUTE, state) for i, state in enumerate(states))
+
+    end = hour + HOUR
+    assert store.uptime('Stripe', HOUR, end=end) == pytest.approx(1 - 4 / 20)
+
+    # The outage runs on through the gap rather than being split by it
+    timeline = store.incident_timeline('Stripe')
+    assert len(timeline) == 1
+    assert timeline[0]['duration'] == 34 * MINUTE
+
+    store.record_samples(('Plaid', hour + i * MINUTE, 'unknown') for i in range(10))
+    assert store.uptime('Plaid', HOUR, end=end) is None
+    assert store.incident_timeline('Plaid') == []
+
+def test_window_edges_fall_back_to_hours_once_minutes_expire(store):
+    now = int(time.time())
+    old_hour = now - now % HOUR - 40 * DAY
+
+    # Only hour and day rollups are written this far back
+    store.record_samples(('Stripe', old_hour + i * MINUTE, 'outage') for i in range(60))
+    store.record_samples(('Stripe', now - HOUR + i * MINUTE, 'operational') for i in range(60))
+
+    # The window starts mid-hour; that hour is read whole instead of lost
+    start = old_hour + 20 * MINUTE
+    assert store.uptime('Stripe', now - start, end=now) == pytest.approx(0.5)
+
+    # Windows that end in expired minutes are widened the same way
+    assert store.uptime('Stripe', 10 * MINUTE, end=old_hour + 30 * MINUTE) == 0.0
+
+def test_prune_keeps_coarser_rollups(store):
+    now = int(time.time())
+    old_hour = now - now % HOUR - 40 * DAY
+    store.record_samples(('Stripe', old_hour + i * MINUTE, 'outage') for i in range(60))
+    store.prune(now=now + 400 * DAY)
+
+    day = old_hour - old_hour % DAY
+    assert store.uptime('Stripe', DAY, end=day + DAY) == 0.0
@@ -4,62 +4,228 @@ Vendor Status Page Monitor for Beacon Compliance Intelligence Platform
 Monitors critical vendor status pages and creates compliance alerts for outages
 """
 
-import requests
 import json
 import sqlite3
 import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import time
 
-class VendorStatusMonitor:
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from vendor_timeseries import VendorUptimeStore
+from status_parsers import get_parser, StatusParseError
+from risk_rules import RiskRuleEngine, load_risk_rules
+from retention import RetentionManager
+from http_client import HttpClient
+
+# Incident lifecycle states, least to most severe
+OPERATIONAL = 'operational'
+DEGRADED = 'degraded'
+OUTAGE = 'outage'
+RESOLVED = 'resolved'
+
+STATE_RANK = {OPERATIONAL: 0, DEGRADED: 1, OUTAGE: 2}
+
+# Record statuses that describe our ability to check, not the vendor itself
+MONITORING_STATUSES = ('Error', 'Unknown')
+
+class IncidentStateMachine:
+    """In-memory vendor and incident state that reports only transitions"""
+    
     def __init__(self):
-        self.base_url = "http://localhost:3000"
-        self.db_path = os.path.join(os.path.dirname(__file__), "data", "vendor_status.db")
+        self.vendor_states: Dict[str, str] = {}
+        self.open_incidents: Dict[str, Dict[str, Dict]] = {}
+    
+    @staticmethod
+    def incident_key(incident: Dict) -> str:
+        """Stable identity for an incident across polls"""
+        if incident.get('incident_id'):
+            return str(incident['incident_id'])
+        return f"{incident['vendor_name']}:{incident.get('incident_title') or 'Service Issue'}"
+    
+    @staticmethod
+    def incident_state(incident: Dict) -> str:
+        """Map a parsed incident onto the degraded/outage states"""
+        if incident.get('severity') in ('High', 'Critical'):
+            return OUTAGE
+        return DEGRADED
+    
+    def vendor_state(self, vendor_name: str) -> str:
+        """Current state of a vendor, derived from its open incidents"""
+        return self.vendor_states.get(vendor_name, OPERATIONAL)
+    
+    def restore(self, incidents: List[Dict]):
+        """Seed state from incidents persisted as still open"""
+        for incident in incidents:
+            incident = dict(incident)
+            incident['state'] = self.incident_state(incident)
+            key = self.incident_key(incident)
+            self.open_incidents.setdefault(incident['vendor_name'], {})[key] = incident
+        
+        for vendor_name in self.open_incidents:
+            self.vendor_states[vendor_name] = self._derive_vendor_state(vendor_name)
+    
+    def observe(self, vendor_name: str, records: List[Dict], snapshot: bool = True) -> List[Dict]:
+        """Apply one poll's records for a vendor and return incident transitions
+        
+        With ``snapshot`` set the records describe every open incident, so any
+        tracked incident missing from them is considered resolved. Monitoring
+        failure records are ignored, and keep a poll from resolving anything.
+        """
+        # A failed check is monitor health, not a vendor incident: it never
+        # opens, changes or resolves anything since we learned nothing
+        if any(record.get('status') in MONITORING_STATUSES for record in records):
+            records = [record for record in records if record.get('status') not in MONITORING_STATUSES]
+            snapshot = False
+        
+        now = datetime.now().isoformat()
+        open_incidents = self.open_incidents.setdefault(vendor_name, {})
+        transitions = []
+        seen = set()
+        
+        for record in records:
+            status = record.get('status')
+            if status == 'Operational':
+                continue
+            
+            key = self.incident_key(record)
+            seen.add(key)
+            current = open_incidents.get(key)
+            
+            if status == 'Resolved':
+                if current:
+                    transitions.append(self._resolve(open_incidents, key, record.get('resolved_at') or now))
+                continue
+            
+            state = self.incident_state(record)
+            if current is None:
+                incident = dict(record, incident_id=key, state=state, transition='opened')
+                incident.setdefault('started_at', now)
+                open_incidents[key] = incident
+                transitions.append(dict(incident))
+            elif current['state'] != state or current.get('status') != status:
+                current.update(
+                    status=status,
+                    severity=record.get('severity'),
+                    incident_title=record.get('incident_title'),
+                    incident_description=record.get('incident_description'),
+                    checked_at=record.get('checked_at', now),
+                    state=state,
+                    transition='changed'
+                )
+                transitions.append(dict(current))
+            else:
+                # Same incident, same state: refresh details without emitting
+                current['incident_description'] = record.get('incident_description')
+                current['checked_at'] = record.get('checked_at', now)
+        
+        if snapshot:
+            for key in [key for key in open_incidents if key not in seen]:
+                transitions.append(self._resolve(open_incidents, key, now))
+        
+        self.vendor_states[vendor_name] = self._derive_vendor_state(vendor_name)
+        return transitions
+    
+    def _resolve(self, open_incidents: Dict[str, Dict], key: str, resolved_at: str) -> Dict:
+        incident = open_incidents.pop(key)
+        incident.update(
+            status='Resolved',
+            state=RESOLVED,
+            resolved_at=resolved_at,
+            checked_at=datetime.now().isoformat(),
+            transition='resolved'
+        )
+        return incident
+    
+    def _derive_vendor_state(self, vendor_name: str) -> str:
+        state = OPERATIONAL
+        for incident in self.open_incidents.get(vendor_name, {}).values():
+            if STATE_RANK[incident['state']] > STATE_RANK[state]:
+                state = incident['state']
+        return state
+
+class VendorStatusMonitor:
+    def __init__(self, max_workers: int = 32, request_timeout: float = 10,
+                 cycle_deadline: float = 30, db_path: Optional[str] = None,
+                 base_url: str = "http://localhost:3000"):
+        self.base_url = base_url
+        self.db_path = db_path or os.path.join(os.path.dirname(__file__), "data", "vendor_status.db")
         self.ensure_data_directory()
         self.init_database()
         
+        # Restore open incidents so a restart doesn't re-alert on them
+        self.state_machine = IncidentStateMachine()
+        self.load_incident_state()
+        
+        # Vendors we currently fail to check, kept apart from their incidents
+        self.monitor_failures = self.load_monitor_health()
+        
+        # Incremental parser cursors, saved at the end of each cycle
+        self.parser_state = self.load_parser_state()
+        self.dirty_parser_state = set()
+        
+        # Per-cycle health samples for uptime/MTTR queries
+        self.uptime_store = VendorUptimeStore(self.db_path)
+        
+        # Concurrent polling settings
+        self.max_workers = max_workers
+        self.request_timeout = request_timeout
+        self.cycle_deadline = cycle_deadline
+        self.http = self.create_http_client()
+        
+        # One pool for every cycle; polls that overran a deadline stay in
+        # pending_polls until they finish, so a vendor is never polled twice
+        # at once
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='vendor-poll')
+        self.pending_polls: Dict[str, Future] = {}
+        
+        # Alert severity/priority mapping from the shared config
+        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "config.yaml")
+        self.risk_rules = RiskRuleEngine(load_risk_rules(config_path), 'vendor_incidents')
+        
         # Critical vendor status pages
         self.vendors = [
             {
                 "name": "Amazon Web Services",
-                "status_url": "https://status.aws.amazon.com/data.json",
-                "type": "aws",
+                "status_url": "https://health.aws.amazon.com/public/currentevents",
+                "format": "aws",
                 "criticality": "Critical",
                 "category": "Cloud Infrastructure"
             },
             {
                 "name": "Microsoft Azure", 
-                "status_url": "https://status.azure.com/en-us/status/history/",
-                "type": "azure",
+                "status_url": "https://azure.status.microsoft/en-us/status/feed/",
+                "format": "azure_rss",
                 "criticality": "Critical",
                 "category": "Cloud Infrastructure"
             },
             {
                 "name": "Google Cloud Platform",
                 "status_url": "https://status.cloud.google.com/incidents.json",
-                "type": "gcp",
+                "format": "gcp",
                 "criticality": "Critical", 
                 "category": "Cloud Infrastructure"
             },
             {
                 "name": "Stripe",
-                "status_url": "https://status.stripe.com/api/v2/status.json",
-                "type": "stripe",
+                "status_url": "https://status.stripe.com",
+                "format": "statuspage_io",
                 "criticality": "High",
                 "category": "Payment Processing"
             },
             {
                 "name": "Plaid",
-                "status_url": "https://status.plaid.com/api/v2/status.json",
-                "type": "plaid", 
+                "status_url": "https://status.plaid.com",
+                "format": "statuspage_io",
                 "criticality": "High",
                 "category": "Financial Services"
             },
             {
                 "name": "Salesforce",
                 "status_url": "https://api.status.salesforce.com/v1/instances/status/preview",
-                "type": "salesforce",
+                "format": "generic_json",
                 "criticality": "Medium",
                 "category": "CRM Platform"
             }
@@ -71,6 +237,14 @@ class VendorStatusMonitor:
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
     
+    def create_http_client(self) -> HttpClient:
+        """Create the keep-alive client shared by all status page checks and API calls"""
+        # One pooled connection per worker so concurrent checks reuse sockets
+        return HttpClient(
+            {'pool_connections': self.max_workers, 'pool_maxsize': self.max_workers},
+            {'User-Agent': 'Beacon-Compliance-Monitor/1.0', 'Accept': 'application/json'}
+        )
+    
     def init_database(self):
         """Initialize SQLite database for storing vendor status"""
         conn = sqlite3.connect(self.db_path)
@@ -92,61 +266,249 @@ class VendorStatusMonitor:
             )
         ''')
         
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS vendor_state (
+                vendor_name TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS parser_state (
+                vendor_name TEXT PRIMARY KEY,
+                cursor TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                updated_at TEXT
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS monitor_health (
+                vendor_name TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                reason TEXT,
+                detail TEXT,
+                failures INTEGER NOT NULL,
+                failing_since TEXT NOT NULL,
+                checked_at TEXT NOT NULL
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_vendor_status_open
+            ON vendor_status(vendor_name, incident_id) WHERE resolved_at IS NULL
+        ''')
+        
+        # Older versions stored failed checks as vendor incidents; they were
+        # never vendor outages, so close them quietly instead of restoring them
+        cursor.execute(f'''
+            UPDATE vendor_status
+            SET resolved_at = COALESCE(checked_at, started_at)
+            WHERE resolved_at IS NULL AND status IN ({', '.join('?' for _ in MONITORING_STATUSES)})
+        ''', MONITORING_STATUSES)
+        
+        conn.commit()
+        conn.close()
+    
+    def load_incident_state(self):
+        """Load incidents that were still open when the monitor last ran"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT id, vendor_name, status, incident_id, incident_title,
+                   incident_description, severity, started_at, checked_at
+            FROM vendor_status
+            WHERE resolved_at IS NULL
+              AND status NOT IN ('Operational', {', '.join('?' for _ in MONITORING_STATUSES)})
+            ORDER BY id
+        ''', MONITORING_STATUSES)
+        
+        # Later rows win, which collapses the per-poll duplicates older
+        # versions of the monitor wrote for the same incident
+        open_incidents = {}
+        for row in cursor.fetchall():
+            incident = {
+                'row_id': row[0],
+                'vendor_name': row[1],
+                'status': row[2],
+                'incident_id': row[3],
+                'incident_title': row[4],
+                'incident_description': row[5],
+                'severity': row[6],
+                'started_at': row[7],
+                'checked_at': row[8]
+            }
+            key = (incident['vendor_name'], IncidentStateMachine.incident_key(incident))
+            open_incidents[key] = incident
+        
+        conn.close()
+        self.state_machine.restore(list(open_incidents.values()))
+    
+    def load_monitor_health(self) -> Dict[str, Dict]:
+        """Load the vendors whose checks were failing when the monitor last ran"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT vendor_name, status, reason, detail, failures, failing_since, checked_at
+            FROM monitor_health
+        ''')
+        
+        failures = {}
+        for row in cursor.fetchall():
+            failures[row[0]] = {
+                'status': row[1],
+                'reason': row[2],
+                'detail': row[3],
+                'failures': row[4],
+                'failing_since': row[5],
+                'checked_at': row[6]
+            }
+        
+        conn.close()
+        return failures
+    
+    def update_monitor_health(self, records: List[Dict]) -> Dict[str, Dict]:
+        """Track which vendors we failed to check this cycle
+        
+        A failed fetch, an unparseable page or a timeout is our problem, not
+        the vendor's, so it's recorded here rather than as an incident, and
+        cleared by the vendor's next successful check.
+        """
+        failed = {
+            record['vendor_name']: record
+            for record in records
+            if record.get('status') in MONITORING_STATUSES
+        }
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        now = datetime.now().isoformat()
+        for vendor in self.vendors:
+            name = vendor['name']
+            record = failed.get(name)
+            
+            if record is None:
+                if self.monitor_failures.pop(name, None) is not None:
+                    print(f"🩺 Monitoring of {name} recovered")
+                    cursor.execute('DELETE FROM monitor_health WHERE vendor_name = ?', (name,))
+                continue
+            
+            failure = self.monitor_failures.setdefault(name, {'failures': 0, 'failing_since': now})
+            failure.update(
+                status=record['status'],
+                reason=record.get('incident_title'),
+                detail=record.get('incident_description'),
+                failures=failure['failures'] + 1,
+                checked_at=now
+            )
+            print(f"🩺 Can't check {name} ({failure['reason']}, {failure['failures']} in a row)")
+            cursor.execute('''
+                INSERT OR REPLACE INTO monitor_health
+                (vendor_name, status, reason, detail, failures, failing_since, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                name,
+                failure['status'],
+                failure['reason'],
+                failure['detail'],
+                failure['failures'],
+                failure['failing_since'],
+                failure['checked_at']
+            ))
+        
         conn.commit()
         conn.close()
+        return self.monitor_failures
     
     def check_generic_status_page(self, vendor: Dict) -> List[Dict]:
-        """Generic status page checker for most vendors"""
+        """Poll a vendor and advance its parser cursor
+        
+        Returns only incidents changed since the vendor's stored cursor. An
+        empty list means nothing changed since the last poll.
+        """
+        incidents, state = self.poll_vendor(vendor)
+        self.update_parser_state(vendor['name'], state)
+        return incidents
+    
+    def update_parser_state(self, vendor_name: str, state: Optional[Dict]):
+        """Adopt a vendor's new cursor; saved by save_parser_state"""
+        if state is not None:
+            self.parser_state[vendor_name] = state
+            self.dirty_parser_state.add(vendor_name)
+    
+    def poll_vendor(self, vendor: Dict) -> Tuple[List[Dict], Optional[Dict]]:
+        """Fetch and parse a vendor's status page through its format's parser plugin
+        
+        Returns the incidents plus the parser state to resume from, which
+        is None when the poll failed and the old cursor should be kept.
+        """
         try:
             print(f"Checking {vendor['name']} status...")
             
-            headers = {
-                'User-Agent': 'Beacon-Compliance-Monitor/1.0',
-                'Accept': 'application/json'
-            }
+            parser = get_parser(vendor.get('format', 'generic_json'))
+            state = self.parser_state.get(vendor['name'], {})
+            url = parser.url(vendor)
             
-            response = requests.get(vendor['status_url'], headers=headers, timeout=10)
+            # Conditional request so unchanged feeds cost a 304
+            headers = {'Accept': parser.accept}
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+            
+            timeout = vendor.get('timeout', self.request_timeout)
+            response = self.http.get(url, headers=headers, timeout=timeout)
+            
+            if response.status_code == 304:
+                return [], None
             
             if response.status_code != 200:
                 return [{
                     'vendor_name': vendor['name'],
                     'status': 'Unknown',
                     'incident_title': 'Status Page Unavailable',
-                    'incident_description': f'Unable to fetch status from {vendor["status_url"]} (HTTP {response.status_code})',
+                    'incident_description': f'Unable to fetch status from {url} (HTTP {response.status_code})',
                     'severity': 'Medium',
                     'started_at': datetime.now().isoformat(),
                     'checked_at': datetime.now().isoformat()
-                }]
+                }], None
             
-            # Try to parse JSON response
-            try:
-                data = response.json()
-            except json.JSONDecodeError:
-                # If not JSON, assume operational
-                return [{
+            result = parser.parse(response, vendor, state.get('cursor', {}))
+            new_state = {
+                'cursor': result.cursor,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+            
+            incidents = result.incidents
+            if result.snapshot and not any(i['status'] == 'Incident' for i in incidents):
+                incidents.append({
                     'vendor_name': vendor['name'],
                     'status': 'Operational',
-                    'incident_title': None,
-                    'incident_description': None,
-                    'severity': 'Info',
                     'checked_at': datetime.now().isoformat()
-                }]
-            
-            # Parse different status page formats
-            incidents = []
+                })
             
-            if vendor['type'] == 'aws':
-                incidents = self.parse_aws_status(data, vendor)
-            elif vendor['type'] == 'stripe' or vendor['type'] == 'plaid':
-                incidents = self.parse_statuspage_io(data, vendor)
-            elif vendor['type'] == 'gcp':
-                incidents = self.parse_gcp_status(data, vendor)
-            else:
-                # Generic parsing
-                incidents = self.parse_generic_status(data, vendor)
+            for incident in incidents:
+                incident['snapshot'] = result.snapshot
             
-            return incidents
+            return incidents, new_state
             
+        except StatusParseError as e:
+            print(f"Unparseable status page for {vendor['name']}: {e}")
+            return [{
+                'vendor_name': vendor['name'],
+                'status': 'Unknown',
+                'incident_title': 'Unparseable Status Page',
+                'incident_description': str(e),
+                'severity': 'Medium',
+                'started_at': datetime.now().isoformat(),
+                'checked_at': datetime.now().isoformat()
+            }], None
         except Exception as e:
             print(f"Error checking {vendor['name']}: {e}")
             return [{
@@ -157,184 +519,210 @@ class VendorStatusMonitor:
                 'severity': 'Low',
                 'started_at': datetime.now().isoformat(),
                 'checked_at': datetime.now().isoformat()
-            }]
-    
-    def parse_aws_status(self, data: Dict, vendor: Dict) -> List[Dict]:
-        """Parse AWS status page format"""
-        incidents = []
-        
-        # AWS uses a complex nested structure
-        if 'current' in data:
-            for region_data in data.get('current', []):
-                if region_data.get('status') != 0:  # 0 = operational
-                    incidents.append({
-                        'vendor_name': vendor['name'],
-                        'status': 'Incident',
-                        'incident_id': f"aws-{region_data.get('region', 'unknown')}",
-                        'incident_title': f"AWS {region_data.get('region', 'Unknown Region')} Issue",
-                        'incident_description': region_data.get('message', 'Service disruption detected'),
-                        'severity': 'High' if region_data.get('status') > 1 else 'Medium',
-                        'started_at': datetime.now().isoformat(),
-                        'checked_at': datetime.now().isoformat()
-                    })
-        
-        if not incidents:
-            incidents.append({
-                'vendor_name': vendor['name'],
-                'status': 'Operational',
-                'checked_at': datetime.now().isoformat()
-            })
+            }], None
+    
+    def load_parser_state(self) -> Dict[str, Dict]:
+        """Load per-vendor parser cursors and conditional request validators"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
         
-        return incidents
+        cursor.execute('SELECT vendor_name, cursor, etag, last_modified FROM parser_state')
+        
+        parser_state = {}
+        for row in cursor.fetchall():
+            parser_state[row[0]] = {
+                'cursor': json.loads(row[1]) if row[1] else {},
+                'etag': row[2],
+                'last_modified': row[3]
+            }
+        
+        conn.close()
+        return parser_state
     
-    def parse_statuspage_io(self, data: Dict, vendor: Dict) -> List[Dict]:
-        """Parse StatusPage.io format (used by Stripe, Plaid, etc.)"""
-        incidents = []
+    def save_parser_state(self):
+        """Persist cursors advanced during this cycle"""
+        if not self.dirty_parser_state:
+            return
         
-        # Check overall status
-        status = data.get('status', {})
-        if status.get('indicator') != 'none':
-            incidents.append({
-                'vendor_name': vendor['name'],
-                'status': 'Incident',
-                'incident_title': status.get('description', 'Service Issue'),
-                'incident_description': f"Overall status: {status.get('description', 'Unknown issue')}",
-                'severity': 'High' if status.get('indicator') == 'major' else 'Medium',
-                'started_at': datetime.now().isoformat(),
-                'checked_at': datetime.now().isoformat()
-            })
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
         
-        if not incidents:
-            incidents.append({
-                'vendor_name': vendor['name'],
-                'status': 'Operational',
-                'checked_at': datetime.now().isoformat()
-            })
+        now = datetime.now().isoformat()
+        for vendor_name in self.dirty_parser_state:
+            state = self.parser_state[vendor_name]
+            cursor.execute('''
+                INSERT OR REPLACE INTO parser_state
+                (vendor_name, cursor, etag, last_modified, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                vendor_name,
+                json.dumps(state['cursor']),
+                state['etag'],
+                state['last_modified'],
+                now
+            ))
         
-        return incidents
+        conn.commit()
+        conn.close()
+        self.dirty_parser_state.clear()
     
-    def parse_gcp_status(self, data: Dict, vendor: Dict) -> List[Dict]:
-        """Parse Google Cloud Platform status format"""
-        incidents = []
-        
-        # GCP returns list of incidents
-        if isinstance(data, list):
-            for incident in data:
-                if incident.get('status') in ['open', 'investigating']:
-                    incidents.append({
-                        'vendor_name': vendor['name'],
-                        'status': 'Incident',
-                        'incident_id': incident.get('id'),
-                        'incident_title': incident.get('summary', 'GCP Incident'),
-                        'incident_description': incident.get('description', 'Service disruption'),
-                        'severity': 'High' if 'major' in incident.get('severity', '').lower() else 'Medium',
-                        'started_at': incident.get('created_at', datetime.now().isoformat()),
-                        'checked_at': datetime.now().isoformat()
-                    })
-        
-        if not incidents:
-            incidents.append({
-                'vendor_name': vendor['name'],
-                'status': 'Operational',
-                'checked_at': datetime.now().isoformat()
-            })
+    def apply_status_updates(self, incidents: List[Dict]) -> List[Dict]:
+        """Feed a cycle's records through the state machine, returning transitions"""
+        by_vendor: Dict[str, List[Dict]] = {}
+        for incident in incidents:
+            # Failed checks are tracked by update_monitor_health instead
+            if incident.get('status') in MONITORING_STATUSES:
+                continue
+            by_vendor.setdefault(incident['vendor_name'], []).append(incident)
         
-        return incidents
+        transitions = []
+        for vendor_name, records in by_vendor.items():
+            snapshot = all(record.get('snapshot', True) for record in records)
+            transitions.extend(self.state_machine.observe(vendor_name, records, snapshot=snapshot))
+        
+        return transitions
     
-    def parse_generic_status(self, data: Dict, vendor: Dict) -> List[Dict]:
-        """Generic status parsing for unknown formats"""
-        # Look for common status indicators
-        status_indicators = ['status', 'state', 'health', 'operational']
-        incident_indicators = ['incidents', 'issues', 'problems', 'outages']
-        
-        incidents = []
-        
-        # Check for incidents
-        for key in incident_indicators:
-            if key in data and data[key]:
-                incidents_data = data[key]
-                if isinstance(incidents_data, list) and len(incidents_data) > 0:
-                    for incident in incidents_data[:3]:  # Limit to 3 most recent
-                        incidents.append({
-                            'vendor_name': vendor['name'],
-                            'status': 'Incident',
-                            'incident_title': str(incident.get('title', incident.get('name', 'Service Issue'))),
-                            'incident_description': str(incident.get('description', incident.get('summary', 'Service disruption detected'))),
-                            'severity': 'Medium',
-                            'started_at': datetime.now().isoformat(),
-                            'checked_at': datetime.now().isoformat()
-                        })
-        
-        if not incidents:
-            incidents.append({
-                'vendor_name': vendor['name'],
-                'status': 'Operational',
-                'checked_at': datetime.now().isoformat()
-            })
+    def record_health_samples(self):
+        """Record one health sample per vendor in the uptime store
         
-        return incidents
+        Vendors we couldn't check this cycle are sampled as unknown, which
+        leaves them out of uptime and MTTR rather than counting as downtime.
+        """
+        now = int(time.time())
+        self.uptime_store.record_samples(
+            (
+                vendor['name'],
+                now,
+                'unknown' if vendor['name'] in self.monitor_failures
+                else self.state_machine.vendor_state(vendor['name'])
+            )
+            for vendor in self.vendors
+        )
     
-    def save_vendor_status(self, incidents: List[Dict]) -> int:
-        """Save vendor status to local database"""
+    def save_vendor_status(self, transitions: List[Dict]) -> int:
+        """Persist incident and vendor state transitions to local database"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         saved_count = 0
-        for incident in incidents:
+        for incident in transitions:
             try:
-                cursor.execute('''
-                    INSERT INTO vendor_status 
-                    (vendor_name, status, incident_id, incident_title, incident_description, 
-                     severity, started_at, resolved_at, checked_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    incident.get('vendor_name'),
-                    incident.get('status'),
-                    incident.get('incident_id'),
-                    incident.get('incident_title'),
-                    incident.get('incident_description'),
-                    incident.get('severity'),
-                    incident.get('started_at'),
-                    incident.get('resolved_at'),
-                    incident.get('checked_at')
-                ))
-                saved_count += 1
+                if incident['transition'] == 'opened':
+                    cursor.execute('''
+                        INSERT INTO vendor_status 
+                        (vendor_name, status, incident_id, incident_title, incident_description, 
+                         severity, started_at, resolved_at, checked_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (
+                        incident.get('vendor_name'),
+                        incident.get('status'),
+                        incident.get('incident_id'),
+                        incident.get('incident_title'),
+                        incident.get('incident_description'),
+                        incident.get('severity'),
+                        incident.get('started_at'),
+                        incident.get('resolved_at'),
+                        incident.get('checked_at')
+                    ))
+                    
+                    # Remember the row so later transitions update it in place
+                    row_id = cursor.lastrowid
+                    tracked = self.state_machine.open_incidents[incident['vendor_name']].get(incident['incident_id'])
+                    if tracked is not None:
+                        tracked['row_id'] = row_id
+                else:
+                    # An incident whose insert failed has no row id; its
+                    # open row, if any, is found by incident id instead
+                    if incident.get('row_id') is not None:
+                        where, key = 'id = ?', (incident['row_id'],)
+                    else:
+                        where = 'vendor_name = ? AND incident_id = ? AND resolved_at IS NULL'
+                        key = (incident.get('vendor_name'), incident.get('incident_id'))
+                    cursor.execute(f'''
+                        UPDATE vendor_status
+                        SET status = ?, incident_title = ?, incident_description = ?,
+                            severity = ?, resolved_at = ?, checked_at = ?
+                        WHERE {where}
+                    ''', (
+                        incident.get('status'),
+                        incident.get('incident_title'),
+                        incident.get('incident_description'),
+                        incident.get('severity'),
+                        incident.get('resolved_at'),
+                        incident.get('checked_at')
+                    ) + key)
+                if cursor.rowcount == 1:
+                    saved_count += 1
             except Exception as e:
                 print(f"Error saving incident: {e}")
         
+        # Record vendor-level transitions
+        now = datetime.now().isoformat()
+        for vendor_name in {incident['vendor_name'] for incident in transitions}:
+            state = self.state_machine.vendor_state(vendor_name)
+            cursor.execute('''
+                INSERT INTO vendor_state (vendor_name, state, changed_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(vendor_name) DO UPDATE
+                SET state = excluded.state, changed_at = excluded.changed_at
+                WHERE vendor_state.state != excluded.state
+            ''', (vendor_name, state, now))
+        
         conn.commit()
         conn.close()
         return saved_count
     
+    def prune_history(self, keep_days: int = 90, archive_path: Optional[str] = None) -> Dict[str, int]:
+        """Expire resolved incident history and old health samples in small chunks"""
+        retention = RetentionManager(self.db_path, archive_path)
+        stats = retention.apply('vendor_status', keep_days=keep_days, archive=archive_path is not None)
+        stats['samples_pruned'] = self.uptime_store.prune()
+        return stats
+    
     def send_to_nextjs_api(self, incidents: List[Dict]) -> bool:
-        """Send vendor incidents to Next.js API for processing"""
+        """Send new, changed and resolved vendor incidents to Next.js API"""
         try:
-            # Filter only incidents (not operational status)
-            actual_incidents = [i for i in incidents if i.get('status') != 'Operational']
+            # Filter only vendor incidents (not operational status or our own failed checks)
+            actual_incidents = [
+                i for i in incidents
+                if i.get('status') != 'Operational' and i.get('status') not in MONITORING_STATUSES
+            ]
             
             if not actual_incidents:
                 return True  # No incidents to report
             
+            assessments = self.risk_rules.evaluate_batch(
+                (
+                    f"{incident.get('incident_title') or ''}\n{incident.get('incident_description') or ''}",
+                    incident['vendor_name'],
+                    'Vendor',
+                    incident.get('severity')
+                )
+                for incident in actual_incidents
+            )
+            
             # Transform incidents for the API
             api_alerts = []
-            for incident in actual_incidents:
+            for incident, assessment in zip(actual_incidents, assessments):
+                resolved = incident.get('status') == 'Resolved'
+                title = f"{incident['vendor_name']}: {incident.get('incident_title') or 'Service Issue'}"
                 api_alert = {
-                    'title': f"{incident['vendor_name']}: {incident.get('incident_title', 'Service Issue')}",
+                    'title': f"{title} (Resolved)" if resolved else title,
                     'description': incident.get('incident_description', 'Vendor service disruption detected'),
                     'source': f"{incident['vendor_name']} Status Page",
                     'category': 'Vendor',
                     'subcategory': 'Service Outage',
-                    'riskLevel': incident.get('severity', 'Medium'),
-                    'severity': 'Critical' if incident.get('severity') == 'High' else 'Warning',
-                    'status': 'Active',
-                    'priority': 1 if incident.get('severity') == 'High' else 2,
+                    'riskLevel': assessment.get('riskLevel', incident.get('severity', 'Medium')),
+                    'severity': assessment.get('severity', 'Warning'),
+                    'status': 'Resolved' if resolved else 'Active',
+                    'priority': assessment.get('priority', 2),
                     'publishedAt': incident.get('started_at', datetime.now().isoformat()),
                     'tags': ['vendor-monitoring', 'service-outage', incident['vendor_name'].lower().replace(' ', '-')]
                 }
                 api_alerts.append(api_alert)
             
             # Send to Next.js API
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/api/news/process",
                 json={'articles': api_alerts},
                 headers={'Content-Type': 'application/json'},
@@ -352,13 +740,10 @@ class VendorStatusMonitor:
             print(f"Error sending vendor alerts to Next.js API: {e}")
             return False
     
-    def run_monitoring_cycle(self):
-        """Run a complete vendor monitoring cycle"""
-        print("🚀 Starting vendor status monitoring cycle...")
-        
+    def check_vendors_sequentially(self) -> List[Dict]:
+        """Check each vendor one after another"""
         all_incidents = []
         
-        # Check each vendor
         for vendor in self.vendors:
             incidents = self.check_generic_status_page(vendor)
             all_incidents.extend(incidents)
@@ -366,22 +751,121 @@ class VendorStatusMonitor:
             # Small delay between checks
             time.sleep(1)
         
-        if all_incidents:
+        return all_incidents
+    
+    def check_vendors_concurrently(self) -> List[Dict]:
+        """Check all vendors in parallel, bounded by the cycle deadline"""
+        all_incidents = []
+        futures = {}
+        for vendor in self.vendors:
+            # A vendor whose last poll is still running isn't polled again;
+            # results of polls that finished after their deadline are dropped
+            pending = self.pending_polls.get(vendor['name'])
+            if pending is not None and not pending.done():
+                print(f"Still checking {vendor['name']} from an earlier cycle")
+                all_incidents.append(self.timeout_record(vendor, 'Status check from an earlier cycle is still running'))
+                continue
+            futures[self.executor.submit(self.poll_vendor, vendor)] = vendor
+        
+        done, not_done = wait(futures, timeout=self.cycle_deadline)
+        
+        # Don't block the cycle on checks that blew the deadline; they finish
+        # once the per-request timeout fires
+        for future, vendor in futures.items():
+            if future in done:
+                self.pending_polls.pop(vendor['name'], None)
+                # Cursors only advance for polls that made the deadline
+                incidents, state = future.result()
+                self.update_parser_state(vendor['name'], state)
+                all_incidents.extend(incidents)
+            else:
+                if not future.cancel():
+                    self.pending_polls[vendor['name']] = future
+                print(f"Timed out checking {vendor['name']} after {self.cycle_deadline}s")
+                all_incidents.append(self.timeout_record(
+                    vendor, f'Status check did not complete within the {self.cycle_deadline}s cycle deadline'
+                ))
+        
+        return all_incidents
+    
+    def timeout_record(self, vendor: Dict, description: str) -> Dict:
+        """Monitoring failure record for a poll that missed the cycle deadline"""
+        return {
+            'vendor_name': vendor['name'],
+            'status': 'Error',
+            'incident_title': 'Monitoring Timeout',
+            'incident_description': description,
+            'severity': 'Low',
+            'started_at': datetime.now().isoformat(),
+            'checked_at': datetime.now().isoformat()
+        }
+    
+    def run_monitoring_cycle(self, concurrent: bool = True):
+        """Run a complete vendor monitoring cycle"""
+        print("🚀 Starting vendor status monitoring cycle...")
+        
+        start_time = time.time()
+        
+        # Check each vendor
+        if concurrent:
+            all_incidents = self.check_vendors_concurrently()
+        else:
+            all_incidents = self.check_vendors_sequentially()
+        
+        print(f"🔎 Checked {len(self.vendors)} vendors in {time.time() - start_time:.2f}s")
+        http_stats = self.http.stats().values()
+        print(f"🔌 {sum(host['reused'] for host in http_stats)} of {sum(host['requests'] for host in http_stats)} "
+              f"requests so far reused a kept-alive connection")
+        
+        # Only state transitions are persisted and alerted on
+        self.update_monitor_health(all_incidents)
+        transitions = self.apply_status_updates(all_incidents)
+        self.record_health_samples()
+        
+        if transitions:
             # Save to local database
-            saved_count = self.save_vendor_status(all_incidents)
-            print(f"💾 Saved {saved_count} vendor status records to database")
+            saved_count = self.save_vendor_status(transitions)
+            print(f"💾 Saved {saved_count} vendor status transitions to database")
             
             # Send incidents to API
-            if self.send_to_nextjs_api(all_incidents):
-                print(f"✅ Sent vendor status updates to Next.js application")
+            if self.send_to_nextjs_api(transitions):
+                print("✅ Sent vendor status updates to Next.js application")
             else:
                 print("❌ Failed to send vendor status updates to Next.js application")
+        else:
+            print("ℹ️ No vendor status changes since the last cycle")
+        
+        # Advance cursors only after their incidents have been stored
+        self.save_parser_state()
         
         print("✅ Vendor monitoring cycle completed")
 
 def main():
-    monitor = VendorStatusMonitor()
-    monitor.run_monitoring_cycle()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Vendor Status Page Monitor')
+    parser.add_argument('--sequential', action='store_true', help='Check vendors one at a time')
+    parser.add_argument('--workers', type=int, default=32, help='Maximum concurrent status checks')
+    parser.add_argument('--timeout', type=float, default=10, help='Per-vendor request timeout in seconds')
+    parser.add_argument('--deadline', type=float, default=30, help='Deadline for a whole monitoring cycle in seconds')
+    parser.add_argument('--prune', action='store_true', help='Expire old resolved incidents instead of monitoring')
+    parser.add_argument('--keep-days', type=int, default=90, help='Days of resolved incident history to keep')
+    parser.add_argument('--archive', help='Archive expired incidents under this directory')
+    
+    args = parser.parse_args()
+    
+    monitor = VendorStatusMonitor(
+        max_workers=args.workers,
+        request_timeout=args.timeout,
+        cycle_deadline=args.deadline
+    )
+    
+    if args.prune:
+        stats = monitor.prune_history(args.keep_days, args.archive)
+        print(f"🧹 Pruned vendor history: {stats}")
+        return
+    
+    monitor.run_monitoring_cycle(concurrent=not args.sequential)
 
 if __name__ == "__main__":
     main()